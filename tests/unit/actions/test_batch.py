@@ -0,0 +1,130 @@
+"""Unit tests for the virgo.core.actions.batch module."""
+
+import sqlite3
+import threading
+from unittest.mock import create_autospec
+
+import pytest
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.actions.batch import BatchManifest, ItemStatus, RunBatchAction
+from virgo.core.actions.generate import GenerateArticleAction
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = BatchManifest(tmp_path / "batch.db")
+    yield manifest
+    manifest.close()
+
+
+class DescribeBatchManifest:
+    def it_adds_each_question_once(self, manifest):
+        assert manifest.add(["What is AI?", "What is ML?", ""]) == 2
+        assert manifest.add(["What is AI?"]) == 0
+
+        assert manifest.counts()[ItemStatus.PENDING] == 2
+
+    def it_never_claims_an_item_twice(self, manifest, tmp_path):
+        manifest.add(["first", "second", "third"])
+        other_host = BatchManifest(tmp_path / "batch.db")
+
+        mine = manifest.claim("host-a", count=2, lease=60.0)
+        theirs = other_host.claim("host-b", count=2, lease=60.0)
+        other_host.close()
+
+        assert [item.question for item in mine] == ["first", "second"]
+        assert [item.question for item in theirs] == ["third"]
+
+    def it_reclaims_items_whose_lease_expired(self, manifest, monkeypatch):
+        manifest.add(["first"])
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1000.0)
+        (crashed,) = manifest.claim("host-a", count=1, lease=60.0)
+
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1061.0)
+        (reclaimed,) = manifest.claim("host-b", count=1, lease=60.0)
+
+        assert reclaimed.id == crashed.id
+        assert reclaimed.attempts == 2
+
+    def it_discards_the_results_of_a_lost_lease(self, manifest, monkeypatch):
+        manifest.add(["first"])
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1000.0)
+        (item,) = manifest.claim("host-a", count=1, lease=60.0)
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1061.0)
+        manifest.claim("host-b", count=1, lease=60.0)
+
+        assert not manifest.complete("host-a", item.id, MarkdownArticleFactory.build())
+        assert manifest.complete("host-b", item.id, MarkdownArticleFactory.build())
+
+    def it_keeps_renewed_leases(self, manifest, monkeypatch):
+        manifest.add(["first"])
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1000.0)
+        (item,) = manifest.claim("host-a", count=1, lease=60.0)
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1050.0)
+        assert manifest.renew("host-a", [item.id], lease=60.0) == 1
+
+        monkeypatch.setattr("virgo.core.actions.batch.time.time", lambda: 1061.0)
+
+        assert manifest.claim("host-b", count=1, lease=60.0) == []
+
+    def it_lists_the_generated_articles(self, manifest):
+        article = MarkdownArticleFactory.build()
+        manifest.add(["first"])
+        (item,) = manifest.claim("host-a", count=1, lease=60.0)
+        manifest.complete("host-a", item.id, article)
+
+        assert list(manifest.articles()) == [("first", article)]
+
+
+class DescribeRunBatchAction:
+    @pytest.fixture
+    def mock_action(self):
+        return create_autospec(GenerateArticleAction, instance=True)
+
+    def it_generates_every_pending_article(self, manifest, mock_action):
+        manifest.add(["first", "second", "third"])
+        mock_action.execute.return_value = MarkdownArticleFactory.build()
+
+        report = RunBatchAction(action=mock_action, shard_size=2).execute(
+            manifest, "host-a"
+        )
+
+        assert report.done == 3
+        assert manifest.counts()[ItemStatus.DONE] == 3
+
+    def it_retries_failed_items_up_to_the_maximum_attempts(self, manifest, mock_action):
+        manifest.add(["first"])
+        mock_action.execute.side_effect = RuntimeError("provider down")
+
+        report = RunBatchAction(action=mock_action, max_attempts=2).execute(
+            manifest, "host-a"
+        )
+
+        assert mock_action.execute.call_count == 2
+        assert report.failed == 2
+        assert manifest.counts()[ItemStatus.FAILED] == 1
+
+    def it_leaves_the_shard_when_a_lease_renewal_fails(
+        self, manifest, mock_action, monkeypatch
+    ):
+        manifest.add(["first", "second"])
+        renewal_failed = threading.Event()
+
+        def renew(*_args):
+            renewal_failed.set()
+            raise sqlite3.OperationalError("database is locked")
+
+        def execute(question):
+            renewal_failed.wait(5)
+            return MarkdownArticleFactory.build()
+
+        monkeypatch.setattr(manifest, "renew", renew)
+        mock_action.execute.side_effect = execute
+
+        report = RunBatchAction(action=mock_action, lease=0.3, shard_size=2).execute(
+            manifest, "host-a"
+        )
+
+        assert (report.done, report.lost) == (1, 1)
+        assert manifest.counts()[ItemStatus.RUNNING] == 1
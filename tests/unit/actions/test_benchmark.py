@@ -0,0 +1,64 @@
+"""Unit tests for the virgo.core.actions.benchmark module."""
+
+import itertools
+from unittest.mock import Mock
+
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.actions.benchmark import NOT_PARSED, RunOutputBenchmarkAction
+from virgo.core.agent.graph.builder import DRAFT, FORMAT, REVISE
+from virgo.core.agent.llms import ChatModelPool, LanguageModelProvider
+from virgo.core.agent.synthetic import SyntheticLanguageModelProvider
+
+
+class DescribeRunOutputBenchmarkAction:
+    def it_calls_every_node_with_every_method(self):
+        ticks = itertools.count()
+        pool = ChatModelPool(
+            {"synthetic": SyntheticLanguageModelProvider()}, "synthetic", "model"
+        )
+        action = RunOutputBenchmarkAction(pool=pool, clock=lambda: float(next(ticks)))
+
+        benchmarks = action.execute(
+            "What is AI?", methods=["function_calling", "json_mode"], repeats=2
+        )
+
+        assert [(benchmark.method, benchmark.node) for benchmark in benchmarks] == [
+            ("function_calling", DRAFT),
+            ("function_calling", REVISE),
+            ("function_calling", FORMAT),
+            ("json_mode", DRAFT),
+            ("json_mode", REVISE),
+            ("json_mode", FORMAT),
+        ]
+        assert all(benchmark.latency.count == 2 for benchmark in benchmarks)
+        assert all(benchmark.latency.p50 == 1.0 for benchmark in benchmarks)
+        assert all(benchmark.failed == 0 for benchmark in benchmarks)
+        assert all(benchmark.output_tokens > 0 for benchmark in benchmarks)
+
+    def it_counts_the_calls_raising_or_not_parsed(self):
+        model = Mock()
+        model.with_structured_output.side_effect = [
+            RunnableLambda(lambda _: {"raw": None, "parsed": None}),
+            RunnableLambda(Mock(side_effect=ValueError())),
+            RunnableLambda(lambda _: {"raw": None, "parsed": object()}),
+        ]
+        provider = Mock(spec=LanguageModelProvider)
+        provider.get_chat_model.return_value = model
+        pool = ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+
+        benchmarks = RunOutputBenchmarkAction(pool=pool).execute(
+            "What is AI?", methods=["json_schema"], repeats=1
+        )
+
+        assert [benchmark.errors for benchmark in benchmarks] == [
+            {NOT_PARSED: 1},
+            {"ValueError": 1},
+            {},
+        ]
+        assert benchmarks[0].failure_rate == 1.0
+        model.with_structured_output.assert_called_with(
+            model.with_structured_output.call_args.args[0],
+            include_raw=True,
+            method="json_schema",
+        )
@@ -0,0 +1,108 @@
+"""Unit tests for the virgo.core.actions.cache module."""
+
+import pytest
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.actions.cache import (
+    InMemoryArticleCache,
+    SQLiteArticleCache,
+    normalize_question,
+    settings_fingerprint,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def _make(ttl=60.0, max_entries=10):
+        if request.param == "memory":
+            return InMemoryArticleCache(ttl=ttl, max_entries=max_entries)
+        return SQLiteArticleCache(
+            tmp_path / "cache.db", ttl=ttl, max_entries=max_entries
+        )
+
+    return _make
+
+
+class DescribeNormalizeQuestion:
+    def it_ignores_case_whitespace_and_trailing_punctuation(self):
+        assert normalize_question("  What is   AI? ") == normalize_question(
+            "what is ai"
+        )
+
+    def it_keeps_distinct_questions_apart(self):
+        assert normalize_question("What is AI?") != normalize_question("What is ML?")
+
+
+class DescribeSettingsFingerprint:
+    def it_is_stable_regardless_of_the_settings_order(self):
+        assert settings_fingerprint(model_name="m", max_iterations=5) == (
+            settings_fingerprint(max_iterations=5, model_name="m")
+        )
+
+    def it_changes_with_the_settings(self):
+        assert settings_fingerprint(model_name="m") != settings_fingerprint(
+            model_name="n"
+        )
+
+
+class DescribeArticleCache:
+    """Tests shared by every article cache backend."""
+
+    def it_returns_the_cached_article(self, make_cache):
+        cache = make_cache()
+        article = MarkdownArticleFactory.build()
+
+        cache.put("What is AI?", "fp", article)
+
+        assert cache.get("what is ai", "fp") == article
+
+    def it_misses_for_other_settings(self, make_cache):
+        cache = make_cache()
+        cache.put("What is AI?", "fp", MarkdownArticleFactory.build())
+
+        assert cache.get("What is AI?", "other") is None
+
+    def it_expires_articles_after_the_ttl(self, make_cache, monkeypatch):
+        cache = make_cache(ttl=10.0)
+        monkeypatch.setattr("virgo.core.actions.cache.time.time", lambda: 1000.0)
+        cache.put("What is AI?", "fp", MarkdownArticleFactory.build())
+
+        monkeypatch.setattr("virgo.core.actions.cache.time.time", lambda: 1011.0)
+
+        assert cache.get("What is AI?", "fp") is None
+        assert len(cache) == 0
+
+    def it_evicts_the_least_recently_used_articles(self, make_cache, monkeypatch):
+        cache = make_cache(max_entries=2)
+        clock = iter(range(1000, 2000))
+        monkeypatch.setattr(
+            "virgo.core.actions.cache.time.time", lambda: float(next(clock))
+        )
+        cache.put("first", "fp", MarkdownArticleFactory.build())
+        cache.put("second", "fp", MarkdownArticleFactory.build())
+        cache.get("first", "fp")
+
+        cache.put("third", "fp", MarkdownArticleFactory.build())
+
+        assert len(cache) == 2
+        assert cache.get("second", "fp") is None
+        assert cache.get("first", "fp") is not None
+
+
+class DescribeSQLiteArticleCache:
+    def it_persists_articles_across_instances(self, tmp_path):
+        article = MarkdownArticleFactory.build()
+        cache = SQLiteArticleCache(tmp_path / "cache.db", ttl=60.0, max_entries=10)
+        cache.put("What is AI?", "fp", article)
+        cache.close()
+
+        reopened = SQLiteArticleCache(tmp_path / "cache.db", ttl=60.0, max_entries=10)
+
+        assert reopened.get("What is AI?", "fp") == article
+
+    def it_lists_the_questions_of_the_valid_articles(self, tmp_path):
+        cache = SQLiteArticleCache(tmp_path / "cache.db", ttl=60.0, max_entries=2)
+        for question in ["What is AI?", "What is ML?", "What is NLP?"]:
+            cache.put(question, "fp", MarkdownArticleFactory.build())
+
+        assert cache.questions() == [("fp", "what is ml"), ("fp", "what is nlp")]
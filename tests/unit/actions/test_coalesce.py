@@ -0,0 +1,151 @@
+"""Unit tests for the virgo.core.actions.coalesce module."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.actions.coalesce import CoalescingArticleGenerator, SingleFlight
+from virgo.core.agent import BatchArticleGenerator, GraphConfiguration
+from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.telemetry.metrics import VirgoMetrics
+
+
+class DescribeSingleFlight:
+    def it_shares_the_outcome_of_the_call_in_flight(self):
+        flight = SingleFlight[str]()
+        calls: list[str] = []
+        followers: list[Future[tuple[str, bool]]] = []
+
+        def call() -> str:
+            calls.append("call")
+            followers.append(executor.submit(flight.do, "key", call))
+            time.sleep(0.2)
+            return "article"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = flight.do("key", call)
+
+        assert leader == ("article", False)
+        assert followers[0].result() == ("article", True)
+        assert calls == ["call"]
+        assert len(flight) == 0
+
+    def it_shares_the_outcome_of_the_asynchronous_call_in_flight(self):
+        flight = SingleFlight[str]()
+        calls: list[str] = []
+
+        async def call() -> str:
+            calls.append("call")
+            await asyncio.sleep(0.1)
+            return "article"
+
+        async def both() -> list[tuple[str, bool]]:
+            return await asyncio.gather(
+                flight.ado("key", call), flight.ado("key", call)
+            )
+
+        assert asyncio.run(both()) == [("article", False), ("article", True)]
+        assert calls == ["call"]
+        assert len(flight) == 0
+
+    def it_runs_the_calls_of_distinct_keys(self):
+        flight = SingleFlight[str]()
+
+        assert flight.do("a", lambda: "first") == ("first", False)
+        assert flight.do("b", lambda: "second") == ("second", False)
+
+    def it_raises_the_error_of_the_call(self):
+        flight = SingleFlight[str]()
+
+        def failing() -> str:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            flight.do("key", failing)
+        assert len(flight) == 0
+
+
+class _SlowGenerator(BatchArticleGenerator):
+    """Generator taking a while to generate, and counting its generations."""
+
+    def __init__(self, article: MarkdownArticle) -> None:
+        self.article = article
+        self.questions: list[str] = []
+
+    def generate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        self.questions.append(question)
+        time.sleep(0.2)
+        return self.article
+
+    async def agenerate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        self.questions.append(question)
+        await asyncio.sleep(0.2)
+        return self.article
+
+
+class DescribeCoalescingArticleGenerator:
+    def it_shares_the_generation_in_flight_between_batches(self):
+        metrics = VirgoMetrics()
+        article = MarkdownArticleFactory.build()
+        inner = _SlowGenerator(article)
+        generator = CoalescingArticleGenerator(inner, fingerprint="fp", metrics=metrics)
+        results: list[list[tuple[str, MarkdownArticle | Exception]]] = []
+
+        callers = [
+            threading.Thread(
+                target=lambda question=question: results.append(
+                    list(generator.generate_many([question]))
+                )
+            )
+            for question in ("What is AI?", "what is AI")
+        ]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join(5)
+
+        assert inner.questions == ["What is AI?"]
+        assert sorted(results) == [
+            [("What is AI?", article)],
+            [("what is AI", article)],
+        ]
+        assert metrics.generations_coalesced.value() == 1
+
+    def it_shares_the_asynchronous_generation_in_flight(self):
+        article = MarkdownArticleFactory.build()
+        inner = _SlowGenerator(article)
+        generator = CoalescingArticleGenerator(inner)
+
+        async def both() -> list[MarkdownArticle | None]:
+            return await asyncio.gather(
+                generator.agenerate("What is AI?"), generator.agenerate("What is AI?")
+            )
+
+        assert asyncio.run(both()) == [article, article]
+        assert inner.questions == ["What is AI?"]
+
+    def it_runs_the_generations_with_distinct_overrides(self):
+        inner = _SlowGenerator(MarkdownArticleFactory.build())
+        generator = CoalescingArticleGenerator(inner)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(generator.generate, "What is AI?")
+            executor.submit(
+                generator.generate, "What is AI?", GraphConfiguration(max_iterations=2)
+            )
+
+        assert inner.questions == ["What is AI?", "What is AI?"]
@@ -1,11 +1,17 @@
+import threading
 from unittest.mock import create_autospec
 
 import pytest
 
-from tests.unit.factories import MarkdownArticleFactory
+from tests.unit.factories import AnswerFactory, MarkdownArticleFactory
+from virgo.core.actions.cache import InMemoryArticleCache
 from virgo.core.actions.generate import GenerateArticleAction
 from virgo.core.actions.protocols import ArticleGenerator
-from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.agent import VirgoAgent
+from virgo.core.agent.graph.builder import create_graph_builder
+from virgo.core.agent.graph.state import AnswerState
+from virgo.core.agent.schemas import MarkdownArticle, PartialArticle
+from virgo.core.telemetry.metrics import VirgoMetrics
 
 
 class DescribeGenerateArticleAction:
@@ -56,3 +62,140 @@ class DescribeGenerateArticleAction:
 
         assert result is not None
         assert result.title == "Article: Test Question"
+
+
+class DescribeGenerateArticleActionMetrics:
+    @pytest.fixture
+    def mock_generator(self):
+        return create_autospec(ArticleGenerator, instance=True)
+
+    @pytest.fixture
+    def metrics(self):
+        return VirgoMetrics()
+
+    @pytest.fixture
+    def action(self, mock_generator, metrics):
+        return GenerateArticleAction(generator=mock_generator, metrics=metrics)
+
+    def it_counts_successful_generations(self, action, mock_generator, metrics):
+        mock_generator.generate.return_value = MarkdownArticleFactory.build()
+
+        action.execute("What is AI?")
+
+        assert metrics.generations_started.value() == 1
+        assert metrics.generations_succeeded.value() == 1
+        assert metrics.generations_failed.value() == 0
+
+    def it_counts_empty_generations_as_failed(self, action, mock_generator, metrics):
+        mock_generator.generate.return_value = None
+
+        action.execute("What is AI?")
+
+        assert metrics.generations_failed.value() == 1
+
+    def it_counts_raising_generations_as_failed(self, action, mock_generator, metrics):
+        mock_generator.generate.side_effect = RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            action.execute("What is AI?")
+
+        assert metrics.generations_started.value() == 1
+        assert metrics.generations_failed.value() == 1
+
+
+class DescribeGenerateArticleActionCache:
+    @pytest.fixture
+    def mock_generator(self):
+        return create_autospec(ArticleGenerator, instance=True)
+
+    @pytest.fixture
+    def metrics(self):
+        return VirgoMetrics()
+
+    @pytest.fixture
+    def action(self, mock_generator, metrics):
+        return GenerateArticleAction(
+            generator=mock_generator,
+            metrics=metrics,
+            cache=InMemoryArticleCache(ttl=60.0, max_entries=10),
+            fingerprint="fp",
+        )
+
+    def it_serves_repeated_questions_from_the_cache(
+        self, action, mock_generator, metrics
+    ):
+        article = MarkdownArticleFactory.build()
+        mock_generator.generate.return_value = article
+
+        action.execute("What is AI?")
+        result = action.execute("what is AI")
+
+        assert result == article
+        mock_generator.generate.assert_called_once_with("What is AI?")
+        assert metrics.cache_misses.value(cache="article") == 1
+        assert metrics.cache_hits.value(cache="article") == 1
+
+    def it_does_not_cache_failed_generations(self, action, mock_generator):
+        mock_generator.generate.return_value = None
+
+        action.execute("What is AI?")
+        action.execute("What is AI?")
+
+        assert mock_generator.generate.call_count == 2
+
+    def it_does_not_cache_partial_articles(self, action, mock_generator):
+        mock_generator.generate.return_value = PartialArticle.model_validate(
+            MarkdownArticleFactory.build().model_dump()
+        )
+
+        action.execute("What is AI?")
+        action.execute("What is AI?")
+
+        assert mock_generator.generate.call_count == 2
+
+    def it_does_not_cache_timed_out_generations(self):
+        release = threading.Event()
+        formatted: list[AnswerState] = []
+        answer = AnswerFactory.build()
+
+        def draft(state: AnswerState) -> AnswerState:
+            return AnswerState(messages=[], final_answer=answer, formatted_article=None)
+
+        def research(state: AnswerState) -> AnswerState:
+            release.wait(5)
+            return AnswerState(messages=[], formatted_article=None)
+
+        def format(state: AnswerState) -> AnswerState:
+            formatted.append(state)
+            return AnswerState(
+                messages=[],
+                final_answer=answer,
+                formatted_article=MarkdownArticleFactory.build(),
+            )
+
+        graph = create_graph_builder(
+            {"DRAFT": draft, "RESEARCH": research, "REVISE": draft, "FORMAT": format},
+            deadline_reserve=0.5,
+        ).compile()
+        cache = InMemoryArticleCache(ttl=60.0, max_entries=10)
+        action = GenerateArticleAction(
+            generator=VirgoAgent(graph=graph, timeout=0.6), cache=cache
+        )
+
+        article = action.execute("What is AI?")
+        release.set()
+
+        # The research is abandoned, and the article made from the draft.
+        assert isinstance(article, PartialArticle)
+        assert cache.get("What is AI?", "") is None
+        assert len(formatted) == 1
+
+    def it_regenerates_when_bypassing_the_cache(self, action, mock_generator):
+        first, second = MarkdownArticleFactory.build_batch(2)
+        mock_generator.generate.side_effect = [first, second]
+
+        action.execute("What is AI?")
+        bypassed = action.execute("What is AI?", use_cache=False)
+
+        assert bypassed == second
+        assert action.execute("What is AI?") == second
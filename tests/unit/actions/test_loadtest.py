@@ -0,0 +1,60 @@
+"""Unit tests for the virgo.core.actions.loadtest module."""
+
+import itertools
+from unittest.mock import Mock
+
+import pytest
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.actions.loadtest import NO_ARTICLE, RunLoadTestAction
+from virgo.core.telemetry.latency import LatencyRecorder
+
+
+class DescribeRunLoadTestAction:
+    def it_runs_the_requested_number_of_generations(self):
+        article = MarkdownArticleFactory()
+        generator = Mock()
+        generator.generate.side_effect = [article, None, TimeoutError(), article] * 2
+        action = RunLoadTestAction(
+            generator=generator, recorder=LatencyRecorder(), concurrency=1
+        )
+
+        report = action.execute(["a", "b", "c"], requests=8)
+
+        assert report.requests == 8
+        assert report.succeeded == 4
+        assert report.failed == 4
+        assert report.errors == {NO_ARTICLE: 2, "TimeoutError": 2}
+        assert report.latency.count == 8
+        assert [call.args[0] for call in generator.generate.call_args_list] == [
+            "a",
+            "b",
+            "c",
+            "a",
+            "b",
+            "c",
+            "a",
+            "b",
+        ]
+
+    def it_starts_generations_until_the_duration_elapses(self):
+        ticks = itertools.count()
+        generator = Mock()
+        action = RunLoadTestAction(
+            generator=generator,
+            recorder=LatencyRecorder(),
+            concurrency=1,
+            clock=lambda: float(next(ticks)),
+        )
+
+        report = action.execute(["a"], duration=6.0)
+
+        # Each generation reads the clock thrice: at the deadline check, its start and end.
+        assert report.requests == 2
+        assert report.throughput == pytest.approx(2 / report.elapsed)
+
+    def it_requires_a_number_of_requests_or_a_duration(self):
+        action = RunLoadTestAction(generator=Mock(), recorder=LatencyRecorder())
+
+        with pytest.raises(ValueError, match="number of requests or a duration"):
+            action.execute(["a"])
@@ -0,0 +1,122 @@
+"""Unit tests for the virgo.core.actions.similarity module."""
+
+import numpy as np
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.actions.cache import InMemoryArticleCache, SQLiteArticleCache
+from virgo.core.actions.similarity import (
+    HashedNgramVectorizer,
+    NearDuplicateArticleCache,
+    QuestionIndex,
+)
+
+
+class DescribeHashedNgramVectorizer:
+    def it_embeds_texts_as_unit_vectors(self):
+        vector = HashedNgramVectorizer(dimensions=64).transform("Solar panels")
+
+        assert vector.shape == (64,)
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+
+    def it_ignores_how_the_question_is_phrased(self):
+        vectorizer = HashedNgramVectorizer()
+
+        similarity = vectorizer.transform(
+            "Tell me about machine learning"
+        ) @ vectorizer.transform("What is machine learning?")
+
+        assert np.isclose(similarity, 1.0)
+
+    def it_scores_rephrasings_above_other_questions(self):
+        vectorizer = HashedNgramVectorizer()
+        question = vectorizer.transform("How do solar panels work?")
+
+        rephrased = question @ vectorizer.transform("How does a solar panel work")
+        other = question @ vectorizer.transform("How do wind turbines work?")
+
+        assert rephrased > 0.75
+        assert other < 0.3
+
+    def it_embeds_texts_without_features_as_zero_vectors(self):
+        assert not HashedNgramVectorizer().transform("the of").any()
+
+
+class DescribeQuestionIndex:
+    def it_finds_the_nearest_question(self):
+        index = QuestionIndex(dimensions=2)
+        index.add("a", np.array([1.0, 0.0], dtype=np.float32))
+        index.add("b", np.array([0.0, 1.0], dtype=np.float32))
+
+        assert index.nearest(np.array([0.6, 0.8], dtype=np.float32)) == (
+            "b",
+            np.float32(0.8),
+        )
+
+    def it_grows_and_compacts_the_removed_questions(self):
+        index = QuestionIndex(dimensions=4)
+        vectors = np.eye(4, dtype=np.float32)
+        for number in range(3000):
+            index.add(f"q{number}", vectors[number % 4])
+            if number % 4:
+                index.remove(f"q{number}")
+
+        assert len(index) == 750
+        assert index.nearest(vectors[0])[0].startswith("q")
+        assert index.nearest(vectors[1])[1] == 0
+
+
+class DescribeNearDuplicateArticleCache:
+    def it_serves_the_article_of_a_near_duplicate_question(self):
+        cache = NearDuplicateArticleCache(
+            InMemoryArticleCache(ttl=60, max_entries=10), threshold=0.7
+        )
+        article = MarkdownArticleFactory.build()
+
+        cache.put("How do solar panels work?", "fp", article)
+
+        assert cache.get("How does a solar panel work", "fp") == article
+        assert cache.get("How do wind turbines work?", "fp") is None
+
+    def it_misses_for_other_settings(self):
+        cache = NearDuplicateArticleCache(
+            InMemoryArticleCache(ttl=60, max_entries=10), threshold=0.7
+        )
+
+        cache.put("What is machine learning?", "fp", MarkdownArticleFactory.build())
+
+        assert cache.get("Explain machine learning", "other") is None
+
+    def it_forgets_the_questions_evicted_from_the_cache(self):
+        cache = NearDuplicateArticleCache(
+            InMemoryArticleCache(ttl=60, max_entries=1), threshold=0.7
+        )
+        cache.put("What is machine learning?", "fp", MarkdownArticleFactory.build())
+        cache.put("What is quantum computing?", "fp", MarkdownArticleFactory.build())
+
+        assert cache.get("Explain machine learning", "fp") is None
+        assert cache.get("Explain quantum computing", "fp") is not None
+
+    def it_indexes_the_questions_of_a_persisted_cache(self, tmp_path):
+        article = MarkdownArticleFactory.build()
+        cache = SQLiteArticleCache(tmp_path / "cache.db", ttl=60, max_entries=10)
+        NearDuplicateArticleCache(cache, threshold=0.7).put(
+            "How do solar panels work?", "fp", article
+        )
+
+        restarted = NearDuplicateArticleCache(cache, threshold=0.7)
+
+        assert restarted.get("How does a solar panel work", "fp") == article
+
+    def it_drops_the_least_recently_used_questions(self):
+        cache = NearDuplicateArticleCache(
+            InMemoryArticleCache(ttl=60, max_entries=10), threshold=0.7, max_entries=2
+        )
+        cache.put("What is machine learning?", "fp", MarkdownArticleFactory.build())
+        cache.put("What is quantum computing?", "fp", MarkdownArticleFactory.build())
+        cache.get("What is machine learning?", "fp")
+
+        cache.put("What is solar power?", "other", MarkdownArticleFactory.build())
+
+        assert len(cache) == 2
+        assert cache.get("Explain machine learning", "fp") is not None
+        assert cache.get("Explain quantum computing", "fp") is None
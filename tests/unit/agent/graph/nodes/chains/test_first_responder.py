@@ -2,7 +2,9 @@
 
 from unittest.mock import MagicMock
 
+from virgo.core.agent.compact import compact_model
 from virgo.core.agent.graph.nodes.chains import first_responder
+from virgo.core.agent.schemas import Answer
 
 
 class DescribeCreateChain:
@@ -42,3 +44,13 @@ class DescribeCreateChain:
 
         # The prompt should have the first instruction about detailed answers
         assert chain is not None
+
+    def it_sends_the_compact_schema_when_requested(self):
+        """Verify the compact schema is used for the structured output."""
+        mock_llm = MagicMock()
+
+        first_responder.create_chain(mock_llm, compact_schemas=True)
+
+        mock_llm.with_structured_output.assert_called_once_with(
+            compact_model(Answer), include_raw=True
+        )
@@ -18,7 +18,7 @@ class DescribeDraftNode:
     @pytest.fixture
     def draft_node(self, mock_chain):
         with pytest.MonkeyPatch.context() as m:
-            m.setattr(first_responder, "create_chain", lambda _: mock_chain)
+            m.setattr(first_responder, "create_chain", lambda *_: mock_chain)
             yield create_node(llm=MagicMock())
 
     def it_updates_state_with_parsed_answer(self, draft_node, mock_chain, answer_state):
@@ -10,7 +10,11 @@ from tests.unit.factories import (
     ReflectionFactory,
     RevisedFactory,
 )
-from virgo.core.agent.graph.nodes.format import _create_node_from_chain, create_node
+from virgo.core.agent.graph.nodes.format import (
+    _create_node_from_chain,
+    create_node,
+    render_locally,
+)
 from virgo.core.agent.graph.state import AnswerState
 
 
@@ -116,6 +120,23 @@ class DescribeCreateNodeFromChain:
         assert "[1] Source A" in call_args["references"]
         assert "[2] Source B" in call_args["references"]
 
+    def it_copies_the_local_references_without_sending_them(self):
+        """Verify the rendered references skip the model and reach the article."""
+        references = ["[1] [Source A](https://example.com/a) - Excerpt"]
+        revised = RevisedFactory.build(references=references)
+        mock_chain = MagicMock()
+        mock_chain.invoke.return_value = {
+            "parsed": MarkdownArticleFactory.build(references=[])
+        }
+
+        node = _create_node_from_chain(mock_chain, local_references=True)
+        result = node(
+            {"messages": [], "final_answer": revised, "formatted_article": None}
+        )
+
+        assert mock_chain.invoke.call_args[0][0]["references"] == "None"
+        assert result["formatted_article"].references == references
+
     def it_uses_none_for_references_when_not_available(self):
         """Verify the node uses 'None' string when references are not available."""
         answer = AnswerFactory.build(
@@ -254,6 +275,38 @@ class DescribeCreateNodeFromChain:
         assert result["messages"] == []
 
 
+class DescribeRenderLocally:
+    """Tests for the local rendering of the latest answer."""
+
+    def it_renders_the_answer_without_the_model(self):
+        answer = RevisedFactory.build(
+            value="Solar panels convert light. They use cells.",
+            references=["[1] https://example.com"],
+        )
+        state: AnswerState = {
+            "messages": [HumanMessage(content="How do solar panels work?")],
+            "final_answer": answer,
+            "formatted_article": None,
+        }
+
+        article = render_locally(state)["formatted_article"]
+
+        assert article is not None
+        assert article.title == "How do solar panels work?"
+        assert article.summary == "Solar panels convert light."
+        assert article.content == answer.value
+        assert article.references == ["[1] https://example.com"]
+
+    def it_renders_nothing_without_an_answer(self):
+        state: AnswerState = {
+            "messages": [],
+            "final_answer": None,
+            "formatted_article": None,
+        }
+
+        assert render_locally(state)["formatted_article"] is None
+
+
 class DescribeCreateNode:
     """Tests for the create_node function."""
 
@@ -1,10 +1,15 @@
 """Unit tests for the research node module."""
 
+import json
 from unittest.mock import MagicMock
 
+from langchain_core.messages import ToolMessage
 from langgraph.prebuilt import ToolNode
 
+from tests.unit.factories import ReflectionFactory
+from virgo.core.agent.evidence import EVIDENCE_REF_PREFIX, InMemoryEvidenceStore
 from virgo.core.agent.graph.nodes.research import create_node
+from virgo.core.agent.ranking import BM25Ranker
 from virgo.core.agent.schemas import Reflection
 
 
@@ -70,3 +75,87 @@ class DescribeCreateNode:
         # Verify Answer schema is used in tool creation
         # This is verified by checking that tools_by_name contains Answer
         assert len(node.tools_by_name) >= 1
+
+
+class DescribeEvidenceStoreSupport:
+    """Tests for the research node backed by an evidence store."""
+
+    def _invoke_answer_tool(self, node: ToolNode) -> ToolMessage:
+        tool = node.tools_by_name["Answer"]
+        return tool.invoke(
+            {
+                "type": "tool_call",
+                "id": "1",
+                "name": "Answer",
+                "args": {
+                    "value": "Answer",
+                    "reflection": ReflectionFactory.build().model_dump(),
+                },
+            }
+        )
+
+    def it_replaces_results_by_references(self):
+        store = InMemoryEvidenceStore()
+
+        def researcher(reflection: Reflection, value: str, references=None):
+            return ["result A", "result B"]
+
+        message = self._invoke_answer_tool(create_node(researcher, store))
+
+        assert all(ref.startswith(EVIDENCE_REF_PREFIX) for ref in message.content)
+        assert store.resolve_messages([message])[0].content == [
+            "result A",
+            "result B",
+        ]
+
+    def it_stores_each_tavily_result_separately(self):
+        store = InMemoryEvidenceStore()
+        result = {"url": "https://example.com", "content": "Text"}
+
+        def researcher(reflection: Reflection, value: str, references=None):
+            return [
+                {"query": "q1", "results": [result]},
+                {"query": "q2", "results": [result]},
+            ]
+
+        message = self._invoke_answer_tool(create_node(researcher, store))
+
+        assert len(store) == 1
+        resolved = store.resolve_messages([message])[0]
+        assert json.loads(resolved.content) == [
+            {"query": "q1", "results": [result]},
+            {"query": "q2", "results": [result]},
+        ]
+
+
+class DescribeRankerSupport:
+    """Tests for the research node ranking the result chunks."""
+
+    def _research(self, node: ToolNode, reflection: Reflection) -> object:
+        tool = node.tools_by_name["Answer"]
+        return tool.func(reflection=reflection, value="Answer")  # type: ignore[attr-defined]
+
+    def it_keeps_the_most_relevant_chunks(self):
+        relevant = {"url": "https://a.example", "content": "Perovskite solar cells."}
+        irrelevant = {"url": "https://b.example", "content": "Cooking pasta at home."}
+
+        def researcher(reflection: Reflection, value: str, references=None):
+            return [{"query": "q", "results": [irrelevant, relevant]}]
+
+        reflection = ReflectionFactory.build(
+            missing="Recent solar cells advances.", search_queries=["perovskite"]
+        )
+        node = create_node(researcher, ranker=BM25Ranker(top_k=1))
+
+        assert self._research(node, reflection) == [
+            {"query": "q", "results": [relevant]}
+        ]
+
+    def it_keeps_search_errors(self):
+        def researcher(reflection: Reflection, value: str, references=None):
+            return [{"error": "timeout"}, "Solar text."]
+
+        reflection = ReflectionFactory.build(missing="solar", search_queries=[])
+        node = create_node(researcher, ranker=BM25Ranker(top_k=5))
+
+        assert self._research(node, reflection) == [{"error": "timeout"}, "Solar text."]
@@ -1,13 +1,15 @@
 """Unit tests for the revise node module."""
 
+import json
 from unittest.mock import MagicMock, patch
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
-from tests.unit.factories import ReflectionFactory, RevisedFactory
-from virgo.core.agent.graph.nodes.revise import create_node
+from tests.unit.factories import AnswerFactory, ReflectionFactory, RevisedFactory
+from virgo.core.agent.evidence import InMemoryEvidenceStore
+from virgo.core.agent.graph.nodes.revise import _create_node_from_chain, create_node
 from virgo.core.agent.graph.state import AnswerState
-from virgo.core.agent.schemas import Revised
+from virgo.core.agent.schemas import Edit, Revised, RevisionPatch
 
 
 class DescribeCreateNode:
@@ -185,3 +187,127 @@ class DescribeCreateNode:
 
         assert isinstance(result["final_answer"], Revised)
         assert len(result["final_answer"].references) == 2
+
+    def it_resolves_evidence_references_only_for_the_prompt(self):
+        """Verify the chain sees resolved evidence while the state keeps references."""
+        store = InMemoryEvidenceStore()
+        ref = store.put("Full search result")
+        tool_message = ToolMessage(content=f'["{ref}"]', tool_call_id="1")
+
+        mock_chain = MagicMock()
+        mock_chain.invoke.return_value = {
+            "raw": HumanMessage(content="raw"),
+            "parsed": RevisedFactory.build(),
+        }
+
+        with patch(
+            "virgo.core.agent.graph.nodes.revise.revisor.create_chain",
+            return_value=mock_chain,
+        ):
+            node = create_node(MagicMock(), evidence_store=store)
+
+        state: AnswerState = {
+            "messages": [HumanMessage(content="Question"), tool_message],
+            "final_answer": None,
+            "formatted_article": None,
+        }
+
+        result = node(state)
+
+        prompt_messages = mock_chain.invoke.call_args[0][0]["messages"]
+        assert prompt_messages[1].content == '["Full search result"]'
+        assert result["messages"][1] is tool_message
+
+    def it_cites_the_sources_by_their_id_in_the_citation_index(self):
+        """Verify the chain sees source IDs and the references are rendered locally."""
+        results = [
+            {
+                "query": "query",
+                "results": [
+                    {"url": "https://example.com/a", "title": "A", "content": "Text A"},
+                    {"url": "https://example.com/b", "title": "B", "content": "Text B"},
+                ],
+            }
+        ]
+        tool_message = ToolMessage(content=json.dumps(results), tool_call_id="1")
+
+        mock_chain = MagicMock()
+        mock_chain.invoke.return_value = {
+            "raw": HumanMessage(content="raw"),
+            "parsed": RevisedFactory.build(value="Cited [2].", references=["[2]"]),
+        }
+
+        with patch(
+            "virgo.core.agent.graph.nodes.revise.revisor.create_chain",
+            return_value=mock_chain,
+        ):
+            node = create_node(MagicMock(), citations=True)
+
+        result = node(
+            {
+                "messages": [HumanMessage(content="Question"), tool_message],
+                "final_answer": None,
+                "formatted_article": None,
+            }
+        )
+
+        prompt_messages = mock_chain.invoke.call_args[0][0]["messages"]
+        cited = json.loads(prompt_messages[1].content)[0]["results"]
+        assert [item["id"] for item in cited] == [1, 2]
+        assert "https://example.com/a" not in prompt_messages[1].content
+        assert result["final_answer"].references == [
+            "[2] [B](https://example.com/b) - Text B"
+        ]
+
+    def it_edits_the_revised_answers_with_the_patch_chain(self):
+        """Verify later revisions apply the edits and call the tool with the result."""
+        previous = RevisedFactory.build(value="Wind is growing.", references=[])
+        patch = RevisionPatch(
+            edits=[Edit(operation="replace", target="growing", text="booming")],
+            reflection=ReflectionFactory.build(),
+        )
+        chain, patch_chain = MagicMock(), MagicMock()
+        patch_chain.invoke.return_value = {
+            "raw": AIMessage(
+                "",
+                tool_calls=[
+                    {"name": "RevisionPatch", "args": patch.model_dump(), "id": "42"}
+                ],
+            ),
+            "parsed": patch,
+        }
+        node = _create_node_from_chain(chain, patch_chain=patch_chain)
+
+        result = node(
+            {
+                "messages": [HumanMessage(content="Question")],
+                "final_answer": previous,
+                "formatted_article": None,
+            }
+        )
+
+        chain.invoke.assert_not_called()
+        assert result["final_answer"].value == "Wind is booming."
+        (call,) = result["messages"][-1].tool_calls
+        assert (call["name"], call["id"]) == ("Revised", "42")
+        assert call["args"]["value"] == "Wind is booming."
+
+    def it_rewrites_the_first_revision_in_full(self):
+        """Verify the draft answer is revised by the full revisor chain."""
+        chain, patch_chain = MagicMock(), MagicMock()
+        chain.invoke.return_value = {
+            "raw": HumanMessage(content="raw"),
+            "parsed": RevisedFactory.build(),
+        }
+        node = _create_node_from_chain(chain, patch_chain=patch_chain)
+
+        node(
+            {
+                "messages": [HumanMessage(content="Question")],
+                "final_answer": AnswerFactory.build(),
+                "formatted_article": None,
+            }
+        )
+
+        patch_chain.invoke.assert_not_called()
+        chain.invoke.assert_called_once()
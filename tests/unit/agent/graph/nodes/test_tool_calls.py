@@ -0,0 +1,47 @@
+"""Unit tests for the tool_calls module of the graph nodes."""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tests.unit.factories import AnswerFactory
+from virgo.core.agent.graph.nodes.tool_calls import as_tool_call, with_tool_call
+
+
+class DescribeAsToolCall:
+    """Tests for the as_tool_call function."""
+
+    def it_calls_the_tool_of_the_output_with_its_arguments(self):
+        answer = AnswerFactory.build()
+        raw = AIMessage(
+            "",
+            tool_calls=[{"name": "RevisionPatch", "args": {}, "id": "42"}],
+            usage_metadata={"input_tokens": 3, "output_tokens": 2, "total_tokens": 5},
+        )
+
+        message = as_tool_call(raw, answer)
+
+        (call,) = message.tool_calls
+        assert (call["name"], call["id"]) == ("Answer", "42")
+        assert call["args"] == answer.model_dump(mode="json")
+        assert message.usage_metadata == raw.usage_metadata
+
+
+class DescribeWithToolCall:
+    """Tests for the with_tool_call function."""
+
+    def it_turns_the_json_answers_into_tool_calls(self):
+        answer = AnswerFactory.build()
+
+        message = with_tool_call(AIMessage(answer.model_dump_json()), answer)
+
+        assert message.content == ""
+        assert message.tool_calls[0]["name"] == "Answer"
+        assert message.tool_calls[0]["id"]
+
+    def it_keeps_the_messages_calling_a_tool_or_not_parsed(self):
+        answer = AnswerFactory.build()
+        call = AIMessage("", tool_calls=[{"name": "Answer", "args": {}, "id": "1"}])
+        text = AIMessage("Not JSON")
+
+        assert with_tool_call(call, answer) is call
+        assert with_tool_call(text, None) is text
+        assert with_tool_call(HumanMessage("raw"), answer).content == "raw"
@@ -135,6 +135,18 @@ class DescribeEventLoop:
 
         assert result == FORMAT
 
+    def it_uses_the_configured_max_iterations(self):
+        """Verify the invocation config overrides the default max iterations."""
+        state: AnswerState = {
+            "messages": [ToolMessage(content="result", tool_call_id="0")],
+            "final_answer": None,
+            "formatted_article": None,
+        }
+
+        result = _event_loop(state, {"configurable": {"max_iterations": 1}})
+
+        assert result == FORMAT
+
     def it_returns_research_when_under_max_iterations(self):
         """Verify event loop continues to RESEARCH when under max iterations."""
         tool_messages = [
@@ -0,0 +1,202 @@
+"""Unit tests for the Virgo agent graph deadline module."""
+
+import math
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import ensure_config
+
+from tests.unit.factories import AnswerFactory
+from virgo.core.agent import configuration
+from virgo.core.agent.graph.builder import FORMAT, create_graph_builder
+from virgo.core.agent.graph.deadline import (
+    is_out_of_time,
+    remaining_time,
+    with_deadline,
+)
+from virgo.core.agent.graph.state import AnswerState
+
+_EMPTY: AnswerState = {"messages": [], "final_answer": None, "formatted_article": None}
+
+
+def _deadline(seconds: float) -> dict:
+    return {"configurable": {"deadline": time.time() + seconds}}
+
+
+class DescribeWithDeadline:
+    """Tests for the with_deadline function."""
+
+    def it_runs_the_node_in_place_without_deadline(self):
+        threads: list[threading.Thread] = []
+
+        def node(state: AnswerState) -> AnswerState:
+            threads.append(threading.current_thread())
+            return state
+
+        with_deadline("draft", node)(_EMPTY, {})
+
+        assert threads == [threading.current_thread()]
+
+    def it_returns_the_node_output_in_time(self):
+        output = AnswerState(
+            messages=[AIMessage(content="draft")],
+            final_answer=None,
+            formatted_article=None,
+        )
+
+        result = with_deadline("draft", lambda _: output)(_EMPTY, _deadline(5))
+
+        assert result is output
+
+    def it_returns_the_fallback_when_the_node_runs_out_of_time(self):
+        release = threading.Event()
+        answer = AnswerFactory.build()
+
+        def slow(state: AnswerState) -> AnswerState:
+            release.wait(5)
+            return state
+
+        result = with_deadline("revise", slow)(
+            {**_EMPTY, "final_answer": answer}, _deadline(0.05)
+        )
+        release.set()
+
+        assert result["final_answer"] is answer
+        assert result["messages"] == []
+
+    def it_keeps_the_reserve_for_the_next_nodes(self):
+        release = threading.Event()
+        answer = AnswerFactory.build()
+
+        def slow(state: AnswerState) -> AnswerState:
+            release.wait(5)
+            return state
+
+        start = time.monotonic()
+        result = with_deadline("revise", slow, reserve=4.9)(
+            {**_EMPTY, "final_answer": answer}, _deadline(5)
+        )
+        release.set()
+
+        assert result["final_answer"] is answer
+        assert time.monotonic() - start < 1
+
+    def it_skips_the_node_past_the_deadline(self):
+        calls: list[AnswerState] = []
+
+        with_deadline("draft", calls.append)(_EMPTY, _deadline(-1))
+
+        assert calls == []
+
+    def it_gives_the_node_calls_its_own_deadline(self):
+        remaining: list[float | None] = []
+
+        def node(state: AnswerState) -> AnswerState:
+            # The calls of the node read the config of the current context.
+            remaining.append(remaining_time(ensure_config()))
+            return state
+
+        with_deadline("revise", node, reserve=4)(_EMPTY, _deadline(5))
+
+        assert remaining[0] is not None
+        assert remaining[0] <= 1
+
+    def it_returns_the_fallback_when_the_node_fails_past_its_deadline(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        answer = AnswerFactory.build()
+
+        def timing_out(state: AnswerState) -> AnswerState:
+            # The deadline passes as the call of the node times out.
+            monkeypatch.setattr(
+                configuration, "time", SimpleNamespace(time=lambda: math.inf)
+            )
+            raise TimeoutError("Request timed out.")
+
+        result = with_deadline("revise", timing_out)(
+            {**_EMPTY, "final_answer": answer}, _deadline(5)
+        )
+
+        assert result["final_answer"] is answer
+
+    def it_raises_the_node_errors(self):
+        def failing(state: AnswerState) -> AnswerState:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            with_deadline("draft", failing)(_EMPTY, _deadline(5))
+
+
+class DescribeIsOutOfTime:
+    """Tests for the is_out_of_time function."""
+
+    def it_compares_the_remaining_time_with_the_reserve(self):
+        assert not is_out_of_time(10, {})
+        assert not is_out_of_time(10, _deadline(60))
+        assert is_out_of_time(10, _deadline(5))
+
+
+class DescribeGraphWithDeadline:
+    """Tests for the graph runs with a deadline."""
+
+    def it_skips_to_format_with_the_latest_answer(self):
+        visited: list[str] = []
+        release = threading.Event()
+        answer = AnswerFactory.build(value="Latest answer.")
+
+        def node(name: str, wait: bool = False):
+            def run(state: AnswerState) -> AnswerState:
+                if wait:
+                    release.wait(5)
+                visited.append(name)
+                return AnswerState(
+                    messages=[], final_answer=answer, formatted_article=None
+                )
+
+            return run
+
+        builder = create_graph_builder(
+            {
+                "DRAFT": node("draft"),
+                "RESEARCH": node("research", wait=True),
+                "REVISE": node("revise"),
+                "FORMAT": node("format"),
+            },
+            deadline_reserve=0.5,
+        )
+        result = builder.compile().invoke(
+            {"messages": [HumanMessage(content="Question")]}, _deadline(0.7)
+        )
+        release.set()
+
+        # The research is abandoned when only the reserve is left.
+        assert visited == ["draft", FORMAT]
+        assert result["final_answer"] is answer
+
+    def it_skips_the_draft_within_the_reserve(self):
+        visited: list[str] = []
+
+        def node(name: str):
+            def run(state: AnswerState) -> AnswerState:
+                visited.append(name)
+                return AnswerState(messages=[], formatted_article=None)
+
+            return run
+
+        builder = create_graph_builder(
+            {
+                "DRAFT": node("draft"),
+                "RESEARCH": node("research"),
+                "REVISE": node("revise"),
+                "FORMAT": node("format"),
+            },
+            deadline_reserve=30,
+        )
+        builder.compile().invoke(
+            {"messages": [HumanMessage(content="Question")]}, _deadline(10)
+        )
+
+        assert visited == [FORMAT]
@@ -0,0 +1,116 @@
+"""Unit tests for the Virgo agent graph hooks module."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.agent.graph.builder import (
+    DRAFT,
+    FORMAT,
+    RESEARCH,
+    REVISE,
+    VIRGO_MAX_ITERATIONS,
+    create_graph_builder,
+)
+from virgo.core.agent.graph.hooks import NodeRun, wrap_node
+from virgo.core.agent.graph.state import AnswerState
+
+
+def _recording_hook(events: list[str], label: str):
+    @contextmanager
+    def hook(run: NodeRun) -> Iterator[None]:
+        events.append(f"{label}:enter:{run.name}")
+        yield
+        events.append(f"{label}:exit:{run.name}:{run.output is not None}")
+
+    return hook
+
+
+class DescribeWrapNode:
+    """Tests for the wrap_node function."""
+
+    def it_runs_function_nodes_within_the_hooks(self):
+        events: list[str] = []
+
+        def node(state: AnswerState) -> AnswerState:
+            events.append("node")
+            return AnswerState(messages=[], final_answer=None, formatted_article=None)
+
+        wrapped = wrap_node(
+            "draft", node, [_recording_hook(events, "a"), _recording_hook(events, "b")]
+        )
+        wrapped({"messages": [], "final_answer": None, "formatted_article": None}, {})
+
+        assert events == [
+            "a:enter:draft",
+            "b:enter:draft",
+            "node",
+            "b:exit:draft:True",
+            "a:exit:draft:True",
+        ]
+
+    def it_invokes_runnable_nodes_with_the_config(self):
+        seen_configs: list[dict] = []
+
+        def _invoke(state, config):
+            seen_configs.append(config)
+            return state
+
+        wrapped = wrap_node("research", RunnableLambda(_invoke), [])
+        wrapped({"messages": []}, {"tags": ["virgo"]})
+
+        assert seen_configs[0]["tags"] == ["virgo"]
+
+    def it_exposes_the_node_output_to_the_hooks(self):
+        runs: list[NodeRun] = []
+
+        @contextmanager
+        def hook(run: NodeRun) -> Iterator[None]:
+            yield
+            runs.append(run)
+
+        output = AnswerState(
+            messages=[AIMessage(content="draft")],
+            final_answer=None,
+            formatted_article=None,
+        )
+        wrapped = wrap_node("draft", lambda state: output, [hook])
+        wrapped({"messages": [], "final_answer": None, "formatted_article": None}, {})
+
+        assert runs[0].output is output
+
+
+class DescribeCreateGraphBuilderWithHooks:
+    """Tests for the node hooks support of the graph builder."""
+
+    def it_runs_every_node_within_the_hooks(self):
+        events: list[str] = []
+
+        def passthrough(state: AnswerState) -> AnswerState:
+            return AnswerState(messages=[], final_answer=None, formatted_article=None)
+
+        def research(state: AnswerState) -> AnswerState:
+            return AnswerState(
+                messages=[
+                    ToolMessage(content=str(i), tool_call_id=str(i))
+                    for i in range(VIRGO_MAX_ITERATIONS)
+                ],
+                final_answer=None,
+                formatted_article=None,
+            )
+
+        builder = create_graph_builder(
+            {
+                "DRAFT": passthrough,
+                "RESEARCH": research,
+                "REVISE": passthrough,
+                "FORMAT": passthrough,
+            },
+            [_recording_hook(events, "hook")],
+        )
+        builder.compile().invoke({"messages": [HumanMessage(content="Question")]})
+
+        entered = [event.split(":")[2] for event in events if ":enter:" in event]
+        assert entered == [DRAFT, RESEARCH, REVISE, FORMAT]
@@ -0,0 +1,122 @@
+"""Unit tests for the VirgoAgent class."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.core.agent import NoArticleError, VirgoAgent
+from virgo.core.agent.schemas import PartialArticle
+
+
+class _FakeGraph:
+    """Graph answering after the delay given in the question, and counting the runs."""
+
+    def __init__(self) -> None:
+        self.articles = {}
+        self.running = 0
+        self.max_running = 0
+        self.configs = []
+        self._lock = threading.Lock()
+
+    def _output(self, state, config):
+        question = state["messages"][0].text
+        if question == "fail":
+            raise ValueError(question)
+        self.configs.append(config)
+        return {
+            "formatted_article": self.articles.get(question),
+            "degraded": question.startswith("partial"),
+        }
+
+    def invoke(self, state, config):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(float(state["messages"][0].text.split()[-1]) / 100)
+            return self._output(state, config)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def ainvoke(self, state, config):
+        await asyncio.sleep(float(state["messages"][0].text.split()[-1]) / 100)
+        return self._output(state, config)
+
+
+@pytest.fixture
+def graph():
+    graph = _FakeGraph()
+    graph.articles = {
+        "slow 5": MarkdownArticleFactory.build(title="Slow"),
+        "fast 1": MarkdownArticleFactory.build(title="Fast"),
+    }
+    return graph
+
+
+class DescribeVirgoAgent:
+    def it_generates_an_article(self, graph):
+        agent = VirgoAgent(graph=graph, timeout=30)  # type: ignore[arg-type]
+
+        assert agent.generate("fast 1") == graph.articles["fast 1"]
+        assert graph.configs[0]["configurable"]["deadline"] > time.time()
+
+    def it_marks_the_articles_of_the_runs_out_of_time_as_partial(self, graph):
+        graph.articles["partial 0"] = MarkdownArticleFactory.build()
+        agent = VirgoAgent(graph=graph)  # type: ignore[arg-type]
+
+        article = agent.generate("partial 0")
+
+        assert isinstance(article, PartialArticle)
+        assert article.model_dump() == graph.articles["partial 0"].model_dump()
+        assert not isinstance(agent.generate("fast 1"), PartialArticle)
+
+    def it_yields_the_articles_as_they_complete(self, graph):
+        agent = VirgoAgent(graph=graph)  # type: ignore[arg-type]
+
+        results = list(agent.generate_many(["slow 5", "fast 1", "none 0"]))
+
+        assert [question for question, _ in results] == ["none 0", "fast 1", "slow 5"]
+        assert isinstance(results[0][1], NoArticleError)
+        assert results[1][1] == graph.articles["fast 1"]
+        assert results[2][1] == graph.articles["slow 5"]
+
+    def it_caps_the_concurrent_generations(self, graph):
+        agent = VirgoAgent(graph=graph)  # type: ignore[arg-type]
+
+        results = dict(agent.generate_many(["slow 5"] * 4, max_concurrency=2))
+
+        assert list(results) == ["slow 5"]
+        assert graph.max_running == 2
+
+    def it_reports_the_errors_of_the_generations(self):
+        graph = Mock()
+        graph.invoke.side_effect = ValueError("boom")
+        agent = VirgoAgent(graph=graph)
+
+        ((question, error),) = agent.generate_many(["What is AI?"])
+
+        assert question == "What is AI?"
+        assert isinstance(error, ValueError)
+
+    def it_yields_the_articles_asynchronously(self, graph):
+        agent = VirgoAgent(graph=graph)  # type: ignore[arg-type]
+
+        async def _collect():
+            return [
+                result
+                async for result in agent.agenerate_many(
+                    ["slow 5", "fast 1"], max_concurrency=2
+                )
+            ]
+
+        results = asyncio.run(_collect())
+
+        assert results == [
+            ("fast 1", graph.articles["fast 1"]),
+            ("slow 5", graph.articles["slow 5"]),
+        ]
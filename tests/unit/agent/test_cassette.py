@@ -0,0 +1,182 @@
+"""Unit tests for the virgo.core.agent.cassette module."""
+
+from unittest.mock import Mock, create_autospec
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.agent.cassette import (
+    Cassette,
+    CassetteChatModel,
+    CassetteLanguageModelProvider,
+    CassetteMissError,
+    CassetteResearcher,
+)
+from virgo.core.agent.llms import LanguageModelProvider
+from virgo.core.agent.schemas import Reflection, SearchHint
+
+_REFLECTION = Reflection(missing="Sources.", superfluous="None.", search_queries=["q"])
+
+
+def _messages(time: str = "2026-01-01 10:00:00"):
+    return [SystemMessage(f"Current time: {time}"), HumanMessage("What is AI?")]
+
+
+def _structured_model(*reflections: Reflection):
+    """Create a fake chat model, whose structured output answers in turn."""
+    answers = iter(reflections)
+
+    def _answer(_, include_raw):
+        if not include_raw:
+            return next(answers)
+        return {
+            "raw": AIMessage(
+                "",
+                usage_metadata={
+                    "input_tokens": 3,
+                    "output_tokens": 2,
+                    "total_tokens": 5,
+                },
+            ),
+            "parsed": next(answers),
+            "parsing_error": None,
+        }
+
+    model = create_autospec(BaseChatModel, instance=True)
+    model.with_structured_output.side_effect = lambda _, include_raw=False: (
+        RunnableLambda(lambda input: _answer(input, include_raw))
+    )
+    return model
+
+
+class DescribeCassetteChatModel:
+    def it_replays_the_recorded_structured_outputs(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        recorder = CassetteChatModel(
+            cassette=Cassette(path, mode="record"),
+            recorded_model="gpt-4o",
+            model=_structured_model(_REFLECTION),
+        )
+        recorded = recorder.with_structured_output(Reflection, include_raw=True).invoke(
+            _messages()
+        )
+
+        replayer = CassetteChatModel(
+            cassette=Cassette(path, mode="replay"), recorded_model="gpt-4o"
+        )
+        replayed = replayer.with_structured_output(Reflection, include_raw=True).invoke(
+            _messages(time="2026-06-30 23:59:59")
+        )
+
+        assert replayed["parsed"] == recorded["parsed"] == _REFLECTION
+        assert replayed["raw"].usage_metadata["total_tokens"] == 5
+        assert replayed["parsing_error"] is None
+
+    def it_replays_the_responses_of_a_request_in_turn(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        second = _REFLECTION.model_copy(update={"missing": "Examples."})
+        recorder = CassetteChatModel(
+            cassette=Cassette(path, mode="record"),
+            recorded_model="gpt-4o",
+            model=_structured_model(_REFLECTION, second),
+        ).with_structured_output(Reflection)
+        recorder.invoke(_messages())
+        recorder.invoke(_messages())
+
+        replayer = CassetteChatModel(
+            cassette=Cassette(path, mode="replay"), recorded_model="gpt-4o"
+        ).with_structured_output(Reflection)
+
+        assert [replayer.invoke(_messages()) for _ in range(3)] == [
+            _REFLECTION,
+            second,
+            _REFLECTION,
+        ]
+
+    def it_replays_the_recorded_chat_results(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        CassetteChatModel(
+            cassette=Cassette(path, mode="record"),
+            recorded_model="gpt-4o",
+            model=GenericFakeChatModel(messages=iter([AIMessage("An answer.")])),
+        ).invoke(_messages())
+
+        replayed = CassetteChatModel(
+            cassette=Cassette(path, mode="replay"), recorded_model="gpt-4o"
+        ).invoke(_messages())
+
+        assert replayed.content == "An answer."
+
+    def it_raises_on_requests_not_recorded(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        path.touch()
+        model = CassetteChatModel(
+            cassette=Cassette(path, mode="replay"), recorded_model="gpt-4o"
+        )
+
+        with pytest.raises(CassetteMissError):
+            model.invoke(_messages())
+
+
+class DescribeCassette:
+    def it_waits_for_the_scaled_recorded_latency(self, tmp_path, monkeypatch):
+        path = tmp_path / "cassette.jsonl"
+        Cassette(path, mode="record").record("research", ["q"], ["result"], 0.4)
+        sleep = Mock()
+        monkeypatch.setattr("virgo.core.agent.cassette.time.sleep", sleep)
+
+        cassette = Cassette(path, mode="replay", latency_scale=0.5)
+
+        assert cassette.replay("research", ["q"]) == ["result"]
+        sleep.assert_called_once_with(0.2)
+        assert len(cassette) == 1
+
+
+class DescribeCassetteLanguageModelProvider:
+    def it_does_not_create_the_actual_models_when_replaying(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        path.touch()
+        provider = create_autospec(LanguageModelProvider, instance=True)
+
+        model = CassetteLanguageModelProvider(
+            provider, Cassette(path, mode="replay")
+        ).get_chat_model("gpt-4o")
+
+        assert isinstance(model, CassetteChatModel)
+        assert model.model is None
+        provider.get_chat_model.assert_not_called()
+
+
+class DescribeCassetteResearcher:
+    def it_replays_the_recorded_searches(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        researcher = Mock(return_value=[{"query": "q", "results": []}])
+        CassetteResearcher(lambda: researcher, Cassette(path, mode="record"))(
+            _REFLECTION, "value"
+        )
+        factory = Mock()
+
+        replayed = CassetteResearcher(factory, Cassette(path, mode="replay"))(
+            _REFLECTION, "value"
+        )
+
+        assert replayed == [{"query": "q", "results": []}]
+        factory.assert_not_called()
+
+    def it_tells_the_research_rounds_and_hints_apart(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        CassetteResearcher(
+            lambda: Mock(return_value=[]), Cassette(path, mode="record")
+        )(_REFLECTION, "value")
+        replaying = CassetteResearcher(Mock(), Cassette(path, mode="replay"))
+        hinted = _REFLECTION.model_copy(
+            update={"search_hints": [SearchHint(query="q", topic="news")]}
+        )
+
+        with pytest.raises(CassetteMissError):
+            replaying(_REFLECTION, "value", references=[])
+        with pytest.raises(CassetteMissError):
+            replaying(hinted, "value")
@@ -0,0 +1,105 @@
+"""Unit tests for the virgo.core.agent.citations module."""
+
+import json
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from virgo.core.agent.citations import SNIPPET_CHARS, Citation, CitationIndex
+
+
+def _tool_message(*urls: str) -> ToolMessage:
+    results = [
+        {
+            "query": "query",
+            "results": [
+                {"url": url, "title": f"Title of {url}", "content": "Some text."}
+                for url in urls
+            ],
+        }
+    ]
+    return ToolMessage(content=json.dumps(results), tool_call_id="1")
+
+
+class DescribeCitation:
+    """Tests for the Citation class."""
+
+    def it_renders_a_numbered_markdown_link(self):
+        citation = Citation(id=2, url="https://example.com", title="A", snippet="B.")
+
+        assert citation.to_markdown() == "[2] [A](https://example.com) - B."
+
+    def it_omits_the_empty_snippet(self):
+        citation = Citation(id=1, url="https://example.com", title="A", snippet="")
+
+        assert citation.to_markdown() == "[1] [A](https://example.com)"
+
+
+class DescribeCitationIndex:
+    """Tests for the CitationIndex class."""
+
+    def it_numbers_each_url_once(self):
+        index = CitationIndex()
+
+        first = index.add("https://example.com/a", "A")
+        second = index.add("https://example.com/b", "B")
+
+        assert (first.id, second.id) == (1, 2)
+        assert index.add("https://example.com/a", "Other title") is first
+        assert len(index) == 2
+
+    def it_falls_back_on_the_url_as_title(self):
+        assert CitationIndex().add("https://example.com").title == "https://example.com"
+
+    def it_shortens_the_content_into_a_snippet(self):
+        citation = CitationIndex().add("https://example.com", content="word " * 100)
+
+        assert len(citation.snippet) <= SNIPPET_CHARS + 1
+        assert citation.snippet.endswith("…")
+
+    def it_indexes_the_search_results_of_the_tool_messages_in_order(self):
+        messages = [
+            HumanMessage(content="Question"),
+            _tool_message("https://example.com/a", "https://example.com/b"),
+            ToolMessage(content="Search failed.", tool_call_id="2"),
+            _tool_message("https://example.com/b", "https://example.com/c"),
+        ]
+
+        index = CitationIndex.from_messages(messages)
+
+        assert [citation.url for citation in index] == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+
+    def it_shows_the_search_results_by_id_instead_of_url(self):
+        messages = [HumanMessage(content="Question"), _tool_message("https://a.org")]
+        index = CitationIndex.from_messages(messages)
+
+        cited = index.cite(messages)
+
+        assert cited[0] is messages[0]
+        assert json.loads(cited[1].content) == [
+            {
+                "query": "query",
+                "results": [
+                    {
+                        "id": 1,
+                        "title": "Title of https://a.org",
+                        "content": "Some text.",
+                    }
+                ],
+            }
+        ]
+
+    def it_renders_the_references_of_the_cited_sources(self):
+        index = CitationIndex.from_messages(
+            [_tool_message("https://a.org", "https://b.org", "https://c.org")]
+        )
+
+        references = index.references("Cited [3] and [1, 9].", ["[1]", "[2] Extra"])
+
+        assert [reference[:3] for reference in references] == ["[1]", "[2]", "[3]"]
+        assert (
+            references[0] == "[1] [Title of https://a.org](https://a.org) - Some text."
+        )
@@ -0,0 +1,68 @@
+"""Unit tests for the virgo.core.agent.compact module."""
+
+import json
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from tests.unit.factories import AnswerFactory
+from virgo.core.agent.compact import (
+    compact_model,
+    estimate_schema_tokens,
+    schema_for,
+    schema_savings,
+)
+from virgo.core.agent.schemas import Answer, MarkdownArticle, Revised
+
+
+class DescribeCompactModel:
+    def it_keeps_the_model_name_for_tool_calls(self):
+        tool = convert_to_openai_tool(compact_model(Revised))
+
+        assert tool["function"]["name"] == "Revised"
+
+    def it_strips_the_examples_and_titles(self):
+        schema = json.dumps(compact_model(Answer).model_json_schema())
+
+        assert "examples" not in schema
+        assert '"title": "Value"' not in schema
+        assert "Reflection on the content of the answer." in schema
+
+    def it_parses_into_the_original_model(self):
+        answer = AnswerFactory.build()
+
+        parsed = compact_model(Answer).model_validate(answer.model_dump())
+
+        assert isinstance(parsed, Answer)
+        assert parsed.value == answer.value
+
+    def it_is_cached(self):
+        assert compact_model(Answer) is compact_model(Answer)
+
+    def it_leaves_the_original_schema_untouched(self):
+        compact_model(Answer)
+
+        assert "examples" in json.dumps(Answer.model_json_schema())
+
+
+class DescribeSchemaFor:
+    def it_returns_the_original_model_unless_compact(self):
+        assert schema_for(Answer, compact=False) is Answer
+        assert schema_for(Answer, compact=True) is compact_model(Answer)
+
+
+class DescribeSchemaSavings:
+    def it_reports_the_tokens_saved_per_call(self):
+        (savings,) = schema_savings([("draft", Answer)])
+
+        assert savings.call == "draft"
+        assert savings.schema == "Answer"
+        assert savings.full_tokens == estimate_schema_tokens(Answer)
+        assert 0 < savings.compact_tokens < savings.full_tokens
+        assert savings.saved_tokens == savings.full_tokens - savings.compact_tokens
+
+    def it_saves_tokens_on_every_structured_output(self):
+        savings = schema_savings(
+            [("draft", Answer), ("revise", Revised), ("format", MarkdownArticle)]
+        )
+
+        assert all(item.saved_tokens > 0 for item in savings)
@@ -0,0 +1,45 @@
+"""Unit tests for the virgo.core.agent.configuration module."""
+
+import time
+
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.agent.configuration import GraphConfiguration
+
+
+class DescribeGraphConfiguration:
+    def it_reads_the_configurable_fields(self):
+        configuration = GraphConfiguration.from_runnable_config(
+            {"configurable": {"model_name": "gpt-4o-mini", "max_iterations": 2}}
+        )
+
+        assert configuration == GraphConfiguration(
+            model_name="gpt-4o-mini", max_iterations=2
+        )
+
+    def it_ignores_unknown_and_unset_fields(self):
+        configuration = GraphConfiguration.from_runnable_config(
+            {"configurable": {"thread_id": "1", "model_name": None}}
+        )
+
+        assert configuration == GraphConfiguration()
+
+    def it_reads_the_config_of_the_running_invocation(self):
+        read = RunnableLambda(lambda _: GraphConfiguration.from_runnable_config())
+
+        configuration = read.invoke(None, {"configurable": {"search_depth": "basic"}})
+
+        assert configuration.search_depth == "basic"
+
+    def it_converts_back_to_the_set_configurable_fields(self):
+        configuration = GraphConfiguration(model_name="llama3", search_max_results=3)
+
+        assert configuration.to_configurable() == {
+            "model_name": "llama3",
+            "search_max_results": 3,
+        }
+
+    def it_tells_the_time_remaining_before_the_deadline(self):
+        assert GraphConfiguration().remaining_time() is None
+        assert GraphConfiguration(deadline=0).remaining_time() == 0
+        assert 50 < GraphConfiguration(deadline=time.time() + 60).remaining_time() <= 60
@@ -0,0 +1,126 @@
+"""Unit tests for the virgo.core.agent.corpus module."""
+
+import os
+import sqlite3
+from pathlib import PureWindowsPath
+
+import pytest
+
+from virgo.core.agent.corpus import CorpusIndex, _like_prefix, read_document
+from virgo.core.agent.ranking import BM25Ranker
+
+
+@pytest.fixture
+def index(tmp_path):
+    corpus_index = CorpusIndex(tmp_path / "index.db", chunk_words=20)
+    yield corpus_index
+    corpus_index.close()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "corpus"
+    directory.mkdir()
+    (directory / "solar.md").write_text("# Solar power\n\nSolar panels efficiency.")
+    (directory / "wind.txt").write_text("Wind turbines produce power.")
+    (directory / "image.png").write_bytes(b"\x89PNG")
+    return directory
+
+
+class DescribeReadDocument:
+    def it_reads_the_title_of_markdown_documents(self, corpus):
+        assert read_document(corpus / "solar.md") == (
+            "Solar power",
+            "# Solar power\n\nSolar panels efficiency.",
+        )
+
+    def it_extracts_the_visible_text_of_html_documents(self, tmp_path):
+        path = tmp_path / "page.html"
+        path.write_text(
+            "<html><head><title>Page</title><style>p {}</style></head>"
+            "<body><p>Visible text</p><script>hidden()</script></body></html>"
+        )
+
+        title, text = read_document(path)
+
+        assert title == "Page"
+        assert text.strip() == "Visible text"
+
+
+class DescribeCorpusIndex:
+    def it_indexes_the_documents_of_a_directory(self, index, corpus):
+        report = index.build(corpus)
+
+        assert (report.added, report.updated, report.removed) == (2, 0, 0)
+        assert len(index) == 2
+
+    def it_finds_the_best_matching_chunks(self, index, corpus):
+        index.build(corpus)
+
+        hits = index.search("solar efficiency")
+
+        assert [hit.title for hit in hits] == ["Solar power"]
+        assert hits[0].path == str((corpus / "solar.md").resolve())
+        assert hits[0].score > 0
+
+    def it_ranks_rarer_terms_higher(self, index, corpus):
+        index.build(corpus)
+
+        hits = index.search("wind power")
+
+        assert [hit.title for hit in hits] == ["wind", "Solar power"]
+
+    def it_only_reindexes_what_changed(self, index, corpus):
+        index.build(corpus)
+        (corpus / "wind.txt").write_text("Tidal power plants.")
+        os.utime(corpus / "wind.txt", ns=(0, 0))
+        (corpus / "solar.md").unlink()
+        (corpus / "nested").mkdir()
+        (corpus / "nested" / "hydro.md").write_text("Hydro dams.")
+
+        report = index.build(corpus)
+
+        assert (report.added, report.updated, report.removed) == (1, 1, 1)
+        assert index.search("wind") == []
+        assert [hit.title for hit in index.search("tidal")] == ["wind"]
+        assert index.build(corpus).unchanged == 2
+
+    def it_keeps_the_documents_of_other_directories(self, index, corpus, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "notes.txt").write_text("Geothermal energy.")
+        index.build(corpus)
+
+        report = index.build(other)
+
+        assert report.removed == 0
+        assert len(index) == 3
+
+    def it_scores_the_chunks_as_the_ranker(self, index, corpus):
+        index.build(corpus)
+
+        hits = index.search("solar wind power")
+
+        scores = BM25Ranker().scores("solar wind power", [hit.content for hit in hits])
+        assert [hit.score for hit in hits] == pytest.approx(scores.tolist())
+
+    def it_finds_nothing_without_query_terms(self, index, corpus):
+        index.build(corpus)
+
+        assert index.search("the and of") == []
+
+
+class DescribeLikePrefix:
+    def it_escapes_the_windows_separator(self, monkeypatch):
+        monkeypatch.setattr(os, "sep", "\\")
+        pattern = _like_prefix(PureWindowsPath("C:\\docs_1"))
+        connection = sqlite3.connect(":memory:")
+
+        def matches(path: str) -> bool:
+            return connection.execute(
+                "SELECT ? LIKE ? ESCAPE '\\'", (path, pattern)
+            ).fetchone()[0]
+
+        assert matches("C:\\docs_1\\guide.md")
+        assert not matches("C:\\docs_12\\guide.md")
+        assert not matches("C:\\docsX1\\guide.md")
@@ -0,0 +1,104 @@
+"""Unit tests for the virgo.core.agent.evidence module."""
+
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from virgo.core.agent.evidence import (
+    EVIDENCE_REF_PREFIX,
+    InMemoryEvidenceStore,
+    SQLiteEvidenceStore,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryEvidenceStore()
+    return SQLiteEvidenceStore(tmp_path / "evidence.db")
+
+
+class DescribeEvidenceStore:
+    """Tests shared by every evidence store backend."""
+
+    def it_returns_a_content_addressed_reference(self, store):
+        ref = store.put({"url": "https://example.com", "content": "Text"})
+
+        assert ref.startswith(EVIDENCE_REF_PREFIX)
+        assert ref == store.put({"content": "Text", "url": "https://example.com"})
+
+    def it_stores_each_item_once(self, store):
+        store.put("same result")
+        store.put("same result")
+        store.put("other result")
+
+        assert len(store) == 2
+
+    def it_gets_the_stored_item(self, store):
+        item = {"url": "https://example.com", "content": "Text"}
+
+        assert store.get(store.put(item)) == item
+
+    def it_returns_none_for_unknown_references(self, store):
+        assert store.get(f"{EVIDENCE_REF_PREFIX}{'0' * 64}") is None
+
+    def it_resolves_references_into_the_inline_json(self, store):
+        results = [{"url": "https://example.com", "content": "Text"}, "plain"]
+        refs = [store.put(result) for result in results]
+
+        resolved = store.resolve(json.dumps(refs))
+
+        assert json.loads(resolved) == results
+
+    def it_keeps_unknown_references(self, store):
+        content = json.dumps([f"{EVIDENCE_REF_PREFIX}{'a' * 64}"])
+
+        assert store.resolve(content) == content
+
+    def it_resolves_only_tool_messages(self, store):
+        ref = store.put("result")
+        human = HumanMessage(content=json.dumps([ref]))
+        tool = ToolMessage(content=json.dumps([ref]), tool_call_id="1")
+
+        resolved = store.resolve_messages([human, tool])
+
+        assert resolved[0] is human
+        assert json.loads(resolved[1].content) == ["result"]
+        assert tool.content == json.dumps([ref])
+
+    def it_resolves_content_blocks(self, store):
+        refs = [store.put("text result"), store.put({"url": "https://example.com"})]
+        tool = ToolMessage(content=[*refs, "inline"], tool_call_id="1")
+
+        (resolved,) = store.resolve_messages([tool])
+
+        assert resolved.content[0] == "text result"
+        assert json.loads(resolved.content[1]) == {"url": "https://example.com"}
+        assert resolved.content[2] == "inline"
+
+
+class DescribeInMemoryEvidenceStore:
+    def it_evicts_the_least_recently_used_items(self):
+        store = InMemoryEvidenceStore(max_entries=2)
+        first = store.put("first")
+        second = store.put("second")
+        store.get(first)
+
+        store.put("third")
+
+        assert len(store) == 2
+        assert store.get(first) == "first"
+        assert store.get(second) is None
+
+
+class DescribeSQLiteEvidenceStore:
+    """Tests for the SQLite backed evidence store."""
+
+    def it_persists_items_across_instances(self, tmp_path):
+        path = tmp_path / "evidence.db"
+        first = SQLiteEvidenceStore(path)
+        ref = first.put("persisted")
+        first.close()
+
+        assert SQLiteEvidenceStore(path).get(ref) == "persisted"
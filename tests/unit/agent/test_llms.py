@@ -4,14 +4,24 @@ from __future__ import annotations
 
 import sys
 import types
+from unittest.mock import ANY, create_autospec
 
 import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
 
 from virgo.core.agent.llms import (
+    ChatModelPool,
+    ConfigurableChatModel,
+    GenerationParams,
+    LanguageModelProvider,
     OllamaLanguageModelProvider,
     OpenAILanguageModelProvider,
     ProviderError,
 )
+from virgo.core.agent.timeouts import DeadlineTransport
 
 
 class DescribeOpenAIProvider:
@@ -26,6 +36,16 @@ class DescribeOpenAIProvider:
             or getattr(model, "model_name", None) == "gpt-4-turbo"
         )
 
+    def it_passes_the_generation_params(self):
+        provider = OpenAILanguageModelProvider()
+        model = provider.get_chat_model(
+            "gpt-4-turbo",
+            GenerationParams(max_tokens=300, temperature=0.2, num_ctx=4096),
+        )
+
+        assert model.max_tokens == 300
+        assert model.temperature == 0.2
+
 
 class DescribeOllamaProvider:
     def it_raises_provider_error_when_cannot_connect(
@@ -49,3 +69,153 @@ class DescribeOllamaProvider:
 
         with pytest.raises(ProviderError):
             provider.get_chat_model("llama3")
+
+    def it_passes_the_ollama_generation_params(self, monkeypatch: pytest.MonkeyPatch):
+        class FakeClient:
+            def _request_raw(self):
+                pass
+
+        fake_langchain_ollama = types.SimpleNamespace(ChatOllama=dict)
+        fake_ollama = types.SimpleNamespace(Client=FakeClient)
+        monkeypatch.setitem(sys.modules, "langchain_ollama", fake_langchain_ollama)
+        monkeypatch.setitem(sys.modules, "ollama", fake_ollama)
+
+        model = OllamaLanguageModelProvider().get_chat_model(
+            "llama3", GenerationParams(max_tokens=256, num_thread=4)
+        )
+
+        assert model == {
+            "model": "llama3",
+            "num_predict": 256,
+            "num_thread": 4,
+            "sync_client_kwargs": {"transport": ANY},
+            "async_client_kwargs": {"transport": ANY},
+        }
+        assert isinstance(model["sync_client_kwargs"]["transport"], DeadlineTransport)
+
+
+class _NamedModelProvider(LanguageModelProvider):
+    """Provider of fake models answering their own name."""
+
+    def __init__(self) -> None:
+        self.created: list[str] = []
+        self.params: list[GenerationParams | None] = []
+        self.models: list = []
+
+    def get_chat_model(self, model_name, params=None):
+        self.created.append(model_name)
+        self.params.append(params)
+        model = create_autospec(ConfigurableChatModel, instance=True)
+        self.models.append(model)
+        model.with_structured_output.side_effect = lambda *_args, **_kwargs: (
+            RunnableLambda(lambda _: model_name)
+        )
+        return model
+
+
+class DescribeChatModelPool:
+    @pytest.fixture
+    def provider(self):
+        return _NamedModelProvider()
+
+    @pytest.fixture
+    def pool(self, provider):
+        return ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+
+    def it_creates_each_model_once(self, pool, provider):
+        assert pool.get(("openai", "gpt-4o")) is pool.get()
+        pool.get(("openai", "gpt-4o-mini"))
+
+        assert provider.created == ["gpt-4o", "gpt-4o-mini"]
+        assert len(pool) == 2
+
+    def it_keys_models_by_the_configured_provider_and_name(self, pool):
+        assert pool.key({"configurable": {"model_name": "gpt-4o-mini"}}) == (
+            "openai",
+            "gpt-4o-mini",
+        )
+        assert pool.key({}) == ("openai", "gpt-4o")
+
+    def it_creates_a_model_per_generation_params(self, pool, provider):
+        capped = GenerationParams(max_tokens=100)
+
+        assert pool.get(params=capped) is not pool.get()
+        assert pool.get(params=GenerationParams(max_tokens=100)) is pool.get(
+            params=capped
+        )
+        assert provider.params == [capped, None]
+
+    def it_rejects_unknown_providers(self, pool):
+        with pytest.raises(ProviderError):
+            pool.get(("anthropic", "claude"))
+
+
+class DescribeConfigurableChatModel:
+    def it_selects_the_structured_output_model_per_invocation(self):
+        provider = _NamedModelProvider()
+        pool = ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+        chain = ConfigurableChatModel(pool=pool).with_structured_output(dict)
+
+        assert chain.invoke("question") == "gpt-4o"
+        assert (
+            chain.invoke("question", {"configurable": {"model_name": "mini"}}) == "mini"
+        )
+        assert chain.invoke("question") == "gpt-4o"
+        assert provider.created == ["gpt-4o", "mini"]
+
+    def it_creates_the_models_with_its_generation_params(self):
+        provider = _NamedModelProvider()
+        pool = ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+        params = GenerationParams(temperature=0.0)
+        chain = ConfigurableChatModel(pool=pool, params=params).with_structured_output(
+            dict
+        )
+
+        chain.invoke("question")
+
+        assert provider.params == [params]
+
+    def it_asks_for_the_structured_output_method_of_the_provider(self):
+        provider = _NamedModelProvider()
+        pool = ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+        model = ConfigurableChatModel(
+            pool=pool,
+            structured_output_methods={
+                "openai": "json_schema",
+                "ollama": "function_calling",
+            },
+        )
+
+        model.with_structured_output(dict, include_raw=True).invoke("question")
+
+        provider.models[0].with_structured_output.assert_called_once_with(
+            dict, include_raw=True, method="json_schema"
+        )
+
+    def it_gives_the_schema_to_follow_in_json_mode(self):
+        class Output(BaseModel):
+            value: str
+
+        provider = _NamedModelProvider()
+        pool = ChatModelPool({"openai": provider}, "openai", "gpt-4o")
+        chain = ConfigurableChatModel(
+            pool=pool, structured_output_methods={"openai": "json_mode"}
+        ).with_structured_output(Output)
+        pool.get()._convert_input.side_effect = lambda input: (
+            BaseChatModel._convert_input(None, input)  # type: ignore[arg-type]
+        )
+        pool.get().with_structured_output.side_effect = lambda *_args, **_kwargs: (
+            RunnableLambda(lambda messages: messages)
+        )
+
+        messages = chain.invoke("question")
+
+        assert isinstance(messages[0], SystemMessage)
+        assert '"value"' in messages[0].text
+        assert messages[1].text == "question"
+
+        messages = chain.invoke([SystemMessage("Be brief."), HumanMessage("question")])
+
+        assert len(messages) == 2
+        assert messages[0].text.startswith("Be brief.\n\n")
+        assert '"value"' in messages[0].text
@@ -0,0 +1,65 @@
+"""Unit tests for the virgo.core.agent.patch module."""
+
+from tests.unit.factories import ReflectionFactory, RevisedFactory
+from virgo.core.agent.patch import apply_edits, apply_patch
+from virgo.core.agent.schemas import Edit, RevisionPatch
+
+
+class DescribeApplyEdits:
+    """Tests for the apply_edits function."""
+
+    def it_replaces_deletes_and_inserts_spans_in_order(self):
+        text = "Solar is cheap. Wind is growing. Coal is declining."
+
+        edited = apply_edits(
+            text,
+            [
+                Edit(operation="replace", target="cheap", text="cheaper than ever [1]"),
+                Edit(operation="delete", target=" Coal is declining."),
+                Edit(operation="insert", target="growing", text=" offshore"),
+            ],
+        )
+
+        assert edited == "Solar is cheaper than ever [1]. Wind is growing offshore."
+
+    def it_matches_the_targets_up_to_whitespace(self):
+        edited = apply_edits(
+            "Wind is\ngrowing fast.",
+            [Edit(operation="replace", target="is  growing", text="grows")],
+        )
+
+        assert edited == "Wind grows fast."
+
+    def it_appends_the_insertions_without_target(self):
+        edited = apply_edits(
+            "Wind is growing.",
+            [Edit(operation="insert", target="", text="Solar too [2].")],
+        )
+
+        assert edited == "Wind is growing. Solar too [2]."
+
+    def it_skips_the_edits_of_unknown_spans(self):
+        text = "Wind is growing."
+
+        assert apply_edits(text, [Edit(operation="delete", target="Coal")]) == text
+
+
+class DescribeApplyPatch:
+    """Tests for the apply_patch function."""
+
+    def it_revises_the_answer_and_adds_the_new_references(self):
+        answer = RevisedFactory.build(
+            value="Wind is growing [1].", references=["[1] Source A"]
+        )
+        reflection = ReflectionFactory.build()
+        patch = RevisionPatch(
+            edits=[Edit(operation="insert", target="", text="Solar too [2].")],
+            reflection=reflection,
+            references=["[1] Source A", "[2] Source B"],
+        )
+
+        revised = apply_patch(answer, patch)
+
+        assert revised.value == "Wind is growing [1]. Solar too [2]."
+        assert revised.reflection == reflection
+        assert revised.references == ["[1] Source A", "[2] Source B"]
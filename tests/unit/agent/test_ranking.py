@@ -0,0 +1,37 @@
+"""Unit tests for the virgo.core.agent.ranking module."""
+
+from virgo.core.agent.ranking import BM25Ranker, chunk_text, tokenize
+
+
+class DescribeTokenize:
+    def it_lowercases_and_drops_stopwords(self):
+        assert tokenize("The Solar panels, and THE wind!") == [
+            "solar",
+            "panels",
+            "wind",
+        ]
+
+
+class DescribeChunkText:
+    def it_merges_short_paragraphs(self):
+        assert chunk_text("a b\n\nc d\n\ne f g", max_words=4) == ["a b c d", "e f g"]
+
+    def it_splits_long_paragraphs(self):
+        assert chunk_text("a b c d e", max_words=2) == ["a b", "c d", "e"]
+
+
+class DescribeBM25Ranker:
+    def it_scores_documents_matching_rare_terms_higher(self):
+        documents = ["solar wind", "solar panels efficiency", "cooking pasta"]
+
+        scores = BM25Ranker().scores("solar efficiency", documents)
+
+        assert scores[1] > scores[0] > scores[2] == 0
+
+    def it_keeps_the_top_k_documents_best_first(self):
+        documents = ["cooking pasta", "solar wind", "solar panels efficiency"]
+
+        assert BM25Ranker(top_k=2).rank("solar efficiency", documents) == [2, 1]
+
+    def it_scores_nothing_without_query_terms(self):
+        assert BM25Ranker().scores("the and of", ["solar"]).tolist() == [0.0]
@@ -0,0 +1,184 @@
+"""Unit tests for the virgo.core.agent.routing module."""
+
+import asyncio
+from unittest.mock import create_autospec
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.agent.llms import (
+    GenerationParams,
+    LanguageModelProvider,
+    ProviderError,
+)
+from virgo.core.agent.routing import (
+    HealthRouter,
+    RouteStats,
+    RoutingChatModel,
+    RoutingLanguageModelProvider,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _model(answer):
+    """Create a fake chat model, whose structured output answers or raises."""
+
+    def _answer(_):
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    model = create_autospec(BaseChatModel, instance=True)
+    model.with_structured_output.return_value = RunnableLambda(_answer)
+    return model
+
+
+class DescribeRouteStats:
+    def it_scores_the_expected_seconds_per_successful_call(self):
+        stats = RouteStats(window=60)
+        stats.record(0, 1.0, ok=True)
+        stats.record(0, 3.0, ok=False)
+
+        assert stats.error_rate == 0.5
+        assert stats.score == 4.0
+
+    def it_forgets_the_calls_older_than_the_window(self):
+        stats = RouteStats(window=60)
+        stats.record(0, 1.0, ok=False)
+
+        stats.expire(61)
+
+        assert len(stats) == 0
+        assert stats.score is None
+
+
+class DescribeHealthRouter:
+    def it_prefers_the_first_route_initially(self):
+        assert HealthRouter(["openai", "ollama"]).order() == [0, 1]
+
+    def it_switches_to_a_route_healthier_by_the_margin(self):
+        router = HealthRouter(["openai", "ollama"], margin=0.5, clock=_Clock())
+        router.record(0, 1.2, ok=True)
+        router.record(1, 1.0, ok=True)
+
+        assert router.order()[0] == 0
+
+        router.record(0, 3.0, ok=False)
+
+        assert router.order()[0] == 1
+        assert router.current == 1
+
+    def it_probes_the_preferred_routes_while_falling_back(self):
+        clock = _Clock()
+        router = HealthRouter(["openai", "ollama"], probe_interval=30, clock=clock)
+        router.record(0, 5.0, ok=False)
+        router.record(1, 1.0, ok=True)
+
+        assert router.order() == [1, 0]
+        assert router.current == 1
+
+        clock.now = 30
+
+        assert router.order() == [0, 1]
+        assert router.order() == [1, 0]
+
+
+class DescribeRoutingChatModel:
+    def it_fails_over_to_the_next_route(self):
+        router = HealthRouter(["openai", "ollama"])
+        model = RoutingChatModel(
+            models=[_model(TimeoutError("slow")), _model("fallback")], router=router
+        )
+
+        assert model.with_structured_output(dict).invoke("question") == "fallback"
+        assert router.stats[0].error_rate == 1.0
+        assert router.stats[1].error_rate == 0.0
+
+    def it_raises_when_every_route_fails(self):
+        model = RoutingChatModel(
+            models=[_model(ValueError("a")), _model(ValueError("b"))],
+            router=HealthRouter(["openai", "ollama"]),
+        )
+
+        with pytest.raises(ValueError, match="b"):
+            model.with_structured_output(dict).invoke("question")
+
+    def it_fails_over_asynchronously(self):
+        router = HealthRouter(["openai", "ollama"])
+        model = RoutingChatModel(
+            models=[_model(TimeoutError("slow")), _model("fallback")], router=router
+        )
+
+        output = asyncio.run(model.with_structured_output(dict).ainvoke("question"))
+
+        assert output == "fallback"
+        assert router.stats[0].error_rate == 1.0
+
+    def it_raises_a_provider_error_without_routes(self):
+        router = create_autospec(HealthRouter, instance=True)
+        router.order.return_value = []
+        model = RoutingChatModel(models=[_model("unused")], router=router)
+
+        with pytest.raises(ProviderError, match="No route"):
+            model.with_structured_output(dict).invoke("question")
+
+
+class DescribeRoutingLanguageModelProvider:
+    def it_routes_the_requested_model_and_the_fallbacks(self):
+        primary = create_autospec(LanguageModelProvider, instance=True)
+        primary.get_chat_model.return_value = _model("primary")
+        fallback = create_autospec(LanguageModelProvider, instance=True)
+        fallback.get_chat_model.return_value = _model("fallback")
+        unavailable = create_autospec(LanguageModelProvider, instance=True)
+        unavailable.get_chat_model.side_effect = ProviderError("no server")
+
+        model = RoutingLanguageModelProvider(
+            ("openai", primary),
+            [("ollama", unavailable, "llama3"), ("openai", fallback, "gpt-4o-mini")],
+        ).get_chat_model("gpt-4o")
+
+        primary.get_chat_model.assert_called_once_with("gpt-4o", None)
+        assert isinstance(model, RoutingChatModel)
+        assert model.router.names == ["openai:gpt-4o", "openai:gpt-4o-mini"]
+
+    def it_falls_back_when_the_primary_is_unavailable(self):
+        primary = create_autospec(LanguageModelProvider, instance=True)
+        primary.get_chat_model.side_effect = ProviderError("no key")
+        fallback = create_autospec(LanguageModelProvider, instance=True)
+        fallback.get_chat_model.return_value = _model("fallback")
+
+        model = RoutingLanguageModelProvider(
+            ("openai", primary), [("ollama", fallback, "llama3")]
+        ).get_chat_model("gpt-4o")
+
+        assert model.router.names == ["ollama:llama3"]
+
+    def it_raises_when_no_route_is_available(self):
+        unavailable = create_autospec(LanguageModelProvider, instance=True)
+        unavailable.get_chat_model.side_effect = ProviderError("no server")
+        provider = RoutingLanguageModelProvider(
+            ("openai", unavailable), [("ollama", unavailable, "llama3")]
+        )
+
+        with pytest.raises(ProviderError, match="gpt-4o"):
+            provider.get_chat_model("gpt-4o")
+
+    def it_shares_the_router_of_the_same_routes(self):
+        primary = create_autospec(LanguageModelProvider, instance=True)
+        primary.get_chat_model.return_value = _model("primary")
+        provider = RoutingLanguageModelProvider(("openai", primary), [])
+
+        capped = provider.get_chat_model("gpt-4o", GenerationParams(max_tokens=600))
+        default = provider.get_chat_model("gpt-4o")
+        other = provider.get_chat_model("gpt-4o-mini")
+
+        assert capped.router is default.router
+        assert other.router is not default.router
@@ -0,0 +1,49 @@
+"""Unit tests for the virgo.core.agent.synthetic module."""
+
+from langchain_core.messages import HumanMessage
+
+from virgo.core.agent.schemas import Answer, MarkdownArticle, Reflection
+from virgo.core.agent.synthetic import (
+    SyntheticLanguageModelProvider,
+    SyntheticResearcher,
+    synthetic_output,
+)
+
+
+class DescribeSyntheticOutput:
+    def it_builds_the_models_from_their_field_examples(self):
+        answer = synthetic_output(Answer)
+
+        assert answer.value.startswith("Renewable energy technologies")
+        assert len(answer.reflection.search_queries) == 3
+
+    def it_fills_the_fields_without_examples(self):
+        article = synthetic_output(MarkdownArticle)
+
+        assert article.title == "Synthetic title."
+        assert len(article.references) == 2
+
+
+class DescribeSyntheticChatModel:
+    def it_answers_with_a_tool_call_and_its_token_usage(self):
+        model = SyntheticLanguageModelProvider().get_chat_model("gpt-4o")
+
+        output = model.with_structured_output(Answer, include_raw=True).invoke(
+            [HumanMessage("What is AI?")]
+        )
+
+        assert output["parsed"] == synthetic_output(Answer)
+        [call] = output["raw"].tool_calls
+        assert call["name"] == "Answer"
+        assert call["args"] == output["parsed"].model_dump()
+        assert output["raw"].usage_metadata["input_tokens"] == 3
+
+
+class DescribeSyntheticResearcher:
+    def it_returns_results_for_each_query(self):
+        reflection = Reflection(missing="", superfluous="", search_queries=["a", "b"])
+
+        results = SyntheticResearcher(max_results=2)(reflection, "value")
+
+        assert [result["query"] for result in results] == ["a", "b"]
+        assert all(len(result["results"]) == 2 for result in results)
@@ -0,0 +1,83 @@
+"""Unit tests for the virgo.core.agent.timeouts module."""
+
+import asyncio
+import time
+
+import httpx
+from langchain_core.runnables import RunnableLambda
+
+from virgo.core.agent.timeouts import (
+    MIN_CALL_TIMEOUT,
+    AsyncDeadlineTransport,
+    DeadlineTransport,
+    call_timeout,
+)
+
+
+def _deadline(seconds: float) -> dict:
+    return {"configurable": {"deadline": time.time() + seconds}}
+
+
+def _recording_transport(timeouts: list[dict]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+class DescribeCallTimeout:
+    def it_is_the_time_left_before_the_deadline(self):
+        assert call_timeout({}) is None
+        assert 0 < call_timeout(_deadline(5)) <= 5  # type: ignore[operator]
+
+    def it_is_minimal_past_the_deadline(self):
+        assert call_timeout(_deadline(-1)) == MIN_CALL_TIMEOUT
+
+    def it_reads_the_deadline_of_the_current_run(self):
+        timeout = RunnableLambda(lambda _: call_timeout()).invoke(None, _deadline(5))
+
+        assert 0 < timeout <= 5
+
+
+class DescribeDeadlineTransport:
+    def it_caps_the_request_timeouts_at_the_deadline(self):
+        timeouts: list[dict] = []
+        client = httpx.Client(
+            transport=DeadlineTransport(_recording_transport(timeouts)),
+            timeout=httpx.Timeout(60, connect=1),
+        )
+
+        RunnableLambda(lambda _: client.get("https://example.com")).invoke(
+            None, _deadline(5)
+        )
+
+        assert timeouts[0]["connect"] == 1
+        assert 0 < timeouts[0]["read"] <= 5
+        assert 0 < timeouts[0]["pool"] <= 5
+
+    def it_keeps_the_request_timeouts_without_deadline(self):
+        timeouts: list[dict] = []
+        client = httpx.Client(
+            transport=DeadlineTransport(_recording_transport(timeouts)), timeout=60
+        )
+
+        client.get("https://example.com")
+
+        assert timeouts == [dict.fromkeys(("connect", "read", "write", "pool"), 60)]
+
+
+class DescribeAsyncDeadlineTransport:
+    def it_caps_the_request_timeouts_at_the_deadline(self):
+        timeouts: list[dict] = []
+        client = httpx.AsyncClient(
+            transport=AsyncDeadlineTransport(_recording_transport(timeouts)),
+            timeout=60,
+        )
+
+        async def get(_: None) -> httpx.Response:
+            return await client.get("https://example.com")
+
+        asyncio.run(RunnableLambda(get).ainvoke(None, _deadline(5)))
+
+        assert 0 < timeouts[0]["read"] <= 5
@@ -0,0 +1,162 @@
+"""Unit tests for the virgo.core.agent.tools module."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from langchain_core.runnables import RunnableLambda
+from langchain_tavily import TavilySearch
+
+from tests.unit.factories import ReflectionFactory
+from virgo.core.agent.corpus import CorpusHit, CorpusIndex
+from virgo.core.agent.schemas import SearchHint
+from virgo.core.agent.tools import (
+    CombinedResearcher,
+    DeadlineTavilySearchAPIWrapper,
+    LocalCorpusResearcher,
+    SearchParams,
+    TavilyResearcher,
+)
+
+
+class DescribeTavilyResearcher:
+    def it_runs_every_search_query(self):
+        tool = MagicMock(spec=TavilySearch, max_results=5)
+        reflection = ReflectionFactory.build(search_queries=["a", "b"])
+
+        TavilyResearcher(tool)(reflection, "answer")
+
+        tool.batch.assert_called_once_with([{"query": "a"}, {"query": "b"}])
+
+    def it_applies_the_configured_search_settings(self):
+        tool = MagicMock(spec=TavilySearch, max_results=5)
+        configured = tool.model_copy.return_value
+        reflection = ReflectionFactory.build(search_queries=["a"])
+        research = RunnableLambda(
+            lambda _: TavilyResearcher(tool)(reflection, "answer")
+        )
+
+        research.invoke(
+            None,
+            {"configurable": {"search_max_results": 2, "search_depth": "advanced"}},
+        )
+
+        tool.model_copy.assert_called_once_with(update={"max_results": 2})
+        configured.batch.assert_called_once_with(
+            [{"query": "a", "search_depth": "advanced"}]
+        )
+
+    def it_adapts_the_search_settings_to_the_research_round(self):
+        tool = MagicMock(spec=TavilySearch, max_results=5)
+        narrow = tool.model_copy.return_value
+        reflection = ReflectionFactory.build(search_queries=["a"])
+        researcher = TavilyResearcher(
+            tool,
+            first_round=SearchParams(search_depth="advanced"),
+            later_rounds=SearchParams(max_results=2, search_depth="basic"),
+        )
+
+        researcher(reflection, "answer")
+        researcher(reflection, "answer", references=[])
+
+        tool.batch.assert_called_once_with([{"query": "a", "search_depth": "advanced"}])
+        tool.model_copy.assert_called_once_with(update={"max_results": 2})
+        narrow.batch.assert_called_once_with([{"query": "a", "search_depth": "basic"}])
+
+    def it_follows_the_hints_of_the_reflection_per_query(self):
+        tool = MagicMock(spec=TavilySearch, max_results=5)
+        tool.batch.return_value = ["b results"]
+        hinted = tool.model_copy.return_value
+        hinted.batch.return_value = ["a results"]
+        reflection = ReflectionFactory.build(
+            search_queries=["a", "b"],
+            search_hints=[SearchHint(query="a", topic="news", max_results=8)],
+        )
+
+        results = TavilyResearcher(
+            tool, first_round=SearchParams(search_depth="basic")
+        )(reflection, "answer")
+
+        assert results == ["a results", "b results"]
+        tool.model_copy.assert_called_once_with(update={"max_results": 8})
+        hinted.batch.assert_called_once_with(
+            [{"query": "a", "search_depth": "basic", "topic": "news"}]
+        )
+        tool.batch.assert_called_once_with([{"query": "b", "search_depth": "basic"}])
+
+
+class DescribeDeadlineTavilySearchAPIWrapper:
+    def it_times_the_search_out_at_the_run_deadline(self):
+        wrapper = DeadlineTavilySearchAPIWrapper(tavily_api_key="key")
+        search = RunnableLambda(
+            lambda _: wrapper.raw_results("a", max_results=5, topic=None)
+        )
+
+        with patch("virgo.core.agent.tools.requests.post") as post:
+            post.return_value.status_code = 200
+            post.return_value.json.return_value = {"results": []}
+            results = search.invoke(
+                None, {"configurable": {"deadline": time.time() + 5}}
+            )
+
+        assert results == {"results": []}
+        assert post.call_args.kwargs["json"] == {"query": "a", "max_results": 5}
+        assert 0 < post.call_args.kwargs["timeout"] <= 5
+
+    def it_sets_no_timeout_without_deadline(self):
+        wrapper = DeadlineTavilySearchAPIWrapper(tavily_api_key="key")
+
+        with patch("virgo.core.agent.tools.requests.post") as post:
+            post.return_value.status_code = 200
+            wrapper.raw_results("a")
+
+        assert post.call_args.kwargs["timeout"] is None
+
+
+class DescribeLocalCorpusResearcher:
+    def it_returns_tavily_shaped_results_per_query(self):
+        index = MagicMock(spec=CorpusIndex)
+        index.search.return_value = [
+            CorpusHit(path="/docs/solar.md", title="Solar", content="Panels", score=2)
+        ]
+        reflection = ReflectionFactory.build(search_queries=["solar"])
+
+        results = LocalCorpusResearcher(index, max_results=3)(reflection, "answer")
+
+        index.search.assert_called_once_with("solar", 3)
+        assert results == [
+            {
+                "query": "solar",
+                "results": [
+                    {
+                        "url": "file:///docs/solar.md",
+                        "title": "Solar",
+                        "content": "Panels",
+                        "score": 2,
+                    }
+                ],
+            }
+        ]
+
+    def it_applies_the_configured_max_results(self):
+        index = MagicMock(spec=CorpusIndex)
+        index.search.return_value = []
+        reflection = ReflectionFactory.build(search_queries=["solar"])
+        research = RunnableLambda(
+            lambda _: LocalCorpusResearcher(index)(reflection, "answer")
+        )
+
+        research.invoke(None, {"configurable": {"search_max_results": 2}})
+
+        index.search.assert_called_once_with("solar", 2)
+
+
+class DescribeCombinedResearcher:
+    def it_concatenates_the_results_of_every_researcher(self):
+        reflection = ReflectionFactory.build()
+        first = MagicMock(return_value=["a"])
+        second = MagicMock(return_value=["b", "c"])
+
+        results = CombinedResearcher([first, second])(reflection, "answer", ["ref"])
+
+        assert results == ["a", "b", "c"]
+        second.assert_called_once_with(reflection, "answer", ["ref"])
@@ -1,12 +1,24 @@
 """Unit tests for the virgo.cli.commands module."""
 
+import os
 from unittest.mock import Mock
 
+import pytest
 from dependency_injector import providers
 from typer.testing import CliRunner
 
 from virgo.cli import app, container
+from virgo.cli.commands import _run_forwarded
+from virgo.cli.daemon import DaemonRequest, main
+from virgo.core.agent.llms import ChatModelPool
 from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.agent.synthetic import SyntheticLanguageModelProvider
+from virgo.core.telemetry.memory import (
+    AllocationSite,
+    NodeMemory,
+    NodeMemoryProfiler,
+)
+from virgo.core.telemetry.profiling import NodeProfiler
 
 runner = CliRunner()
 
@@ -30,7 +42,7 @@ class DescribeGenerateCommand:
             result = runner.invoke(app, ["generate", "What is AI?"])
 
         assert result.exit_code == 0
-        mock_action.execute.assert_called_once_with("What is AI?")
+        mock_action.execute.assert_called_once_with("What is AI?", use_cache=True)
 
     def it_shows_error_on_generation_failure(self):
         """Verify generate command shows error when generation fails."""
@@ -43,6 +55,84 @@ class DescribeGenerateCommand:
         assert result.exit_code == 0  # Typer doesn't exit with error by default
         assert "Failed to generate article" in result.output
 
+    def it_reports_node_timings_when_profiling(self, tmp_path):
+        """Verify generate command prints the profile and writes the statistics."""
+        mock_action = Mock()
+        mock_action.execute.return_value = MarkdownArticle(
+            title="Test Article", summary="Summary.", content="Content."
+        )
+        output = tmp_path / "virgo.prof"
+
+        with (
+            container.generate_action.override(mock_action),
+            container.node_profiler.override(
+                providers.Singleton(NodeProfiler, deterministic=True)
+            ),
+            container.config.profile.override(False),
+            container.config.profile_output.override(None),
+        ):
+            result = runner.invoke(
+                app, ["generate", "What is AI?", "--profile-output", str(output)]
+            )
+
+        assert result.exit_code == 0
+        assert "graph overhead" in result.output
+        assert output.exists()
+
+    def it_reports_the_node_memory_when_memory_profiling(self):
+        mock_action = Mock()
+        mock_action.execute.return_value = MarkdownArticle(
+            title="Test Article", summary="Summary.", content="Content."
+        )
+        profiler = NodeMemoryProfiler()
+        profiler.steps.append(
+            NodeMemory(
+                name="draft",
+                allocated=2048,
+                peak=4096,
+                top=[AllocationSite("chains.py:12", size=1024, count=3)],
+                state_sizes={"messages": 512},
+            )
+        )
+
+        with (
+            container.generate_action.override(mock_action),
+            container.memory_profiler.override(providers.Object(profiler)),
+            container.config.memory_profile.override(False),
+        ):
+            result = runner.invoke(app, ["generate", "What is AI?", "--memory-profile"])
+
+        assert result.exit_code == 0
+        assert "Memory profile" in result.output
+        assert "2.0 KiB" in result.output
+        assert "chains.py:12" in result.output
+
+    def it_writes_the_article_as_json(self, tmp_path):
+        """Verify generate command writes the article to the requested output."""
+        mock_action = Mock()
+        mock_action.execute.return_value = MarkdownArticle(
+            title="Test Article", summary="Summary.", content="Content."
+        )
+        output = tmp_path / "article.json"
+
+        with container.generate_action.override(mock_action):
+            result = runner.invoke(
+                app,
+                [
+                    "generate",
+                    "What is AI?",
+                    "--output",
+                    str(output),
+                    "--format",
+                    "json",
+                ],
+            )
+
+        assert result.exit_code == 0
+        assert MarkdownArticle.model_validate_json(output.read_text()).title == (
+            "Test Article"
+        )
+
     def it_requires_question_argument(self):
         """Verify generate command requires a question argument."""
         # Use a mock to avoid actual API calls
@@ -107,3 +197,179 @@ class DescribeContainer:
             agent = container._agent()
 
         assert action.generator is agent
+
+
+class DescribeBatchCommands:
+    """Tests for the batch CLI commands."""
+
+    def it_generates_the_articles_of_a_batch(self, tmp_path):
+        manifest = tmp_path / "batch.db"
+        questions = tmp_path / "questions.txt"
+        questions.write_text("What is AI?\nWhat is ML?\n")
+        mock_action = Mock()
+        mock_action.execute.return_value = MarkdownArticle(
+            title="Test Article", summary="Summary.", content="Content."
+        )
+
+        added = runner.invoke(app, ["batch", "add", str(manifest), str(questions)])
+        with container.generate_action.override(mock_action):
+            run = runner.invoke(app, ["batch", "run", str(manifest)])
+        status = runner.invoke(app, ["batch", "status", str(manifest)])
+
+        assert added.exit_code == 0
+        assert "Added 2 question(s)" in added.output
+        assert run.exit_code == 0
+        assert "Generated 2 article(s)" in run.output
+        assert mock_action.execute.call_count == 2
+        assert "done" in status.output
+
+        export = runner.invoke(
+            app, ["batch", "export", str(manifest), "-o", str(tmp_path / "articles")]
+        )
+
+        assert export.exit_code == 0
+        assert len(list((tmp_path / "articles").iterdir())) == 2
+
+
+class DescribeLoadTestCommand:
+    """Tests for the loadtest CLI command."""
+
+    def it_reports_the_throughput_and_latency_percentiles(self, tmp_path):
+        questions = tmp_path / "questions.txt"
+        questions.write_text("What is AI?\n\nWhat is ML?\n")
+        mock_agent = Mock()
+        mock_agent.generate.side_effect = [
+            MarkdownArticle(title="AI", summary="Summary.", content="Content."),
+            None,
+            None,
+        ]
+
+        with (
+            container._agent.override(providers.Object(mock_agent)),
+            container.config.record_latencies.override(True),
+        ):
+            result = runner.invoke(
+                app, ["loadtest", str(questions), "-n", "3", "-c", "1"]
+            )
+
+        assert result.exit_code == 0
+        assert "3 generation(s)" in result.output
+        assert "2 failure(s)" in result.output
+        assert "end-to-end" in result.output
+        assert "NoArticle" in result.output
+        assert [call.args[0] for call in mock_agent.generate.call_args_list] == [
+            "What is AI?",
+            "What is ML?",
+            "What is AI?",
+        ]
+
+
+class DescribeBenchmarkCommand:
+    """Tests for the benchmark CLI command."""
+
+    def it_reports_each_node_and_method(self):
+        pool = ChatModelPool(
+            {"synthetic": SyntheticLanguageModelProvider()}, "synthetic", "model"
+        )
+
+        with container.chat_model_pool.override(providers.Object(pool)):
+            result = runner.invoke(app, ["benchmark", "-m", "json_schema", "-n", "2"])
+
+        assert result.exit_code == 0
+        assert "json_schema" in result.output
+        assert "function_calling" not in result.output
+        for node in ("draft", "revise", "format"):
+            assert node in result.output
+
+
+class DescribeIndexCommands:
+    """Tests for the index CLI commands."""
+
+    def it_builds_and_searches_a_local_corpus(self, tmp_path):
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        (corpus / "solar.md").write_text("# Solar power\n\nSolar panels efficiency.")
+        index = str(tmp_path / "index.db")
+
+        build = runner.invoke(app, ["index", "build", str(corpus), "--index", index])
+        rebuild = runner.invoke(app, ["index", "build", str(corpus), "--index", index])
+        search = runner.invoke(app, ["index", "search", "solar", "--index", index])
+
+        assert build.exit_code == 0
+        assert "1 added" in build.output
+        assert "1 unchanged" in rebuild.output
+        assert search.exit_code == 0
+        assert "Solar power" in search.output
+
+
+class DescribeSchemasCommand:
+    """Tests for the schemas CLI command."""
+
+    def it_reports_the_tokens_saved_per_call(self):
+        result = runner.invoke(app, ["schemas"])
+
+        assert result.exit_code == 0
+        for call in ("draft", "revise", "format"):
+            assert call in result.output
+
+
+class DescribeDaemonForwarding:
+    """Tests for the commands forwarded to the daemon."""
+
+    @pytest.fixture(autouse=True)
+    def restore_settings(self):
+        """Restore the environment and settings replaced by the forwarded commands."""
+        environ = dict(os.environ)
+        settings = container.config()
+        yield
+        os.environ.clear()
+        os.environ.update(environ)
+        container.config.from_dict(settings)
+        container.reset_singletons()
+
+    def it_runs_the_command_with_the_client_environment(self, monkeypatch, capsys):
+        monkeypatch.setenv("VIRGO_MAX_ITERATIONS", "7")
+        mock_action = Mock()
+        mock_action.execute.return_value = None
+
+        with container.generate_action.override(mock_action):
+            exit_code = _run_forwarded(
+                DaemonRequest(
+                    argv=["generate", "What is AI?", "--no-cache"],
+                    cwd=".",
+                    env={"VIRGO_MAX_ITERATIONS": "2"},
+                )
+            )
+
+        assert exit_code == 0
+        assert container.config.max_iterations() == 2
+        mock_action.execute.assert_called_once_with("What is AI?", use_cache=False)
+        assert "Failed to generate article" in capsys.readouterr().out
+
+    def it_returns_the_exit_code_of_the_command(self, capsys):
+        assert _run_forwarded(DaemonRequest(argv=["unknown"], cwd=".")) == 2
+        assert "No such command" in capsys.readouterr().err
+
+
+class DescribeDaemonCommand:
+    """Tests for the daemon CLI command."""
+
+    def it_exits_on_unsupported_platforms(self, monkeypatch):
+        monkeypatch.setattr("virgo.cli.commands.is_supported", lambda: False)
+
+        result = runner.invoke(app, ["daemon"])
+
+        assert result.exit_code == 1
+        assert "not supported on this platform" in result.output
+
+    def it_runs_the_commands_locally_on_unsupported_platforms(self, monkeypatch):
+        forward = Mock()
+        monkeypatch.setattr("virgo.cli.daemon.is_supported", lambda: False)
+        monkeypatch.setattr("virgo.cli.daemon.forward", forward)
+        monkeypatch.setattr("sys.argv", ["virgo", "--help"])
+
+        with pytest.raises(SystemExit) as error:
+            main()
+
+        assert error.value.code == 0
+        forward.assert_not_called()
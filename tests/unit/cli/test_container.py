@@ -4,10 +4,29 @@ import pytest
 from dependency_injector import providers
 
 from virgo.cli.container import Container, VirgoSettings
+from virgo.core.actions.cache import SQLiteArticleCache
+from virgo.core.actions.coalesce import CoalescingArticleGenerator
+from virgo.core.actions.similarity import NearDuplicateArticleCache
+from virgo.core.agent.cassette import CassetteChatModel, CassetteResearcher
+from virgo.core.agent.evidence import InMemoryEvidenceStore, SQLiteEvidenceStore
 from virgo.core.agent.llms import (
+    ConfigurableChatModel,
+    GenerationParams,
     OllamaLanguageModelProvider,
     OpenAILanguageModelProvider,
 )
+from virgo.core.agent.ranking import BM25Ranker
+from virgo.core.agent.routing import RoutingChatModel
+from virgo.core.agent.synthetic import SyntheticChatModel, SyntheticResearcher
+from virgo.core.agent.tools import (
+    CombinedResearcher,
+    LocalCorpusResearcher,
+    SearchParams,
+    TavilyResearcher,
+)
+from virgo.core.telemetry.latency import LatencyRecorder
+from virgo.core.telemetry.profiling import NodeProfiler
+from virgo.core.telemetry.tracing import OTLPTracer
 
 
 class DescribeVirgoSettings:
@@ -37,6 +56,19 @@ class DescribeVirgoSettings:
         assert settings.model_name == "llama3"
         assert settings.max_iterations == 7
 
+    def it_loads_the_generation_params_from_json(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(
+            "VIRGO_GENERATION_PARAMS", '{"format": {"temperature": 0, "num_ctx": 8192}}'
+        )
+
+        settings = VirgoSettings()
+
+        assert settings.generation_params["format"].temperature == 0
+        assert settings.generation_params["format"].num_ctx == 8192
+        assert settings.generation_params["format"].max_tokens is None
+
 
 class DescribeContainer:
     """Tests for container providers and wiring."""
@@ -65,6 +97,315 @@ class DescribeContainer:
         provider = container._language_model_provider()
         assert isinstance(provider, OllamaLanguageModelProvider)
 
+    def it_builds_the_graph_around_the_pooled_chat_models(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings())
+
+        chat_model = container._chat_model()
+
+        assert isinstance(chat_model, ConfigurableChatModel)
+        assert chat_model.pool is container.chat_model_pool()
+
+    def it_gives_the_nodes_their_generation_params(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(
+                generation_params={"draft": {"max_tokens": 600, "temperature": 0.3}}
+            )
+        )
+
+        node_llms = container._graph.kwargs["node_llms"]()
+
+        assert list(node_llms) == ["DRAFT"]
+        assert node_llms["DRAFT"].pool is container.chat_model_pool()
+        assert node_llms["DRAFT"].params == GenerationParams(
+            max_tokens=600, temperature=0.3
+        )
+
+    def it_gives_the_nodes_their_structured_output_methods(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(structured_output_methods={"format": {"ollama": "json_mode"}})
+        )
+
+        node_llms = container._graph.kwargs["node_llms"]()
+
+        assert list(node_llms) == ["FORMAT"]
+        assert node_llms["FORMAT"].params is None
+        assert node_llms["FORMAT"].structured_output_methods == {"ollama": "json_mode"}
+
+    def it_replays_the_chat_models_and_searches_from_a_cassette(self, tmp_path) -> None:
+        cassette = tmp_path / "cassette.jsonl"
+        cassette.touch()
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(cassette="replay", cassette_path=str(cassette))
+        )
+
+        model = container.chat_model_pool().get()
+        researcher = container._graph.kwargs["researcher"]()
+
+        assert isinstance(model, CassetteChatModel)
+        assert model.model is None
+        assert isinstance(researcher, CassetteResearcher)
+
+    def it_selects_the_synthetic_backends(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(
+                genai_provider="synthetic",
+                research_backend="synthetic",
+                synthetic_latency=0.5,
+            )
+        )
+
+        model = container.chat_model_pool().get()
+        researcher = container._graph.kwargs["researcher"]()
+
+        assert isinstance(model, SyntheticChatModel)
+        assert model.latency == 0.5
+        assert isinstance(researcher, SyntheticResearcher)
+
+    def it_routes_the_chat_models_to_the_fallbacks(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(genai_fallbacks=["openai:gpt-4o-mini"])
+        )
+
+        model = container.chat_model_pool().get()
+
+        assert isinstance(model, RoutingChatModel)
+        assert model.router.names == ["openai:gpt-4-turbo", "openai:gpt-4o-mini"]
+
+    def it_configures_the_agent_runs_with_the_max_iterations(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(max_iterations=3))
+
+        with container._graph.override(providers.Object(object())):
+            agent = container._virgo_agent()
+
+        assert agent._configuration.max_iterations == 3
+
+    def it_ranks_research_results_when_top_k_is_set(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(research_top_k=4))
+
+        ranker = container._ranker()
+
+        assert isinstance(ranker, BM25Ranker)
+        assert ranker.top_k == 4
+
+    def it_disables_ranking_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings())
+
+        assert container._ranker() is None
+
+    def it_researches_with_tavily_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings())
+
+        with container._tavily_tool.override(providers.Object(object())):
+            assert isinstance(container._researcher(), TavilyResearcher)
+
+    def it_keeps_the_search_parameters_of_the_rounds_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings())
+
+        with container._tavily_tool.override(providers.Object(object())):
+            researcher = container._researcher()
+
+        assert researcher._first_round == SearchParams(max_results=5)
+        assert researcher._later_rounds == SearchParams(max_results=5)
+
+    def it_narrows_the_later_research_rounds(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(search_rounds={"later": {"max_results": 2}})
+        )
+
+        with container._tavily_tool.override(providers.Object(object())):
+            researcher = container._researcher()
+
+        assert researcher._later_rounds == SearchParams(max_results=2)
+
+    def it_researches_in_the_local_corpus(self, tmp_path) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(
+                research_backend="local",
+                corpus_index_path=str(tmp_path / "index.db"),
+            )
+        )
+
+        assert isinstance(container._researcher(), LocalCorpusResearcher)
+
+    def it_combines_tavily_and_the_local_corpus(self, tmp_path) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(
+                research_backend="both",
+                corpus_index_path=str(tmp_path / "index.db"),
+            )
+        )
+
+        with container._tavily_tool.override(providers.Object(object())):
+            assert isinstance(container._researcher(), CombinedResearcher)
+
+    def it_disables_evidence_store_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(evidence_store="none"))
+
+        assert container._evidence_store() is None
+
+    def it_selects_memory_evidence_store(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(evidence_store="memory", evidence_store_max_entries=50)
+        )
+
+        store = container._evidence_store()
+        assert isinstance(store, InMemoryEvidenceStore)
+        assert store._max_entries == 50
+
+    def it_selects_sqlite_evidence_store(self, tmp_path) -> None:
+        settings = VirgoSettings(
+            evidence_store="sqlite",
+            evidence_store_path=str(tmp_path / "evidence.db"),
+        )
+        container = Container()
+        container.config.from_pydantic(settings)
+
+        assert isinstance(container._evidence_store(), SQLiteEvidenceStore)
+
+    def it_has_no_node_hooks_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(profile=False))
+
+        assert container._node_hooks() == []
+
+    def it_hooks_the_node_profiler_when_profiling(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(profile=True))
+
+        (hook,) = container._node_hooks()
+
+        assert isinstance(hook, NodeProfiler)
+        assert hook is container.node_profiler()
+
+    def it_hooks_the_latency_recorder_when_recording_latencies(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(record_latencies=True))
+
+        (hook,) = container._node_hooks()
+
+        assert isinstance(hook, LatencyRecorder)
+        assert hook is container.loadtest_action(generator=object()).recorder
+
+    def it_has_no_callbacks_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(trace_exporter="none"))
+
+        assert container._callbacks() == []
+
+    def it_attaches_the_tracer_when_exporting_traces(self, tmp_path) -> None:
+        settings = VirgoSettings(
+            trace_exporter="file", trace_file=str(tmp_path / "traces.jsonl")
+        )
+        container = Container()
+        container.config.from_pydantic(settings)
+
+        (tracer,) = container._callbacks()
+
+        assert isinstance(tracer, OTLPTracer)
+
+    def it_collects_metrics_when_exposed(self, tmp_path) -> None:
+        settings = VirgoSettings(metrics_textfile=str(tmp_path / "virgo.prom"))
+        container = Container()
+        container.config.from_pydantic(settings)
+
+        metrics = container.metrics()
+
+        assert container._node_hooks() == [metrics]
+        assert container._callbacks() == [metrics]
+        assert container.generate_action(generator=object()).metrics is metrics
+
+    def it_disables_article_cache_by_default(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(article_cache="none"))
+
+        assert container.generate_action(generator=object()).cache is None
+
+    def it_selects_sqlite_article_cache(self, tmp_path) -> None:
+        settings = VirgoSettings(
+            article_cache="sqlite",
+            article_cache_path=str(tmp_path / "cache.db"),
+        )
+        container = Container()
+        container.config.from_pydantic(settings)
+
+        assert isinstance(
+            container.generate_action(generator=object()).cache, SQLiteArticleCache
+        )
+
+    def it_serves_near_duplicate_questions_when_a_similarity_is_set(self) -> None:
+        container = Container()
+        container.config.from_pydantic(
+            VirgoSettings(article_cache="memory", article_cache_similarity=0.9)
+        )
+
+        assert isinstance(
+            container.generate_action(generator=object()).cache,
+            NearDuplicateArticleCache,
+        )
+
+    @pytest.mark.parametrize(
+        ("before", "after"),
+        [
+            ({"model_name": "gpt-4o"}, {"model_name": "gpt-4o-mini"}),
+            (
+                {"generation_params": {}},
+                {"generation_params": {"draft": {"max_tokens": 600}}},
+            ),
+            ({"citation_index": False}, {"citation_index": True}),
+            ({"revision_mode": "rewrite"}, {"revision_mode": "patch"}),
+            ({"research_backend": "tavily"}, {"research_backend": "local"}),
+            (
+                {"search_rounds": {}},
+                {"search_rounds": {"later": {"max_results": 3}}},
+            ),
+            ({"research_top_k": None}, {"research_top_k": 8}),
+            ({"compact_schemas": False}, {"compact_schemas": True}),
+            (
+                {"structured_output_methods": {}},
+                {"structured_output_methods": {"draft": {"openai": "json_schema"}}},
+            ),
+        ],
+    )
+    def it_fingerprints_the_generation_settings(
+        self, before: dict, after: dict
+    ) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings(**before))
+        fingerprint = container._fingerprint()
+
+        container.config.from_pydantic(VirgoSettings(**after))
+
+        assert container._fingerprint() != fingerprint
+
+    def it_shares_the_coalescing_agent_between_the_actions(self) -> None:
+        container = Container()
+        container.config.from_pydantic(VirgoSettings())
+
+        with container._graph.override(providers.Object(object())):
+            action = container.generate_action()
+            loadtest = container.loadtest_action()
+
+        assert isinstance(action.generator, CoalescingArticleGenerator)
+        assert action.generator is loadtest.generator
+        assert action.generator.generator is container._virgo_agent()
+        assert action.generator.fingerprint == action.fingerprint
+
     def it_provides_generate_action_with_overridden_agent(self) -> None:
         container = Container()
         container.config.from_pydantic(VirgoSettings())
@@ -0,0 +1,68 @@
+"""Unit tests for the virgo.cli.daemon module."""
+
+import os
+import signal
+import time
+
+import pytest
+
+from virgo.cli.daemon import DaemonError, DaemonRequest, forward, is_supported, serve
+
+pytestmark = pytest.mark.skipif(
+    not is_supported(), reason="The daemon needs fork and Unix sockets."
+)
+
+
+def _echo(request: DaemonRequest) -> int:
+    """Write the forwarded request to the standard streams, as a command would."""
+    os.write(
+        1, f"{' '.join(request.argv)} {request.env['VIRGO_MODEL_NAME']}\n".encode()
+    )
+    os.write(2, b"warning\n")
+    return 3
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    path = tmp_path / "virgo.sock"
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve(path, _echo)
+        finally:
+            os._exit(0)
+    deadline = time.monotonic() + 10
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield path
+    os.kill(pid, signal.SIGTERM)
+    os.waitpid(pid, 0)
+
+
+class DescribeForward:
+    def it_runs_locally_without_a_daemon(self, tmp_path):
+        assert forward(["generate", "question"], tmp_path / "virgo.sock") is None
+
+    def it_runs_the_command_in_the_daemon_with_the_client_streams(
+        self, daemon, capfd, monkeypatch
+    ):
+        monkeypatch.setenv("VIRGO_MODEL_NAME", "gpt-4o")
+
+        exit_code = forward(["generate", "question"], daemon)
+
+        captured = capfd.readouterr()
+        assert exit_code == 3
+        assert captured.out == "generate question gpt-4o\n"
+        assert captured.err == "warning\n"
+
+
+class DescribeServe:
+    def it_refuses_to_serve_twice(self, daemon):
+        with pytest.raises(DaemonError):
+            serve(daemon, _echo)
+
+    def it_replaces_a_stale_socket(self, tmp_path):
+        path = tmp_path / "virgo.sock"
+        path.touch()
+
+        assert forward(["generate"], path) is None
@@ -0,0 +1,84 @@
+"""Unit tests for the virgo.cli.output module."""
+
+import io
+import json
+
+from rich.console import Console
+
+from tests.unit.factories import MarkdownArticleFactory
+from virgo.cli.output import (
+    ConsoleSink,
+    DirectorySink,
+    OutputFormat,
+    StreamSink,
+    open_sink,
+    slugify,
+)
+
+
+class DescribeStreamSink:
+    def it_writes_raw_markdown(self):
+        stream = io.StringIO()
+        article = MarkdownArticleFactory.build()
+
+        StreamSink(stream, OutputFormat.MARKDOWN).write(article)
+
+        assert stream.getvalue() == article.to_markdown() + "\n"
+
+    def it_writes_one_json_article_per_line(self):
+        stream = io.StringIO()
+        articles = MarkdownArticleFactory.build_batch(2)
+        sink = StreamSink(stream, OutputFormat.JSON)
+
+        for article in articles:
+            sink.write(article)
+
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == [
+            article.title for article in articles
+        ]
+
+
+class DescribeDirectorySink:
+    def it_writes_one_file_per_article(self, tmp_path):
+        sink = DirectorySink(tmp_path / "articles", OutputFormat.MARKDOWN)
+        article = MarkdownArticleFactory.build(title="What is AI?")
+
+        sink.write(article)
+        sink.write(article)
+
+        assert sorted(path.name for path in (tmp_path / "articles").iterdir()) == [
+            "what-is-ai-2.md",
+            "what-is-ai.md",
+        ]
+
+
+class DescribeOpenSink:
+    def it_renders_with_rich_on_terminals(self):
+        console = Console(file=io.StringIO(), force_terminal=True)
+
+        with open_sink(None, None, console) as sink:
+            assert isinstance(sink, ConsoleSink)
+
+    def it_writes_raw_markdown_when_not_on_a_terminal(self):
+        console = Console(file=io.StringIO(), force_terminal=False)
+
+        with open_sink(None, None, console) as sink:
+            assert isinstance(sink, StreamSink)
+
+    def it_writes_to_a_file(self, tmp_path):
+        output = tmp_path / "article.json"
+        article = MarkdownArticleFactory.build()
+
+        with open_sink(output, OutputFormat.JSON, Console()) as sink:
+            sink.write(article)
+
+        assert json.loads(output.read_text())["title"] == article.title
+
+    def it_writes_to_a_directory_for_paths_without_suffix(self, tmp_path):
+        with open_sink(tmp_path / "articles", None, Console()) as sink:
+            assert isinstance(sink, DirectorySink)
+
+
+def it_slugifies_titles():
+    assert slugify("Énergie & Climat: 2024!") == "energie-climat-2024"
@@ -0,0 +1 @@
+"""Tests for the virgo.core.telemetry package."""
@@ -0,0 +1,64 @@
+"""Unit tests for the virgo.core.telemetry.latency module."""
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.agent.graph.state import AnswerState
+from virgo.core.telemetry.latency import LatencyRecorder, LatencySummary
+
+
+class DescribeLatencySummary:
+    def it_computes_the_percentiles_of_the_samples(self):
+        summary = LatencySummary.of([float(value) for value in range(1, 101)])
+
+        assert summary.count == 100
+        assert summary.p50 == pytest.approx(50.5)
+        assert summary.p95 == pytest.approx(95.05)
+        assert summary.p99 == pytest.approx(99.01)
+
+    def it_is_zero_without_samples(self):
+        assert LatencySummary.of([]) == LatencySummary(0, 0.0, 0.0, 0.0)
+
+
+class DescribeLatencyRecorder:
+    def it_records_the_latency_and_tokens_of_each_node_run(self):
+        recorder = LatencyRecorder()
+        state = AnswerState(messages=[], final_answer=None, formatted_article=None)
+
+        for _ in range(2):
+            run = NodeRun(name="draft", state=state)
+            with recorder(run):
+                run.output = AnswerState(
+                    messages=[
+                        AIMessage(
+                            content="",
+                            usage_metadata={
+                                "input_tokens": 10,
+                                "output_tokens": 4,
+                                "total_tokens": 14,
+                            },
+                        )
+                    ],
+                    final_answer=None,
+                    formatted_article=None,
+                )
+        with (
+            pytest.raises(RuntimeError),
+            recorder(NodeRun(name="research", state=state)),
+        ):
+            raise RuntimeError("Search failed.")
+
+        assert {
+            name: summary.count for name, summary in recorder.latencies().items()
+        } == {
+            "draft": 2,
+            "research": 1,
+        }
+        tokens = recorder.token_usage()
+        assert list(tokens) == ["draft"]
+        assert tokens["draft"].total_tokens == 28
+
+        recorder.clear()
+
+        assert recorder.latencies() == {}
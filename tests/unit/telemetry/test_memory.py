@@ -0,0 +1,58 @@
+"""Unit tests for the virgo.core.telemetry.memory module."""
+
+import tracemalloc
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.agent.graph.state import AnswerState
+from virgo.core.telemetry.memory import NodeMemoryProfiler, deep_size
+
+
+@pytest.fixture
+def profiler():
+    profiler = NodeMemoryProfiler(top=2)
+    yield profiler
+    if tracemalloc.is_tracing():
+        profiler.stop()
+
+
+class DescribeNodeMemoryProfiler:
+    """Tests for the NodeMemoryProfiler node hook."""
+
+    def it_measures_the_memory_left_allocated_by_each_node(self, profiler):
+        question = HumanMessage("What is AI?")
+        state = AnswerState(
+            messages=[question], final_answer=None, formatted_article=None
+        )
+        run = NodeRun(name="research", state=state)
+
+        with profiler(run):
+            run.output = AnswerState(
+                messages=[AIMessage("x" * 100_000)],
+                final_answer=None,
+                formatted_article=None,
+            )
+
+        (step,) = profiler.steps
+        assert step.name == "research"
+        assert step.allocated >= 100_000
+        assert step.peak >= step.allocated
+        assert step.top[0].size >= 100_000
+        assert "test_memory.py" in step.top[0].location
+        assert step.state_sizes["messages"] >= 100_000 + deep_size(question)
+        assert set(step.state_sizes) == {
+            "messages",
+            "final_answer",
+            "formatted_article",
+        }
+
+
+class DescribeDeepSize:
+    def it_counts_the_shared_objects_once(self):
+        text = "x" * 1000
+        single = deep_size([text])
+
+        assert deep_size([text, text]) == single + 8
+        assert deep_size([text]) > 1000
@@ -0,0 +1,168 @@
+"""Unit tests for the virgo.core.telemetry.metrics module."""
+
+import urllib.request
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.agent.graph.state import AnswerState
+from virgo.core.telemetry.metrics import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    VirgoMetrics,
+)
+
+
+class DescribeMetricsRegistry:
+    """Tests for the metrics registry and the Prometheus text format."""
+
+    def it_renders_counters(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("virgo_total", "Things.", ["kind"])
+        counter.inc(kind="a")
+        counter.inc(2, kind='quoted "b"')
+
+        text = registry.render()
+
+        assert "# HELP virgo_total Things.\n# TYPE virgo_total counter" in text
+        assert 'virgo_total{kind="a"} 1' in text
+        assert 'virgo_total{kind="quoted \\"b\\""} 2' in text
+
+    def it_renders_unlabelled_counters_before_any_increment(self):
+        registry = MetricsRegistry()
+        registry.counter("virgo_total", "Things.")
+
+        assert "virgo_total 0" in registry.render()
+
+    def it_renders_cumulative_histogram_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("virgo_seconds", "Latency.", buckets=(1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'virgo_seconds_bucket{le="1"} 2' in text
+        assert 'virgo_seconds_bucket{le="5"} 3' in text
+        assert 'virgo_seconds_bucket{le="+Inf"} 4' in text
+        assert "virgo_seconds_sum 14.5" in text
+        assert "virgo_seconds_count 4" in text
+
+    def it_rejects_unexpected_labels(self):
+        counter = MetricsRegistry().counter("virgo_total", "Things.", ["kind"])
+
+        with pytest.raises(ValueError):
+            counter.inc(other="a")
+
+    def it_rejects_duplicate_metrics(self):
+        registry = MetricsRegistry()
+        registry.counter("virgo_total", "Things.")
+
+        with pytest.raises(ValueError):
+            registry.counter("virgo_total", "Things.")
+
+    def it_writes_a_textfile(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.counter("virgo_total", "Things.").inc()
+        path = tmp_path / "virgo.prom"
+
+        registry.write_textfile(path)
+
+        assert path.read_text() == registry.render()
+        assert list(tmp_path.iterdir()) == [path]
+
+    def it_serves_the_metrics_over_http(self):
+        registry = MetricsRegistry()
+        registry.counter("virgo_total", "Things.").inc()
+
+        server = registry.serve(0)
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{server.server_port}/metrics", timeout=5
+            ) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert body == registry.render()
+        assert content_type == CONTENT_TYPE
+
+
+class DescribeVirgoMetrics:
+    """Tests for the Virgo metrics collected from the graph."""
+
+    def it_measures_node_latency_and_new_tokens(self):
+        metrics = VirgoMetrics()
+        previous = AIMessage(
+            content="old",
+            usage_metadata={
+                "input_tokens": 100,
+                "output_tokens": 100,
+                "total_tokens": 200,
+            },
+        )
+        state = AnswerState(
+            messages=[previous], final_answer=None, formatted_article=None
+        )
+        run = NodeRun(name="revise", state=state)
+
+        with metrics(run):
+            run.output = AnswerState(
+                messages=[
+                    previous,
+                    AIMessage(
+                        content="new",
+                        usage_metadata={
+                            "input_tokens": 12,
+                            "output_tokens": 3,
+                            "total_tokens": 15,
+                        },
+                    ),
+                ],
+                final_answer=None,
+                formatted_article=None,
+            )
+
+        assert metrics.node_duration.count(node="revise") == 1
+        assert metrics.node_tokens.value(node="revise", direction="input") == 12
+        assert metrics.node_tokens.value(node="revise", direction="output") == 3
+
+    def it_observes_iterations_when_formatting(self):
+        metrics = VirgoMetrics()
+        state = AnswerState(
+            messages=[
+                HumanMessage(content="Question"),
+                ToolMessage(content="a", tool_call_id="1"),
+                ToolMessage(content="b", tool_call_id="2"),
+            ],
+            final_answer=None,
+            formatted_article=None,
+        )
+
+        with metrics(NodeRun(name="format", state=state)):
+            pass
+
+        assert metrics.iterations.count() == 1
+        assert 'virgo_iterations_per_article_bucket{le="2"} 1' in (
+            metrics.registry.render()
+        )
+
+    def it_measures_searches_and_their_errors(self):
+        metrics = VirgoMetrics()
+        ok, failed, reported, other = uuid4(), uuid4(), uuid4(), uuid4()
+
+        metrics.on_tool_start({"name": "tavily_search"}, "q", run_id=ok)
+        metrics.on_tool_end({"results": []}, run_id=ok)
+        metrics.on_tool_start({"name": "tavily_search"}, "q", run_id=failed)
+        metrics.on_tool_error(RuntimeError("boom"), run_id=failed)
+        metrics.on_tool_start({"name": "tavily_search"}, "q", run_id=reported)
+        metrics.on_tool_end({"error": RuntimeError("quota")}, run_id=reported)
+        metrics.on_tool_start({"name": "Answer"}, "q", run_id=other)
+        metrics.on_tool_end("result", run_id=other)
+
+        assert metrics.search_duration.count() == 3
+        assert metrics.search_errors.value() == 2
@@ -0,0 +1,53 @@
+"""Unit tests for the virgo.core.telemetry.profiling module."""
+
+import pstats
+
+import pytest
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.telemetry.profiling import NodeProfiler
+
+
+class DescribeNodeProfiler:
+    """Tests for the NodeProfiler node hook."""
+
+    def it_accumulates_timings_per_node(self):
+        profiler = NodeProfiler()
+
+        for name in ("draft", "revise", "revise"):
+            with profiler(NodeRun(name=name, state={})):  # type: ignore[typeddict-item]
+                sum(range(1000))
+
+        assert list(profiler.timings) == ["draft", "revise"]
+        assert profiler.timings["revise"].calls == 2
+        assert profiler.timings["draft"].wall_time > 0
+        assert profiler.timings["draft"].mean_wall_time > 0
+
+    def it_measures_nested_sections(self):
+        profiler = NodeProfiler()
+
+        with (
+            profiler.section("generate"),
+            profiler(NodeRun(name="draft", state={})),  # type: ignore[typeddict-item]
+        ):
+            sum(range(1000))
+
+        assert (
+            profiler.timings["generate"].wall_time
+            >= profiler.timings["draft"].wall_time
+        )
+
+    def it_dumps_deterministic_profiler_statistics(self, tmp_path):
+        profiler = NodeProfiler(deterministic=True)
+
+        with profiler.section("draft"):
+            sorted(range(1000), reverse=True)
+
+        path = tmp_path / "virgo.prof"
+        profiler.dump_stats(path)
+
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def it_refuses_to_dump_without_deterministic_profiler(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            NodeProfiler().dump_stats(tmp_path / "virgo.prof")
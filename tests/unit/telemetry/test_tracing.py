@@ -0,0 +1,179 @@
+"""Unit tests for the virgo.core.telemetry.tracing module."""
+
+import json
+import threading
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import TypedDict
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+
+from virgo.core.telemetry.tracing import (
+    FileSpanExporter,
+    OTLPHTTPSpanExporter,
+    OTLPTracer,
+    Span,
+    SpanExporter,
+    to_export_request,
+)
+
+
+class _ListExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.batches: list[list[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.batches.append(list(spans))
+
+
+class _State(TypedDict):
+    value: str
+
+
+@tool
+def tavily_search(query: str) -> str:
+    """Fake search tool."""
+    return f"results for {query}"
+
+
+def _run_graph(tracer: OTLPTracer, fail: bool = False) -> None:
+    llm = FakeListChatModel(responses=["answer"])
+
+    def draft(state: _State) -> _State:
+        return {"value": llm.invoke(state["value"]).content}  # type: ignore[typeddict-item]
+
+    def research(state: _State) -> _State:
+        if fail:
+            raise RuntimeError("search failed")
+        return {"value": tavily_search.invoke({"query": state["value"]})}
+
+    builder = StateGraph(_State)
+    builder.add_node("draft", draft)
+    builder.add_node("research", research)
+    builder.add_edge(START, "draft")
+    builder.add_edge("draft", "research")
+    builder.add_edge("research", END)
+    builder.compile().invoke({"value": "question"}, {"callbacks": [tracer]})
+
+
+class DescribeOTLPTracer:
+    """Tests for the OTLPTracer callback handler."""
+
+    def it_exports_one_trace_per_graph_run(self):
+        exporter = _ListExporter()
+
+        _run_graph(OTLPTracer(exporter))
+
+        (spans,) = exporter.batches
+        names = {span.name for span in spans}
+        assert {"virgo.node draft", "virgo.node research"} <= names
+        assert "tool tavily_search" in names
+        assert any(name.startswith("chat ") for name in names)
+        assert len({span.trace_id for span in spans}) == 1
+
+    def it_nests_spans_under_the_closest_traced_ancestor(self):
+        exporter = _ListExporter()
+
+        _run_graph(OTLPTracer(exporter))
+
+        spans = {span.name: span for span in exporter.batches[0]}
+        (root,) = [span for span in spans.values() if span.parent_span_id is None]
+        assert spans["virgo.node draft"].parent_span_id == root.span_id
+        assert (
+            spans["tool tavily_search"].parent_span_id
+            == spans["virgo.node research"].span_id
+        )
+
+    def it_records_latency_and_query_attributes(self):
+        exporter = _ListExporter()
+
+        _run_graph(OTLPTracer(exporter))
+
+        spans = {span.name: span for span in exporter.batches[0]}
+        search = spans["tool tavily_search"]
+        assert search.attributes["virgo.search.query"] == "answer"
+        assert search.attributes["virgo.duration_ms"] >= 0
+        assert search.end_time_ns is not None
+
+    def it_records_errors(self):
+        exporter = _ListExporter()
+
+        with pytest.raises(RuntimeError):
+            _run_graph(OTLPTracer(exporter), fail=True)
+
+        spans = {span.name: span for span in exporter.batches[0]}
+        assert "search failed" in (spans["virgo.node research"].error or "")
+
+    def it_never_fails_the_run_when_exporting_fails(self):
+        class _FailingExporter(SpanExporter):
+            def export(self, spans: Sequence[Span]) -> None:
+                raise OSError("disk full")
+
+        _run_graph(OTLPTracer(_FailingExporter()))
+
+
+class DescribeExporters:
+    """Tests for the OTLP-JSON span exporters."""
+
+    @pytest.fixture
+    def span(self) -> Span:
+        span = Span(
+            trace_id="0" * 32,
+            span_id="1" * 16,
+            parent_span_id=None,
+            name="virgo.node draft",
+            attributes={"virgo.node": "draft", "gen_ai.usage.input_tokens": 12},
+        )
+        span.end()
+        return span
+
+    def it_builds_otlp_json_export_requests(self, span):
+        request = to_export_request([span])
+
+        (otlp_span,) = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert otlp_span["traceId"] == "0" * 32
+        assert otlp_span["startTimeUnixNano"] == str(span.start_time_ns)
+        assert {"key": "gen_ai.usage.input_tokens", "value": {"intValue": "12"}} in (
+            otlp_span["attributes"]
+        )
+        assert "parentSpanId" not in otlp_span
+
+    def it_appends_one_request_per_line_to_a_file(self, span, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = FileSpanExporter(path)
+
+        exporter.export([span])
+        exporter.export([span])
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0]) == to_export_request([span])
+
+    def it_posts_requests_to_a_collector(self, span):
+        received: list[tuple[str, dict]] = []
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((self.path, json.loads(body)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            OTLPHTTPSpanExporter(f"http://127.0.0.1:{server.server_port}").export(
+                [span]
+            )
+        finally:
+            thread.join(timeout=5)
+            server.server_close()
+
+        assert received == [("/v1/traces", to_export_request([span]))]
@@ -4,12 +4,35 @@ This package is organized into three main subpackages:
 - agent: LangGraph implementation (chains, tools, graph)
 - actions: Use cases/application layer (protocols and actions)
 - cli: Command-line interface
+
+The re-exported classes are imported on first access, so that light modules,
+such as the thin client of the daemon, do not pay for the dependency imports.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from virgo.core.actions import ArticleGenerator, GenerateArticleAction
+    from virgo.core.agent import VirgoAgent
+    from virgo.core.agent.schemas import MarkdownArticle
+
 # Re-export main classes for convenience
-from virgo.core.actions import ArticleGenerator, GenerateArticleAction
-from virgo.core.agent import VirgoAgent
-from virgo.core.agent.schemas import MarkdownArticle
+_EXPORTS = {
+    "ArticleGenerator": "virgo.core.actions",
+    "GenerateArticleAction": "virgo.core.actions",
+    "MarkdownArticle": "virgo.core.agent.schemas",
+    "VirgoAgent": "virgo.core.agent",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ArticleGenerator",
@@ -1,11 +1,32 @@
-"""CLI module for Virgo command-line interface."""
+"""CLI module for Virgo command-line interface.
 
-from virgo.cli.commands import app
-from virgo.cli.container import Container, VirgoSettings
+The application and its container are created on first access, so that the
+thin client of the daemon starts without importing the commands.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typer import Typer
+
+    from virgo.cli.container import Container
+
+    app: Typer
+    container: Container
+
+
+def __getattr__(name: str) -> Any:
+    if name not in ("app", "container"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from virgo.cli.commands import app
+    from virgo.cli.container import Container, VirgoSettings
+
+    # Initialize the container (auto-wires to commands module via wiring_config)
+    container = Container()
+    container.config.from_pydantic(VirgoSettings())
+    globals().update(app=app, container=container)
+    return globals()[name]
 
-# Initialize the container (auto-wires to commands module via wiring_config)
-container = Container()
-container.config.from_pydantic(VirgoSettings())
 
 __all__ = [
     "app",
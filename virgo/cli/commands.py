@@ -1,39 +1,291 @@
 """CLI commands for Virgo."""
 
+import os
+from collections.abc import Sequence
+from contextlib import AbstractContextManager, nullcontext
+from enum import StrEnum
+from pathlib import Path
 from typing import Annotated
 
 import typer
-from dependency_injector.wiring import Provide, inject
+from dependency_injector import providers
+from dependency_injector.wiring import Provide, Provider, inject
 from rich.console import Console
-from rich.markdown import Markdown
+from rich.table import Table
 
-from virgo.cli.container import Container
+from virgo.cli.container import Container, VirgoSettings
+from virgo.cli.daemon import (
+    DaemonError,
+    DaemonRequest,
+    default_socket_path,
+    is_supported,
+    serve,
+)
+from virgo.cli.output import OutputFormat, open_sink
 from virgo.core.actions import GenerateArticleAction
+from virgo.core.actions.batch import BatchManifest, RunBatchAction
+from virgo.core.actions.benchmark import MethodBenchmark, RunOutputBenchmarkAction
+from virgo.core.actions.coalesce import CoalescingArticleGenerator
+from virgo.core.actions.loadtest import LoadTestReport, RunLoadTestAction
+from virgo.core.agent import VirgoAgent
+from virgo.core.agent.compact import schema_savings
+from virgo.core.agent.corpus import CorpusIndex
+from virgo.core.agent.graph.builder import DRAFT, FORMAT, RESEARCH, REVISE
+from virgo.core.agent.graph.state import AnswerState
+from virgo.core.agent.llms import ProviderError
+from virgo.core.agent.schemas import Answer, MarkdownArticle, Revised
+from virgo.core.telemetry.memory import NodeMemoryProfiler
+from virgo.core.telemetry.metrics import VirgoMetrics
+from virgo.core.telemetry.profiling import NodeProfiler
 
 app = typer.Typer(
     name="virgo",
     help="Virgo - Assistant to generate, review and improve articles.",
 )
+batch_app = typer.Typer(
+    name="batch",
+    help="Generate articles in batch, across one or several hosts.",
+)
+app.add_typer(batch_app)
+index_app = typer.Typer(
+    name="index",
+    help="Index a local corpus of documents to research in.",
+)
+app.add_typer(index_app)
 console = Console()
+err_console = Console(stderr=True)
+
+OutputOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--output",
+        "-o",
+        help="Write the articles to this file, or to one file per article in "
+        "this directory, instead of the standard output.",
+    ),
+]
+FormatOption = Annotated[
+    OutputFormat | None,
+    typer.Option(
+        "--format",
+        "-f",
+        help="Write the articles as raw Markdown or JSON. By default, articles "
+        "are rendered on terminals and written as raw Markdown otherwise.",
+    ),
+]
+
+
+@inject
+def _configure_profiling(
+    profile: bool,
+    output: Path | None,
+    config: providers.Configuration = Provider[Container.config],
+) -> NodeProfiler | None:
+    """Enable the node profiler before the graph gets built, if requested.
+
+    Returns:
+        NodeProfiler | None: The profiler when profiling is enabled, either by
+            the command options or by the settings.
+    """
+    if output is not None:
+        config.profile_output.from_value(str(output))
+    if profile or config.profile_output():
+        config.profile.from_value(True)
+        _discard_agent()
+    return _get_profiler() if config.profile() else None
+
+
+@inject
+def _configure_memory_profiling(
+    memory_profile: bool,
+    config: providers.Configuration = Provider[Container.config],
+    memory_profiler: providers.Singleton[NodeMemoryProfiler] = Provider[
+        Container.memory_profiler
+    ],
+) -> NodeMemoryProfiler | None:
+    """Enable the memory profiler before the graph gets built, if requested.
+
+    Returns:
+        NodeMemoryProfiler | None: The profiler when memory profiling is
+            enabled, either by the command options or by the settings.
+    """
+    if memory_profile:
+        config.memory_profile.from_value(True)
+        _discard_agent()
+    return memory_profiler() if config.memory_profile() else None
+
+
+@inject
+def _configure_timeout(
+    timeout: float | None,
+    config: providers.Configuration = Provider[Container.config],
+) -> None:
+    """Set the request timeout before the agent gets built, if requested."""
+    if timeout is not None:
+        config.request_timeout.from_value(timeout)
+        _discard_agent()
+
+
+@inject
+def _discard_agent(
+    graph: providers.Singleton[object] = Provider[Container._graph],
+    virgo_agent: providers.Singleton[VirgoAgent] = Provider[Container._virgo_agent],
+    agent: providers.Singleton[CoalescingArticleGenerator] = Provider[Container._agent],
+) -> None:
+    """Rebuild the agent after its settings change, if a warm daemon built it."""
+    graph.reset()
+    virgo_agent.reset()
+    agent.reset()
+
+
+@inject
+def _get_profiler(
+    profiler: NodeProfiler = Provide[Container.node_profiler],
+) -> NodeProfiler:
+    """Get the node profiler of the container."""
+    return profiler
+
+
+def _section(profiler: NodeProfiler | None, name: str) -> AbstractContextManager[None]:
+    """Measure a section of the command when profiling."""
+    return nullcontext() if profiler is None else profiler.section(name)
+
+
+@inject
+def _print_profile(
+    profiler: NodeProfiler,
+    output: str | None = Provide[Container.config.profile_output],
+) -> None:
+    """Print the per-node timings and write the profiler statistics, if requested."""
+    timings = profiler.timings
+    total = timings["generate"].wall_time if "generate" in timings else 0.0
+    nodes = [
+        timings[name] for name in (DRAFT, RESEARCH, REVISE, FORMAT) if name in timings
+    ]
+
+    table = Table(title="Profile")
+    table.add_column("Section")
+    table.add_column("Calls", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("CPU (s)", justify="right")
+    table.add_column("Wall %", justify="right")
+
+    def _add_row(name: str, calls: str, wall: float, cpu: str) -> None:
+        share = f"{wall / total:.1%}" if total else "-"
+        table.add_row(name, calls, f"{wall:.3f}", cpu, share)
+
+    for timing in nodes:
+        _add_row(
+            timing.name, str(timing.calls), timing.wall_time, f"{timing.cpu_time:.3f}"
+        )
+    _add_row("graph overhead", "-", total - sum(t.wall_time for t in nodes), "-")
+    if "render" in timings:
+        render = timings["render"]
+        _add_row(
+            "render", str(render.calls), render.wall_time, f"{render.cpu_time:.3f}"
+        )
+    err_console.print(table)
+
+    if output is not None:
+        profiler.dump_stats(output)
+        err_console.print(f"Profiler statistics written to {output}")
+
+
+def _format_bytes(size: float) -> str:
+    """Format a size in bytes, or a signed delta."""
+    if abs(size) < 1024:
+        return f"{size:.0f} B"
+    if abs(size) < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / 1024 / 1024:.1f} MiB"
+
+
+def _print_memory_profile(profiler: NodeMemoryProfiler) -> None:
+    """Print the memory allocated by each node and the size of the state fields."""
+    fields = list(AnswerState.__annotations__)
+    table = Table(title="Memory profile")
+    table.add_column("Step", justify="right")
+    table.add_column("Node")
+    table.add_column("Allocated", justify="right")
+    table.add_column("Peak", justify="right")
+    for name in fields:
+        table.add_column(name, justify="right")
+    sites = Table(title="Top allocation sites")
+    sites.add_column("Step", justify="right")
+    sites.add_column("Node")
+    sites.add_column("Location", overflow="fold")
+    sites.add_column("Size", justify="right")
+    sites.add_column("Blocks", justify="right")
+
+    for step, memory in enumerate(profiler.steps, start=1):
+        table.add_row(
+            str(step),
+            memory.name,
+            _format_bytes(memory.allocated),
+            _format_bytes(memory.peak),
+            *(_format_bytes(memory.state_sizes.get(name, 0)) for name in fields),
+        )
+        for site in memory.top:
+            sites.add_row(
+                str(step),
+                memory.name,
+                site.location,
+                _format_bytes(site.size),
+                str(site.count),
+            )
+    err_console.print(table)
+    err_console.print(sites)
+    profiler.stop()
+
+
+@inject
+def _serve_metrics(
+    port: int | None = Provide[Container.config.metrics_port],
+    metrics: VirgoMetrics | None = Provide[Container._metrics],
+) -> None:
+    """Serve the Prometheus metrics while the command runs, if configured."""
+    if port is not None and metrics is not None:
+        metrics.registry.serve(port)
+
+
+@inject
+def _write_metrics(
+    path: str | None = Provide[Container.config.metrics_textfile],
+    metrics: VirgoMetrics | None = Provide[Container._metrics],
+) -> None:
+    """Write the Prometheus metrics textfile, if configured."""
+    if path is not None and metrics is not None:
+        metrics.registry.write_textfile(path)
 
 
 @inject
 def _execute_generate(
     question: str,
     action: GenerateArticleAction = Provide[Container.generate_action],
+    profiler: NodeProfiler | None = None,
+    use_cache: bool = True,
+    output: Path | None = None,
+    output_format: OutputFormat | None = None,
 ) -> None:
     """Execute article generation with injected action."""
-    with console.status("[bold green]Generating article...[/bold green]"):
-        article = action.execute(question)
+    with (
+        console.status("[bold green]Generating article...[/bold green]"),
+        _section(profiler, "generate"),
+    ):
+        article = action.execute(question, use_cache=use_cache)
 
     if article:
-        markdown_content = article.to_markdown()
-        console.print(Markdown(markdown_content))
+        with (
+            _section(profiler, "render"),
+            open_sink(output, output_format, console) as sink,
+        ):
+            sink.write(article)
     else:
         typer.secho(
             "Failed to generate article. Please try again.",
             fg=typer.colors.RED,
         )
+    _write_metrics()
 
 
 @app.command()
@@ -41,18 +293,618 @@ def generate(
     question: Annotated[
         str, typer.Argument(..., help="The input question to generate an article for.")
     ],
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Report the wall-clock and CPU time spent in each node of the graph.",
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path | None,
+        typer.Option(
+            help="Also run the deterministic profiler and write its statistics "
+            "to this file, in the pstats format (implies --profile).",
+        ),
+    ] = None,
+    memory_profile: Annotated[
+        bool,
+        typer.Option(
+            "--memory-profile",
+            help="Report the memory allocated by each node, its peak usage, the "
+            "top allocating call sites and the size of the state fields, with "
+            "tracemalloc.",
+        ),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Generate the article even if it is cached, replacing the cached one.",
+        ),
+    ] = False,
+    timeout: Annotated[
+        float | None,
+        typer.Option(
+            help="Return the best article so far after this many seconds, "
+            "instead of letting slow searches or models run on.",
+            min=1,
+        ),
+    ] = None,
+    output: OutputOption = None,
+    output_format: FormatOption = None,
 ) -> None:
     """Generate an article using the Virgo assistant."""
-    _execute_generate(question)
+    profiler = _configure_profiling(profile, profile_output)
+    memory_profiler = _configure_memory_profiling(memory_profile)
+    _configure_timeout(timeout)
+    _execute_generate(
+        question,
+        profiler=profiler,
+        use_cache=not no_cache,
+        output=output,
+        output_format=output_format,
+    )
+    if profiler is not None:
+        _print_profile(profiler)
+    if memory_profiler is not None:
+        _print_memory_profile(memory_profiler)
+
+
+@app.command()
+def schemas() -> None:
+    """Report the prompt tokens saved by the compact structured output schemas."""
+    table = Table(title="Structured output schemas (estimated tokens per call)")
+    table.add_column("Call")
+    table.add_column("Schema")
+    table.add_column("Full", justify="right")
+    table.add_column("Compact", justify="right")
+    table.add_column("Saved", justify="right")
+    for savings in schema_savings(
+        [(DRAFT, Answer), (REVISE, Revised), (FORMAT, MarkdownArticle)]
+    ):
+        table.add_row(
+            savings.call,
+            savings.schema,
+            str(savings.full_tokens),
+            str(savings.compact_tokens),
+            f"{savings.saved_tokens} ({savings.saved_tokens / savings.full_tokens:.0%})",
+        )
+    console.print(table)
+
+
+class LoadTestBackend(StrEnum):
+    """The backends the load tests run against."""
+
+    REAL = "real"
+    REPLAY = "replay"
+    SYNTHETIC = "synthetic"
+
+
+_LOADTEST_QUESTIONS = (
+    "What is retrieval-augmented generation?",
+    "How do heat pumps work?",
+    "What are the benefits of static typing?",
+    "How does the Raft consensus algorithm work?",
+)
+
+
+@inject
+def _configure_loadtest(
+    backend: LoadTestBackend,
+    cassette: Path | None,
+    latency: float,
+    container: Container = Provide[Container],
+) -> None:
+    """Select the backends of the load test and record the node latencies.
+
+    The warm objects are rebuilt if the settings change.
+    """
+    config = container.config
+    settings = config()
+    config.record_latencies.from_value(True)
+    if backend is LoadTestBackend.REPLAY:
+        config.cassette.from_value("replay")
+        if cassette is not None:
+            config.cassette_path.from_value(str(cassette))
+    elif backend is LoadTestBackend.SYNTHETIC:
+        config.genai_provider.from_value("synthetic")
+        config.genai_fallbacks.from_value([])
+        config.research_backend.from_value("synthetic")
+        config.synthetic_latency.from_value(latency)
+    if config() != settings:
+        container.reset_singletons()
+
+
+def _print_loadtest(report: LoadTestReport) -> None:
+    """Print the throughput, latency percentiles and errors of a load test."""
+    console.print(
+        f"{report.requests} generation(s) in {report.elapsed:.1f}s: "
+        f"{report.throughput:.2f} generation(s)/s, {report.failed} failure(s), "
+        f"{report.tokens.total_tokens} tokens ({report.token_throughput:.0f} tokens/s)"
+    )
+
+    table = Table(title="Latency (s)")
+    table.add_column("Section")
+    table.add_column("Calls", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Tokens in", justify="right")
+    table.add_column("Tokens out", justify="right")
+    for name, summary in [
+        ("end-to-end", report.latency),
+        *report.node_latencies.items(),
+    ]:
+        tokens = report.node_tokens.get(name)
+        table.add_row(
+            name,
+            str(summary.count),
+            f"{summary.p50:.3f}",
+            f"{summary.p95:.3f}",
+            f"{summary.p99:.3f}",
+            str(tokens.input_tokens) if tokens else "-",
+            str(tokens.output_tokens) if tokens else "-",
+        )
+    console.print(table)
+
+    if report.errors:
+        errors = Table(title="Errors")
+        errors.add_column("Error")
+        errors.add_column("Count", justify="right")
+        for error, count in report.errors.items():
+            errors.add_row(error, str(count))
+        console.print(errors)
+
+
+@inject
+def _execute_loadtest(
+    questions: Sequence[str],
+    requests: int | None,
+    duration: float | None,
+    concurrency: int,
+    loadtest_action: providers.Factory[RunLoadTestAction] = Provider[
+        Container.loadtest_action
+    ],
+) -> None:
+    """Execute the load test with the injected action."""
+    action = loadtest_action(concurrency=concurrency)
+    with console.status("[bold green]Load testing...[/bold green]"):
+        report = action.execute(questions, requests, duration)
+    _print_loadtest(report)
+    _write_metrics()
+
+
+@app.command()
+def loadtest(
+    questions: Annotated[
+        typer.FileText | None,
+        typer.Argument(
+            help="File listing the questions, one per line ('-' for stdin). "
+            "Defaults to a few sample questions."
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            "--concurrency", "-c", help="How many generations run at once.", min=1
+        ),
+    ] = 4,
+    requests: Annotated[
+        int | None,
+        typer.Option(
+            "--requests",
+            "-n",
+            help="How many generations to run. Defaults to 20 without --duration.",
+            min=1,
+        ),
+    ] = None,
+    duration: Annotated[
+        float | None,
+        typer.Option(
+            "--duration",
+            "-d",
+            help="How long to start generations for, in seconds.",
+            min=0,
+        ),
+    ] = None,
+    backend: Annotated[
+        LoadTestBackend,
+        typer.Option(
+            help="Run against the configured providers, the calls replayed from "
+            "a cassette, or synthetic chat models and searches.",
+        ),
+    ] = LoadTestBackend.REAL,
+    cassette: Annotated[
+        Path | None,
+        typer.Option(
+            help="The cassette replayed by the replay backend. Defaults to the "
+            "`cassette_path` setting.",
+            exists=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    latency: Annotated[
+        float,
+        typer.Option(
+            help="How long each call of the synthetic backend takes, in seconds.",
+            min=0,
+        ),
+    ] = 0.0,
+) -> None:
+    """Drive concurrent generations and report their throughput and latency."""
+    lines = [line.strip() for line in questions] if questions else []
+    if requests is None and duration is None:
+        requests = 20
+    _configure_loadtest(backend, cassette, latency)
+    _execute_loadtest(
+        [line for line in lines if line] or list(_LOADTEST_QUESTIONS),
+        requests,
+        duration,
+        concurrency,
+    )
+
+
+class OutputMethod(StrEnum):
+    """The structured output methods the benchmark compares."""
+
+    FUNCTION_CALLING = "function_calling"
+    JSON_SCHEMA = "json_schema"
+    JSON_MODE = "json_mode"
+
+
+def _print_benchmark(benchmarks: Sequence[MethodBenchmark]) -> None:
+    """Print the latency and failures of each node and structured output method."""
+    table = Table(title="Structured output methods (latency in s)")
+    table.add_column("Node")
+    table.add_column("Method", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Failures", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Tokens out", justify="right")
+    table.add_column("Errors")
+    nodes = [DRAFT, REVISE, FORMAT]
+    for benchmark in sorted(
+        benchmarks, key=lambda benchmark: nodes.index(benchmark.node)
+    ):
+        table.add_row(
+            benchmark.node,
+            benchmark.method,
+            str(benchmark.latency.count),
+            f"{benchmark.failed} ({benchmark.failure_rate:.0%})",
+            f"{benchmark.latency.p50:.3f}",
+            f"{benchmark.latency.p95:.3f}",
+            str(benchmark.output_tokens),
+            ", ".join(
+                f"{error} ({count})" for error, count in benchmark.errors.items()
+            ),
+        )
+    console.print(table)
+
+
+@inject
+def _execute_benchmark(
+    question: str,
+    methods: Sequence[OutputMethod],
+    repeats: int,
+    benchmark_action: RunOutputBenchmarkAction = Provide[Container.benchmark_action],
+) -> None:
+    """Execute the benchmark with the injected action."""
+    with console.status("[bold green]Benchmarking...[/bold green]"):
+        try:
+            benchmarks = benchmark_action.execute(
+                question, [method.value for method in methods], repeats
+            )
+        except ProviderError as e:
+            err_console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1) from e
+    _print_benchmark(benchmarks)
+
+
+@app.command()
+def benchmark(
+    methods: Annotated[
+        list[OutputMethod] | None,
+        typer.Option(
+            "--method",
+            "-m",
+            help="A structured output method to compare; all of them by default.",
+        ),
+    ] = None,
+    repeats: Annotated[
+        int,
+        typer.Option(
+            "--repeat",
+            "-n",
+            help="How many times each node is called with each method.",
+            min=1,
+        ),
+    ] = 3,
+    question: Annotated[
+        str,
+        typer.Option(help="The question the nodes answer."),
+    ] = _LOADTEST_QUESTIONS[0],
+) -> None:
+    """Compare the latency and failure rate of the structured output methods."""
+    _execute_benchmark(question, methods or list(OutputMethod), repeats)
+
+
+@batch_app.command("add")
+def batch_add(
+    manifest: Annotated[
+        Path, typer.Argument(help="The manifest file shared by the hosts.")
+    ],
+    questions: Annotated[
+        typer.FileText,
+        typer.Argument(
+            help="File listing the questions, one per line ('-' for stdin)."
+        ),
+    ],
+) -> None:
+    """Add questions to a batch manifest, creating it if needed."""
+    batch = BatchManifest(manifest)
+    try:
+        added = batch.add(questions)
+    finally:
+        batch.close()
+    console.print(f"Added {added} question(s) to {manifest}.")
+
+
+@inject
+def _execute_batch(
+    manifest: Path,
+    worker: str | None,
+    batch_action: providers.Factory[RunBatchAction] = Provider[Container.batch_action],
+    **options: float,
+) -> None:
+    """Execute the batch generation with the injected action."""
+    action = batch_action(**options)
+    batch = BatchManifest(manifest)
+    try:
+        with console.status("[bold green]Generating articles...[/bold green]"):
+            report = action.execute(batch, worker)
+    finally:
+        batch.close()
+    console.print(
+        f"Generated {report.done} article(s), {report.failed} failure(s), "
+        f"{report.lost} question(s) taken over by other workers."
+    )
+    _write_metrics()
+
+
+@batch_app.command("run")
+def batch_run(
+    manifest: Annotated[
+        Path, typer.Argument(help="The manifest file shared by the hosts.")
+    ],
+    worker: Annotated[
+        str | None,
+        typer.Option(help="Identifier of this worker (defaults to host and PID)."),
+    ] = None,
+    lease: Annotated[
+        float,
+        typer.Option(help="How long the claimed questions are reserved, in seconds."),
+    ] = 600.0,
+    shard_size: Annotated[
+        int, typer.Option(help="How many questions are claimed at once.")
+    ] = 5,
+    max_attempts: Annotated[
+        int, typer.Option(help="How many times a question is attempted.")
+    ] = 3,
+) -> None:
+    """Generate the pending articles of a batch, until none is left."""
+    _execute_batch(
+        manifest,
+        worker,
+        lease=lease,
+        shard_size=shard_size,
+        max_attempts=max_attempts,
+    )
+
+
+@batch_app.command("export")
+def batch_export(
+    manifest: Annotated[
+        Path,
+        typer.Argument(
+            help="The manifest file shared by the hosts.", exists=True, dir_okay=False
+        ),
+    ],
+    output: OutputOption = None,
+    output_format: FormatOption = None,
+) -> None:
+    """Write the articles generated so far by a batch."""
+    batch = BatchManifest(manifest)
+    try:
+        with open_sink(output, output_format, console) as sink:
+            for _, article in batch.articles():
+                sink.write(article)
+    finally:
+        batch.close()
+
+
+@batch_app.command("status")
+def batch_status(
+    manifest: Annotated[
+        Path,
+        typer.Argument(
+            help="The manifest file shared by the hosts.", exists=True, dir_okay=False
+        ),
+    ],
+) -> None:
+    """Show how many questions of a batch are pending, running, done or failed."""
+    batch = BatchManifest(manifest)
+    try:
+        counts = batch.counts()
+    finally:
+        batch.close()
+
+    table = Table(title=str(manifest))
+    table.add_column("Status")
+    table.add_column("Questions", justify="right")
+    for status, count in counts.items():
+        table.add_row(status.value, str(count))
+    console.print(table)
+
+
+IndexOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--index",
+        help="The index database file. Defaults to the `corpus_index_path` setting.",
+        dir_okay=False,
+    ),
+]
+
+
+@inject
+def _get_corpus_index(
+    path: Path | None,
+    config: providers.Configuration = Provider[Container.config],
+    corpus_index: providers.Provider[CorpusIndex] = Provider[Container.corpus_index],
+) -> CorpusIndex:
+    """Get the corpus index, stored in the given file or the configured one."""
+    if path is not None:
+        config.corpus_index_path.from_value(str(path))
+    return corpus_index()
+
+
+@index_app.command("build")
+def index_build(
+    directory: Annotated[
+        Path,
+        typer.Argument(
+            help="The directory of the Markdown, text and HTML documents.",
+            exists=True,
+            file_okay=False,
+        ),
+    ],
+    index: IndexOption = None,
+) -> None:
+    """Index the documents of a directory, re-indexing only what changed."""
+    corpus_index = _get_corpus_index(index)
+    try:
+        with console.status("Indexing documents..."):
+            report = corpus_index.build(directory)
+        indexed = len(corpus_index)
+    finally:
+        corpus_index.close()
+    console.print(
+        f"{report.added} added, {report.updated} updated, "
+        f"{report.removed} removed, {report.unchanged} unchanged "
+        f"({indexed} documents indexed)"
+    )
+
+
+@index_app.command("search")
+def index_search(
+    query: Annotated[str, typer.Argument(help="The search query.")],
+    index: IndexOption = None,
+    limit: Annotated[
+        int, typer.Option("--limit", "-n", help="How many chunks to show.", min=1)
+    ] = 5,
+) -> None:
+    """Search the local corpus, as the researcher does."""
+    corpus_index = _get_corpus_index(index)
+    try:
+        hits = corpus_index.search(query, limit)
+    finally:
+        corpus_index.close()
+
+    table = Table(title=query)
+    table.add_column("Score", justify="right")
+    table.add_column("Document")
+    table.add_column("Excerpt")
+    for hit in hits:
+        excerpt = hit.content if len(hit.content) <= 200 else hit.content[:197] + "..."
+        table.add_row(f"{hit.score:.2f}", f"{hit.title}\n{hit.path}", excerpt)
+    console.print(table)
+
+
+@inject
+def _warm_up(
+    agent: CoalescingArticleGenerator = Provide[Container._agent],
+) -> CoalescingArticleGenerator:
+    """Build the agent, its chat models and its graph, ahead of the commands."""
+    return agent
+
+
+@inject
+def _run_forwarded(
+    request: DaemonRequest,
+    container: Container = Provide[Container],
+) -> int:
+    """Run a command forwarded to the daemon, in its forked child.
+
+    The environment of the client replaces the `VIRGO_*` variables of the
+    daemon, and the warm objects are rebuilt if the settings differ.
+    """
+    for key in [key for key in os.environ if key.startswith("VIRGO_")]:
+        del os.environ[key]
+    os.environ.update(request.env)
+    settings = container.config()
+    container.config.from_pydantic(VirgoSettings())
+    if container.config() != settings:
+        container.reset_singletons()
+    try:
+        app(args=request.argv, prog_name="virgo")
+    except SystemExit as error:
+        if error.code is None or isinstance(error.code, int):
+            return error.code or 0
+        err_console.print(error.code)
+        return 1
+    return 0
+
+
+@app.command()
+def daemon(
+    socket_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--socket",
+            help="The Unix socket to listen on. Defaults to VIRGO_DAEMON_SOCKET, "
+            "or to a per-user socket in the runtime directory.",
+        ),
+    ] = None,
+) -> None:
+    """Keep a warm process serving the commands of the `virgo` client."""
+    if not is_supported():
+        err_console.print("[red]The daemon is not supported on this platform.[/red]")
+        raise typer.Exit(1)
+    path = socket_path or default_socket_path()
+    with console.status("[bold green]Warming up...[/bold green]"):
+        try:
+            _warm_up()
+        except ProviderError as e:
+            err_console.print(f"[yellow]Chat models not warmed up: {e}[/yellow]")
+    err_console.print(f"Virgo daemon listening on {path}")
+    try:
+        serve(path, _run_forwarded)
+    except DaemonError as e:
+        err_console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from e
 
 
 @app.callback()
-def main() -> None:
+def main(ctx: typer.Context) -> None:
     """Virgo - Assistant to generate, review and improve articles."""
-    pass
+    # The commands forwarded to the daemon serve their own metrics.
+    if ctx.invoked_subcommand != "daemon":
+        _serve_metrics()
 
 
 __all__ = [
     "app",
+    "batch_add",
+    "batch_export",
+    "batch_run",
+    "batch_status",
+    "benchmark",
+    "daemon",
     "generate",
+    "index_build",
+    "index_search",
+    "loadtest",
+    "schemas",
 ]
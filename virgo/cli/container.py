@@ -1,18 +1,167 @@
 """Dependency injection container for Virgo CLI."""
 
+import operator
+from collections.abc import Callable, Mapping
+
 from dependency_injector import containers, providers
 from langchain_tavily import TavilySearch
 
-from virgo.core.actions import GenerateArticleAction
-from virgo.core.agent import VirgoAgent
+from virgo.core.actions import ArticleCache, GenerateArticleAction
+from virgo.core.actions.batch import RunBatchAction
+from virgo.core.actions.benchmark import RunOutputBenchmarkAction
+from virgo.core.actions.cache import (
+    InMemoryArticleCache,
+    SQLiteArticleCache,
+    settings_fingerprint,
+)
+from virgo.core.actions.coalesce import CoalescingArticleGenerator, SingleFlight
+from virgo.core.actions.loadtest import RunLoadTestAction
+from virgo.core.actions.similarity import NearDuplicateArticleCache
+from virgo.core.agent import GraphConfiguration, VirgoAgent
+from virgo.core.agent.cassette import (
+    Cassette,
+    CassetteLanguageModelProvider,
+    CassetteResearcher,
+)
+from virgo.core.agent.corpus import CorpusIndex
+from virgo.core.agent.evidence import (
+    EvidenceStore,
+    InMemoryEvidenceStore,
+    SQLiteEvidenceStore,
+)
 from virgo.core.agent.graph import create_graph
+from virgo.core.agent.graph.hooks import NodeHook
 from virgo.core.agent.llms import (
+    ChatModelPool,
+    ConfigurableChatModel,
+    GenerationParams,
     LanguageModelProvider,
     OllamaLanguageModelProvider,
     OpenAILanguageModelProvider,
+    ProviderError,
+)
+from virgo.core.agent.ranking import BM25Ranker
+from virgo.core.agent.routing import RoutingLanguageModelProvider
+from virgo.core.agent.synthetic import (
+    SyntheticLanguageModelProvider,
+    SyntheticResearcher,
 )
-from virgo.core.agent.tools import TavilyResearcher
-from virgo.core.settings import VirgoSettings
+from virgo.core.agent.tools import (
+    CombinedResearcher,
+    DeadlineTavilySearchAPIWrapper,
+    LocalCorpusResearcher,
+    SearchParams,
+    TavilyResearcher,
+)
+from virgo.core.settings import StructuredOutputMethod, VirgoSettings
+from virgo.core.telemetry.latency import LatencyRecorder
+from virgo.core.telemetry.memory import NodeMemoryProfiler
+from virgo.core.telemetry.metrics import VirgoMetrics
+from virgo.core.telemetry.profiling import NodeProfiler
+from virgo.core.telemetry.tracing import (
+    FileSpanExporter,
+    OTLPHTTPSpanExporter,
+    OTLPTracer,
+)
+
+
+def _when[T](enabled: bool, provider: Callable[[], T]) -> T | None:
+    """Provide an object only when the feature it implements is enabled."""
+    return provider() if enabled else None
+
+
+def _any(*values: object) -> bool:
+    """Tell whether any of the configuration values is set."""
+    return any(value is not None for value in values)
+
+
+def _enabled[T](*items: T | None) -> list[T]:
+    """Collect the objects of the enabled features, such as node hooks."""
+    return [item for item in items if item is not None]
+
+
+def _near_duplicate(
+    cache: ArticleCache | None, threshold: float | None, max_entries: int
+) -> ArticleCache | None:
+    """Serve the articles of near-duplicate questions, when a threshold is set."""
+    if cache is None or threshold is None:
+        return cache
+    return NearDuplicateArticleCache(
+        cache, threshold=threshold, max_entries=max_entries
+    )
+
+
+def _with_fallbacks(
+    language_model_providers: Mapping[str, LanguageModelProvider],
+    primary: str,
+    fallbacks: list[str],
+) -> Mapping[str, LanguageModelProvider]:
+    """Route the calls of the primary provider to its fallbacks, if any.
+
+    Raises:
+        ProviderError: If a fallback is not a `provider:model` of a known provider.
+    """
+    if not fallbacks:
+        return language_model_providers
+    routes = []
+    for fallback in fallbacks:
+        name, _, model_name = fallback.partition(":")
+        if name not in language_model_providers or not model_name:
+            raise ProviderError(f"Invalid fallback chat model: {fallback}.")
+        routes.append((name, language_model_providers[name], model_name))
+    return {
+        **language_model_providers,
+        primary: RoutingLanguageModelProvider(
+            (primary, language_model_providers[primary]), routes
+        ),
+    }
+
+
+def _node_chat_models(
+    pool: ChatModelPool,
+    generation_params: Mapping[str, Mapping[str, object]],
+    structured_output_methods: Mapping[str, Mapping[str, StructuredOutputMethod]],
+) -> dict[str, ConfigurableChatModel]:
+    """Create the chat models of the nodes with their own parameters or output methods."""
+    return {
+        node.upper(): ConfigurableChatModel(
+            pool=pool,
+            params=GenerationParams(**generation_params[node])  # type: ignore[arg-type]
+            if node in generation_params
+            else None,
+            structured_output_methods=dict(structured_output_methods.get(node, {})),
+        )
+        for node in {**generation_params, **structured_output_methods}
+    }
+
+
+def _search_params(
+    search_rounds: Mapping[str, Mapping[str, object]], search_round: str
+) -> SearchParams:
+    """Get the parameters of the searches of a research round."""
+    return SearchParams(**search_rounds.get(search_round, {}))  # type: ignore[arg-type]
+
+
+def _with_cassette(
+    language_model_providers: Mapping[str, LanguageModelProvider],
+    cassette: Cassette | None,
+) -> Mapping[str, LanguageModelProvider]:
+    """Record or replay the calls of the chat models, when a cassette is set."""
+    if cassette is None:
+        return language_model_providers
+    return {
+        name: CassetteLanguageModelProvider(provider, cassette)
+        for name, provider in language_model_providers.items()
+    }
+
+
+def _researcher_with_cassette(
+    researcher: Callable[[], Callable[..., list]], cassette: Cassette | None
+) -> Callable[..., list]:
+    """Record or replay the searches, when a cassette is set."""
+    if cassette is None:
+        return researcher()
+    return CassetteResearcher(researcher, cassette)
 
 
 class Container(containers.DeclarativeContainer):
@@ -38,46 +187,267 @@ class Container(containers.DeclarativeContainer):
     config = providers.Configuration(strict=True, pydantic_settings=[VirgoSettings()])
     """The configuration provider for Virgo settings."""
 
-    _language_model_provider = providers.Selector[LanguageModelProvider](
-        config.genai_provider,
+    _language_model_providers = providers.Dict(
         openai=providers.Singleton(OpenAILanguageModelProvider),
         ollama=providers.Singleton(OllamaLanguageModelProvider),
+        synthetic=providers.Singleton(
+            SyntheticLanguageModelProvider, latency=config.synthetic_latency
+        ),
     )
 
-    _chat_model = providers.Callable(
-        lambda provider, model_name: provider.get_chat_model(model_name),
-        provider=_language_model_provider,
-        model_name=config.model_name,
+    _language_model_provider = providers.Selector[LanguageModelProvider](
+        config.genai_provider,
+        openai=_language_model_providers.kwargs["openai"],
+        ollama=_language_model_providers.kwargs["ollama"],
+        synthetic=_language_model_providers.kwargs["synthetic"],
+    )
+
+    _cassette = providers.Selector[Cassette | None](
+        config.cassette,
+        off=providers.Object(None),
+        record=providers.Singleton(Cassette, path=config.cassette_path, mode="record"),
+        replay=providers.Singleton(
+            Cassette,
+            path=config.cassette_path,
+            mode="replay",
+            latency_scale=config.cassette_latency_scale,
+        ),
     )
 
+    chat_model_pool = providers.Singleton(
+        ChatModelPool,
+        providers=providers.Callable(
+            _with_cassette,
+            providers.Callable(
+                _with_fallbacks,
+                _language_model_providers,
+                config.genai_provider,
+                config.genai_fallbacks,
+            ),
+            _cassette,
+        ),
+        default_provider=config.genai_provider,
+        default_model_name=config.model_name,
+    )
+    """The chat models shared by the graph runs, per provider and model name."""
+
+    _chat_model = providers.Singleton(ConfigurableChatModel, pool=chat_model_pool)
+
     _tavily_tool = providers.Singleton(
         TavilySearch,
         max_results=5,
+        api_wrapper=providers.Singleton(DeadlineTavilySearchAPIWrapper),
+    )
+
+    corpus_index = providers.Factory(
+        CorpusIndex,
+        path=config.corpus_index_path,
+        chunk_words=config.research_chunk_words,
     )
+    """The inverted index of the local corpus, opened on each call."""
 
-    _researcher = providers.Callable(
+    _tavily_researcher = providers.Callable(
         TavilyResearcher,
         tool=_tavily_tool,
+        first_round=providers.Callable(_search_params, config.search_rounds, "first"),
+        later_rounds=providers.Callable(_search_params, config.search_rounds, "later"),
+    )
+
+    _local_researcher = providers.Singleton(
+        LocalCorpusResearcher,
+        index=corpus_index,
+        max_results=config.corpus_max_results,
+    )
+
+    _researcher = providers.Selector(
+        config.research_backend,
+        tavily=_tavily_researcher,
+        local=_local_researcher,
+        both=providers.Singleton(
+            CombinedResearcher,
+            researchers=providers.List(_tavily_researcher, _local_researcher),
+        ),
+        synthetic=providers.Singleton(
+            SyntheticResearcher, latency=config.synthetic_latency
+        ),
+    )
+
+    _evidence_store = providers.Selector[EvidenceStore | None](
+        config.evidence_store,
+        none=providers.Object(None),
+        memory=providers.Singleton(
+            InMemoryEvidenceStore, max_entries=config.evidence_store_max_entries
+        ),
+        sqlite=providers.Singleton(
+            SQLiteEvidenceStore,
+            path=config.evidence_store_path,
+        ),
+    )
+
+    _ranker = providers.Callable(
+        _when,
+        providers.Callable(_any, config.research_top_k),
+        providers.Singleton(
+            BM25Ranker,
+            top_k=config.research_top_k,
+            chunk_words=config.research_chunk_words,
+        ).provider,
+    )
+
+    node_profiler = providers.Singleton(
+        NodeProfiler,
+        deterministic=config.profile_output.as_(bool),
+    )
+    """The profiler measuring the time spent in each node, when profiling is enabled."""
+
+    memory_profiler = providers.Singleton(NodeMemoryProfiler)
+    """The profiler tracing the memory allocated by each node, when enabled."""
+
+    metrics = providers.Singleton(VirgoMetrics)
+    """The Prometheus metrics of the generations."""
+
+    _metrics = providers.Callable(
+        _when,
+        providers.Callable(_any, config.metrics_textfile, config.metrics_port),
+        metrics.provider,
+    )
+
+    latency_recorder = providers.Singleton(LatencyRecorder)
+    """The recorder of the latency of every node run, when recording is enabled."""
+
+    _node_hooks = providers.Callable[list[NodeHook]](
+        _enabled,
+        _metrics,
+        providers.Callable(_when, config.profile, node_profiler.provider),
+        providers.Callable(_when, config.record_latencies, latency_recorder.provider),
+        providers.Callable(_when, config.memory_profile, memory_profiler.provider),
     )
 
     _graph = providers.Singleton(
         create_graph,
         llm=_chat_model,
-        researcher=_researcher,
+        researcher=providers.Callable(
+            _researcher_with_cassette, _researcher.provider, _cassette
+        ),
+        evidence_store=_evidence_store,
+        node_hooks=_node_hooks,
+        compact_schemas=config.compact_schemas,
+        ranker=_ranker,
+        deadline_reserve=config.deadline_reserve,
+        node_llms=providers.Callable(
+            _node_chat_models,
+            chat_model_pool,
+            config.generation_params,
+            config.structured_output_methods,
+        ),
+        citations=config.citation_index,
+        revision_patches=providers.Callable(operator.eq, config.revision_mode, "patch"),
     )
 
-    _agent = providers.Singleton(
+    _tracer = providers.Selector[OTLPTracer | None](
+        config.trace_exporter,
+        none=providers.Object(None),
+        file=providers.Singleton(
+            OTLPTracer,
+            exporter=providers.Singleton(FileSpanExporter, path=config.trace_file),
+        ),
+        otlp=providers.Singleton(
+            OTLPTracer,
+            exporter=providers.Singleton(
+                OTLPHTTPSpanExporter, endpoint=config.trace_endpoint
+            ),
+        ),
+    )
+
+    _callbacks = providers.Callable(_enabled, _tracer, _metrics)
+
+    _fingerprint = providers.Callable(
+        settings_fingerprint,
+        genai_provider=config.genai_provider,
+        model_name=config.model_name,
+        max_iterations=config.max_iterations,
+        generation_params=config.generation_params,
+        citation_index=config.citation_index,
+        revision_mode=config.revision_mode,
+        research_backend=config.research_backend,
+        search_rounds=config.search_rounds,
+        research_top_k=config.research_top_k,
+        compact_schemas=config.compact_schemas,
+        structured_output_methods=config.structured_output_methods,
+    )
+
+    _virgo_agent = providers.Singleton(
         VirgoAgent,
         graph=_graph,
+        callbacks=_callbacks,
+        configuration=providers.Factory(
+            GraphConfiguration, max_iterations=config.max_iterations
+        ),
+        timeout=config.request_timeout,
     )
     """The Virgo agent singleton provider."""
 
+    _agent = providers.Singleton(
+        CoalescingArticleGenerator,
+        generator=_virgo_agent,
+        single_flight=providers.Singleton(SingleFlight),
+        fingerprint=_fingerprint,
+        metrics=_metrics,
+    )
+    """The agent sharing the identical generations in flight, used by all the actions."""
+
+    _exact_article_cache = providers.Selector[ArticleCache | None](
+        config.article_cache,
+        none=providers.Object(None),
+        memory=providers.Singleton(
+            InMemoryArticleCache,
+            ttl=config.article_cache_ttl,
+            max_entries=config.article_cache_max_entries,
+        ),
+        sqlite=providers.Singleton(
+            SQLiteArticleCache,
+            path=config.article_cache_path,
+            ttl=config.article_cache_ttl,
+            max_entries=config.article_cache_max_entries,
+        ),
+    )
+
+    _article_cache = providers.Singleton(
+        _near_duplicate,
+        cache=_exact_article_cache,
+        threshold=config.article_cache_similarity,
+        max_entries=config.article_cache_max_entries,
+    )
+
     generate_action = providers.Factory(
         GenerateArticleAction,
         generator=_agent,
+        metrics=_metrics,
+        cache=_article_cache,
+        fingerprint=_fingerprint,
     )
     """The action provider for generating articles."""
 
+    batch_action = providers.Factory(
+        RunBatchAction,
+        action=generate_action,
+    )
+    """The action provider for generating the articles of a batch."""
+
+    loadtest_action = providers.Factory(
+        RunLoadTestAction,
+        generator=_agent,
+        recorder=latency_recorder,
+    )
+    """The action provider for load testing the article generation."""
+
+    benchmark_action = providers.Factory(
+        RunOutputBenchmarkAction,
+        pool=chat_model_pool,
+        compact_schemas=config.compact_schemas,
+    )
+    """The action provider for benchmarking the structured output methods."""
+
 
 __all__ = [
     "Container",
@@ -0,0 +1,257 @@
+"""Warm daemon serving the CLI commands, and the thin client forwarding them.
+
+Each `virgo` invocation pays the interpreter startup, the dependency imports,
+the container wiring and the graph compilation. `virgo daemon` pays them once:
+it warms up the container and listens on a Unix socket. When the daemon runs,
+the `virgo` client forwards its arguments, working directory, `VIRGO_*`
+environment and standard streams to it, instead of importing the commands.
+
+The daemon forks a child per command, with the client standard streams as its
+own, so that commands behave as in a fresh process, terminal detection and
+prompts included, while starting from the warm state. The child reports the
+exit code once the command returns.
+
+The daemon needs `fork` and Unix sockets passing file descriptors: on other
+platforms, such as Windows, the commands always run locally.
+
+This module only imports the standard library, to keep the client light.
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import traceback
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+SOCKET_ENV = "VIRGO_DAEMON_SOCKET"
+"""The environment variable overriding the path of the daemon socket."""
+
+_STREAMS = (0, 1, 2)
+_STOP_SIGNALS = {signal.SIGINT, signal.SIGTERM}
+_MAX_MESSAGE = 1 << 20
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot serve."""
+
+
+@dataclass(frozen=True)
+class DaemonRequest:
+    """A command forwarded by the client to the daemon."""
+
+    argv: list[str]
+    """The command line arguments, without the program name."""
+
+    cwd: str
+    """The working directory of the client."""
+
+    env: dict[str, str] = field(default_factory=dict)
+    """The `VIRGO_*` environment variables of the client."""
+
+
+def is_supported() -> bool:
+    """Tell whether the platform can run the daemon and forward commands to it."""
+    return (
+        hasattr(os, "fork")
+        and hasattr(os, "getuid")
+        and hasattr(socket, "AF_UNIX")
+        and hasattr(socket, "send_fds")
+    )
+
+
+def default_socket_path() -> Path:
+    """Get the path of the daemon socket, private to the current user."""
+    if path := os.environ.get(SOCKET_ENV):
+        return Path(path)
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(directory) / f"virgo-{os.getuid()}.sock"
+
+
+def _connect(path: Path) -> socket.socket | None:
+    """Connect to the daemon, if one owned by the current user listens."""
+    try:
+        if path.stat().st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def forward(argv: Sequence[str], path: Path | None = None) -> int | None:
+    """Run a command in the daemon, with the standard streams of this process.
+
+    Args:
+        argv: The command line arguments, without the program name.
+        path: The path of the daemon socket, the default one if not given.
+
+    Returns:
+        int | None: The exit code of the command, or None if no daemon is
+            listening, for the command to run locally instead.
+    """
+    sock = _connect(path or default_socket_path())
+    if sock is None:
+        return None
+    request = DaemonRequest(
+        argv=list(argv),
+        cwd=os.getcwd(),
+        env={
+            key: value for key, value in os.environ.items() if key.startswith("VIRGO_")
+        },
+    )
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with sock, sock.makefile("rb") as replies:
+        socket.send_fds(
+            sock, [json.dumps(request.__dict__).encode() + b"\n"], list(_STREAMS)
+        )
+        pid: int | None = None
+        while True:
+            try:
+                line = replies.readline()
+            except KeyboardInterrupt:
+                # The terminal interrupts the client only, pass it on to the command.
+                if pid is not None:
+                    os.kill(pid, signal.SIGINT)
+                continue
+            if not line:
+                # The command died without reporting its exit code.
+                return 1
+            reply = json.loads(line)
+            if "exit_code" in reply:
+                return int(reply["exit_code"])
+            pid = reply.get("pid")
+
+
+def _receive(conn: socket.socket) -> tuple[DaemonRequest, list[int]]:
+    """Receive a request, along with the standard streams of the client."""
+    data, fds, _, _ = socket.recv_fds(conn, _MAX_MESSAGE, len(_STREAMS))
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(_MAX_MESSAGE)
+        if not chunk:
+            raise DaemonError("Incomplete request.")
+        data += chunk
+    if len(fds) != len(_STREAMS):
+        raise DaemonError("The client did not send its standard streams.")
+    return DaemonRequest(**json.loads(data)), fds
+
+
+def _handle(conn: socket.socket, run: Callable[[DaemonRequest], int]) -> None:
+    """Run a forwarded command in the forked child, then report its exit code."""
+    request, fds = _receive(conn)
+    _send(conn, {"pid": os.getpid()})
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for fd, stream in zip(fds, _STREAMS, strict=True):
+        os.dup2(fd, stream)
+        os.close(fd)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.chdir(request.cwd)
+    try:
+        exit_code = run(request)
+    except KeyboardInterrupt:
+        exit_code = 130
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    _send(conn, {"exit_code": exit_code})
+
+
+def serve(path: Path, run: Callable[[DaemonRequest], int]) -> None:
+    """Serve the forwarded commands until terminated.
+
+    Args:
+        path: The path of the socket to listen on.
+        run: Run a command in the forked child, returning its exit code.
+
+    Raises:
+        DaemonError: If the platform does not support the daemon, or a daemon
+            already listens on the socket.
+    """
+    if not is_supported():
+        raise DaemonError("The daemon is not supported on this platform.")
+    existing = _connect(path)
+    if existing is not None:
+        existing.close()
+        raise DaemonError(f"A daemon already listens on {path}.")
+    path.unlink(missing_ok=True)
+
+    def _terminate(*_: object) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _terminate)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(umask)
+    try:
+        server.listen()
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                # Hold the signals during the fork: the fork hooks would
+                # swallow the exceptions raised by their handlers.
+                signal.pthread_sigmask(signal.SIG_BLOCK, _STOP_SIGNALS)
+                pid = os.fork()
+                if pid == 0:
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+                if pid != 0:
+                    continue
+                server.close()
+                exit_code = 0
+                try:
+                    _handle(conn, run)
+                except BaseException:  # noqa: BLE001
+                    traceback.print_exc()
+                    exit_code = 1
+                os._exit(exit_code)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def main() -> None:
+    """Run the `virgo` command, in the daemon if one is listening."""
+    argv = sys.argv[1:]
+    if argv[:1] != ["daemon"] and is_supported():
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from virgo.cli import app
+
+    app()
+
+
+__all__ = [
+    "SOCKET_ENV",
+    "DaemonError",
+    "DaemonRequest",
+    "default_socket_path",
+    "forward",
+    "is_supported",
+    "main",
+    "serve",
+]
@@ -0,0 +1,163 @@
+"""Output sinks writing the generated articles.
+
+Rich rendering is only used for interactive terminals. Otherwise, the articles
+are written as they are produced, as raw Markdown or JSON, to the standard
+output, to a file or to a directory holding one file per article.
+"""
+
+import re
+import sys
+import unicodedata
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import TextIO, override
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from virgo.core.agent.schemas import MarkdownArticle
+
+
+class OutputFormat(StrEnum):
+    """The formats the articles are written in."""
+
+    MARKDOWN = "markdown"
+    JSON = "json"
+
+    @property
+    def suffix(self) -> str:
+        """The file suffix of the format."""
+        return ".md" if self is OutputFormat.MARKDOWN else ".json"
+
+    def serialize(self, article: MarkdownArticle) -> str:
+        """Serialize an article in this format."""
+        if self is OutputFormat.JSON:
+            return article.model_dump_json()
+        return article.to_markdown()
+
+
+class ArticleSink(ABC):
+    """Abstract base class for the destinations of the generated articles."""
+
+    @abstractmethod
+    def write(self, article: MarkdownArticle) -> None:
+        """Write an article.
+
+        Args:
+            article: The article to write.
+        """
+        ...
+
+
+class ConsoleSink(ArticleSink):
+    """Sink rendering the articles with Rich, for interactive terminals."""
+
+    def __init__(self, console: Console) -> None:
+        self._console = console
+
+    @override
+    def write(self, article: MarkdownArticle) -> None:
+        self._console.print(Markdown(article.to_markdown()))
+
+
+class StreamSink(ArticleSink):
+    """Sink writing the articles to a text stream, flushed after each article.
+
+    Markdown articles are separated by a horizontal rule, and JSON articles
+    are written one per line (JSON Lines).
+    """
+
+    def __init__(self, stream: TextIO, output_format: OutputFormat) -> None:
+        self._stream = stream
+        self._format = output_format
+        self._count = 0
+
+    @override
+    def write(self, article: MarkdownArticle) -> None:
+        if self._count and self._format is OutputFormat.MARKDOWN:
+            self._stream.write("\n---\n\n")
+        self._stream.write(self._format.serialize(article))
+        self._stream.write("\n")
+        self._stream.flush()
+        self._count += 1
+
+
+class DirectorySink(ArticleSink):
+    """Sink writing each article to its own file, named after its title."""
+
+    def __init__(self, directory: Path, output_format: OutputFormat) -> None:
+        self._directory = directory
+        self._format = output_format
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    @override
+    def write(self, article: MarkdownArticle) -> None:
+        self._path_for(article.title).write_text(
+            self._format.serialize(article) + "\n", encoding="utf-8"
+        )
+
+    def _path_for(self, title: str) -> Path:
+        """Find a file name for the title, not overwriting the previous articles."""
+        stem = slugify(title) or "article"
+        path = self._directory / f"{stem}{self._format.suffix}"
+        index = 1
+        while path.exists():
+            index += 1
+            path = self._directory / f"{stem}-{index}{self._format.suffix}"
+        return path
+
+
+def slugify(text: str) -> str:
+    """Convert a text to a lowercase, ASCII file name."""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_text.lower()).strip("-")[:80]
+
+
+@contextmanager
+def open_sink(
+    output: Path | None,
+    output_format: OutputFormat | None,
+    console: Console,
+) -> Iterator[ArticleSink]:
+    """Open the sink of the generated articles.
+
+    Args:
+        output: The file or directory to write to, the standard output if None.
+            An existing directory, or a path without a file suffix, receives
+            one file per article.
+        output_format: The format of the articles, raw Markdown by default.
+        console: The console of the standard output, rendering the articles
+            with Rich when no format is requested and it is a terminal.
+
+    Yields:
+        ArticleSink: The sink to write the articles to.
+    """
+    if output is None:
+        if output_format is None and console.is_terminal:
+            yield ConsoleSink(console)
+        else:
+            yield StreamSink(sys.stdout, output_format or OutputFormat.MARKDOWN)
+        return
+
+    output_format = output_format or OutputFormat.MARKDOWN
+    if output.is_dir() or not output.suffix:
+        yield DirectorySink(output, output_format)
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as stream:
+        yield StreamSink(stream, output_format)
+
+
+__all__ = [
+    "ArticleSink",
+    "ConsoleSink",
+    "DirectorySink",
+    "OutputFormat",
+    "StreamSink",
+    "open_sink",
+    "slugify",
+]
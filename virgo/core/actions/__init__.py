@@ -1,9 +1,10 @@
 """Actions module containing use cases and protocols for Virgo."""
 
 from virgo.core.actions.generate import GenerateArticleAction
-from virgo.core.actions.protocols import ArticleGenerator
+from virgo.core.actions.protocols import ArticleCache, ArticleGenerator
 
 __all__ = [
+    "ArticleCache",
     "ArticleGenerator",
     "GenerateArticleAction",
 ]
@@ -0,0 +1,385 @@
+"""Batch article generation, shared by several hosts through a manifest.
+
+The manifest is a SQLite database, typically on a shared filesystem, listing
+the questions of the batch and the status of each one. Hosts claim shards of
+pending questions with time-limited leases, renewed while the articles are
+generated: the shards of a crashed host are claimed again by the others once
+their leases expire, and the results of a host that lost its lease are
+discarded, so that each article is recorded once.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+from virgo.core.actions.generate import GenerateArticleAction
+from virgo.core.agent.schemas import MarkdownArticle
+
+logger = logging.getLogger(__name__)
+
+
+class ItemStatus(StrEnum):
+    """The status of a batch item."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """A question of the batch, as claimed by a worker."""
+
+    id: int
+    """The identifier of the item in the manifest."""
+
+    question: str
+    """The question to generate an article for."""
+
+    attempts: int
+    """How many times the item was claimed, including the current claim."""
+
+
+def default_worker_id() -> str:
+    """Identify the current process among the hosts sharing a manifest."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class BatchManifest:
+    """Manifest of a batch, stored in a SQLite database shared by the workers.
+
+    Every state transition runs in an immediate transaction, so that concurrent
+    workers never claim the same item. On network filesystems, SQLite relies on
+    their file locking, which must therefore be enabled.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0) -> None:
+        """Open the manifest, creating it if needed.
+
+        Args:
+            path: The SQLite database file.
+            timeout: How long to wait for the other workers' locks, in seconds.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "id INTEGER PRIMARY KEY, question TEXT NOT NULL UNIQUE, "
+                "status TEXT NOT NULL, worker TEXT, lease_expires_at REAL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, article TEXT, error TEXT, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def add(self, questions: Iterable[str]) -> int:
+        """Add questions to the batch, ignoring the ones already listed.
+
+        Args:
+            questions: The questions to add.
+
+        Returns:
+            int: How many questions were added.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO items (question, status, updated_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (question, ItemStatus.PENDING, now)
+                    for question in (q.strip() for q in questions)
+                    if question
+                ],
+            )
+            return connection.total_changes - before
+
+    def claim(self, worker: str, count: int, lease: float) -> list[BatchItem]:
+        """Claim a shard of pending items, or of items whose lease expired.
+
+        Args:
+            worker: The identifier of the claiming worker.
+            count: The maximum number of items to claim.
+            lease: How long the items are reserved to the worker, in seconds.
+
+        Returns:
+            list[BatchItem]: The claimed items, empty once the batch is exhausted.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, question, attempts FROM items "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY id LIMIT ?",
+                (ItemStatus.PENDING, ItemStatus.RUNNING, now, count),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE items SET status = ?, worker = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [
+                    (ItemStatus.RUNNING, worker, now + lease, now, row[0])
+                    for row in rows
+                ],
+            )
+        return [
+            BatchItem(id=item_id, question=question, attempts=attempts + 1)
+            for item_id, question, attempts in rows
+        ]
+
+    def renew(self, worker: str, item_ids: Iterable[int], lease: float) -> int:
+        """Extend the leases the worker still holds.
+
+        Returns:
+            int: How many leases were extended.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "UPDATE items SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                [
+                    (now + lease, now, item_id, worker, ItemStatus.RUNNING)
+                    for item_id in item_ids
+                ],
+            )
+            return connection.total_changes - before
+
+    def complete(self, worker: str, item_id: int, article: MarkdownArticle) -> bool:
+        """Record the article of an item.
+
+        Returns:
+            bool: Whether the article was recorded, which fails when the worker
+                lost its lease to another worker.
+        """
+        return self._finish(
+            worker,
+            item_id,
+            ItemStatus.DONE,
+            article=article.model_dump_json(),
+        )
+
+    def fail(self, worker: str, item_id: int, error: str, retry: bool) -> bool:
+        """Record the failure of an item.
+
+        Args:
+            worker: The identifier of the worker holding the item.
+            item_id: The identifier of the failed item.
+            error: The description of the failure.
+            retry: Whether to release the item for another attempt.
+
+        Returns:
+            bool: Whether the failure was recorded, which fails when the worker
+                lost its lease to another worker.
+        """
+        status = ItemStatus.PENDING if retry else ItemStatus.FAILED
+        return self._finish(worker, item_id, status, error=error)
+
+    def _finish(
+        self,
+        worker: str,
+        item_id: int,
+        status: ItemStatus,
+        article: str | None = None,
+        error: str | None = None,
+    ) -> bool:
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE items SET status = ?, article = ?, error = ?, "
+                "lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (
+                    status,
+                    article,
+                    error,
+                    time.time(),
+                    item_id,
+                    worker,
+                    ItemStatus.RUNNING,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self) -> dict[ItemStatus, int]:
+        """Count the items of each status."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM items GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys(ItemStatus, 0)
+        counts.update({ItemStatus(status): count for status, count in rows})
+        return counts
+
+    def articles(self) -> Iterator[tuple[str, MarkdownArticle]]:
+        """Iterate over the generated articles, with their questions."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT question, article FROM items WHERE status = ? ORDER BY id",
+                (ItemStatus.DONE,),
+            ).fetchall()
+        for question, article in rows:
+            yield question, MarkdownArticle.model_validate_json(article)
+
+
+@dataclass
+class BatchReport:
+    """The outcome of a batch run on one worker."""
+
+    done: int = 0
+    """How many articles the worker recorded."""
+
+    failed: int = 0
+    """How many failures the worker recorded, including the retried ones."""
+
+    lost: int = 0
+    """How many items the worker lost to other workers, its lease having expired
+    or failed to be renewed."""
+
+
+@dataclass
+class RunBatchAction:
+    """Action generating the articles of a batch, alongside other workers.
+
+    The worker claims shards of the manifest until none is left, generating
+    each article with the article generation action while a background thread
+    renews its leases. When a renewal fails, the rest of the shard is left to
+    be claimed again once its leases expire.
+    """
+
+    action: GenerateArticleAction
+    """The action generating each article."""
+
+    lease: float = 600.0
+    """How long the claimed items are reserved, in seconds."""
+
+    shard_size: int = 5
+    """How many items are claimed at once."""
+
+    max_attempts: int = 3
+    """How many times an item is attempted before being marked as failed."""
+
+    def execute(
+        self, manifest: BatchManifest, worker: str | None = None
+    ) -> BatchReport:
+        """Generate the articles of the batch until it is exhausted.
+
+        Args:
+            manifest: The manifest shared by the workers.
+            worker: The identifier of this worker, unique among the hosts.
+
+        Returns:
+            BatchReport: The outcome of the items this worker processed.
+        """
+        worker = worker or default_worker_id()
+        report = BatchReport()
+        while shard := manifest.claim(worker, self.shard_size, self.lease):
+            with self._renewing(
+                manifest, worker, [item.id for item in shard]
+            ) as renewal_failed:
+                for item in shard:
+                    if renewal_failed.is_set():
+                        report.lost += 1
+                        continue
+                    self._process(manifest, worker, item, report)
+        return report
+
+    def _process(
+        self,
+        manifest: BatchManifest,
+        worker: str,
+        item: BatchItem,
+        report: BatchReport,
+    ) -> None:
+        try:
+            article = self.action.execute(item.question)
+            error = None if article else "The article could not be generated."
+        except Exception as e:
+            logger.warning("Could not generate %r.", item.question, exc_info=True)
+            article, error = None, f"{type(e).__name__}: {e}"
+
+        if article is not None:
+            recorded = manifest.complete(worker, item.id, article)
+        else:
+            recorded = manifest.fail(
+                worker,
+                item.id,
+                error or "",
+                retry=item.attempts < self.max_attempts,
+            )
+        if not recorded:
+            report.lost += 1
+        elif article is not None:
+            report.done += 1
+        else:
+            report.failed += 1
+
+    @contextmanager
+    def _renewing(
+        self, manifest: BatchManifest, worker: str, item_ids: list[int]
+    ) -> Iterator[threading.Event]:
+        """Renew the leases of a shard in the background while it is processed.
+
+        Yields:
+            threading.Event: Set once a renewal failed, and the leases stopped
+                being renewed.
+        """
+        stopped = threading.Event()
+        failed = threading.Event()
+
+        def _renew() -> None:
+            while not stopped.wait(self.lease / 3):
+                try:
+                    manifest.renew(worker, item_ids, self.lease)
+                except Exception:
+                    logger.warning(
+                        "Could not renew the leases of items %s.",
+                        item_ids,
+                        exc_info=True,
+                    )
+                    failed.set()
+                    return
+
+        thread = threading.Thread(target=_renew, daemon=True)
+        thread.start()
+        try:
+            yield failed
+        finally:
+            stopped.set()
+            thread.join()
+
+
+__all__ = [
+    "BatchItem",
+    "BatchManifest",
+    "BatchReport",
+    "ItemStatus",
+    "RunBatchAction",
+    "default_worker_id",
+]
@@ -0,0 +1,198 @@
+"""Benchmark of the structured output methods of the chat models.
+
+Function calling, JSON schema and JSON modes differ in latency and failure
+rate depending on the provider and model. The benchmark runs the chains of
+the draft, revise and format nodes a few times with each method, on the
+structured output schemas the graph uses, so that the method of each node
+can be chosen with the `structured_output_methods` setting.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import Runnable
+
+from virgo.core.agent.graph.builder import DRAFT, FORMAT, REVISE
+from virgo.core.agent.graph.nodes.chains import (
+    first_responder,
+    markdown_formatter,
+    revisor,
+)
+from virgo.core.agent.llms import ChatModelPool, ConfigurableChatModel
+from virgo.core.agent.schemas import Answer, Revised
+from virgo.core.agent.synthetic import synthetic_output
+from virgo.core.settings import StructuredOutputMethod
+from virgo.core.telemetry.latency import LatencySummary
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_OUTPUT_METHODS: tuple[StructuredOutputMethod, ...] = (
+    "function_calling",
+    "json_schema",
+    "json_mode",
+)
+"""The structured output methods compared by default."""
+
+NOT_PARSED = "NotParsed"
+"""The error reported for the outputs that could not be parsed."""
+
+
+@dataclass
+class MethodBenchmark:
+    """The outcome of the calls of a node with a structured output method."""
+
+    node: str
+    """The node whose chain was called."""
+
+    method: StructuredOutputMethod
+    """The structured output method."""
+
+    latency: LatencySummary
+    """The latency of the calls, successful or not."""
+
+    failed: int = 0
+    """How many calls raised, or returned an output that could not be parsed."""
+
+    output_tokens: int = 0
+    """The output tokens of the calls, as reported by the provider."""
+
+    errors: dict[str, int] = field(default_factory=dict)
+    """How many calls failed, per exception type or `NotParsed`."""
+
+    @property
+    def failure_rate(self) -> float:
+        """The share of the calls that failed."""
+        return self.failed / self.latency.count if self.latency.count else 0.0
+
+
+def _inputs(question: str) -> dict[str, dict[str, Any]]:
+    """Build the inputs of the chains of each node, from the schema examples."""
+    answer = synthetic_output(Answer)
+    revised = synthetic_output(Revised)
+    results = [
+        {
+            "query": query,
+            "results": [
+                {
+                    "url": f"https://example.com/{index}",
+                    "title": query,
+                    "content": answer.value,
+                }
+            ],
+        }
+        for index, query in enumerate(answer.reflection.search_queries)
+    ]
+    return {
+        DRAFT: {"messages": [HumanMessage(question)]},
+        REVISE: {
+            "messages": [
+                HumanMessage(question),
+                AIMessage(
+                    "",
+                    tool_calls=[
+                        {"name": "Answer", "args": answer.model_dump(), "id": "draft"}
+                    ],
+                ),
+                ToolMessage(json.dumps(results), tool_call_id="draft"),
+            ]
+        },
+        FORMAT: {
+            "article": revised.value,
+            "references": "\n".join(revised.references),
+        },
+    }
+
+
+@dataclass
+class RunOutputBenchmarkAction:
+    """Action comparing the structured output methods on the graph chains.
+
+    The calls go to the default provider and model of the pool, with the
+    generation parameters of the providers.
+    """
+
+    pool: ChatModelPool
+    """The pool of the chat models to benchmark."""
+
+    compact_schemas: bool = False
+    """Whether the chains send the compact structured output schemas."""
+
+    clock: Callable[[], float] = time.perf_counter
+    """The monotonic clock timing the calls."""
+
+    def _chains(
+        self, method: StructuredOutputMethod
+    ) -> dict[str, Runnable[dict[str, Any], Any]]:
+        provider, _ = self.pool.key()
+        llm = ConfigurableChatModel(
+            pool=self.pool, structured_output_methods={provider: method}
+        )
+        return {
+            DRAFT: first_responder.create_chain(llm, self.compact_schemas),
+            REVISE: revisor.create_chain(llm, self.compact_schemas),
+            FORMAT: markdown_formatter.create_chain(llm, self.compact_schemas),
+        }
+
+    def execute(
+        self,
+        question: str,
+        methods: Sequence[StructuredOutputMethod] = STRUCTURED_OUTPUT_METHODS,
+        repeats: int = 3,
+    ) -> list[MethodBenchmark]:
+        """Run the benchmark.
+
+        Args:
+            question: The question the chains answer.
+            methods: The structured output methods to compare.
+            repeats: How many times each chain is called with each method.
+
+        Returns:
+            list[MethodBenchmark]: The outcome of each node and method.
+        """
+        inputs = _inputs(question)
+        benchmarks: list[MethodBenchmark] = []
+        for method in methods:
+            for node, chain in self._chains(method).items():
+                latencies: list[float] = []
+                errors: Counter[str] = Counter()
+                output_tokens = 0
+                for _ in range(repeats):
+                    start = self.clock()
+                    try:
+                        output = chain.invoke(inputs[node])
+                    except Exception as e:
+                        logger.debug("%s failed with %s.", node, method, exc_info=True)
+                        errors[type(e).__name__] += 1
+                        latencies.append(self.clock() - start)
+                        continue
+                    latencies.append(self.clock() - start)
+                    if output.get("parsed") is None:
+                        errors[NOT_PARSED] += 1
+                    usage = getattr(output.get("raw"), "usage_metadata", None)
+                    if usage:
+                        output_tokens += usage["output_tokens"]
+                benchmarks.append(
+                    MethodBenchmark(
+                        node=node,
+                        method=method,
+                        latency=LatencySummary.of(latencies),
+                        failed=errors.total(),
+                        output_tokens=output_tokens,
+                        errors=dict(errors.most_common()),
+                    )
+                )
+        return benchmarks
+
+
+__all__ = [
+    "NOT_PARSED",
+    "STRUCTURED_OUTPUT_METHODS",
+    "MethodBenchmark",
+    "RunOutputBenchmarkAction",
+]
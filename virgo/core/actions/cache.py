@@ -0,0 +1,214 @@
+"""Caches of finished articles, used by the article generation action.
+
+Articles are keyed by the normalized question and a fingerprint of the
+generation settings (provider, model, iterations, generation parameters), so
+that a cached article is only served for the same question asked with the same
+settings.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from virgo.core.agent.schemas import MarkdownArticle
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question, so that trivial variations share a cache entry.
+
+    The question is Unicode-normalized, case-folded, its whitespace collapsed
+    and its trailing punctuation removed.
+
+    Args:
+        question: The question to normalize.
+
+    Returns:
+        str: The normalized question.
+    """
+    normalized = unicodedata.normalize("NFKC", question).casefold()
+    return _WHITESPACE.sub(" ", normalized).strip().rstrip("?!. ")
+
+
+def settings_fingerprint(**settings: object) -> str:
+    """Compute a short fingerprint of the settings affecting the generated articles.
+
+    Args:
+        **settings: The settings, such as the provider, model and generation
+            parameters.
+
+    Returns:
+        str: The fingerprint, stable across processes.
+    """
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def cache_key(question: str, fingerprint: str) -> str:
+    """Compute the cache key of a question generated with the given settings."""
+    payload = f"{fingerprint}\x00{normalize_question(question)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InMemoryArticleCache:
+    """Least recently used article cache, kept in memory."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: How long an article stays valid, in seconds.
+            max_entries: How many articles are kept before evicting the least
+                recently used ones.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, question: str, fingerprint: str) -> MarkdownArticle | None:
+        """Get the cached article of a question, if still valid."""
+        key = cache_key(question, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, payload = entry
+            if time.time() - created_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return MarkdownArticle.model_validate_json(payload)
+
+    def put(self, question: str, fingerprint: str, article: MarkdownArticle) -> None:
+        """Cache the article of a question."""
+        key = cache_key(question, fingerprint)
+        with self._lock:
+            self._entries[key] = (time.time(), article.model_dump_json())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteArticleCache:
+    """Least recently used article cache, persisted in a SQLite database file.
+
+    Being persisted, the cache is shared by successive CLI invocations and by
+    the processes using the same file. The normalized questions are stored
+    along with the articles, so that they can be listed.
+    """
+
+    def __init__(self, path: str | Path, ttl: float, max_entries: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: The SQLite database file.
+            ttl: How long an article stays valid, in seconds.
+            max_entries: How many articles are kept before evicting the least
+                recently used ones.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "key TEXT PRIMARY KEY, article TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "question TEXT NOT NULL)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM articles"
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def get(self, question: str, fingerprint: str) -> MarkdownArticle | None:
+        """Get the cached article of a question, if still valid."""
+        key = cache_key(question, fingerprint)
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT article, created_at FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self._ttl:
+                self._connection.execute("DELETE FROM articles WHERE key = ?", (key,))
+                self._connection.execute("DELETE FROM questions WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE articles SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return MarkdownArticle.model_validate_json(row[0])
+
+    def put(self, question: str, fingerprint: str, article: MarkdownArticle) -> None:
+        """Cache the article of a question."""
+        key = cache_key(question, fingerprint)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO articles "
+                "(key, article, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, article.model_dump_json(), now, now),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO questions (key, fingerprint, question) "
+                "VALUES (?, ?, ?)",
+                (key, fingerprint, normalize_question(question)),
+            )
+            self._connection.execute(
+                "DELETE FROM articles WHERE key IN ("
+                "SELECT key FROM articles ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+            self._connection.execute(
+                "DELETE FROM questions WHERE key NOT IN (SELECT key FROM articles)"
+            )
+
+    def questions(self) -> list[tuple[str, str]]:
+        """List the questions of the valid cached articles.
+
+        Returns:
+            list[tuple[str, str]]: The fingerprint and normalized question of
+                each article, least recently used first.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT q.fingerprint, q.question FROM questions q "
+                "JOIN articles a ON a.key = q.key WHERE a.created_at >= ? "
+                "ORDER BY a.accessed_at",
+                (time.time() - self._ttl,),
+            ).fetchall()
+
+
+__all__ = [
+    "InMemoryArticleCache",
+    "SQLiteArticleCache",
+    "cache_key",
+    "normalize_question",
+    "settings_fingerprint",
+]
@@ -0,0 +1,183 @@
+"""Single-flight coalescing of identical in-flight generations.
+
+Identical questions often arrive together, such as in batches or behind a
+server. Rather than running the graph once per request, the first request of a
+key runs the generation while the others wait for it and share its article,
+or its error. The coalescing generator wraps the agent, so that the actions,
+the batches of the agent and the load tests all share the generations in
+flight.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import override
+
+from virgo.core.actions.cache import cache_key, settings_fingerprint
+from virgo.core.agent import BatchArticleGenerator, GraphConfiguration
+from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.telemetry.metrics import VirgoMetrics
+
+
+class SingleFlight[T]:
+    """Run a single call per key at a time, sharing its outcome with the waiters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[T]] = {}
+
+    def __len__(self) -> int:
+        """The number of calls in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: str, call: Callable[[], T]) -> tuple[T, bool]:
+        """Run a call, unless a call of the same key is in flight.
+
+        Args:
+            key: The key of the call, such as a cache key.
+            call: The call to run.
+
+        Returns:
+            tuple[T, bool]: The outcome of the call, and whether it was shared
+                with the call already in flight.
+
+        Raises:
+            Exception: Whatever the call raised, for the waiters as well.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = call()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._leave(key)
+        return result, False
+
+    async def ado(self, key: str, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run an asynchronous call, unless a call of the same key is in flight.
+
+        The calls in flight are shared with the synchronous ones of `do`.
+
+        Args:
+            key: The key of the call, such as a cache key.
+            call: The call to run.
+
+        Returns:
+            tuple[T, bool]: The outcome of the call, and whether it was shared
+                with the call already in flight.
+
+        Raises:
+            Exception: Whatever the call raised, for the waiters as well.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+
+        try:
+            result = await call()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._leave(key)
+        return result, False
+
+    def _join(self, key: str) -> tuple[Future[T], bool]:
+        """Get the call in flight of a key, and whether it is a new one to run."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _leave(self, key: str) -> None:
+        """Forget the call of a key once it completed."""
+        with self._lock:
+            del self._calls[key]
+
+
+@dataclass
+class CoalescingArticleGenerator(BatchArticleGenerator):
+    """Article generator sharing the identical generations in flight.
+
+    The generations are identical when their questions normalize the same, and
+    their settings and per-run overrides are the same.
+    """
+
+    generator: BatchArticleGenerator
+    """The generator of the articles, such as the agent."""
+    single_flight: SingleFlight[MarkdownArticle | None] = field(
+        default_factory=SingleFlight
+    )
+    """The generations in flight, possibly shared by several generators."""
+    fingerprint: str = ""
+    """The fingerprint of the generation settings, part of the coalescing keys."""
+    metrics: VirgoMetrics | None = None
+    """Optional metrics counting the coalesced generations."""
+
+    @override
+    def generate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        article, shared = self.single_flight.do(
+            self._key(question, configuration, timeout),
+            lambda: self.generator.generate(question, configuration, timeout),
+        )
+        self._count(shared)
+        return article
+
+    @override
+    async def agenerate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        article, shared = await self.single_flight.ado(
+            self._key(question, configuration, timeout),
+            lambda: self.generator.agenerate(question, configuration, timeout),
+        )
+        self._count(shared)
+        return article
+
+    def _key(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None,
+        timeout: float | None,
+    ) -> str:
+        """Compute the coalescing key of a generation."""
+        fingerprint = self.fingerprint
+        if configuration is not None or timeout is not None:
+            fingerprint = settings_fingerprint(
+                fingerprint=fingerprint,
+                configuration=configuration and configuration.to_configurable(),
+                timeout=timeout,
+            )
+        return cache_key(question, fingerprint)
+
+    def _count(self, shared: bool) -> None:
+        """Count the generation when it was coalesced and metrics are enabled."""
+        if shared and self.metrics is not None:
+            self.metrics.generations_coalesced.inc()
+
+
+__all__ = [
+    "CoalescingArticleGenerator",
+    "SingleFlight",
+]
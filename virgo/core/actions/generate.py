@@ -2,8 +2,9 @@
 
 from dataclasses import dataclass
 
-from virgo.core.actions.protocols import ArticleGenerator
-from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.actions.protocols import ArticleCache, ArticleGenerator
+from virgo.core.agent.schemas import MarkdownArticle, PartialArticle
+from virgo.core.telemetry.metrics import VirgoMetrics
 
 
 @dataclass
@@ -30,17 +31,61 @@ class GenerateArticleAction:
     """
 
     generator: ArticleGenerator
+    metrics: VirgoMetrics | None = None
+    """Optional metrics counting the generations started, succeeded and failed."""
+    cache: ArticleCache | None = None
+    """Optional cache of the finished articles, looked up before generating."""
+    fingerprint: str = ""
+    """The fingerprint of the generation settings, part of the cache keys."""
 
-    def execute(self, question: str) -> MarkdownArticle | None:
+    def execute(
+        self, question: str, *, use_cache: bool = True
+    ) -> MarkdownArticle | None:
         """Execute the article generation action.
 
         Args:
             question: The question to generate an article for.
+            use_cache: Whether to serve a cached article. When disabled, the
+                article is generated anyway and replaces the cached one.
 
         Returns:
             MarkdownArticle if generation succeeded, None otherwise.
         """
-        return self.generator.generate(question)
+        if self.cache is not None and use_cache:
+            article = self.cache.get(question, self.fingerprint)
+            if self.metrics is not None:
+                counter = (
+                    self.metrics.cache_hits if article else self.metrics.cache_misses
+                )
+                counter.inc(cache="article")
+            if article is not None:
+                return article
+
+        article = self._generate(question)
+        if (
+            article is not None
+            and not isinstance(article, PartialArticle)
+            and self.cache is not None
+        ):
+            self.cache.put(question, self.fingerprint, article)
+        return article
+
+    def _generate(self, question: str) -> MarkdownArticle | None:
+        """Generate the article, counting the generation when metrics are enabled."""
+        if self.metrics is None:
+            return self.generator.generate(question)
+
+        self.metrics.generations_started.inc()
+        try:
+            article = self.generator.generate(question)
+        except Exception:
+            self.metrics.generations_failed.inc()
+            raise
+        if article is None:
+            self.metrics.generations_failed.inc()
+        else:
+            self.metrics.generations_succeeded.inc()
+        return article
 
 
 __all__ = [
@@ -0,0 +1,175 @@
+"""Load tests of the article generation.
+
+The load test drives concurrent generations, for a number of requests or a
+duration, cycling through a list of questions. The generator is called
+directly, without the article cache, so that every request runs the graph.
+Against the synthetic or replayed backends, it measures the overhead of the
+graph itself; against the actual providers, the latency users experience.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from virgo.core.actions.protocols import ArticleGenerator
+from virgo.core.telemetry.latency import LatencyRecorder, LatencySummary, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+NO_ARTICLE = "NoArticle"
+"""The error reported for the generations that returned no article."""
+
+
+@dataclass
+class LoadTestReport:
+    """The outcome of a load test."""
+
+    requests: int
+    """How many generations completed, successfully or not."""
+
+    succeeded: int
+    """How many generations returned an article."""
+
+    elapsed: float
+    """How long the load test ran, in seconds."""
+
+    latency: LatencySummary
+    """The end-to-end latency of the generations."""
+
+    errors: dict[str, int] = field(default_factory=dict)
+    """How many generations failed, per exception type or `NoArticle`."""
+
+    node_latencies: dict[str, LatencySummary] = field(default_factory=dict)
+    """The latency of each graph node."""
+
+    node_tokens: dict[str, TokenUsage] = field(default_factory=dict)
+    """The tokens used by the chat model calls of each graph node."""
+
+    @property
+    def failed(self) -> int:
+        """How many generations raised or returned no article."""
+        return self.requests - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        """The completed generations per second."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tokens(self) -> TokenUsage:
+        """The tokens used by all the chat model calls."""
+        return TokenUsage(
+            sum(usage.input_tokens for usage in self.node_tokens.values()),
+            sum(usage.output_tokens for usage in self.node_tokens.values()),
+        )
+
+    @property
+    def token_throughput(self) -> float:
+        """The tokens used per second."""
+        return self.tokens.total_tokens / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class RunLoadTestAction:
+    """Action driving concurrent generations and measuring their latency.
+
+    Each worker thread generates articles one after the other until the
+    requested number of generations is started, or the duration elapses.
+    Generations started before the end of the duration are waited for.
+    """
+
+    generator: ArticleGenerator
+    """The generator of the articles, called without cache."""
+
+    recorder: LatencyRecorder
+    """The node hook of the graph recording the latency of each node."""
+
+    concurrency: int = 4
+    """How many generations run at once."""
+
+    clock: Callable[[], float] = time.perf_counter
+    """The monotonic clock timing the generations."""
+
+    def execute(
+        self,
+        questions: Sequence[str],
+        requests: int | None = None,
+        duration: float | None = None,
+    ) -> LoadTestReport:
+        """Run the load test.
+
+        Args:
+            questions: The questions to generate articles for, in turn.
+            requests: How many generations to run.
+            duration: How long to start generations for, in seconds.
+
+        Returns:
+            LoadTestReport: The throughput, latencies and errors of the run.
+
+        Raises:
+            ValueError: If no question, or neither a number of requests nor a
+                duration, is given.
+        """
+        if not questions:
+            raise ValueError("The load test needs at least one question.")
+        if requests is None and duration is None:
+            raise ValueError("The load test needs a number of requests or a duration.")
+
+        lock = threading.Lock()
+        turns = itertools.count()
+        latencies: list[float] = []
+        errors: Counter[str] = Counter()
+        self.recorder.clear()
+        started = self.clock()
+        deadline = None if duration is None else started + duration
+
+        def _next_question() -> str | None:
+            with lock:
+                turn = next(turns)
+            if requests is not None and turn >= requests:
+                return None
+            if deadline is not None and self.clock() >= deadline:
+                return None
+            return questions[turn % len(questions)]
+
+        def _work() -> None:
+            while (question := _next_question()) is not None:
+                start = self.clock()
+                error: str | None = None
+                try:
+                    if self.generator.generate(question) is None:
+                        error = NO_ARTICLE
+                except Exception as e:
+                    logger.debug("Could not generate %r.", question, exc_info=True)
+                    error = type(e).__name__
+                latency = self.clock() - start
+                with lock:
+                    latencies.append(latency)
+                    if error is not None:
+                        errors[error] += 1
+
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            for future in [executor.submit(_work) for _ in range(self.concurrency)]:
+                future.result()
+
+        return LoadTestReport(
+            requests=len(latencies),
+            succeeded=len(latencies) - errors.total(),
+            elapsed=self.clock() - started,
+            latency=LatencySummary.of(latencies),
+            errors=dict(errors.most_common()),
+            node_latencies=self.recorder.latencies(),
+            node_tokens=self.recorder.token_usage(),
+        )
+
+
+__all__ = [
+    "NO_ARTICLE",
+    "LoadTestReport",
+    "RunLoadTestAction",
+]
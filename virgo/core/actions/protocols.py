@@ -1,6 +1,6 @@
 """Protocols (abstract interfaces) for dependency injection in Virgo actions."""
 
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from virgo.core.agent.schemas import MarkdownArticle
 
@@ -24,6 +24,57 @@ class ArticleGenerator(Protocol):
         ...
 
 
+class ArticleCache(Protocol):
+    """Protocol for caches of finished articles.
+
+    Articles are cached per question and per fingerprint of the generation
+    settings, so that changing the provider or the model never serves an
+    article generated with the previous settings.
+    """
+
+    def get(self, question: str, fingerprint: str) -> MarkdownArticle | None:
+        """Get the cached article of a question.
+
+        Args:
+            question: The question the article was generated for.
+            fingerprint: The fingerprint of the generation settings.
+
+        Returns:
+            MarkdownArticle if a valid article is cached, None otherwise.
+        """
+        ...
+
+    def put(self, question: str, fingerprint: str, article: MarkdownArticle) -> None:
+        """Cache the article generated for a question.
+
+        Args:
+            question: The question the article was generated for.
+            fingerprint: The fingerprint of the generation settings.
+            article: The generated article.
+        """
+        ...
+
+
+@runtime_checkable
+class ListableArticleCache(ArticleCache, Protocol):
+    """Protocol for article caches listing the questions they hold.
+
+    Persisted caches list their questions, so that the indexes built over
+    them, such as the near-duplicate question index, survive the process.
+    """
+
+    def questions(self) -> list[tuple[str, str]]:
+        """List the questions of the valid cached articles.
+
+        Returns:
+            list[tuple[str, str]]: The fingerprint and normalized question of
+                each article, least recently used first.
+        """
+        ...
+
+
 __all__ = [
+    "ArticleCache",
     "ArticleGenerator",
+    "ListableArticleCache",
 ]
@@ -0,0 +1,256 @@
+"""Near-duplicate lookup of cached questions.
+
+Exact-match caching misses the rephrasings of a question. The questions are
+embedded as hashed word and character n-gram vectors, which needs neither a
+model nor a network access, and stacked in a NumPy matrix: a lookup is a single
+matrix-vector product, scoring every cached question by cosine similarity.
+"""
+
+import itertools
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+from virgo.core.actions.cache import normalize_question
+from virgo.core.actions.protocols import ArticleCache, ListableArticleCache
+from virgo.core.agent.ranking import tokenize
+from virgo.core.agent.schemas import MarkdownArticle
+
+_INITIAL_CAPACITY: Final[int] = 1024
+
+_QUESTION_WORDS: Final[frozenset[str]] = frozenset(
+    ["how", "do", "does", "explain", "describe", "tell", "me", "about", "give"]
+)
+"""Words phrasing a question rather than telling what it is about."""
+
+
+class HashedNgramVectorizer:
+    """Embed texts as L2-normalized vectors of hashed n-grams.
+
+    The features are the words and word bigrams of the text, without the
+    stopwords and question words, and the character n-grams of its words.
+    Each feature is hashed to a signed dimension, so that collisions cancel
+    out on average.
+    """
+
+    def __init__(self, dimensions: int = 512, char_ngrams: int = 3) -> None:
+        """Initialize the vectorizer.
+
+        Args:
+            dimensions: The number of dimensions of the vectors.
+            char_ngrams: The length of the character n-grams.
+        """
+        self.dimensions = dimensions
+        self._char_ngrams = char_ngrams
+
+    def features(self, text: str) -> list[str]:
+        """List the n-gram features of a text."""
+        words = [
+            word
+            for word in tokenize(normalize_question(text))
+            if word not in _QUESTION_WORDS
+        ]
+        features = [f"w:{word}" for word in words]
+        features.extend(f"b:{a} {b}" for a, b in itertools.pairwise(words))
+        n = self._char_ngrams
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(
+                f"c:{padded[start : start + n]}"
+                for start in range(max(len(padded) - n + 1, 1))
+            )
+        return features
+
+    def transform(self, text: str) -> NDArray[np.float32]:
+        """Embed a text.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            NDArray[np.float32]: The unit vector of the text, or a zero vector
+                if it has no features.
+        """
+        hashes = np.array(
+            [zlib.crc32(feature.encode()) for feature in self.features(text)],
+            dtype=np.uint32,
+        )
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dimensions, signs)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class QuestionIndex:
+    """Vectors of questions, stacked in a growable NumPy matrix."""
+
+    def __init__(self, dimensions: int) -> None:
+        self._matrix = np.zeros((_INITIAL_CAPACITY, dimensions), dtype=np.float32)
+        self._questions: list[str | None] = []
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, question: str, vector: NDArray[np.float32]) -> None:
+        """Add a question, or replace its vector if already indexed."""
+        row = self._rows.get(question)
+        if row is None:
+            if len(self._questions) == len(self._matrix):
+                self._grow()
+            row = len(self._questions)
+            self._questions.append(question)
+            self._rows[question] = row
+        self._matrix[row] = vector
+
+    def remove(self, question: str) -> None:
+        """Remove a question, leaving a zero row until the matrix is compacted."""
+        row = self._rows.pop(question, None)
+        if row is not None:
+            self._matrix[row] = 0
+            self._questions[row] = None
+
+    def nearest(self, vector: NDArray[np.float32]) -> tuple[str, float] | None:
+        """Find the question most similar to a vector.
+
+        Args:
+            vector: The unit vector to compare the questions with.
+
+        Returns:
+            tuple[str, float] | None: The nearest question and its cosine
+                similarity, or None if the index is empty.
+        """
+        if not self._rows:
+            return None
+        scores = self._matrix[: len(self._questions)] @ vector
+        row = int(np.argmax(scores))
+        question = self._questions[row]
+        return None if question is None else (question, float(scores[row]))
+
+    def _grow(self) -> None:
+        """Make room for more questions, dropping the removed ones first."""
+        if len(self._rows) < len(self._questions) // 2:
+            rows = list(self._rows.values())
+            self._matrix[: len(rows)] = self._matrix[rows]
+            self._questions = [self._questions[row] for row in rows]
+            self._rows = {question: row for row, question in enumerate(self._rows)}
+            self._matrix[len(rows) :] = 0
+            return
+        grown = np.zeros(
+            (2 * len(self._matrix), self._matrix.shape[1]), dtype=np.float32
+        )
+        grown[: len(self._matrix)] = self._matrix
+        self._matrix = grown
+
+
+class NearDuplicateArticleCache:
+    """Article cache also serving the articles of similar questions.
+
+    It wraps an exact-match cache: when a question misses, the most similar
+    question previously cached with the same settings is looked up instead,
+    and its article served if the cosine similarity reaches the threshold.
+    The question vectors are kept in memory. When the wrapped cache lists its
+    questions, as the SQLite cache does, they are indexed on startup, so that
+    the questions cached by previous processes are matched too.
+    """
+
+    def __init__(
+        self,
+        cache: ArticleCache,
+        threshold: float = 0.85,
+        vectorizer: HashedNgramVectorizer | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache: The exact-match cache storing the articles.
+            threshold: The minimum cosine similarity of a near-duplicate question.
+            vectorizer: The vectorizer embedding the questions.
+            max_entries: How many questions are indexed before dropping the
+                least recently used ones, without limit if None.
+        """
+        self._cache = cache
+        self._threshold = threshold
+        self._vectorizer = vectorizer or HashedNgramVectorizer()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._indexes: dict[str, QuestionIndex] = {}
+        self._recent: OrderedDict[tuple[str, str], None] = OrderedDict()
+        if isinstance(cache, ListableArticleCache):
+            for fingerprint, question in cache.questions():
+                self._add(question, fingerprint)
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def get(self, question: str, fingerprint: str) -> MarkdownArticle | None:
+        """Get the cached article of a question, or of a near-duplicate question."""
+        article = self._cache.get(question, fingerprint)
+        if article is not None:
+            self._touch(normalize_question(question), fingerprint)
+            return article
+
+        vector = self._vectorizer.transform(question)
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            match = index.nearest(vector) if index is not None else None
+        if match is None or match[1] < self._threshold:
+            return None
+
+        article = self._cache.get(match[0], fingerprint)
+        if article is None:
+            # The article expired or was evicted from the underlying cache.
+            with self._lock:
+                self._remove(match[0], fingerprint)
+        else:
+            self._touch(match[0], fingerprint)
+        return article
+
+    def put(self, question: str, fingerprint: str, article: MarkdownArticle) -> None:
+        """Cache the article of a question, and index the question."""
+        self._cache.put(question, fingerprint, article)
+        self._add(normalize_question(question), fingerprint)
+
+    def _add(self, question: str, fingerprint: str) -> None:
+        """Index a normalized question, dropping the least recently used ones."""
+        vector = self._vectorizer.transform(question)
+        with self._lock:
+            index = self._indexes.setdefault(
+                fingerprint, QuestionIndex(self._vectorizer.dimensions)
+            )
+            index.add(question, vector)
+            self._recent[fingerprint, question] = None
+            self._recent.move_to_end((fingerprint, question))
+            while (
+                self._max_entries is not None and len(self._recent) > self._max_entries
+            ):
+                oldest_fingerprint, oldest = next(iter(self._recent))
+                self._remove(oldest, oldest_fingerprint)
+
+    def _touch(self, question: str, fingerprint: str) -> None:
+        """Mark an indexed question as the most recently used."""
+        with self._lock:
+            if (fingerprint, question) in self._recent:
+                self._recent.move_to_end((fingerprint, question))
+
+    def _remove(self, question: str, fingerprint: str) -> None:
+        """Drop an indexed question, along with its index once empty."""
+        self._recent.pop((fingerprint, question), None)
+        index = self._indexes.get(fingerprint)
+        if index is not None:
+            index.remove(question)
+            if not index:
+                del self._indexes[fingerprint]
+
+
+__all__ = [
+    "HashedNgramVectorizer",
+    "NearDuplicateArticleCache",
+    "QuestionIndex",
+]
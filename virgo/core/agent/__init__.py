@@ -1,39 +1,252 @@
 """Agent module containing LangGraph implementation for Virgo."""
 
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from typing import override
+
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
+from virgo.core.agent.configuration import GraphConfiguration
 from virgo.core.agent.graph import VirgoGraph
-from virgo.core.agent.schemas import MarkdownArticle
+from virgo.core.agent.schemas import MarkdownArticle, PartialArticle
+
+
+class NoArticleError(Exception):
+    """Exception reported for the questions no article could be generated for."""
+
+
+class BatchArticleGenerator(ABC):
+    """Article generator running batches of generations, one question per run."""
+
+    @abstractmethod
+    def generate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        """Generate an article based on the input question.
 
+        Args:
+            question: The question to generate an article for.
+            configuration: Settings of this run, such as the model.
+            timeout: The wall-clock limit of this run, in seconds.
+
+        Returns:
+            MarkdownArticle if generation succeeded, None otherwise.
+        """
+
+    @abstractmethod
+    async def agenerate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        """Generate an article based on the input question, asynchronously.
+
+        Args:
+            question: The question to generate an article for.
+            configuration: Settings of this run, such as the model.
+            timeout: The wall-clock limit of this run, in seconds.
+
+        Returns:
+            MarkdownArticle if generation succeeded, None otherwise.
+        """
+
+    def generate_many(
+        self,
+        questions: Iterable[str],
+        max_concurrency: int | None = None,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[tuple[str, MarkdownArticle | Exception]]:
+        """Generate the articles of several questions, as they complete.
+
+        The generations run in a batch of at most `max_concurrency` graph runs
+        at once. The timeout of each generation starts when it does, not when
+        the batch is submitted. Stopping the iteration early still waits for
+        the generations already started.
+
+        Args:
+            questions: The questions to generate articles for.
+            max_concurrency: How many generations run at once, unbounded if None.
+            configuration: Settings of the runs, overriding the default
+                configuration of the agent.
+            timeout: The wall-clock limit of each run, in seconds.
 
-class VirgoAgent:
+        Yields:
+            tuple[str, MarkdownArticle | Exception]: Each question, with its
+                article, or the exception its generation raised, in order of
+                completion. A `NoArticleError` is reported for the questions
+                no article was generated for.
+        """
+        questions = list(questions)
+        for index, output in self._batch(configuration, timeout).batch_as_completed(
+            questions, {"max_concurrency": max_concurrency}, return_exceptions=True
+        ):
+            yield questions[index], output
+
+    async def agenerate_many(
+        self,
+        questions: Iterable[str],
+        max_concurrency: int | None = None,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[tuple[str, MarkdownArticle | Exception]]:
+        """Generate the articles of several questions asynchronously, as they complete.
+
+        Args:
+            questions: The questions to generate articles for.
+            max_concurrency: How many generations run at once, unbounded if None.
+            configuration: Settings of the runs, overriding the default
+                configuration of the agent.
+            timeout: The wall-clock limit of each run, in seconds.
+
+        Yields:
+            tuple[str, MarkdownArticle | Exception]: Each question, with its
+                article, or the exception its generation raised, in order of
+                completion.
+        """
+        questions = list(questions)
+        async for index, output in self._batch(
+            configuration, timeout
+        ).abatch_as_completed(
+            questions, {"max_concurrency": max_concurrency}, return_exceptions=True
+        ):
+            yield questions[index], output
+
+    def _batch(
+        self, configuration: GraphConfiguration | None, timeout: float | None
+    ) -> RunnableLambda[str, MarkdownArticle]:
+        """Wrap the generations in a runnable, to run them in batch.
+
+        Each item of the batch is generated on its own, so that the deadline of
+        a run is set when it starts.
+        """
+
+        def _generate(question: str) -> MarkdownArticle:
+            article = self.generate(question, configuration, timeout)
+            if article is None:
+                raise NoArticleError(f"No article was generated for: {question}")
+            return article
+
+        async def _agenerate(question: str) -> MarkdownArticle:
+            article = await self.agenerate(question, configuration, timeout)
+            if article is None:
+                raise NoArticleError(f"No article was generated for: {question}")
+            return article
+
+        return RunnableLambda(_generate, _agenerate, name="VirgoBatch")
+
+
+class VirgoAgent(BatchArticleGenerator):
     """The Virgo agent that wraps the LangGraph implementation."""
 
     _graph: VirgoGraph
+    _callbacks: Sequence[BaseCallbackHandler] = ()
+    _configuration: GraphConfiguration = GraphConfiguration()
+    _timeout: float | None = None
 
-    def __init__(self, graph: VirgoGraph) -> None:
+    def __init__(
+        self,
+        graph: VirgoGraph,
+        callbacks: Sequence[BaseCallbackHandler] = (),
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> None:
         """Initialize the Virgo agent.
 
         Args:
             graph: The computational graph for the agent.
+            callbacks: Callback handlers attached to every graph run, such as tracers.
+            configuration: The default configuration of the graph runs.
+            timeout: The default wall-clock limit of a generation, in seconds.
+                Runs with a deadline return the best answer so far when it is due.
 
         """
         self._graph = graph
+        self._callbacks = callbacks
+        self._configuration = configuration or GraphConfiguration()
+        self._timeout = timeout
 
-    def generate(self, question: str) -> MarkdownArticle | None:
+    @override
+    def generate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
         """Generate an article based on the input question.
 
         Args:
             question: The question to generate an article for.
+            configuration: Settings of this run, such as the model, overriding
+                the default configuration of the agent.
+            timeout: The wall-clock limit of this run, in seconds, overriding
+                the default timeout unless the configuration sets a deadline.
+
+        Returns:
+            MarkdownArticle if generation succeeded, None otherwise. The
+                article is a `PartialArticle` when the run ran out of time.
+        """
+        result = self._graph.invoke(
+            {"messages": [HumanMessage(content=question)]},  # type: ignore[arg-type]
+            self._run_config(configuration, timeout),
+        )
+        return _article(result)
+
+    @override
+    async def agenerate(
+        self,
+        question: str,
+        configuration: GraphConfiguration | None = None,
+        timeout: float | None = None,
+    ) -> MarkdownArticle | None:
+        """Generate an article based on the input question, asynchronously.
+
+        Args:
+            question: The question to generate an article for.
+            configuration: Settings of this run, overriding the default
+                configuration of the agent.
+            timeout: The wall-clock limit of this run, in seconds.
 
         Returns:
             MarkdownArticle if generation succeeded, None otherwise.
         """
-        message = HumanMessage(content=question)
-        result = self._graph.invoke({"messages": [message]})  # type: ignore[arg-type]
-        return result.get("formatted_article")
+        result = await self._graph.ainvoke(
+            {"messages": [HumanMessage(content=question)]},  # type: ignore[arg-type]
+            self._run_config(configuration, timeout),
+        )
+        return _article(result)
+
+    def _run_config(
+        self, configuration: GraphConfiguration | None, timeout: float | None
+    ) -> RunnableConfig:
+        """Build the config of a graph run, setting its deadline from now."""
+        configurable = self._configuration.to_configurable()
+        if configuration is not None:
+            configurable.update(configuration.to_configurable())
+        timeout = timeout if timeout is not None else self._timeout
+        if timeout is not None and "deadline" not in configurable:
+            configurable["deadline"] = time.time() + timeout
+        return {"callbacks": list(self._callbacks), "configurable": configurable}
+
+
+def _article(result: dict) -> MarkdownArticle | None:
+    """Get the article of a graph run, partial when the run ran out of time."""
+    article = result.get("formatted_article")
+    if article is None or not result.get("degraded"):
+        return article
+    return PartialArticle.model_validate(article.model_dump())
 
 
 __all__ = [
+    "BatchArticleGenerator",
+    "GraphConfiguration",
+    "NoArticleError",
     "VirgoAgent",
 ]
@@ -0,0 +1,377 @@
+"""Record and replay of the chat model and research calls of the graph runs.
+
+A cassette is a JSON Lines file of interactions: the request, the response
+and the latency of each chat model or researcher call. Recording wraps the
+actual chat models and researcher; replaying serves the recorded responses
+instead, without network access nor API keys, so that graph changes can be
+benchmarked and regression-tested offline and deterministically.
+
+Requests are matched on their content: the messages sent to the chat model,
+with the current time of the prompts masked, or the search queries. A request
+recorded several times is answered with its responses in turn.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal, override
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel, ConfigDict
+
+from virgo.core.agent.llms import GenerationParams, LanguageModelProvider
+from virgo.core.agent.schemas import Reflection
+
+type CassetteMode = Literal["record", "replay"]
+"""Whether a cassette records the calls, or replays them."""
+
+_VOLATILE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+"""The current time given to the prompts, which differs on every run."""
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request was not recorded."""
+
+
+def _key(kind: str, request: Any) -> str:
+    """Hash a request into the key matching its recorded responses."""
+    canonical = json.dumps([kind, request], sort_keys=True, default=str)
+    return hashlib.sha256(_VOLATILE.sub("<time>", canonical).encode()).hexdigest()
+
+
+class Cassette:
+    """Interactions recorded to, or replayed from, a JSON Lines file."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CassetteMode = "replay",
+        latency_scale: float = 0.0,
+    ) -> None:
+        """Initialize the cassette, loading the recorded interactions to replay.
+
+        Args:
+            path: The JSON Lines file of the interactions.
+            mode: Whether to record the calls, or to replay them.
+            latency_scale: When replaying, wait for the recorded latency of
+                each call times this factor, such as 1.0 to replay the
+                recorded latencies, or 0.0 to answer at once.
+
+        Raises:
+            FileNotFoundError: If the cassette to replay does not exist.
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self._latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._interactions: dict[str, list[dict[str, Any]]] = {}
+        self._served: dict[str, int] = {}
+        if mode == "replay":
+            with self.path.open(encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._interactions.setdefault(interaction["key"], []).append(
+                            interaction
+                        )
+
+    @property
+    def replaying(self) -> bool:
+        """Whether the cassette replays the recorded calls."""
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._interactions.values())
+
+    def record(self, kind: str, request: Any, response: Any, latency: float) -> None:
+        """Append an interaction to the cassette.
+
+        Args:
+            kind: The kind of call, such as `chat` or `research`.
+            request: The JSON-serializable request.
+            response: The JSON-serializable response.
+            latency: How long the call took, in seconds.
+        """
+        interaction = {
+            "kind": kind,
+            "key": _key(kind, request),
+            "request": request,
+            "response": response,
+            "latency": latency,
+        }
+        line = json.dumps(interaction, default=str)
+        with self._lock:
+            self._interactions.setdefault(interaction["key"], []).append(interaction)
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+    def replay(self, kind: str, request: Any) -> Any:
+        """Get the next recorded response of a request.
+
+        Raises:
+            CassetteMissError: If the request was not recorded.
+        """
+        key = _key(kind, request)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                raise CassetteMissError(
+                    f"No {kind} call matching the request in {self.path}."
+                )
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            interaction = interactions[served % len(interactions)]
+        if self._latency_scale > 0:
+            time.sleep(interaction["latency"] * self._latency_scale)
+        return interaction["response"]
+
+    def call[T](
+        self,
+        kind: str,
+        request: Any,
+        call: Callable[[], T],
+        dump: Callable[[T], Any],
+        load: Callable[[Any], T],
+    ) -> T:
+        """Record a call, or replay its recorded response.
+
+        Args:
+            kind: The kind of call.
+            request: The JSON-serializable request.
+            call: Make the actual call, when recording.
+            dump: Serialize the response of the call to JSON.
+            load: Deserialize a recorded response.
+
+        Returns:
+            T: The response of the call.
+        """
+        if self.replaying:
+            return load(self.replay(kind, request))
+        started = time.perf_counter()
+        response = call()
+        self.record(kind, request, dump(response), time.perf_counter() - started)
+        return response
+
+
+def _message_request(message: BaseMessage) -> dict[str, Any]:
+    """Get the matched content of a message, without its volatile ids."""
+    request: dict[str, Any] = {"type": message.type, "content": message.content}
+    if isinstance(message, AIMessage) and message.tool_calls:
+        request["tool_calls"] = [
+            {"name": call["name"], "args": call["args"], "id": call["id"]}
+            for call in message.tool_calls
+        ]
+    if tool_call_id := getattr(message, "tool_call_id", None):
+        request["tool_call_id"] = tool_call_id
+    return request
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model recording the calls of another one, or replaying them."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    cassette: Cassette
+    """The cassette of the calls."""
+
+    recorded_model: str
+    """The name of the recorded model, matched along with the messages."""
+
+    model: BaseChatModel | None = None
+    """The actual chat model, unused when replaying."""
+
+    @property
+    @override
+    def _llm_type(self) -> str:
+        return "virgo-cassette"
+
+    def _request(self, messages: list[BaseMessage], **extra: Any) -> dict[str, Any]:
+        return {
+            "model": self.recorded_model,
+            "messages": [_message_request(message) for message in messages],
+            **extra,
+        }
+
+    def _actual(self) -> BaseChatModel:
+        assert self.model is not None, "Recording requires the actual chat model."
+        return self.model
+
+    @override
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.cassette.call(
+            "chat",
+            self._request(messages),
+            lambda: self._actual()._generate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            ),
+            lambda result: [
+                message_to_dict(generation.message)
+                for generation in result.generations
+                if isinstance(generation, ChatGeneration)
+            ],
+            lambda recorded: ChatResult(
+                generations=[
+                    ChatGeneration(message=message)
+                    for message in messages_from_dict(recorded)
+                ]
+            ),
+        )
+
+    @override
+    def with_structured_output(  # type: ignore[override]
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any
+    ) -> Runnable[Any, Any]:
+        bound = (
+            None
+            if self.cassette.replaying
+            else self._actual().with_structured_output(
+                schema, include_raw=include_raw, **kwargs
+            )
+        )
+        name = getattr(schema, "__name__", None) or str(schema.get("title"))
+
+        def _dump(output: Any) -> dict[str, Any]:
+            if not include_raw:
+                output = {"parsed": output}
+            parsed = output.get("parsed")
+            error = output.get("parsing_error")
+            return {
+                "raw": message_to_dict(output["raw"]) if "raw" in output else None,
+                "parsed": (
+                    parsed.model_dump(mode="json")
+                    if isinstance(parsed, BaseModel)
+                    else parsed
+                ),
+                "parsing_error": None if error is None else str(error),
+            }
+
+        def _load(recorded: dict[str, Any]) -> Any:
+            parsed = recorded["parsed"]
+            if (
+                parsed is not None
+                and isinstance(schema, type)
+                and issubclass(schema, BaseModel)
+            ):
+                parsed = schema.model_validate(parsed)
+            if not include_raw:
+                return parsed
+            error = recorded["parsing_error"]
+            return {
+                "raw": messages_from_dict([recorded["raw"]])[0],
+                "parsed": parsed,
+                "parsing_error": None
+                if error is None
+                else OutputParserException(error),
+            }
+
+        def _invoke(input: LanguageModelInput, config: RunnableConfig) -> Any:
+            messages = self._convert_input(input).to_messages()
+            return self.cassette.call(
+                "chat",
+                self._request(messages, schema=name),
+                lambda: bound.invoke(messages, config),  # type: ignore[union-attr]
+                _dump,
+                _load,
+            )
+
+        return RunnableLambda(_invoke, name="CassetteStructuredOutput")
+
+
+class CassetteLanguageModelProvider(LanguageModelProvider):
+    """Language model provider recording the calls of the chat models of another one.
+
+    When replaying, the actual provider is not used, so that no API key or
+    server is needed.
+    """
+
+    def __init__(self, provider: LanguageModelProvider, cassette: Cassette) -> None:
+        self._provider = provider
+        self._cassette = cassette
+
+    @override
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
+        return CassetteChatModel(
+            cassette=self._cassette,
+            recorded_model=model_name,
+            model=(
+                None
+                if self._cassette.replaying
+                else self._provider.get_chat_model(model_name, params)
+            ),
+        )
+
+
+class CassetteResearcher:
+    """Callable recording the searches of another researcher, or replaying them.
+
+    The actual researcher is created on the first recorded call, so that none
+    is needed when replaying.
+    """
+
+    def __init__(
+        self, researcher: Callable[[], Callable[..., list]], cassette: Cassette
+    ) -> None:
+        self._researcher = researcher
+        self._cassette = cassette
+
+    def __call__(
+        self,
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list:
+        """Run the search queries found in the reflection, or replay their results.
+
+        Args:
+            reflection (Reflection): The reflection object containing search queries.
+            value (str): The answer text.
+            references (list[str], optional): References for revised answers.
+
+        Returns:
+            list: The search results.
+        """
+        # The Tavily parameters depend on the round and on the search hints.
+        request = {
+            "queries": reflection.search_queries,
+            "round": "first" if references is None else "later",
+            "hints": [hint.model_dump(mode="json") for hint in reflection.search_hints],
+        }
+        return self._cassette.call(
+            "research",
+            request,
+            lambda: self._researcher()(reflection, value, references),
+            lambda results: results,
+            lambda recorded: recorded,
+        )
+
+
+__all__ = [
+    "Cassette",
+    "CassetteChatModel",
+    "CassetteLanguageModelProvider",
+    "CassetteMissError",
+    "CassetteMode",
+    "CassetteResearcher",
+]
@@ -0,0 +1,217 @@
+"""Citation index linking the numbered citations to the research sources.
+
+The sources found by the research rounds are numbered in order of first
+appearance, once per URL. The revisor is shown the search results with their
+ID instead of their URL, and cites them by ID; the references of the revised
+answer are then rendered locally from the index, as Markdown links, so that
+the model neither copies the URLs nor has to format them.
+
+The index is rebuilt from the tool messages of the graph state, which only
+grow, so that the IDs stay the same from one revision to the next.
+"""
+
+import json
+import re
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Self
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+SNIPPET_CHARS = 160
+"""Maximum length of the snippets describing the sources."""
+
+_CITATION_PATTERN = re.compile(r"\[(\d+(?:\s*,\s*\d+)*)\]")
+
+
+def _snippet(content: str) -> str:
+    """Shorten a search result content into a single-line snippet."""
+    content = " ".join(content.split())
+    if len(content) <= SNIPPET_CHARS:
+        return content
+    cut = content[:SNIPPET_CHARS].rsplit(" ", 1)[0]
+    return f"{cut.rstrip(',;:.')}…"
+
+
+def _items(result: Any) -> list[dict[str, Any]] | None:
+    """Get the search result items of a Tavily response, if it is one."""
+    if isinstance(result, dict) and isinstance(result.get("results"), list):
+        return [
+            item
+            for item in result["results"]
+            if isinstance(item, dict) and isinstance(item.get("url"), str)
+        ]
+    return None
+
+
+def _tool_results(message: BaseMessage) -> list[Any] | None:
+    """Parse the search results held by a tool message, if any."""
+    if not (isinstance(message, ToolMessage) and isinstance(message.content, str)):
+        return None
+    try:
+        results = json.loads(message.content)
+    except json.JSONDecodeError:
+        return None
+    return results if isinstance(results, list) else None
+
+
+@dataclass(frozen=True)
+class Citation:
+    """A research source, as listed in the citation index."""
+
+    id: int
+    """The number the source is cited by."""
+
+    url: str
+    """The URL of the source."""
+
+    title: str
+    """The title of the source."""
+
+    snippet: str
+    """A short excerpt describing the source."""
+
+    def to_markdown(self) -> str:
+        """Render the source as a numbered Markdown link."""
+        reference = f"[{self.id}] [{self.title}]({self.url})"
+        return f"{reference} - {self.snippet}" if self.snippet else reference
+
+
+class CitationIndex:
+    """The research sources, numbered once per URL in order of first appearance."""
+
+    def __init__(self) -> None:
+        self._by_url: dict[str, Citation] = {}
+        self._by_id: dict[int, Citation] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Citation]:
+        return iter(self._by_id.values())
+
+    def add(self, url: str, title: str = "", content: str = "") -> Citation:
+        """Add a source, unless its URL is already indexed.
+
+        Args:
+            url: The URL of the source.
+            title: The title of the source, the URL if empty.
+            content: The content of the source, shortened into its snippet.
+
+        Returns:
+            Citation: The citation of the source.
+        """
+        if url not in self._by_url:
+            citation = Citation(
+                id=len(self._by_id) + 1,
+                url=url,
+                title=" ".join(title.split()) or url,
+                snippet=_snippet(content),
+            )
+            self._by_url[url] = self._by_id[citation.id] = citation
+        return self._by_url[url]
+
+    def get(self, id: int) -> Citation | None:
+        """Get the source cited by a number, if any."""
+        return self._by_id.get(id)
+
+    @classmethod
+    def from_messages(cls, messages: Sequence[BaseMessage]) -> Self:
+        """Index the search results held by the tool messages.
+
+        The evidence references of the messages must be resolved beforehand.
+
+        Args:
+            messages: The messages of the graph state.
+
+        Returns:
+            Self: The citation index of the sources.
+        """
+        index = cls()
+        for message in messages:
+            for result in _tool_results(message) or []:
+                for item in _items(result) or []:
+                    index.add(
+                        item["url"],
+                        str(item.get("title") or ""),
+                        str(item.get("content") or ""),
+                    )
+        return index
+
+    def cite(self, messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+        """Replace the URLs of the indexed search results by their ID.
+
+        Only the ID, title and content of each search result are kept, so
+        that the revisor cites the sources by ID.
+
+        Args:
+            messages: The messages of the graph state, with resolved evidence.
+
+        Returns:
+            list[BaseMessage]: Copies of the tool messages holding search
+                results, along with the other messages unchanged.
+        """
+        cited: list[BaseMessage] = []
+        for message in messages:
+            results = _tool_results(message)
+            if results is None:
+                cited.append(message)
+                continue
+            cited.append(
+                message.model_copy(
+                    update={
+                        "content": json.dumps(
+                            [self._cite_result(result) for result in results],
+                            ensure_ascii=False,
+                        )
+                    }
+                )
+            )
+        return cited
+
+    def _cite_result(self, result: Any) -> Any:
+        items = _items(result)
+        if items is None:
+            return result
+        return {
+            **result,
+            "results": [
+                {
+                    "id": self.add(item["url"]).id,
+                    "title": item.get("title"),
+                    "content": item.get("content"),
+                }
+                for item in items
+            ],
+        }
+
+    def references(self, value: str, cited: Sequence[str] = ()) -> list[str]:
+        """Render the references of the sources cited by an answer.
+
+        Args:
+            value: The answer text, citing the sources as `[1]` or `[1, 2]`.
+            cited: The references listed by the answer, starting with the
+                ID of the source they cite.
+
+        Returns:
+            list[str]: The Markdown references of the indexed sources cited,
+                by ID; unknown IDs are dropped.
+        """
+        ids = {
+            int(id)
+            for text in (value, *cited)
+            for match in _CITATION_PATTERN.finditer(text)
+            for id in match.group(1).split(",")
+        }
+        return [
+            citation.to_markdown()
+            for id in sorted(ids)
+            if (citation := self.get(id)) is not None
+        ]
+
+
+__all__ = [
+    "SNIPPET_CHARS",
+    "Citation",
+    "CitationIndex",
+]
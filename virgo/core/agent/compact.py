@@ -0,0 +1,174 @@
+"""Compact JSON schemas for the structured outputs of the Virgo assistant.
+
+The schemas of the structured outputs are sent to the model on every draft,
+revise and format call. Their field examples and long descriptions help weaker
+models, but cost prompt tokens on every call. The compact variants of the
+schemas drop the examples and titles, and keep only the first sentence of each
+description, while parsing into the same models.
+"""
+
+import functools
+import json
+import math
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, override
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
+from pydantic.json_schema import (
+    DEFAULT_REF_TEMPLATE,
+    GenerateJsonSchema,
+    JsonSchemaMode,
+)
+from pydantic_core import CoreSchema
+
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?:])(?:\s|$)", re.DOTALL)
+
+CHARS_PER_TOKEN = 4.0
+"""Average number of characters per token, used to estimate the schema sizes."""
+
+
+def _shorten(description: str) -> str:
+    """Keep the first sentence of a description, on a single line."""
+    description = " ".join(description.split())
+    match = _FIRST_SENTENCE.match(description)
+    return match.group(1) if match else description
+
+
+def _compact(schema: Any, root: bool = False) -> Any:
+    """Recursively strip the examples and titles, and shorten the descriptions."""
+    if isinstance(schema, list):
+        return [_compact(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    compact: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key == "examples" or (key == "title" and not root):
+            continue
+        if key == "description" and isinstance(value, str):
+            compact[key] = _shorten(value)
+        elif key == "properties" and isinstance(value, dict):
+            compact[key] = {name: _compact(field) for name, field in value.items()}
+        else:
+            compact[key] = _compact(value)
+    return compact
+
+
+class CompactJsonSchema(GenerateJsonSchema):
+    """JSON schema generator emitting compact schemas."""
+
+    @override
+    def generate(
+        self, schema: CoreSchema, mode: JsonSchemaMode = "validation"
+    ) -> dict[str, Any]:
+        return _compact(super().generate(schema, mode), root=True)
+
+
+class _CompactSchema(BaseModel):
+    """Base of the compact models, generating compact JSON schemas by default."""
+
+    @override
+    @classmethod
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: type[GenerateJsonSchema] = CompactJsonSchema,
+        mode: JsonSchemaMode = "validation",
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        return super().model_json_schema(
+            by_alias, ref_template, schema_generator, mode, **kwargs
+        )
+
+
+@functools.cache
+def compact_model[M: BaseModel](model: type[M]) -> type[M]:
+    """Create the compact variant of a structured output model.
+
+    The variant is a subclass of the model, with the same name so that the
+    tool calls keep their names, and generating compact JSON schemas.
+
+    Args:
+        model: The structured output model, such as `Answer`.
+
+    Returns:
+        type[M]: The compact variant of the model.
+    """
+    return type(model)(
+        model.__name__,
+        (_CompactSchema, model),
+        {
+            "__module__": model.__module__,
+            "__qualname__": model.__qualname__,
+            "__doc__": _shorten(model.__doc__ or ""),
+        },
+    )
+
+
+def schema_for[M: BaseModel](model: type[M], compact: bool) -> type[M]:
+    """Get the model to use for structured outputs, compact or not."""
+    return compact_model(model) if compact else model
+
+
+def estimate_schema_tokens(model: type[BaseModel]) -> int:
+    """Estimate the prompt tokens taken by the tool definition of a model."""
+    definition = json.dumps(convert_to_openai_tool(model), separators=(",", ":"))
+    return math.ceil(len(definition) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class SchemaSavings:
+    """The prompt tokens saved by the compact schema of a model call."""
+
+    call: str
+    """The call sending the schema, such as the node name."""
+
+    schema: str
+    """The name of the structured output model."""
+
+    full_tokens: int
+    """The estimated tokens of the full schema."""
+
+    compact_tokens: int
+    """The estimated tokens of the compact schema."""
+
+    @property
+    def saved_tokens(self) -> int:
+        """The estimated tokens saved on each call."""
+        return self.full_tokens - self.compact_tokens
+
+
+def schema_savings(
+    calls: Sequence[tuple[str, type[BaseModel]]],
+) -> list[SchemaSavings]:
+    """Estimate the prompt tokens saved by the compact schemas of each call.
+
+    Args:
+        calls: The calls, with the structured output model they send.
+
+    Returns:
+        list[SchemaSavings]: The estimated savings of each call.
+    """
+    return [
+        SchemaSavings(
+            call=call,
+            schema=model.__name__,
+            full_tokens=estimate_schema_tokens(model),
+            compact_tokens=estimate_schema_tokens(compact_model(model)),
+        )
+        for call, model in calls
+    ]
+
+
+__all__ = [
+    "CHARS_PER_TOKEN",
+    "CompactJsonSchema",
+    "SchemaSavings",
+    "compact_model",
+    "estimate_schema_tokens",
+    "schema_for",
+    "schema_savings",
+]
@@ -0,0 +1,83 @@
+"""Per-invocation configuration of the Virgo graph.
+
+A single compiled graph serves requests with different models, iteration
+limits, search settings or deadlines: they are read from the `configurable`
+mapping of the `RunnableConfig` each invocation runs with, such as
+`graph.invoke(state, {"configurable": {"model_name": "gpt-4o-mini"}})`.
+Unset fields fall back to the defaults the graph was built with.
+"""
+
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Literal, Self
+
+from langchain_core.runnables import RunnableConfig, ensure_config
+
+type SearchDepth = Literal["basic", "advanced"]
+"""Supported Tavily search depths."""
+
+type SearchTopic = Literal["general", "news", "finance"]
+"""Supported Tavily search topics."""
+
+
+@dataclass(frozen=True)
+class GraphConfiguration:
+    """Settings of a graph invocation, overriding the graph defaults."""
+
+    genai_provider: str | None = None
+    """The GenAI provider of the chat model, such as `openai` or `ollama`."""
+
+    model_name: str | None = None
+    """The name of the chat model."""
+
+    max_iterations: int | None = None
+    """The maximum number of research and revision iterations."""
+
+    search_max_results: int | None = None
+    """The maximum number of results of each search query."""
+
+    search_depth: SearchDepth | None = None
+    """The depth of the search queries."""
+
+    search_topic: SearchTopic | None = None
+    """The topic of the search queries."""
+
+    deadline: float | None = None
+    """The wall-clock time, as a `time.time()` timestamp, the article is due by."""
+
+    @classmethod
+    def from_runnable_config(cls, config: RunnableConfig | None = None) -> Self:
+        """Read the configuration of an invocation.
+
+        Args:
+            config: The invocation config. Defaults to the config of the
+                runnable currently executing, if any.
+
+        Returns:
+            Self: The configuration, with the fields that are not configured unset.
+        """
+        configurable = ensure_config(config).get("configurable", {})
+        return cls(
+            **{
+                field.name: configurable[field.name]
+                for field in fields(cls)
+                if configurable.get(field.name) is not None
+            }
+        )
+
+    def remaining_time(self) -> float | None:
+        """The seconds left before the deadline, if any, down to zero."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.time(), 0.0)
+
+    def to_configurable(self) -> dict[str, Any]:
+        """Convert the configuration to the `configurable` mapping of an invocation."""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+__all__ = [
+    "GraphConfiguration",
+    "SearchDepth",
+    "SearchTopic",
+]
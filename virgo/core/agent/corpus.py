@@ -0,0 +1,341 @@
+"""On-disk inverted index of a local corpus of documents.
+
+Markdown, text and HTML documents are split into chunks, whose terms are
+stored in an inverted index within a SQLite database file. Re-indexing a
+directory only processes the files added, changed or removed since the last
+build. Queries are scored with Okapi BM25 over the postings of their terms.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Final, override
+
+import numpy as np
+
+from virgo.core.agent.ranking import BM25Ranker, chunk_text, tokenize
+
+DOCUMENT_SUFFIXES: Final[frozenset[str]] = frozenset(
+    {".md", ".markdown", ".txt", ".html", ".htm"}
+)
+"""The suffixes of the indexed documents."""
+
+
+class _TextExtractor(HTMLParser):
+    """Extract the title and visible text of an HTML document."""
+
+    _SKIPPED: Final = frozenset({"script", "style", "noscript", "template"})
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.title = ""
+        self._parts: list[str] = []
+        self._stack: list[str] = []
+
+    @override
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._stack.append(tag)
+        if tag in {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "section"}:
+            self._parts.append("\n\n")
+
+    @override
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._stack:
+            del self._stack[len(self._stack) - 1 - self._stack[::-1].index(tag) :]
+
+    @override
+    def handle_data(self, data: str) -> None:
+        if any(tag in self._SKIPPED for tag in self._stack):
+            return
+        if self._stack and self._stack[-1] == "title":
+            self.title += data.strip()
+            return
+        self._parts.append(data)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+def read_document(path: Path) -> tuple[str, str]:
+    """Read the title and text of a document.
+
+    The title is the HTML title or the first Markdown heading, and defaults to
+    the file name.
+
+    Args:
+        path: The document file.
+
+    Returns:
+        tuple[str, str]: The title and the text of the document.
+    """
+    content = path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix.lower() in {".html", ".htm"}:
+        extractor = _TextExtractor()
+        extractor.feed(content)
+        return extractor.title or path.stem, extractor.text
+    for line in content.splitlines():
+        if line.startswith("# "):
+            return line[2:].strip(), content
+    return path.stem, content
+
+
+@dataclass(frozen=True)
+class CorpusHit:
+    """A chunk of a document matching a query."""
+
+    path: str
+    """The path of the document."""
+
+    title: str
+    """The title of the document."""
+
+    content: str
+    """The text of the matching chunk."""
+
+    score: float
+    """The BM25 score of the chunk."""
+
+
+@dataclass
+class IndexReport:
+    """The outcome of an index build."""
+
+    added: int = 0
+    """How many documents were indexed for the first time."""
+
+    updated: int = 0
+    """How many changed documents were re-indexed."""
+
+    removed: int = 0
+    """How many documents were removed from the index, their files being gone."""
+
+    unchanged: int = 0
+    """How many documents were left as they were."""
+
+
+class CorpusIndex:
+    """Inverted index of a local corpus, stored in a SQLite database file."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        chunk_words: int = 120,
+        ranker: BM25Ranker | None = None,
+    ) -> None:
+        """Open the index, creating it if needed.
+
+        Args:
+            path: The SQLite database file.
+            chunk_words: The maximum number of words of the indexed chunks.
+            ranker: The BM25 ranker scoring the postings, with its defaults if None.
+        """
+        self._chunk_words = chunk_words
+        self._ranker = ranker or BM25Ranker()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, "
+                "title TEXT NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, digest TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "id INTEGER PRIMARY KEY, document_id INTEGER NOT NULL, "
+                "text TEXT NOT NULL, length INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS chunks_document ON chunks(document_id);"
+                "CREATE TABLE IF NOT EXISTS postings ("
+                "term TEXT NOT NULL, chunk_id INTEGER NOT NULL, "
+                "frequency INTEGER NOT NULL, PRIMARY KEY (term, chunk_id)"
+                ") WITHOUT ROWID;"
+                "CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);"
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM documents"
+            ).fetchone()
+        return count
+
+    def build(self, directory: str | Path) -> IndexReport:
+        """Index the documents of a directory, re-indexing only what changed.
+
+        Args:
+            directory: The directory of the documents, searched recursively.
+
+        Returns:
+            IndexReport: How many documents were added, updated, removed or kept.
+        """
+        root = Path(directory).resolve()
+        report = IndexReport()
+        seen: set[str] = set()
+        for path in _documents(root):
+            seen.add(str(path))
+            report_field = self._index_document(path)
+            setattr(report, report_field, getattr(report, report_field) + 1)
+
+        with self._lock, self._connection:
+            indexed = self._connection.execute(
+                "SELECT id, path FROM documents WHERE path LIKE ? ESCAPE '\\'",
+                (_like_prefix(root),),
+            ).fetchall()
+            for document_id, path in indexed:
+                if path not in seen:
+                    self._delete(document_id)
+                    report.removed += 1
+        return report
+
+    def _index_document(self, path: Path) -> str:
+        """Index a document if new or changed, returning the report field to count."""
+        stat = path.stat()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, mtime_ns, size, digest FROM documents WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if row is not None and (row[1], row[2]) == (stat.st_mtime_ns, stat.st_size):
+            return "unchanged"
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        with self._lock, self._connection:
+            if row is not None and row[3] == digest:
+                self._connection.execute(
+                    "UPDATE documents SET mtime_ns = ?, size = ? WHERE id = ?",
+                    (stat.st_mtime_ns, stat.st_size, row[0]),
+                )
+                return "unchanged"
+            if row is not None:
+                self._delete(row[0])
+
+            title, text = read_document(path)
+            document_id = self._connection.execute(
+                "INSERT INTO documents (path, title, mtime_ns, size, digest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(path), title, stat.st_mtime_ns, stat.st_size, digest),
+            ).lastrowid
+            for chunk in chunk_text(text, self._chunk_words):
+                terms = Counter(tokenize(chunk))
+                chunk_id = self._connection.execute(
+                    "INSERT INTO chunks (document_id, text, length) VALUES (?, ?, ?)",
+                    (document_id, chunk, sum(terms.values())),
+                ).lastrowid
+                self._connection.executemany(
+                    "INSERT INTO postings (term, chunk_id, frequency) VALUES (?, ?, ?)",
+                    [(term, chunk_id, count) for term, count in terms.items()],
+                )
+        return "added" if row is None else "updated"
+
+    def _delete(self, document_id: int) -> None:
+        """Delete a document, its chunks and their postings."""
+        self._connection.execute(
+            "DELETE FROM postings WHERE chunk_id IN "
+            "(SELECT id FROM chunks WHERE document_id = ?)",
+            (document_id,),
+        )
+        self._connection.execute(
+            "DELETE FROM chunks WHERE document_id = ?", (document_id,)
+        )
+        self._connection.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def search(self, query: str, limit: int = 5) -> list[CorpusHit]:
+        """Find the chunks best matching a query.
+
+        Args:
+            query: The query.
+            limit: The maximum number of chunks to return.
+
+        Returns:
+            list[CorpusHit]: The matching chunks, best first.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            chunk_count, average_length = self._connection.execute(
+                "SELECT COUNT(*), AVG(length) FROM chunks"
+            ).fetchone()
+            placeholders = ",".join("?" * len(terms))
+            postings = self._connection.execute(
+                "SELECT p.term, p.chunk_id, p.frequency, c.length "
+                f"FROM postings p JOIN chunks c ON c.id = p.chunk_id "
+                f"WHERE p.term IN ({placeholders})",
+                terms,
+            ).fetchall()
+        if not postings:
+            return []
+
+        chunk_ids = np.array([posting[1] for posting in postings])
+        frequencies = np.array([posting[2] for posting in postings], dtype=float)
+        lengths = np.array([posting[3] for posting in postings], dtype=float)
+        _, term_ids = np.unique(
+            [posting[0] for posting in postings], return_inverse=True
+        )
+        partial = self._ranker.term_scores(
+            frequencies,
+            lengths,
+            np.bincount(term_ids)[term_ids],
+            chunk_count,
+            average_length,
+        )
+        candidates, positions = np.unique(chunk_ids, return_inverse=True)
+        scores = np.bincount(positions, weights=partial)
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return self._hits(
+            [int(candidates[index]) for index in best],
+            [float(scores[index]) for index in best],
+        )
+
+    def _hits(self, chunk_ids: list[int], scores: list[float]) -> list[CorpusHit]:
+        with self._lock:
+            placeholders = ",".join("?" * len(chunk_ids))
+            rows = {
+                row[0]: row[1:]
+                for row in self._connection.execute(
+                    "SELECT c.id, d.path, d.title, c.text FROM chunks c "
+                    "JOIN documents d ON d.id = c.document_id "
+                    f"WHERE c.id IN ({placeholders})",
+                    chunk_ids,
+                )
+            }
+        hits = []
+        for chunk_id, score in zip(chunk_ids, scores, strict=True):
+            path, title, text = rows[chunk_id]
+            hits.append(CorpusHit(path=path, title=title, content=text, score=score))
+        return hits
+
+
+def _documents(root: Path) -> Iterator[Path]:
+    """Iterate over the documents of a directory, recursively and in order."""
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES:
+            yield path
+
+
+def _like_prefix(root: Path) -> str:
+    """Build the `LIKE` pattern matching the paths below a directory."""
+    # The separator is escaped along with the path: on Windows it is the
+    # escape character itself.
+    prefix = f"{root}{os.sep}"
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+__all__ = [
+    "DOCUMENT_SUFFIXES",
+    "CorpusHit",
+    "CorpusIndex",
+    "IndexReport",
+    "read_document",
+]
@@ -0,0 +1,212 @@
+"""Content-addressed storage for research evidence.
+
+Search results are stored once, keyed by the SHA-256 hash of their canonical
+JSON serialization. Graph state and tool messages only carry compact references
+to them, which are resolved back into the full content when a prompt is built.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Final, override
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+EVIDENCE_REF_PREFIX: Final[str] = "evidence:"
+"""Prefix of the references handed out by the evidence stores."""
+
+_QUOTED_REF_PATTERN: Final[re.Pattern[str]] = re.compile(
+    rf'"{EVIDENCE_REF_PREFIX}([0-9a-f]{{64}})"'
+)
+
+
+class EvidenceStore(ABC):
+    """Abstract base class for content-addressed evidence stores."""
+
+    def put(self, item: object) -> str:
+        """Store an item, if not stored yet, and return its reference.
+
+        Args:
+            item: A JSON-serializable search result.
+
+        Returns:
+            str: The reference to the stored item.
+        """
+        payload = json.dumps(item, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        self._save(digest, payload)
+        return f"{EVIDENCE_REF_PREFIX}{digest}"
+
+    def get(self, ref: str) -> object | None:
+        """Get the item behind a reference.
+
+        Args:
+            ref: A reference returned by `put`.
+
+        Returns:
+            object | None: The stored item, or None if the reference is unknown.
+        """
+        payload = self._load(ref.removeprefix(EVIDENCE_REF_PREFIX))
+        return None if payload is None else json.loads(payload)
+
+    def resolve(self, content: str) -> str:
+        """Replace the JSON-quoted references in a text with the stored items.
+
+        Since the items are stored as JSON, resolving a JSON document
+        yields the same document that would have been produced inline.
+        Unknown references are left untouched.
+
+        Args:
+            content: The text containing references.
+
+        Returns:
+            str: The text with the known references replaced.
+        """
+
+        def _replace(match: re.Match[str]) -> str:
+            payload = self._load(match.group(1))
+            return match.group(0) if payload is None else payload
+
+        return _QUOTED_REF_PATTERN.sub(_replace, content)
+
+    def resolve_messages(self, messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+        """Resolve the references held by tool messages.
+
+        Tool messages hold either a JSON document, resolved with `resolve`, or a
+        list of content blocks, where each block that is a reference is replaced
+        by the stored item.
+
+        Args:
+            messages: The messages to resolve.
+
+        Returns:
+            list[BaseMessage]: Copies of the tool messages holding references,
+                along with the other messages unchanged.
+        """
+        return [
+            message.model_copy(
+                update={"content": self._resolve_content(message.content)}
+            )
+            if isinstance(message, ToolMessage)
+            else message
+            for message in messages
+        ]
+
+    def _resolve_content(self, content: str | list) -> str | list:
+        if isinstance(content, str):
+            return self.resolve(content)
+        return [self._resolve_block(block) for block in content]
+
+    def _resolve_block(self, block: object) -> object:
+        if not (isinstance(block, str) and block.startswith(EVIDENCE_REF_PREFIX)):
+            return block
+        payload = self._load(block.removeprefix(EVIDENCE_REF_PREFIX))
+        if payload is None:
+            return block
+        item = json.loads(payload)
+        return item if isinstance(item, str) else payload
+
+    @abstractmethod
+    def _save(self, digest: str, payload: str) -> None:
+        """Persist a payload under its digest, unless it is already stored."""
+        ...
+
+    @abstractmethod
+    def _load(self, digest: str) -> str | None:
+        """Load the payload stored under a digest, if any."""
+        ...
+
+
+class InMemoryEvidenceStore(EvidenceStore):
+    """Evidence store keeping the payloads in a dictionary.
+
+    The store lives as long as the process, so it evicts the least recently
+    used payloads beyond its capacity. The references to evicted payloads are
+    left unresolved: long-lived processes had better use the SQLite store.
+    """
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        """Initialize the store.
+
+        Args:
+            max_entries: How many payloads are kept before evicting the least
+                recently used ones, unbounded if None.
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._payloads: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    @override
+    def _save(self, digest: str, payload: str) -> None:
+        with self._lock:
+            self._payloads.setdefault(digest, payload)
+            self._payloads.move_to_end(digest)
+            if self._max_entries is not None:
+                while len(self._payloads) > self._max_entries:
+                    self._payloads.popitem(last=False)
+
+    @override
+    def _load(self, digest: str) -> str | None:
+        with self._lock:
+            payload = self._payloads.get(digest)
+            if payload is not None:
+                self._payloads.move_to_end(digest)
+            return payload
+
+
+class SQLiteEvidenceStore(EvidenceStore):
+    """Evidence store backed by a SQLite database file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS evidence "
+                "(digest TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM evidence"
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @override
+    def _save(self, digest: str, payload: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO evidence (digest, payload) VALUES (?, ?)",
+                (digest, payload),
+            )
+
+    @override
+    def _load(self, digest: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM evidence WHERE digest = ?", (digest,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+
+__all__ = [
+    "EVIDENCE_REF_PREFIX",
+    "EvidenceStore",
+    "InMemoryEvidenceStore",
+    "SQLiteEvidenceStore",
+]
@@ -1,30 +1,80 @@
 """Graph agent components for Virgo."""
 
+from collections.abc import Mapping, Sequence
+
 from langchain_core.language_models import BaseChatModel
 from langgraph.graph.state import CompiledStateGraph
 
-from virgo.core.agent.graph.builder import create_graph_builder
+from virgo.core.agent.evidence import EvidenceStore
+from virgo.core.agent.graph.builder import (
+    DEFAULT_DEADLINE_RESERVE,
+    create_graph_builder,
+)
+from virgo.core.agent.graph.hooks import NodeHook
 from virgo.core.agent.graph.nodes import draft, format, research, revise
 from virgo.core.agent.graph.state import AnswerState
+from virgo.core.agent.ranking import BM25Ranker
 
 type VirgoGraph = CompiledStateGraph[AnswerState, None, AnswerState, AnswerState]
 
 
-def create_graph(llm: BaseChatModel, researcher: research.Researcher) -> VirgoGraph:
+def create_graph(
+    llm: BaseChatModel,
+    researcher: research.Researcher,
+    *,
+    evidence_store: EvidenceStore | None = None,
+    node_hooks: Sequence[NodeHook] = (),
+    compact_schemas: bool = False,
+    ranker: BM25Ranker | None = None,
+    deadline_reserve: float = DEFAULT_DEADLINE_RESERVE,
+    node_llms: Mapping[str, BaseChatModel] | None = None,
+    citations: bool = False,
+    revision_patches: bool = False,
+) -> VirgoGraph:
     """Create the Virgo graph from a language model.
 
     Args:
         llm: The language model to be used by the agent.
+        researcher: The researcher callable to run the search queries.
+        evidence_store: Optional store keeping the search results out of the graph state.
+        node_hooks: Hooks to run around every node execution, such as profilers.
+        compact_schemas: Whether to send compact structured output schemas,
+            without examples and with short descriptions, to save prompt tokens.
+        ranker: Optional ranker forwarding only the search result chunks most
+            relevant to the current critique to the revisor.
+        deadline_reserve: The seconds kept for the formatter before the
+            deadline of a run, below which the graph skips to FORMAT.
+        node_llms: Optional language models of specific nodes, by node name,
+            such as with capped output tokens. The other nodes use `llm`.
+        citations: Whether the revisor cites the sources by their ID in a
+            citation index built from the search results, the references
+            being rendered locally instead of by the models.
+        revision_patches: Whether the revisions after the first one are
+            edits of the previous answer, applied locally, instead of full
+            rewrites.
 
     Returns:
         VirgoGraph: A configured instance of VirgoGraph.
     """
+    node_llms = node_llms or {}
     builder = create_graph_builder(
         {
-            "DRAFT": draft.create_node(llm),
-            "RESEARCH": research.create_node(researcher),
-            "REVISE": revise.create_node(llm),
-            "FORMAT": format.create_node(llm),
-        }
+            "DRAFT": draft.create_node(node_llms.get("DRAFT", llm), compact_schemas),
+            "RESEARCH": research.create_node(
+                researcher, evidence_store, compact_schemas, ranker
+            ),
+            "REVISE": revise.create_node(
+                node_llms.get("REVISE", llm),
+                evidence_store,
+                compact_schemas,
+                citations,
+                revision_patches,
+            ),
+            "FORMAT": format.create_node(
+                node_llms.get("FORMAT", llm), compact_schemas, citations
+            ),
+        },
+        node_hooks,
+        deadline_reserve,
     )
     return builder.compile()
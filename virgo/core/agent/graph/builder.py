@@ -5,17 +5,26 @@ This module defines the structure and nodes of the Virgo agent's computational g
 
 import os
 import sys
+from collections.abc import Callable, Sequence
 from typing import Final, TypedDict
 
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import StateNode
 from langgraph.prebuilt import ToolNode
 
+from virgo.core.agent.configuration import GraphConfiguration
+from virgo.core.agent.graph.deadline import is_out_of_time, with_deadline
+from virgo.core.agent.graph.hooks import NodeHook, wrap_node
+from virgo.core.agent.graph.nodes.format import render_locally
 from virgo.core.agent.graph.state import AnswerState
 
 VIRGO_MAX_ITERATIONS: Final[int] = int(os.getenv("VIRGO_MAX_ITERATIONS", 5))
 
+DEFAULT_DEADLINE_RESERVE: Final[float] = 10.0
+"""Seconds kept for the formatter before the deadline of a run, by default."""
+
 # Define interned node names for efficiency
 DRAFT: Final[str] = sys.intern("draft")
 RESEARCH: Final[str] = sys.intern("research")
@@ -40,11 +49,19 @@ class VirgoNodes(TypedDict):
     FORMAT: StateNode[AnswerState]
 
 
-def create_graph_builder(nodes: VirgoNodes) -> _VirgoGraphBuilder:
+def create_graph_builder(
+    nodes: VirgoNodes,
+    node_hooks: Sequence[NodeHook] = (),
+    deadline_reserve: float = DEFAULT_DEADLINE_RESERVE,
+) -> _VirgoGraphBuilder:
     """Create the state graph builder for Virgo.
 
     Args:
         nodes: The nodes to be added to the graph.
+        node_hooks: Hooks to run around every node execution, outermost first.
+        deadline_reserve: The seconds kept for the formatter when a run has a
+            deadline: the other nodes are abandoned when they would eat into
+            it, and with less time left, the graph skips straight to FORMAT.
 
     Returns:
         VirgoStateGraph: The state graph builder for Virgo.
@@ -54,21 +71,33 @@ def create_graph_builder(nodes: VirgoNodes) -> _VirgoGraphBuilder:
     )
 
     # Nodes
-    builder.add_node(DRAFT, nodes["DRAFT"])
-    builder.add_node(RESEARCH, nodes["RESEARCH"])
-    builder.add_node(REVISE, nodes["REVISE"])
-    builder.add_node(FORMAT, nodes["FORMAT"])
-
-    # Edges
-    builder.add_edge(DRAFT, RESEARCH)
-    builder.add_edge(RESEARCH, REVISE)
+    for name, node in (
+        (DRAFT, with_deadline(DRAFT, nodes["DRAFT"], reserve=deadline_reserve)),
+        (
+            RESEARCH,
+            with_deadline(RESEARCH, nodes["RESEARCH"], reserve=deadline_reserve),
+        ),
+        (REVISE, with_deadline(REVISE, nodes["REVISE"], reserve=deadline_reserve)),
+        (FORMAT, with_deadline(FORMAT, nodes["FORMAT"], render_locally)),
+    ):
+        builder.add_node(
+            name, wrap_node(name, node, node_hooks) if node_hooks else node
+        )
+
+    # Edges, skipping to FORMAT when running out of time
+    builder.add_conditional_edges(
+        DRAFT, _unless_out_of_time(RESEARCH, deadline_reserve)
+    )
+    builder.add_conditional_edges(
+        RESEARCH, _unless_out_of_time(REVISE, deadline_reserve)
+    )
 
     # Entry point
     builder.set_entry_point(DRAFT)
 
     builder.add_conditional_edges(
         REVISE,
-        _event_loop,
+        _unless_out_of_time(_event_loop, deadline_reserve),
     )
 
     # Add edge from FORMAT to END
@@ -77,18 +106,47 @@ def create_graph_builder(nodes: VirgoNodes) -> _VirgoGraphBuilder:
     return builder
 
 
+def _unless_out_of_time(
+    next_node: str | Callable[[AnswerState, RunnableConfig | None], str],
+    reserve: float,
+) -> Callable[[AnswerState, RunnableConfig | None], str]:
+    """Route to the next node, or straight to FORMAT when running out of time.
+
+    Args:
+        next_node: The next node, or the routing function choosing it.
+        reserve: The seconds kept for the formatter before the deadline.
+
+    Returns:
+        Callable: The routing function.
+    """
+
+    def route(state: AnswerState, config: RunnableConfig | None = None) -> str:
+        if is_out_of_time(reserve, config):
+            return FORMAT
+        return next_node if isinstance(next_node, str) else next_node(state, config)
+
+    route.__name__ = f"route_{getattr(next_node, '__name__', next_node)}"
+    return route
+
+
 # Define the event loop for the graph
-def _event_loop(state: AnswerState) -> str:
+def _event_loop(state: AnswerState, config: RunnableConfig | None = None) -> str:
     """The event loop that runs the graph until the final answer is produced, or the maximum number of iterations is reached.
 
     Args:
         state (AnswerState): The current state of the graph.
+        config (RunnableConfig, optional): The invocation config, whose
+            `max_iterations` overrides the `VIRGO_MAX_ITERATIONS` default.
     Returns:
         str: The next node to execute.
     """
+    max_iterations = (
+        GraphConfiguration.from_runnable_config(config).max_iterations
+        or VIRGO_MAX_ITERATIONS
+    )
     count_tool_invocations = sum(
         isinstance(msg, ToolMessage) for msg in state["messages"]
     )
-    if count_tool_invocations >= VIRGO_MAX_ITERATIONS:
+    if count_tool_invocations >= max_iterations:
         return FORMAT
     return RESEARCH
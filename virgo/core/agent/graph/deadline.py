@@ -0,0 +1,138 @@
+"""Per-request deadlines of the graph runs.
+
+The `deadline` of the invocation configuration bounds the wall-clock time of a
+run. Each node but the formatter is given the remaining time minus the reserve
+of the formatter, and the formatter the remaining time: a node still running
+when its time runs out is abandoned, and its fallback update is used instead.
+Once less than the reserve is left, the graph skips straight to FORMAT with the
+latest answer, which is rendered locally if even the formatter is out of time.
+The fallbacks mark the run as degraded, so that its article is not cached.
+
+Each node runs with the deadline of its own time as the deadline of its
+configuration, which bounds the timeouts of its calls to the chat models and
+the search API: a node whose calls time out returns its fallback update too.
+As a last resort, the nodes still running at their deadline are abandoned in
+daemon threads until their calls return, and their results are discarded.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from langchain_core.runnables import RunnableConfig, ensure_config
+from langchain_core.runnables.config import var_child_runnable_config
+from langgraph.graph.state import StateNode
+from langgraph.prebuilt import ToolNode
+
+from virgo.core.agent.configuration import GraphConfiguration
+from virgo.core.agent.graph.hooks import invoke_node
+from virgo.core.agent.graph.state import AnswerState
+
+logger = logging.getLogger(__name__)
+
+
+def remaining_time(config: RunnableConfig | None = None) -> float | None:
+    """Get the seconds left before the deadline of the current run, if any."""
+    return GraphConfiguration.from_runnable_config(config).remaining_time()
+
+
+def is_out_of_time(reserve: float, config: RunnableConfig | None = None) -> bool:
+    """Tell whether less than `reserve` seconds are left before the deadline."""
+    remaining = remaining_time(config)
+    return remaining is not None and remaining <= reserve
+
+
+def _with_deadline(config: RunnableConfig, deadline: float) -> RunnableConfig:
+    """Copy an invocation config with another deadline."""
+    configurable = {**config.get("configurable", {}), "deadline": deadline}
+    return RunnableConfig(**{**config, "configurable": configurable})  # type: ignore[typeddict-item]
+
+
+def _invoke_within(
+    node: StateNode[AnswerState] | ToolNode,
+    state: AnswerState,
+    config: RunnableConfig,
+) -> AnswerState:
+    """Invoke a node with a config also read by its calls from the context."""
+    var_child_runnable_config.set(config)
+    return invoke_node(node, state, config)
+
+
+def keep_state(state: AnswerState) -> AnswerState:
+    """Fallback of the nodes abandoned at the deadline, keeping the latest answer."""
+    return AnswerState(
+        messages=[],
+        final_answer=state.get("final_answer"),
+        formatted_article=None,
+        degraded=True,
+    )
+
+
+def with_deadline(
+    name: str,
+    node: StateNode[AnswerState] | ToolNode,
+    fallback: Callable[[AnswerState], AnswerState] = keep_state,
+    reserve: float = 0.0,
+) -> StateNode[AnswerState]:
+    """Wrap a node so that it returns its fallback update at the deadline.
+
+    Without a deadline, the node runs as is. Otherwise, it runs in a separate
+    thread with the remaining time minus the reserve as its own deadline, and
+    is waited for no longer than that. The fallback update is also returned
+    when the node fails past its deadline, as its calls time out then.
+
+    Args:
+        name: The name of the node in the graph.
+        node: The node to wrap, either a function or a runnable.
+        fallback: The state update returned when the node runs out of time.
+        reserve: The seconds of the remaining time kept for the next nodes,
+            such as the formatter.
+
+    Returns:
+        StateNode[AnswerState]: The wrapped node.
+    """
+
+    def timed(state: AnswerState, config: RunnableConfig | None = None) -> AnswerState:
+        # Called by the node hooks without config, read from the current context.
+        config = ensure_config(config)
+        remaining = remaining_time(config)
+        if remaining is None:
+            return invoke_node(node, state, config)
+        remaining -= reserve
+        if remaining > 0:
+            node_config = _with_deadline(config, time.time() + remaining)
+            future: Future[AnswerState] = Future()
+            context = contextvars.copy_context()
+
+            def run() -> None:
+                try:
+                    future.set_result(
+                        context.run(_invoke_within, node, state, node_config)
+                    )
+                except BaseException as error:  # noqa: BLE001
+                    future.set_exception(error)
+
+            threading.Thread(target=run, name=f"virgo-{name}", daemon=True).start()
+            try:
+                return future.result(timeout=remaining)
+            except TimeoutError:
+                pass
+            except Exception:
+                if remaining_time(node_config):
+                    raise
+        logger.warning("Node %s ran out of time, using its fallback.", name)
+        return fallback(state)
+
+    timed.__name__ = name
+    return timed
+
+
+__all__ = [
+    "is_out_of_time",
+    "keep_state",
+    "remaining_time",
+    "with_deadline",
+]
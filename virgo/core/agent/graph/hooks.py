@@ -0,0 +1,93 @@
+"""Hooks running around the execution of the graph nodes.
+
+A node hook is a callable receiving a `NodeRun` and returning a context manager,
+entered right before the node runs and exited right after it. This is the
+extension point used by the profilers and the telemetry collectors.
+"""
+
+from collections.abc import Sequence
+from contextlib import AbstractContextManager, ExitStack
+from dataclasses import dataclass
+from typing import Protocol
+
+from langchain_core.runnables import Runnable, RunnableConfig
+from langgraph.graph.state import StateNode
+from langgraph.prebuilt import ToolNode
+
+from virgo.core.agent.graph.state import AnswerState
+
+
+@dataclass
+class NodeRun:
+    """A single execution of a graph node, as seen by the node hooks."""
+
+    name: str
+    """The name of the node."""
+
+    state: AnswerState
+    """The state the node was invoked with."""
+
+    output: AnswerState | None = None
+    """The state update returned by the node, set once it has returned."""
+
+
+class NodeHook(Protocol):
+    """Callable creating the context manager that wraps a node execution."""
+
+    def __call__(self, run: NodeRun) -> AbstractContextManager[object]:
+        """Create the context manager wrapping the given node execution.
+
+        Args:
+            run: The node execution about to start.
+
+        Returns:
+            AbstractContextManager: The context manager wrapping the execution.
+        """
+        ...
+
+
+def wrap_node(
+    name: str,
+    node: StateNode[AnswerState] | ToolNode,
+    hooks: Sequence[NodeHook],
+) -> StateNode[AnswerState]:
+    """Wrap a node so that it runs within the given hooks.
+
+    Args:
+        name: The name of the node in the graph.
+        node: The node to wrap, either a function or a runnable.
+        hooks: The hooks to run around the node, outermost first.
+
+    Returns:
+        StateNode[AnswerState]: The wrapped node.
+    """
+
+    def hooked(state: AnswerState, config: RunnableConfig) -> AnswerState:
+        run = NodeRun(name=name, state=state)
+        with ExitStack() as stack:
+            for hook in hooks:
+                stack.enter_context(hook(run))
+            run.output = invoke_node(node, state, config)
+        return run.output
+
+    hooked.__name__ = name
+    return hooked
+
+
+def invoke_node(
+    node: StateNode[AnswerState] | ToolNode,
+    state: AnswerState,
+    config: RunnableConfig,
+) -> AnswerState:
+    """Invoke a node, passing the config along to runnable nodes."""
+    if isinstance(node, Runnable):
+        return node.invoke(state, config)
+    return node(state)  # type: ignore[call-arg, operator]
+
+
+__all__ = [
+    "NodeHook",
+    "NodeRun",
+    "invoke_node",
+    "wrap_node",
+]
@@ -5,6 +5,7 @@ from datetime import datetime
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts.chat import ChatPromptTemplate, MessagesPlaceholder
 
+from virgo.core.agent.compact import schema_for
 from virgo.core.agent.schemas import Answer
 
 _PROMPT = ChatPromptTemplate.from_messages(
@@ -27,15 +28,18 @@ _PROMPT = ChatPromptTemplate.from_messages(
 """The prompt template for the actor agent to generate answers and reflections."""
 
 
-def create_chain(llm: BaseChatModel):
+def create_chain(llm: BaseChatModel, compact_schemas: bool = False):
     """Create a chain that generates detailed answers to questions.
 
     Args:
         llm (BaseChatModel): The language model to use. It must support tool usage.
+        compact_schemas (bool): Whether to send the compact structured output schema.
 
     Returns:
         RunnableSerializable: The first responder chain.
     """
     return _PROMPT.partial(
         first_instruction="Answer the question in detail, with ~250 words."
-    ) | llm.with_structured_output(Answer, include_raw=True)
+    ) | llm.with_structured_output(
+        schema_for(Answer, compact_schemas), include_raw=True
+    )
@@ -3,6 +3,7 @@
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts.chat import ChatPromptTemplate
 
+from virgo.core.agent.compact import schema_for
 from virgo.core.agent.schemas import MarkdownArticle
 
 _PROMPT = ChatPromptTemplate.from_messages(
@@ -40,13 +41,16 @@ _PROMPT = ChatPromptTemplate.from_messages(
 """The prompt template for the Markdown formatter."""
 
 
-def create_chain(llm: BaseChatModel):
+def create_chain(llm: BaseChatModel, compact_schemas: bool = False):
     """Create a chain that formats articles into Markdown.
 
     Args:
         llm (BaseChatModel): The language model to use. It must support tool usage.
+        compact_schemas (bool): Whether to send the compact structured output schema.
 
     Returns:
         RunnableSerializable: The markdown formatter chain.
     """
-    return _PROMPT | llm.with_structured_output(MarkdownArticle, include_raw=True)
+    return _PROMPT | llm.with_structured_output(
+        schema_for(MarkdownArticle, compact_schemas), include_raw=True
+    )
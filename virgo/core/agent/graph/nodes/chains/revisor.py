@@ -3,14 +3,14 @@ from datetime import datetime
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-from virgo.core.agent.schemas import Revised
-
-_PROMPT = (
-    ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """
+from virgo.core.agent.compact import schema_for
+from virgo.core.agent.schemas import Revised, RevisionPatch
+
+_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """
                 You are an expert researcher.
 
                 Current time: {current_time}
@@ -19,13 +19,12 @@ _PROMPT = (
                 2. Reflect and critique your answer. Be severe, to maximize improvement.
                 3. Recommend search queries to get information and improve your answer.
                 """,
-            ),
-            MessagesPlaceholder(variable_name="messages"),
-        ],
-    )
-    .partial(current_time=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    .partial(
-        first_instruction="""
+        ),
+        MessagesPlaceholder(variable_name="messages"),
+    ],
+).partial(current_time=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+_INSTRUCTION = """
         Revise your previous answer using the new information.
             - You should use the previous critique to add important information to your answer;
             - You MUST include numerical citations in your revised answer, to ensure it can be verified;
@@ -33,18 +32,72 @@ _PROMPT = (
                 [1] Author Name, "Title of the Article", Source, Year. URL
                 [2] "Title of the Article", Source, Year. URL
             - You should use the previous critique to remove any superfluous information from your answer, and make sure it does not contain more than ~250 words.
-        """,
-    )
-)
+        """
+"""The instruction of the revisor, citing the sources in full."""
+
+_CITATION_INSTRUCTION = """
+        Revise your previous answer using the new information.
+            - You should use the previous critique to add important information to your answer;
+            - You MUST include numerical citations in your revised answer, to ensure it can be verified, using the "id" of the search results: for example [3];
+            - In the references, only list the citations you used, such as "[3]", without titles nor URLs: they are added from the search results;
+            - You should use the previous critique to remove any superfluous information from your answer, and make sure it does not contain more than ~250 words.
+        """
+"""The instruction of the revisor, citing the sources by their ID in the citation index."""
+
+_PATCH_INSTRUCTION = """
+        Revise your previous answer using the new information, by editing it instead of rewriting it.
+            - You should use the previous critique to add important information to your answer, and to remove any superfluous information, keeping it under ~250 words;
+            - List your edits: replace or delete a span quoted verbatim from your previous answer, or insert text after it. Leave the rest of the answer unchanged;
+            - You MUST include numerical citations in the text you add, to ensure it can be verified;
+            - Only list the full citations of the numerical citations you add; the references of your previous answer are kept.
+        """
+"""The instruction of the revisor, editing the previous answer and citing the sources in full."""
+
+_CITATION_PATCH_INSTRUCTION = """
+        Revise your previous answer using the new information, by editing it instead of rewriting it.
+            - You should use the previous critique to add important information to your answer, and to remove any superfluous information, keeping it under ~250 words;
+            - List your edits: replace or delete a span quoted verbatim from your previous answer, or insert text after it. Leave the rest of the answer unchanged;
+            - You MUST include numerical citations in the text you add, to ensure it can be verified, using the "id" of the search results: for example [3];
+            - In the references, only list the citations you add, such as "[3]", without titles nor URLs: they are added from the search results.
+        """
+"""The instruction of the revisor, editing the previous answer and citing the sources by ID."""
 
 
-def create_chain(llm: BaseChatModel):
+def create_chain(
+    llm: BaseChatModel, compact_schemas: bool = False, citations: bool = False
+):
     """Create a chain that revises previous answers based on reflections and new information.
 
     Args:
         llm (BaseChatModel): The language model to use. It must support tool usage.
+        compact_schemas (bool): Whether to send the compact structured output schema.
+        citations (bool): Whether to cite the sources by their ID in the citation
+            index, instead of in full.
 
     Returns:
         RunnableSerializable: The revisor chain.
     """
-    return _PROMPT | llm.with_structured_output(Revised, include_raw=True)
+    instruction = _CITATION_INSTRUCTION if citations else _INSTRUCTION
+    return _PROMPT.partial(first_instruction=instruction) | llm.with_structured_output(
+        schema_for(Revised, compact_schemas), include_raw=True
+    )
+
+
+def create_patch_chain(
+    llm: BaseChatModel, compact_schemas: bool = False, citations: bool = False
+):
+    """Create a chain that revises previous answers by listing their edits.
+
+    Args:
+        llm (BaseChatModel): The language model to use. It must support tool usage.
+        compact_schemas (bool): Whether to send the compact structured output schema.
+        citations (bool): Whether to cite the sources by their ID in the citation
+            index, instead of in full.
+
+    Returns:
+        RunnableSerializable: The revisor chain, answering with a `RevisionPatch`.
+    """
+    instruction = _CITATION_PATCH_INSTRUCTION if citations else _PATCH_INSTRUCTION
+    return _PROMPT.partial(first_instruction=instruction) | llm.with_structured_output(
+        schema_for(RevisionPatch, compact_schemas), include_raw=True
+    )
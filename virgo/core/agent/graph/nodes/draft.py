@@ -4,6 +4,7 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableSerializable
 from langgraph.graph.state import StateNode
 
+from virgo.core.agent.graph.nodes.tool_calls import with_tool_call
 from virgo.core.agent.graph.state import AnswerState
 
 
@@ -32,7 +33,7 @@ def _create_node_from_chain(
             {"messages": state["messages"], "formatted_article": None}
         )
         return AnswerState(
-            messages=[output["raw"]],
+            messages=[with_tool_call(output["raw"], output["parsed"])],
             final_answer=output["parsed"],
             formatted_article=None,
         )
@@ -40,16 +41,19 @@ def _create_node_from_chain(
     return draft
 
 
-def create_node(llm: BaseChatModel) -> StateNode[AnswerState]:
+def create_node(
+    llm: BaseChatModel, compact_schemas: bool = False
+) -> StateNode[AnswerState]:
     """Create the draft node.
 
     Args:
         llm: The language model to be used by the node.
+        compact_schemas: Whether to send the compact structured output schema.
 
     Returns:
         StateNode[AnswerState]: The draft state node.
     """
     from virgo.core.agent.graph.nodes.chains import first_responder
 
-    chain = first_responder.create_chain(llm)
+    chain = first_responder.create_chain(llm, compact_schemas)
     return _create_node_from_chain(chain)
@@ -1,17 +1,27 @@
+import re
+
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableSerializable
 from langgraph.graph.state import StateNode
 
 from virgo.core.agent.graph.state import AnswerState
+from virgo.core.agent.schemas import MarkdownArticle
+
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(?:\s|$)", re.DOTALL)
 
 
 def _create_node_from_chain(
     chain: RunnableSerializable[dict, dict],
+    local_references: bool = False,
 ) -> StateNode[AnswerState]:
     """Create the formatter node function.
 
     Args:
         chain: The markdown formatter chain.
+        local_references: Whether the references of the answer are already
+            rendered, from the citation index. They are then left out of the
+            prompt, and copied to the article as they are.
 
     Returns:
         callable: The formatter node function.
@@ -38,11 +48,17 @@ def _create_node_from_chain(
         output = chain.invoke(
             {
                 "article": article_content,
-                "references": "\n".join(references) if references else "None",
+                "references": "\n".join(references)
+                if references and not local_references
+                else "None",
             }
         )
 
         formatted_article = output.get("parsed")
+        if local_references and formatted_article is not None:
+            formatted_article = formatted_article.model_copy(
+                update={"references": list(references)}
+            )
 
         return AnswerState(
             messages=[], formatted_article=formatted_article, final_answer=latest_answer
@@ -51,16 +67,62 @@ def _create_node_from_chain(
     return format
 
 
-def create_node(llm: BaseChatModel) -> StateNode[AnswerState]:
+def render_locally(state: AnswerState) -> AnswerState:
+    """Render the latest answer as an article without calling the model.
+
+    This is the fallback of the formatter when the deadline of the run leaves
+    no time to call it. The question becomes the title and the first sentence
+    of the answer its summary.
+
+    Args:
+        state (AnswerState): The current state of the graph.
+
+    Returns:
+        AnswerState: The updated state with the locally rendered article.
+    """
+    latest_answer = state.get("final_answer")
+    if not latest_answer:
+        return AnswerState(messages=[], formatted_article=None, final_answer=None)
+
+    question = next(
+        (
+            message.text
+            for message in state["messages"]
+            if isinstance(message, HumanMessage)
+        ),
+        "",
+    )
+    content = latest_answer.value.strip()
+    match = _FIRST_SENTENCE.match(" ".join(content.split()))
+    article = MarkdownArticle(
+        title=question.strip() or "Article",
+        summary=match.group(1) if match else content,
+        content=content,
+        references=list(getattr(latest_answer, "references", [])),
+    )
+    return AnswerState(
+        messages=[],
+        formatted_article=article,
+        final_answer=latest_answer,
+        degraded=True,
+    )
+
+
+def create_node(
+    llm: BaseChatModel, compact_schemas: bool = False, local_references: bool = False
+) -> StateNode[AnswerState]:
     """Create the formatter node.
 
     Args:
         llm: The language model to be used by the formatter chain.
+        compact_schemas: Whether to send the compact structured output schema.
+        local_references: Whether the references are rendered from the
+            citation index, instead of by the model.
 
     Returns:
         StateNode[AnswerState]: The formatter node.
     """
     from virgo.core.agent.graph.nodes.chains import markdown_formatter
 
-    chain = markdown_formatter.create_chain(llm)
-    return _create_node_from_chain(chain)
+    chain = markdown_formatter.create_chain(llm, compact_schemas)
+    return _create_node_from_chain(chain, local_references)
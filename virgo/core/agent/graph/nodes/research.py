@@ -9,6 +9,9 @@ from typing import Protocol
 from langchain_core.tools import StructuredTool
 from langgraph.prebuilt import ToolNode
 
+from virgo.core.agent.compact import schema_for
+from virgo.core.agent.evidence import EvidenceStore
+from virgo.core.agent.ranking import BM25Ranker, chunk_text
 from virgo.core.agent.schemas import Answer, Reflection, Revised
 
 
@@ -34,28 +37,146 @@ class Researcher(Protocol):
         ...
 
 
-def create_node(researcher: Researcher) -> ToolNode:
+def _reference(result: object, store: EvidenceStore) -> object:
+    """Store a search result and return what should be kept in its place.
+
+    Tavily responses bundle several results under a `results` key; each of
+    them is stored on its own, so that results found by different queries
+    are only stored once.
+    """
+    if isinstance(result, dict) and isinstance(result.get("results"), list):
+        return {**result, "results": [store.put(item) for item in result["results"]]}
+    return store.put(result)
+
+
+def _with_evidence_store(researcher: Researcher, store: EvidenceStore) -> Researcher:
+    """Wrap a researcher so that its results are replaced by evidence references.
+
+    Args:
+        researcher: The researcher callable to wrap.
+        store: The evidence store where the results are kept.
+
+    Returns:
+        Researcher: The wrapped researcher.
+    """
+
+    def research(
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list[str]:
+        return [
+            _reference(result, store)  # type: ignore[misc]
+            for result in researcher(reflection, value, references)
+        ]
+
+    return research
+
+
+def _with_ranker(researcher: Researcher, ranker: BM25Ranker) -> Researcher:
+    """Wrap a researcher so that only the most relevant result chunks are kept.
+
+    The results are split into chunks, ranked against the critique of what is
+    missing and the search queries, and the `top_k` best chunks are kept in
+    place of the results they come from. Results that are neither Tavily
+    responses nor texts, such as search errors, are kept as they are.
+
+    Args:
+        researcher: The researcher callable to wrap.
+        ranker: The ranker scoring the result chunks.
+
+    Returns:
+        Researcher: The wrapped researcher.
+    """
+
+    def research(
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list[str]:
+        results: list[object] = list(researcher(reflection, value, references))
+        chunks: list[tuple[int, object, str]] = []
+        for index, result in enumerate(results):
+            if isinstance(result, dict) and isinstance(result.get("results"), list):
+                items = result["results"]
+            elif isinstance(result, str):
+                items = [result]
+            else:
+                continue
+            for item in items:
+                text = item.get("content", "") if isinstance(item, dict) else str(item)
+                chunks.extend(
+                    (index, item, chunk)
+                    for chunk in chunk_text(str(text), ranker.chunk_words)
+                )
+
+        query = " ".join([reflection.missing, *reflection.search_queries])
+        kept: dict[int, list[tuple[object, str]]] = {}
+        for position in ranker.rank(query, [chunk for _, _, chunk in chunks]):
+            index, item, chunk = chunks[position]
+            kept.setdefault(index, []).append((item, chunk))
+
+        ranked: list[object] = []
+        for index, result in enumerate(results):
+            if isinstance(result, dict) and isinstance(result.get("results"), list):
+                ranked.append(
+                    {
+                        **result,
+                        "results": [
+                            {**item, "content": chunk}  # type: ignore[dict-item]
+                            for item, chunk in kept.get(index, [])
+                        ],
+                    }
+                )
+            elif isinstance(result, str):
+                if index in kept:
+                    ranked.append("\n\n".join(chunk for _, chunk in kept[index]))
+            else:
+                ranked.append(result)
+        return ranked  # type: ignore[return-value]
+
+    return research
+
+
+def create_node(
+    researcher: Researcher,
+    evidence_store: EvidenceStore | None = None,
+    compact_schemas: bool = False,
+    ranker: BM25Ranker | None = None,
+) -> ToolNode:
     """Create the researcher node.
 
     Args:
         researcher: The researcher callable to run the search queries.
+        evidence_store: Optional store for the search results. When given, the
+            tool messages only hold references to the stored results.
+        compact_schemas: Whether the tools use the compact schemas, matching
+            the structured outputs of the draft and revise nodes.
+        ranker: Optional ranker keeping only the result chunks most relevant
+            to the current critique.
 
     Returns:
         StateNode[AnswerState]: The researcher state node.
     """
+    if ranker is not None:
+        researcher = _with_ranker(researcher, ranker)
+    if evidence_store is not None:
+        researcher = _with_evidence_store(researcher, evidence_store)
+    answer = schema_for(Answer, compact_schemas)
+    revised = schema_for(Revised, compact_schemas)
     return ToolNode(
         [
             StructuredTool.from_function(
                 researcher,
-                name=Answer.__name__,
-                description=Answer.__doc__,
-                args_schema=Answer,
+                name=answer.__name__,
+                description=answer.__doc__,
+                args_schema=answer,
             ),
             StructuredTool.from_function(
                 researcher,
-                name=Revised.__name__,
-                description=Revised.__doc__,
-                args_schema=Revised,
+                name=revised.__name__,
+                description=revised.__doc__,
+                args_schema=revised,
             ),
         ]
     )
@@ -4,29 +4,85 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableSerializable
 from langgraph.graph.state import StateNode
 
+from virgo.core.agent.citations import CitationIndex
+from virgo.core.agent.evidence import EvidenceStore
 from virgo.core.agent.graph.nodes.chains import revisor
+from virgo.core.agent.graph.nodes.tool_calls import as_tool_call, with_tool_call
 from virgo.core.agent.graph.state import AnswerState
+from virgo.core.agent.patch import apply_patch
+from virgo.core.agent.schemas import Revised
 
 
 def _create_node_from_chain(
     chain: RunnableSerializable,
+    evidence_store: EvidenceStore | None = None,
+    citations: bool = False,
+    patch_chain: RunnableSerializable | None = None,
 ) -> StateNode[AnswerState]:
-    """Return a node that invokes the provided revisor chain."""
+    """Return a node that invokes the provided revisor chain.
+
+    When an evidence store is given, the evidence references held by the
+    messages are resolved only for the prompt, and never written back to the state.
+    With citations, the prompt shows the search results by their ID in the
+    citation index, and the references of the revised answer are rendered
+    from the index.
+
+    With a patch chain, the revisions of an answer already revised are
+    edits of it, applied locally; the first revision is still a full rewrite.
+    A patch that cannot be parsed leaves the previous answer unchanged.
+    """
 
     def revise(state: AnswerState) -> AnswerState:
         """Revise the previous answer based on the current reflection."""
-        output = chain.invoke({"messages": state["messages"]})
+        messages = state["messages"]
+        if evidence_store is not None:
+            messages = evidence_store.resolve_messages(messages)
+        index = None
+        if citations:
+            index = CitationIndex.from_messages(messages)
+            messages = index.cite(messages)
+        previous = state.get("final_answer")
+        if patch_chain is not None and isinstance(previous, Revised):
+            output = patch_chain.invoke({"messages": messages})
+            patch = output["parsed"]
+            final_answer = (
+                apply_patch(previous, patch) if patch is not None else previous
+            )
+            # The research node runs the Revised calls, and the next patch
+            # edits the full answer.
+            raw = as_tool_call(output["raw"], final_answer)
+        else:
+            output = chain.invoke({"messages": messages})
+            final_answer = output["parsed"]
+            raw = with_tool_call(output["raw"], final_answer)
+        if index is not None and final_answer is not None:
+            final_answer = final_answer.model_copy(
+                update={
+                    "references": index.references(
+                        final_answer.value, final_answer.references
+                    )
+                }
+            )
         return AnswerState(
-            messages=[*state["messages"], output["raw"]],
-            final_answer=output["parsed"],
+            messages=[*state["messages"], raw],
+            final_answer=final_answer,
             formatted_article=None,
         )
 
     return revise
 
 
-def create_node(llm: BaseChatModel) -> StateNode[AnswerState]:
+def create_node(
+    llm: BaseChatModel,
+    evidence_store: EvidenceStore | None = None,
+    compact_schemas: bool = False,
+    citations: bool = False,
+    patch: bool = False,
+) -> StateNode[AnswerState]:
     """Create the revisor node that wraps the revisor chain."""
 
-    chain = revisor.create_chain(llm)
-    return _create_node_from_chain(chain)
+    chain = revisor.create_chain(llm, compact_schemas, citations)
+    patch_chain = (
+        revisor.create_patch_chain(llm, compact_schemas, citations) if patch else None
+    )
+    return _create_node_from_chain(chain, evidence_store, citations, patch_chain)
@@ -0,0 +1,72 @@
+"""Tool calls of the structured outputs of the draft and revise nodes.
+
+The research node runs the tool calls of the answers. Their messages do not
+always hold one: the JSON schema and JSON modes answer with a JSON content,
+and the revision patches call another tool than `Revised`.
+"""
+
+import uuid
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+
+def as_tool_call(raw: AIMessage, output: BaseModel) -> AIMessage:
+    """Turn a chat model message into the tool call of a structured output.
+
+    The message keeps its usage and the identifier of its first tool call, if
+    any, but calls the tool named after the output model with the output as
+    arguments. Its content is cleared, since the arguments hold the output.
+
+    Args:
+        raw: The message of the chat model.
+        output: The structured output, such as the parsed `Answer`.
+
+    Returns:
+        AIMessage: A copy of the message calling the tool of the output.
+    """
+    call_id = next(
+        (call["id"] for call in raw.tool_calls if call.get("id")),
+        f"call_{uuid.uuid4().hex}",
+    )
+    return raw.model_copy(
+        update={
+            "content": "",
+            "tool_calls": [
+                {
+                    "name": type(output).__name__,
+                    "args": output.model_dump(mode="json"),
+                    "id": call_id,
+                    "type": "tool_call",
+                }
+            ],
+            "invalid_tool_calls": [],
+            "additional_kwargs": {
+                key: value
+                for key, value in raw.additional_kwargs.items()
+                if key != "tool_calls"
+            },
+        }
+    )
+
+
+def with_tool_call(raw: AIMessage, output: BaseModel | None) -> AIMessage:
+    """Make sure a chat model message calls the tool of its structured output.
+
+    Args:
+        raw: The message of the chat model.
+        output: The structured output parsed from the message, if any.
+
+    Returns:
+        AIMessage: The message itself if it calls a tool, or cannot be parsed;
+            otherwise a copy calling the tool of the output.
+    """
+    if output is None or not isinstance(raw, AIMessage) or raw.tool_calls:
+        return raw
+    return as_tool_call(raw, output)
+
+
+__all__ = [
+    "as_tool_call",
+    "with_tool_call",
+]
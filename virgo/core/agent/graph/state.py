@@ -1,5 +1,5 @@
 import operator
-from typing import Annotated, TypedDict
+from typing import Annotated, NotRequired, TypedDict
 
 from langchain_core.messages.base import BaseMessage
 
@@ -17,3 +17,6 @@ class AnswerState(TypedDict):
 
     formatted_article: MarkdownArticle | None
     """The formatted article produced by the formatter chain."""
+
+    degraded: NotRequired[Annotated[bool, operator.or_]]
+    """Whether a node ran out of time, the article being made from a partial answer."""
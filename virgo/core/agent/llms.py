@@ -1,10 +1,26 @@
 """Module for managing GenAI providers and creating language model instances."""
 
+import json
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import override
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, replace
+from typing import Any, override
 
+import httpx
+from langchain_core.callbacks import CallbackManagerForLLMRun
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
+from openai import DEFAULT_CONNECTION_LIMITS
+from pydantic import BaseModel, ConfigDict, Field
+
+from virgo.core.agent.configuration import GraphConfiguration
+from virgo.core.agent.timeouts import AsyncDeadlineTransport, DeadlineTransport
+from virgo.core.settings import StructuredOutputMethod
 
 
 class ProviderError(Exception):
@@ -13,15 +29,46 @@ class ProviderError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class GenerationParams:
+    """Generation parameters of a chat model, left to the provider defaults if unset."""
+
+    max_tokens: int | None = None
+    """The maximum number of output tokens."""
+
+    temperature: float | None = None
+    """The sampling temperature."""
+
+    num_ctx: int | None = None
+    """The size of the context window, in tokens (Ollama only)."""
+
+    num_predict: int | None = None
+    """The maximum number of predicted tokens (Ollama only), `max_tokens` by default."""
+
+    num_thread: int | None = None
+    """The number of threads running the model (Ollama only)."""
+
+    def to_kwargs(self, *names: str) -> dict[str, Any]:
+        """Get the set parameters among the given names, as keyword arguments."""
+        return {
+            name: value
+            for name, value in asdict(self).items()
+            if name in names and value is not None
+        }
+
+
 class LanguageModelProvider(ABC):
     """Abstract base class for language model providers."""
 
     @abstractmethod
-    def get_chat_model(self, model_name: str) -> BaseChatModel:
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
         """Get the chat model instance for the given model name.
 
         Args:
             model_name (str): The name of the model to instantiate.
+            params (GenerationParams, optional): The generation parameters of the model.
         Returns:
             BaseChatModel: An instance of the specified language model.
         Raises:
@@ -34,15 +81,41 @@ class OpenAILanguageModelProvider(LanguageModelProvider):
     """Language model provider for OpenAI."""
 
     @override
-    def get_chat_model(self, model_name: str) -> BaseChatModel:
-        return ChatOpenAI(model=model_name)
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
+        params = params or GenerationParams()
+        # The requests time out at the deadline of the run, if any.
+        proxy = os.getenv("OPENAI_PROXY") or None
+        return ChatOpenAI(
+            model=model_name,
+            openai_proxy=None,
+            http_client=httpx.Client(
+                transport=DeadlineTransport(
+                    httpx.HTTPTransport(limits=DEFAULT_CONNECTION_LIMITS, proxy=proxy)
+                )
+            ),
+            http_async_client=httpx.AsyncClient(
+                transport=AsyncDeadlineTransport(
+                    httpx.AsyncHTTPTransport(
+                        limits=DEFAULT_CONNECTION_LIMITS, proxy=proxy
+                    )
+                )
+            ),
+            **params.to_kwargs("max_tokens", "temperature"),
+        )
 
 
 class OllamaLanguageModelProvider(LanguageModelProvider):
     """Language model provider for Ollama."""
 
     @override
-    def get_chat_model(self, model_name: str) -> BaseChatModel:
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
+        params = params or GenerationParams()
+        if params.num_predict is None and params.max_tokens is not None:
+            params = replace(params, num_predict=params.max_tokens)
         try:
             from langchain_ollama import ChatOllama
             from ollama import Client
@@ -51,6 +124,12 @@ class OllamaLanguageModelProvider(LanguageModelProvider):
             client._request_raw()  # Test connection
             return ChatOllama(
                 model=model_name,
+                # The requests time out at the deadline of the run, if any.
+                sync_client_kwargs={"transport": DeadlineTransport()},
+                async_client_kwargs={"transport": AsyncDeadlineTransport()},
+                **params.to_kwargs(
+                    "temperature", "num_ctx", "num_predict", "num_thread"
+                ),
             )
         except ImportError as e:
             raise ProviderError(
@@ -60,3 +139,170 @@ class OllamaLanguageModelProvider(LanguageModelProvider):
             raise ProviderError(
                 "Ollama client could not connect to the Ollama server. Please ensure the Ollama server is running, or the `OLLAMA_HOST` environment variable is set correctly."
             ) from e
+
+
+type ChatModelKey = tuple[str, str]
+"""The key of a pooled chat model: its provider and model name."""
+
+
+class ChatModelPool:
+    """Pool of chat models, created once per provider and model name.
+
+    The chat models (and their HTTP clients) are shared by all the invocations
+    selecting the same provider and model, whatever their other settings.
+    """
+
+    def __init__(
+        self,
+        providers: Mapping[str, LanguageModelProvider],
+        default_provider: str,
+        default_model_name: str,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            providers: The language model providers, by name.
+            default_provider: The provider used when none is configured.
+            default_model_name: The model used when none is configured.
+        """
+        self._providers = providers
+        self._default_key = (default_provider, default_model_name)
+        self._lock = threading.Lock()
+        self._models: dict[tuple[str, str, GenerationParams | None], BaseChatModel] = {}
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def key(self, config: RunnableConfig | None = None) -> ChatModelKey:
+        """Get the key of the chat model selected by an invocation config.
+
+        Args:
+            config: The invocation config, defaulting to the current one.
+
+        Returns:
+            ChatModelKey: The provider and model name, falling back to the defaults.
+        """
+        configuration = GraphConfiguration.from_runnable_config(config)
+        return (
+            configuration.genai_provider or self._default_key[0],
+            configuration.model_name or self._default_key[1],
+        )
+
+    def get(
+        self,
+        key: ChatModelKey | None = None,
+        params: GenerationParams | None = None,
+    ) -> BaseChatModel:
+        """Get the chat model of a provider, model name and parameters, creating it once.
+
+        Raises:
+            ProviderError: If the provider is unknown, or fails to create the model.
+        """
+        provider_name, model_name = key or self._default_key
+        with self._lock:
+            if (provider_name, model_name, params) not in self._models:
+                if provider_name not in self._providers:
+                    raise ProviderError(f"Unknown GenAI provider: {provider_name}.")
+                self._models[provider_name, model_name, params] = self._providers[
+                    provider_name
+                ].get_chat_model(model_name, params)
+            return self._models[provider_name, model_name, params]
+
+
+def _with_schema_instructions(model: BaseChatModel, schema: Any) -> Runnable[Any, Any]:
+    """Tell the model the JSON schema to follow, which the JSON mode does not send.
+
+    The instructions are merged into the leading system prompt, if any, since
+    some providers only take a single system message, at the start.
+    """
+    definition = (
+        schema.model_json_schema()
+        if isinstance(schema, type) and issubclass(schema, BaseModel)
+        else schema
+    )
+    instructions = (
+        "Answer with a single JSON object following this JSON schema:\n"
+        + json.dumps(definition, separators=(",", ":"))
+    )
+
+    def prepend(input: Any) -> list[BaseMessage]:
+        messages = model._convert_input(input).to_messages()
+        if messages and isinstance(messages[0], SystemMessage):
+            system = messages[0]
+            return [
+                SystemMessage(f"{system.text}\n\n{instructions}"),
+                *messages[1:],
+            ]
+        return [SystemMessage(instructions), *messages]
+
+    return RunnableLambda(prepend, name="SchemaInstructions")
+
+
+class ConfigurableChatModel(BaseChatModel):
+    """Chat model delegating to the pooled model selected by the invocation config.
+
+    The graph chains are built once around this model. On each call, the
+    `genai_provider` and `model_name` of the invocation config select the
+    actual chat model, and its structured output runnable, from the pool.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    pool: ChatModelPool
+    """The pool of the actual chat models."""
+
+    params: GenerationParams | None = None
+    """The generation parameters of the actual chat models, such as for a node."""
+
+    structured_output_methods: dict[str, StructuredOutputMethod] = Field(
+        default_factory=dict
+    )
+    """The structured output method of each provider, its default if unset."""
+
+    @property
+    @override
+    def _llm_type(self) -> str:
+        return "virgo-configurable"
+
+    @override
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        model = self.pool.get(self.pool.key(), self.params)
+        return model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    @override
+    def with_structured_output(  # type: ignore[override]
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any
+    ) -> Runnable[Any, Any]:
+        lock = threading.Lock()
+        bound: dict[ChatModelKey, Runnable[Any, Any]] = {}
+
+        def _select(config: RunnableConfig) -> Runnable[Any, Any]:
+            key = self.pool.key(config)
+            with lock:
+                if key not in bound:
+                    options = dict(kwargs)
+                    if method := self.structured_output_methods.get(key[0]):
+                        options.setdefault("method", method)
+                    model = self.pool.get(key, self.params)
+                    bound[key] = model.with_structured_output(
+                        schema, include_raw=include_raw, **options
+                    )
+                    if options.get("method") == "json_mode":
+                        bound[key] = (
+                            _with_schema_instructions(model, schema) | bound[key]
+                        )
+                return bound[key]
+
+        def _invoke(input: Any, config: RunnableConfig) -> Any:
+            return _select(config).invoke(input, config)
+
+        async def _ainvoke(input: Any, config: RunnableConfig) -> Any:
+            return await _select(config).ainvoke(input, config)
+
+        return RunnableLambda(_invoke, _ainvoke, name="ConfigurableStructuredOutput")
@@ -0,0 +1,92 @@
+"""Local application of the revision patches.
+
+In the patch revision mode, the revisor does not rewrite the whole answer on
+every iteration, but lists the edits of the previous one: the spans to
+replace or delete, and the text to insert. The edits are applied here, so that
+the revisor only outputs what changes.
+"""
+
+import logging
+import re
+from collections.abc import Sequence
+
+from virgo.core.agent.schemas import Answer, Edit, Revised, RevisionPatch
+
+logger = logging.getLogger(__name__)
+
+
+def _find(text: str, target: str) -> tuple[int, int] | None:
+    """Find a span in a text, verbatim or up to whitespace differences."""
+    start = text.find(target)
+    if start >= 0:
+        return start, start + len(target)
+    words = target.split()
+    if not words:
+        return None
+    match = re.search(r"\s+".join(map(re.escape, words)), text)
+    return match.span() if match else None
+
+
+def apply_edits(text: str, edits: Sequence[Edit]) -> str:
+    """Apply edits to a text, in order.
+
+    Each edit applies to the first occurrence of its target in the text, as
+    edited by the previous ones. Edits whose target is not found are skipped.
+
+    Args:
+        text: The text to edit, such as the previous answer.
+        edits: The edits to apply.
+
+    Returns:
+        str: The edited text.
+    """
+    for edit in edits:
+        if edit.operation == "insert" and not edit.target.strip():
+            text = f"{text.rstrip()} {edit.text.strip()}"
+            continue
+        span = _find(text, edit.target)
+        if span is None:
+            logger.warning(
+                "Skipping the %s of a span not found: %r.", edit.operation, edit.target
+            )
+            continue
+        start, end = span
+        if edit.operation == "insert":
+            text = f"{text[:end]}{edit.text}{text[end:]}"
+        elif edit.operation == "replace":
+            text = f"{text[:start]}{edit.text}{text[end:]}"
+        else:
+            text = f"{text[:start]}{text[end:]}"
+    return text
+
+
+def apply_patch(answer: Answer, patch: RevisionPatch) -> Revised:
+    """Revise an answer by applying a revision patch.
+
+    Args:
+        answer: The previous answer.
+        patch: The edits of the answer, with the new reflection and references.
+
+    Returns:
+        Revised: The revised answer, with the references of the previous answer
+            followed by the new ones.
+    """
+    references = list(getattr(answer, "references", []))
+    return Revised(
+        value=apply_edits(answer.value, patch.edits),
+        reflection=patch.reflection,
+        references=[
+            *references,
+            *(
+                reference
+                for reference in patch.references
+                if reference not in references
+            ),
+        ],
+    )
+
+
+__all__ = [
+    "apply_edits",
+    "apply_patch",
+]
@@ -0,0 +1,199 @@
+"""Lexical relevance ranking of the research results.
+
+The search results are split into chunks, scored with Okapi BM25 against the
+critique and the search queries of the current reflection, and only the best
+chunks are forwarded to the revisor. The scores are computed with NumPy over
+the query terms only, which is all BM25 needs.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Sequence
+from typing import Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+_TOKEN: Final = re.compile(r"\w+")
+
+STOPWORDS: Final[frozenset[str]] = frozenset(
+    [
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "has",
+        "have",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "their",
+        "this",
+        "to",
+        "was",
+        "were",
+        "what",
+        "when",
+        "which",
+        "who",
+        "why",
+        "will",
+        "with",
+    ]
+)
+"""Words too frequent to tell relevant results apart."""
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase terms, without the stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_text(text: str, max_words: int) -> list[str]:
+    """Split a text into chunks of at most `max_words` words, along paragraphs.
+
+    Args:
+        text: The text to split.
+        max_words: The maximum number of words of a chunk.
+
+    Returns:
+        list[str]: The chunks, in order.
+    """
+    pieces: list[list[str]] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        pieces.extend(
+            words[start : start + max_words]
+            for start in range(0, len(words), max_words)
+        )
+
+    chunks: list[str] = []
+    current: list[str] = []
+    for words in pieces:
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class BM25Ranker:
+    """Okapi BM25 ranker, scoring chunks of text against a query."""
+
+    def __init__(
+        self,
+        top_k: int = 8,
+        chunk_words: int = 120,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        """Initialize the ranker.
+
+        Args:
+            top_k: How many chunks to keep.
+            chunk_words: The maximum number of words of a chunk.
+            k1: The term frequency saturation parameter.
+            b: The document length normalization parameter.
+        """
+        self.top_k = top_k
+        self.chunk_words = chunk_words
+        self._k1 = k1
+        self._b = b
+
+    def scores(self, query: str, documents: Sequence[str]) -> NDArray[np.float64]:
+        """Score the documents against the query.
+
+        Args:
+            query: The query, such as the critique and the search queries.
+            documents: The documents to score.
+
+        Returns:
+            NDArray[np.float64]: The score of each document.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not documents or not terms:
+            return np.zeros(len(documents))
+
+        column = {term: index for index, term in enumerate(terms)}
+        frequencies = np.zeros((len(documents), len(terms)))
+        lengths = np.empty(len(documents))
+        for row, document in enumerate(documents):
+            tokens = tokenize(document)
+            lengths[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                if term in column:
+                    frequencies[row, column[term]] = count
+
+        return self.term_scores(
+            frequencies,
+            lengths[:, None],
+            np.count_nonzero(frequencies, axis=0),
+            len(documents),
+            lengths.mean(),
+        ).sum(axis=1)
+
+    def term_scores(
+        self,
+        frequencies: NDArray[np.float64],
+        lengths: NDArray[np.float64],
+        document_frequencies: NDArray[np.int_],
+        document_count: int,
+        average_length: float,
+    ) -> NDArray[np.float64]:
+        """Score the occurrences of the query terms in the documents.
+
+        The arrays broadcast together, so that the occurrences can be given as
+        a matrix of documents by terms, or as the postings of an inverted index.
+
+        Args:
+            frequencies: How many times each term occurs in each document.
+            lengths: The length of the documents, in terms.
+            document_frequencies: How many documents contain each term.
+            document_count: How many documents there are.
+            average_length: The average length of the documents.
+
+        Returns:
+            NDArray[np.float64]: The score of each occurrence, summing up to
+                the score of each document.
+        """
+        idf = np.log1p(
+            (document_count - document_frequencies + 0.5) / (document_frequencies + 0.5)
+        )
+        norms = self._k1 * (1 - self._b + self._b * lengths / (average_length or 1.0))
+        return idf * frequencies * (self._k1 + 1) / (frequencies + norms)
+
+    def rank(self, query: str, documents: Sequence[str]) -> list[int]:
+        """Rank the documents, keeping the `top_k` best matches.
+
+        Args:
+            query: The query, such as the critique and the search queries.
+            documents: The documents to rank.
+
+        Returns:
+            list[int]: The indexes of the kept documents, best first.
+        """
+        scores = self.scores(query, documents)
+        order = np.argsort(-scores, kind="stable")[: self.top_k]
+        return [int(index) for index in order]
+
+
+__all__ = [
+    "STOPWORDS",
+    "BM25Ranker",
+    "chunk_text",
+    "tokenize",
+]
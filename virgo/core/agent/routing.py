@@ -0,0 +1,341 @@
+"""Latency-aware routing of the chat model calls across GenAI providers.
+
+A routing chat model wraps the chat models of several providers, such as
+OpenAI with a local Ollama model as fallback. It tracks the latency and the
+errors of the recent calls of each route, sends the calls to the healthiest
+one, and fails over to the next routes when a call raises.
+
+Switching routes requires the healthiest route to beat the current one by a
+margin, and the statistics only expire after a time window, so that the
+routing does not flap between routes of similar health. While a fallback is
+in use, the preferred routes are probed again from time to time, so that the
+calls move back to them once they recover.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, override
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import ConfigDict
+
+from virgo.core.agent.llms import (
+    GenerationParams,
+    LanguageModelProvider,
+    ProviderError,
+)
+
+logger = logging.getLogger(__name__)
+
+_MIN_SUCCESS_RATE = 0.05
+
+
+class RouteStats:
+    """The latency and outcome of the recent calls of a route."""
+
+    def __init__(self, window: float, max_samples: int = 50) -> None:
+        """Initialize the statistics.
+
+        Args:
+            window: How long a call is accounted for, in seconds.
+            max_samples: How many calls are accounted for at most.
+        """
+        self._window = window
+        self._samples: deque[tuple[float, float, bool]] = deque(maxlen=max_samples)
+        self.last_call: float | None = None
+
+    def record(self, now: float, latency: float, ok: bool) -> None:
+        """Record a call, which took `latency` seconds and succeeded if `ok`."""
+        self._samples.append((now, latency, ok))
+        self.last_call = now
+
+    def expire(self, now: float) -> None:
+        """Forget the calls older than the window."""
+        while self._samples and now - self._samples[0][0] > self._window:
+            self._samples.popleft()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        """The share of the recent calls that raised."""
+        if not self._samples:
+            return 0.0
+        return sum(not ok for _, _, ok in self._samples) / len(self._samples)
+
+    @property
+    def mean_latency(self) -> float:
+        """The mean latency of the recent calls, in seconds."""
+        if not self._samples:
+            return 0.0
+        return sum(latency for _, latency, _ in self._samples) / len(self._samples)
+
+    @property
+    def score(self) -> float | None:
+        """The expected seconds per successful call, None without recent calls."""
+        if not self._samples:
+            return None
+        return self.mean_latency / max(1.0 - self.error_rate, _MIN_SUCCESS_RATE)
+
+
+class HealthRouter:
+    """Choose the route of each call from the health of the routes.
+
+    The routes are given in order of preference. The current route only
+    changes when another route scores better by the `margin`, the score being
+    the expected seconds per successful call.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        window: float = 300.0,
+        margin: float = 0.5,
+        probe_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            names: The names of the routes, in order of preference.
+            window: How long a call is accounted for in the statistics, in seconds.
+            margin: How much better, relatively, another route must score for
+                the calls to switch to it.
+            probe_interval: How often a route preferred to the current one is
+                probed, in seconds.
+            clock: The monotonic clock timing the calls.
+        """
+        self.names = list(names)
+        self.stats = [RouteStats(window) for _ in self.names]
+        self.current = 0
+        self._margin = margin
+        self._probe_interval = probe_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def order(self) -> list[int]:
+        """Get the routes to try for a call, in order.
+
+        Returns:
+            list[int]: The indexes of the routes: a probed route, if any, then
+                the current route, then the others from the healthiest.
+        """
+        with self._lock:
+            now = self._clock()
+            for stats in self.stats:
+                stats.expire(now)
+            self._switch()
+            others = sorted(
+                (index for index in range(len(self.names)) if index != self.current),
+                key=lambda index: (
+                    self.stats[index].score is None,
+                    self.stats[index].score or 0.0,
+                    index,
+                ),
+            )
+            for index in range(self.current):
+                last_call = self.stats[index].last_call
+                if last_call is None or now - last_call >= self._probe_interval:
+                    # Claim the probe, so that concurrent calls do not all probe.
+                    self.stats[index].last_call = now
+                    others.remove(index)
+                    return [index, self.current, *others]
+            return [self.current, *others]
+
+    def record(self, index: int, latency: float, ok: bool) -> None:
+        """Record the outcome of a call sent to a route."""
+        with self._lock:
+            self.stats[index].record(self._clock(), latency, ok)
+
+    def _switch(self) -> None:
+        """Switch to the healthiest route, if it beats the current one by the margin."""
+        current = self.stats[self.current].score
+        if current is None:
+            return
+        scored = [
+            (score, index)
+            for index, stats in enumerate(self.stats)
+            if (score := stats.score) is not None
+        ]
+        best, index = min(scored)
+        if index != self.current and best * (1.0 + self._margin) < current:
+            logger.warning(
+                "Routing the chat model calls from %s to %s.",
+                self.names[self.current],
+                self.names[index],
+            )
+            self.current = index
+
+
+class RoutingChatModel(BaseChatModel):
+    """Chat model routing its calls to the healthiest of several chat models."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    models: list[BaseChatModel]
+    """The chat models of the routes, in order of preference."""
+
+    router: HealthRouter
+    """The router choosing the route of each call."""
+
+    @property
+    @override
+    def _llm_type(self) -> str:
+        return "virgo-routing"
+
+    def _route[T](self, call: Callable[[BaseChatModel, int], T]) -> T:
+        """Run a call on the routes in order, until one succeeds."""
+        error: Exception | None = None
+        for index in self.router.order():
+            started = time.perf_counter()
+            try:
+                result = call(self.models[index], index)
+            except Exception as exc:
+                self.router.record(index, time.perf_counter() - started, ok=False)
+                logger.warning(
+                    "Chat model call failed on %s.",
+                    self.router.names[index],
+                    exc_info=True,
+                )
+                error = exc
+                continue
+            self.router.record(index, time.perf_counter() - started, ok=True)
+            return result
+        if error is None:
+            raise ProviderError("No route is available for the chat model calls.")
+        raise error
+
+    async def _aroute[T](self, call: Callable[[BaseChatModel, int], Awaitable[T]]) -> T:
+        """Run an async call on the routes in order, until one succeeds."""
+        error: Exception | None = None
+        for index in self.router.order():
+            started = time.perf_counter()
+            try:
+                result = await call(self.models[index], index)
+            except Exception as exc:
+                self.router.record(index, time.perf_counter() - started, ok=False)
+                logger.warning(
+                    "Chat model call failed on %s.",
+                    self.router.names[index],
+                    exc_info=True,
+                )
+                error = exc
+                continue
+            self.router.record(index, time.perf_counter() - started, ok=True)
+            return result
+        if error is None:
+            raise ProviderError("No route is available for the chat model calls.")
+        raise error
+
+    @override
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self._route(
+            lambda model, _: model._generate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        )
+
+    @override
+    def with_structured_output(  # type: ignore[override]
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any
+    ) -> Runnable[Any, Any]:
+        bound = [
+            model.with_structured_output(schema, include_raw=include_raw, **kwargs)
+            for model in self.models
+        ]
+
+        def _invoke(input: Any, config: RunnableConfig) -> Any:
+            return self._route(lambda _, index: bound[index].invoke(input, config))
+
+        async def _ainvoke(input: Any, config: RunnableConfig) -> Any:
+            return await self._aroute(
+                lambda _, index: bound[index].ainvoke(input, config)
+            )
+
+        return RunnableLambda(_invoke, _ainvoke, name="RoutingStructuredOutput")
+
+
+class RoutingLanguageModelProvider(LanguageModelProvider):
+    """Language model provider routing the calls across several providers.
+
+    The primary provider serves the requested model, and each fallback
+    provider serves its own model, such as a local Ollama model. Providers
+    whose model cannot be created, such as an Ollama server not running, are
+    left out. The chat models of the same routes, such as those of the nodes
+    with their own generation parameters, share their router, hence the
+    health of the routes.
+    """
+
+    def __init__(
+        self,
+        primary: tuple[str, LanguageModelProvider],
+        fallbacks: Sequence[tuple[str, LanguageModelProvider, str]],
+        router_factory: Callable[[Sequence[str]], HealthRouter] = HealthRouter,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            primary: The name of the preferred provider, and the provider.
+            fallbacks: The name, provider and model name of each fallback, in
+                order of preference.
+            router_factory: Create the router of the chat models, from the
+                names of their routes.
+        """
+        self._primary = primary
+        self._fallbacks = fallbacks
+        self._router_factory = router_factory
+        self._routers: dict[tuple[str, ...], HealthRouter] = {}
+        self._lock = threading.Lock()
+
+    @override
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
+        primary_name, primary = self._primary
+        names: list[str] = []
+        models: list[BaseChatModel] = []
+        for name, provider, route_model in [
+            (primary_name, primary, model_name),
+            *self._fallbacks,
+        ]:
+            try:
+                models.append(provider.get_chat_model(route_model, params))
+            except ProviderError:
+                logger.warning(
+                    "Route %s:%s is unavailable.", name, route_model, exc_info=True
+                )
+                continue
+            names.append(f"{name}:{route_model}")
+        if not models:
+            raise ProviderError(f"No route could create a chat model for {model_name}.")
+        return RoutingChatModel(models=models, router=self._router(names))
+
+    def _router(self, names: list[str]) -> HealthRouter:
+        """Get the router shared by the chat models of the same routes."""
+        with self._lock:
+            router = self._routers.get(tuple(names))
+            if router is None:
+                router = self._routers[tuple(names)] = self._router_factory(names)
+            return router
+
+
+__all__ = [
+    "HealthRouter",
+    "RouteStats",
+    "RoutingChatModel",
+    "RoutingLanguageModelProvider",
+]
@@ -1,9 +1,50 @@
 """Schemas for the Virgo assistant's answers and reflections."""
 
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
+from virgo.core.agent.configuration import SearchDepth, SearchTopic
+
+
+class SearchHint(BaseModel):
+    """Hints on how to run one of the search queries."""
+
+    query: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The search query the hints apply to, as listed in the search queries.",
+            }
+        ),
+    ]
+    topic: Annotated[
+        SearchTopic | None,
+        Field(
+            json_schema_extra={
+                "description": "The topic of the search: news for recent events, finance for markets and companies.",
+            }
+        ),
+    ] = None
+    search_depth: Annotated[
+        SearchDepth | None,
+        Field(
+            json_schema_extra={
+                "description": "Advanced for a deeper, slower search, basic for a quick one.",
+            }
+        ),
+    ] = None
+    max_results: Annotated[
+        int | None,
+        Field(
+            ge=1,
+            le=20,
+            json_schema_extra={
+                "description": "How many results the search should return.",
+            },
+        ),
+    ] = None
+
 
 class Reflection(BaseModel):
     """Reflection model representing the assistant's reflection on a given content."""
@@ -46,6 +87,23 @@ class Reflection(BaseModel):
             },
         ),
     ]
+    search_hints: Annotated[
+        list[SearchHint],
+        Field(
+            default_factory=list,
+            json_schema_extra={
+                "description": "Optional hints on how to run some of the search queries, such as a news search for recent events.",
+                "examples": [
+                    [
+                        {
+                            "query": "Latest advancements in renewable energy technologies 2024",
+                            "topic": "news",
+                        }
+                    ]
+                ],
+            },
+        ),
+    ]
 
 
 class Answer(BaseModel):
@@ -92,6 +150,76 @@ class Revised(Answer):
     ]
 
 
+class Edit(BaseModel):
+    """An edit of a span of the previous answer."""
+
+    operation: Annotated[
+        Literal["insert", "replace", "delete"],
+        Field(
+            json_schema_extra={
+                "description": "Replace or delete the target span, or insert the text after it.",
+                "examples": ["replace"],
+            }
+        ),
+    ]
+    target: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The exact span of the previous answer to edit, quoted verbatim. Leave it empty to insert the text at the end of the answer.",
+                "examples": ["offshore wind farms are becoming more prevalent"],
+            }
+        ),
+    ]
+    text: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The text to insert, or to replace the target with. Leave it empty to delete the target.",
+                "examples": [
+                    "offshore wind capacity grew by 10.8 GW in 2023 [1]",
+                ],
+            }
+        ),
+    ] = ""
+
+
+class RevisionPatch(BaseModel):
+    """Revision of the previous answer as a list of edits, instead of a full rewrite."""
+
+    edits: Annotated[
+        list[Edit],
+        Field(
+            default_factory=list,
+            json_schema_extra={
+                "description": "The edits revising the previous answer, applied in order.",
+            },
+        ),
+    ]
+    reflection: Annotated[
+        Reflection,
+        Field(
+            json_schema_extra={
+                "description": "Reflection on the content of the revised answer.",
+            }
+        ),
+    ]
+    references: Annotated[
+        list[str],
+        Field(
+            default_factory=list,
+            json_schema_extra={
+                "description": "Full citations of the numerical citations added by the edits. The references of the previous answer are kept.",
+                "examples": [
+                    [
+                        "[3] Global Wind Energy Council (2024). Global Offshore Wind Report.",
+                    ]
+                ],
+            },
+        ),
+    ]
+
+
 class MarkdownArticle(BaseModel):
     """A well-formatted Markdown article."""
 
@@ -155,9 +283,20 @@ class MarkdownArticle(BaseModel):
         return "\n".join(parts)
 
 
+class PartialArticle(MarkdownArticle):
+    """An article made from a partial answer, as its generation ran out of time.
+
+    Partial articles are served, but never cached.
+    """
+
+
 __all__ = [
     "Answer",
+    "Edit",
     "MarkdownArticle",
+    "PartialArticle",
     "Reflection",
     "Revised",
+    "RevisionPatch",
+    "SearchHint",
 ]
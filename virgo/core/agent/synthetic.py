@@ -0,0 +1,203 @@
+"""Synthetic chat models and researcher, answering without any provider.
+
+They stand in for the GenAI providers and the search backends in load tests,
+so that the graph itself can be driven at high concurrency, offline and at no
+cost. The structured outputs are built from the field examples of the schemas,
+and the tool calls and token usage are filled in as a provider would, so that
+every node runs as it does against an actual model.
+"""
+
+import json
+import math
+import time
+import uuid
+from typing import Any, override
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+
+from virgo.core.agent.compact import CHARS_PER_TOKEN
+from virgo.core.agent.llms import GenerationParams, LanguageModelProvider
+from virgo.core.agent.schemas import Reflection
+
+
+def synthetic_output[M: BaseModel](schema: type[M]) -> M:
+    """Build an instance of a structured output model from its field examples.
+
+    Fields without examples are filled with a placeholder sentence, or their
+    default value.
+
+    Args:
+        schema: The structured output model, such as `Answer`.
+
+    Returns:
+        M: The synthetic instance.
+    """
+    values: dict[str, Any] = {}
+    for name, field in schema.model_fields.items():
+        extra = (
+            field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        )
+        examples = field.examples or extra.get("examples")
+        if examples:
+            values[name] = examples[0]
+        elif isinstance(field.annotation, type) and issubclass(
+            field.annotation, BaseModel
+        ):
+            values[name] = synthetic_output(field.annotation)
+        elif field.annotation is str:
+            values[name] = f"Synthetic {name.replace('_', ' ')}."
+    return schema.model_validate(values)
+
+
+def _tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _usage(messages: list[BaseMessage], output: str) -> UsageMetadata:
+    """Estimate the token usage of a call from the length of its text."""
+    input_tokens = sum(_tokens(message.text) for message in messages)
+    output_tokens = _tokens(output)
+    return UsageMetadata(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+    )
+
+
+class SyntheticChatModel(BaseChatModel):
+    """Chat model answering every call with synthetic outputs, after a delay."""
+
+    model_name: str = "synthetic"
+    """The name of the model, as requested from the provider."""
+
+    latency: float = 0.0
+    """How long each call waits before answering, in seconds."""
+
+    @property
+    @override
+    def _llm_type(self) -> str:
+        return "virgo-synthetic"
+
+    @override
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        content = "Synthetic answer."
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(content, usage_metadata=_usage(messages, content))
+                )
+            ]
+        )
+
+    @override
+    def with_structured_output(  # type: ignore[override]
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any
+    ) -> Runnable[Any, Any]:
+        parsed = synthetic_output(schema)
+        args = parsed.model_dump(mode="json")
+
+        def _invoke(input: LanguageModelInput, config: RunnableConfig) -> Any:
+            time.sleep(self.latency)
+            if not include_raw:
+                return parsed
+            messages = self._convert_input(input).to_messages()
+            raw = AIMessage(
+                "",
+                tool_calls=[
+                    {
+                        "name": schema.__name__,
+                        "args": args,
+                        "id": f"call_{uuid.uuid4().hex}",
+                    }
+                ],
+                usage_metadata=_usage(messages, json.dumps(args)),
+            )
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        return RunnableLambda(_invoke, name="SyntheticStructuredOutput")
+
+
+class SyntheticLanguageModelProvider(LanguageModelProvider):
+    """Language model provider of synthetic chat models, for load tests."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize the provider.
+
+        Args:
+            latency: How long the calls of the chat models wait, in seconds.
+        """
+        self._latency = latency
+
+    @override
+    def get_chat_model(
+        self, model_name: str, params: GenerationParams | None = None
+    ) -> BaseChatModel:
+        return SyntheticChatModel(model_name=model_name, latency=self._latency)
+
+
+class SyntheticResearcher:
+    """Callable returning synthetic search results, shaped as the Tavily ones."""
+
+    def __init__(self, latency: float = 0.0, max_results: int = 5) -> None:
+        """Initialize the researcher.
+
+        Args:
+            latency: How long each search waits before answering, in seconds.
+            max_results: How many results each search query returns.
+        """
+        self._latency = latency
+        self._max_results = max_results
+
+    def __call__(
+        self,
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list[dict]:
+        """Return synthetic results for the search queries found in the reflection.
+
+        Args:
+            reflection (Reflection): The reflection object containing search queries.
+            value (str): The answer text (unused but required by schema).
+            references (list[str], optional): References for revised answers (unused).
+
+        Returns:
+            list[dict]: The results of each search query.
+        """
+        time.sleep(self._latency)
+        return [
+            {
+                "query": query,
+                "results": [
+                    {
+                        "url": f"https://example.com/{index}/{rank}",
+                        "title": f"Synthetic result {rank} for {query}",
+                        "content": f"Synthetic content about {query}. " * 20,
+                        "score": 1.0 / (rank + 1),
+                    }
+                    for rank in range(self._max_results)
+                ],
+            }
+            for index, query in enumerate(reflection.search_queries)
+        ]
+
+
+__all__ = [
+    "SyntheticChatModel",
+    "SyntheticLanguageModelProvider",
+    "SyntheticResearcher",
+    "synthetic_output",
+]
@@ -0,0 +1,95 @@
+"""Timeouts of the HTTP calls, bounded by the deadline of the current run.
+
+When a run has a deadline, each call to the chat models and to the search API
+is given the time left before it as its timeout, so that no call outlives
+the run. The chat model clients send their requests through the transports
+of this module, which read the deadline of the runnable currently executing.
+"""
+
+from typing import Final, override
+
+import httpx
+from langchain_core.runnables import RunnableConfig
+
+from virgo.core.agent.configuration import GraphConfiguration
+
+MIN_CALL_TIMEOUT: Final[float] = 0.001
+"""The timeout of the calls made past the deadline, so that they fail at once."""
+
+
+def call_timeout(config: RunnableConfig | None = None) -> float | None:
+    """Get the timeout of a call made now, if the current run has a deadline.
+
+    Args:
+        config: The invocation config. Defaults to the config of the
+            runnable currently executing, if any.
+
+    Returns:
+        float | None: The seconds left before the deadline, or None without one.
+    """
+    remaining = GraphConfiguration.from_runnable_config(config).remaining_time()
+    return None if remaining is None else max(remaining, MIN_CALL_TIMEOUT)
+
+
+def _cap_timeout(request: httpx.Request) -> None:
+    """Cap the timeouts of a request at the deadline of the current run."""
+    timeout = call_timeout()
+    if timeout is None:
+        return
+    timeouts = request.extensions.get("timeout") or dict.fromkeys(
+        ("connect", "read", "write", "pool")
+    )
+    request.extensions["timeout"] = {
+        key: timeout if value is None else min(value, timeout)
+        for key, value in timeouts.items()
+    }
+
+
+class DeadlineTransport(httpx.BaseTransport):
+    """HTTP transport capping the timeouts of the requests at the run deadline."""
+
+    def __init__(self, transport: httpx.BaseTransport | None = None) -> None:
+        """Initialize the transport.
+
+        Args:
+            transport: The transport sending the requests, HTTP by default.
+        """
+        self._transport = transport or httpx.HTTPTransport()
+
+    @override
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _cap_timeout(request)
+        return self._transport.handle_request(request)
+
+    @override
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncDeadlineTransport(httpx.AsyncBaseTransport):
+    """Async HTTP transport capping the timeouts of the requests at the run deadline."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        """Initialize the transport.
+
+        Args:
+            transport: The transport sending the requests, HTTP by default.
+        """
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    @override
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _cap_timeout(request)
+        return await self._transport.handle_async_request(request)
+
+    @override
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+__all__ = [
+    "MIN_CALL_TIMEOUT",
+    "AsyncDeadlineTransport",
+    "DeadlineTransport",
+    "call_timeout",
+]
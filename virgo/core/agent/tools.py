@@ -1,18 +1,121 @@
 """Tools for the Virgo assistant.
 
-Currently includes a web search tool using Tavily.
+Includes researchers searching the web with Tavily, or a local corpus of
+documents indexed on disk.
 """
 
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Self, override
+
+import requests
 from langchain_tavily import TavilySearch
+from langchain_tavily._utilities import TAVILY_API_URL, TavilySearchAPIWrapper
 
+from virgo.core.agent.configuration import (
+    GraphConfiguration,
+    SearchDepth,
+    SearchTopic,
+)
+from virgo.core.agent.corpus import CorpusIndex
 from virgo.core.agent.schemas import Reflection
+from virgo.core.agent.timeouts import call_timeout
+
+
+@dataclass(frozen=True)
+class SearchParams:
+    """Parameters of the Tavily searches, left to the tool defaults if unset."""
+
+    max_results: int | None = None
+    """The maximum number of results of each search query."""
+
+    search_depth: SearchDepth | None = None
+    """The depth of the search queries."""
+
+    topic: SearchTopic | None = None
+    """The topic of the search queries."""
+
+    def override(self, other: Self) -> Self:
+        """Get these parameters, with the ones set in the other overriding them."""
+        return replace(
+            self,
+            **{key: value for key, value in asdict(other).items() if value is not None},
+        )
+
+
+class DeadlineTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+    """Tavily Search API wrapper whose requests time out at the run deadline.
+
+    The requests are those of the wrapped API, which sets no timeout.
+    """
+
+    @override
+    def raw_results(self, query: str, **kwargs: Any) -> dict[str, Any]:  # type: ignore[override]
+        params = {
+            "query": query,
+            **{key: value for key, value in kwargs.items() if value is not None},
+        }
+        response = requests.post(
+            f"{self.api_base_url or TAVILY_API_URL}/search",
+            json=params,
+            headers={
+                "Authorization": f"Bearer {self.tavily_api_key.get_secret_value()}",
+                "Content-Type": "application/json",
+                "X-Client-Source": "langchain-tavily",
+            },
+            timeout=call_timeout(),
+        )
+        if response.status_code != 200:
+            detail = response.json().get("detail", {})
+            error = detail.get("error") if isinstance(detail, dict) else None
+            raise ValueError(
+                f"Error {response.status_code}: {error or 'Unknown error'}"
+            )
+        return response.json()
 
 
 class TavilyResearcher:
-    """Callable that performs research using the Tavily search tool."""
+    """Callable that performs research using the Tavily search tool.
+
+    The search parameters adapt to the research round: the searches of the
+    draft answer, which has no references yet, make the first round, and the
+    searches of the revisions the later ones, which can be narrower and
+    cheaper. The hints of the reflection override them per query, and the
+    search depth, topic and maximum number of results set per invocation,
+    through the graph configuration, override both.
+    """
 
-    def __init__(self, tool: TavilySearch) -> None:
+    def __init__(
+        self,
+        tool: TavilySearch,
+        first_round: SearchParams | None = None,
+        later_rounds: SearchParams | None = None,
+    ) -> None:
+        """Initialize the researcher.
+
+        Args:
+            tool: The Tavily search tool, with the default parameters.
+            first_round: The parameters of the searches of the draft answers.
+            later_rounds: The parameters of the searches of the revisions.
+        """
         self._tool = tool
+        self._first_round = first_round or SearchParams()
+        self._later_rounds = later_rounds or SearchParams()
+        self._lock = threading.Lock()
+        self._tools: dict[int, TavilySearch] = {}
+
+    def _tool_for(self, max_results: int | None) -> TavilySearch:
+        """Get the search tool returning the given number of results."""
+        if max_results is None or max_results == self._tool.max_results:
+            return self._tool
+        with self._lock:
+            if max_results not in self._tools:
+                self._tools[max_results] = self._tool.model_copy(
+                    update={"max_results": max_results}
+                )
+            return self._tools[max_results]
 
     def __call__(
         self,
@@ -25,11 +128,125 @@ class TavilyResearcher:
         Args:
             reflection (Reflection): The reflection object containing search queries.
             value (str): The answer text (unused but required by schema).
-            references (list[str], optional): References for revised answers (unused).
+            references (list[str], optional): References for revised answers,
+                None for the draft answers of the first round.
 
         Returns:
             list[str]: The list of search results.
         """
-        return self._tool.batch(
-            [{"query": query} for query in reflection.search_queries]
+        configuration = GraphConfiguration.from_runnable_config()
+        configured = SearchParams(
+            max_results=configuration.search_max_results,
+            search_depth=configuration.search_depth,
+            topic=configuration.search_topic,
+        )
+        round_params = self._first_round if references is None else self._later_rounds
+        hints = {hint.query: hint for hint in reflection.search_hints}
+
+        # Queries returning different numbers of results need different tools.
+        batches: dict[int | None, list[tuple[int, dict[str, Any]]]] = {}
+        for position, query in enumerate(reflection.search_queries):
+            params = round_params
+            if hint := hints.get(query):
+                params = params.override(
+                    SearchParams(hint.max_results, hint.search_depth, hint.topic)
+                )
+            params = params.override(configured)
+            inputs = {
+                key: value
+                for key, value in (
+                    ("search_depth", params.search_depth),
+                    ("topic", params.topic),
+                )
+                if value is not None
+            }
+            batches.setdefault(params.max_results, []).append(
+                (position, {"query": query, **inputs})
+            )
+
+        if len(batches) == 1:
+            ((max_results, batch),) = batches.items()
+            return self._tool_for(max_results).batch([inputs for _, inputs in batch])
+        results: list[Any] = [None] * len(reflection.search_queries)
+        for max_results, batch in batches.items():
+            outputs = self._tool_for(max_results).batch([inputs for _, inputs in batch])
+            for (position, _), output in zip(batch, outputs, strict=True):
+                results[position] = output
+        return results
+
+
+class LocalCorpusResearcher:
+    """Callable that performs research in a local corpus, indexed on disk.
+
+    The results have the shape of the Tavily responses, one per query, so
+    that they are handled alike by the research node.
+    """
+
+    def __init__(self, index: CorpusIndex, max_results: int = 5) -> None:
+        self._index = index
+        self._max_results = max_results
+
+    def __call__(
+        self,
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list[dict]:
+        """Run the search queries found in the reflection against the local index.
+
+        Args:
+            reflection (Reflection): The reflection object containing search queries.
+            value (str): The answer text (unused but required by schema).
+            references (list[str], optional): References for revised answers (unused).
+
+        Returns:
+            list[dict]: The results of each search query.
+        """
+        max_results = (
+            GraphConfiguration.from_runnable_config().search_max_results
+            or self._max_results
         )
+        return [
+            {
+                "query": query,
+                "results": [
+                    {
+                        "url": Path(hit.path).as_uri(),
+                        "title": hit.title,
+                        "content": hit.content,
+                        "score": hit.score,
+                    }
+                    for hit in self._index.search(query, max_results)
+                ],
+            }
+            for query in reflection.search_queries
+        ]
+
+
+class CombinedResearcher:
+    """Callable concatenating the results of several researchers."""
+
+    def __init__(self, researchers: Sequence[Callable[..., list]]) -> None:
+        self._researchers = researchers
+
+    def __call__(
+        self,
+        reflection: Reflection,
+        value: str,
+        references: list[str] | None = None,
+    ) -> list:
+        """Run the search queries with every researcher, in order.
+
+        Args:
+            reflection (Reflection): The reflection object containing search queries.
+            value (str): The answer text.
+            references (list[str], optional): References for revised answers.
+
+        Returns:
+            list: The results of every researcher.
+        """
+        return [
+            result
+            for researcher in self._researchers
+            for result in researcher(reflection, value, references)
+        ]
@@ -1,11 +1,128 @@
 from typing import Annotated, Literal
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-type GenAIProvider = Literal["openai", "ollama"]
+type GenAIProvider = Literal["openai", "ollama", "synthetic"]
 """Supported GenAI providers."""
 
+type EvidenceStoreBackend = Literal["none", "memory", "sqlite"]
+"""Supported evidence store backends."""
+
+type ResearchBackend = Literal["tavily", "local", "both", "synthetic"]
+"""Supported research backends."""
+
+type ArticleCacheBackend = Literal["none", "memory", "sqlite"]
+"""Supported finished-article cache backends."""
+
+type TraceExporter = Literal["none", "file", "otlp"]
+"""Supported trace exporters."""
+
+type CassetteSetting = Literal["off", "record", "replay"]
+"""Supported record/replay modes of the chat model and research calls."""
+
+type GenerationNode = Literal["draft", "revise", "format"]
+"""Graph nodes calling the chat model."""
+
+type RevisionMode = Literal["rewrite", "patch"]
+"""Supported ways of revising the answers: full rewrites, or edits of the previous one."""
+
+type StructuredOutputMethod = Literal["function_calling", "json_schema", "json_mode"]
+"""Supported ways of asking the chat models for structured outputs."""
+
+type SearchRound = Literal["first", "later"]
+"""Research rounds: the searches of the draft answer, then of the revisions."""
+
+
+class NodeGenerationSettings(BaseModel):
+    """Generation parameters of the chat model calls of a graph node."""
+
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The maximum number of output tokens.",
+                "examples": [600, 1200],
+            },
+        ),
+    ] = None
+    temperature: Annotated[
+        float | None,
+        Field(
+            ge=0,
+            le=2,
+            json_schema_extra={
+                "description": "The sampling temperature.",
+                "examples": [0, 0.7],
+            },
+        ),
+    ] = None
+    num_ctx: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The Ollama context window, in tokens.",
+                "examples": [4096],
+            },
+        ),
+    ] = None
+    num_predict: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The Ollama maximum number of predicted tokens, `max_tokens` by default.",
+                "examples": [512],
+            },
+        ),
+    ] = None
+    num_thread: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The number of threads running the Ollama model.",
+                "examples": [8],
+            },
+        ),
+    ] = None
+
+
+class SearchRoundSettings(BaseModel):
+    """Parameters of the Tavily searches of a research round."""
+
+    max_results: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            le=20,
+            json_schema_extra={
+                "description": "The maximum number of results per query.",
+                "examples": [3, 5],
+            },
+        ),
+    ] = None
+    search_depth: Annotated[
+        Literal["basic", "advanced"] | None,
+        Field(
+            json_schema_extra={
+                "description": "The depth of the searches.",
+                "examples": ["basic", "advanced"],
+            },
+        ),
+    ] = None
+    topic: Annotated[
+        Literal["general", "news", "finance"] | None,
+        Field(
+            json_schema_extra={
+                "description": "The topic of the searches.",
+                "examples": ["general", "news"],
+            },
+        ),
+    ] = None
+
 
 class VirgoSettings(BaseSettings):
     """Settings for the Virgo application."""
@@ -16,8 +133,8 @@ class VirgoSettings(BaseSettings):
         GenAIProvider,
         Field(
             json_schema_extra={
-                "description": "The GenAI provider to use for language model interactions.",
-                "examples": ["openai", "ollama"],
+                "description": "The GenAI provider to use for language model interactions. The `synthetic` provider answers with made-up structured outputs, for load tests.",
+                "examples": ["openai", "ollama", "synthetic"],
             },
         ),
     ] = "openai"
@@ -30,6 +147,49 @@ class VirgoSettings(BaseSettings):
             }
         ),
     ] = "gpt-4-turbo"
+    genai_fallbacks: Annotated[
+        list[str],
+        Field(
+            json_schema_extra={
+                "description": "Fallback chat models, as `provider:model`, in order of preference. The calls are routed to the healthiest of the configured model and its fallbacks, from the latency and errors of their recent calls, and fail over to the next ones when a call fails.",
+                "examples": [
+                    ["ollama:llama3.2"],
+                    ["openai:gpt-4o-mini", "ollama:llama3.2"],
+                ],
+            },
+        ),
+    ] = []
+    generation_params: Annotated[
+        dict[GenerationNode, NodeGenerationSettings],
+        Field(
+            json_schema_extra={
+                "description": "Generation parameters of the chat model calls, per graph node. Capping the output tokens of the drafts and revisions, and lowering the temperature of the formatter, bounds the latency and cost of each call. Ollama also takes its context window, output and thread limits. Unset parameters are left to the provider defaults.",
+                "examples": [
+                    {
+                        "draft": {"max_tokens": 600},
+                        "revise": {"max_tokens": 800},
+                        "format": {"max_tokens": 1200, "temperature": 0},
+                    },
+                    {"draft": {"num_ctx": 4096, "num_predict": 512, "num_thread": 8}},
+                ],
+            },
+        ),
+    ] = {}
+    structured_output_methods: Annotated[
+        dict[GenerationNode, dict[GenAIProvider, StructuredOutputMethod]],
+        Field(
+            json_schema_extra={
+                "description": "How the chat model calls of each graph node ask for structured outputs, per provider: with tool calls (`function_calling`), a JSON schema the output is constrained to (`json_schema`), or JSON objects following the schema given in the prompt (`json_mode`). Their latency and failure rates differ per provider and model, as `virgo benchmark` reports. Unset methods are left to the provider defaults.",
+                "examples": [
+                    {
+                        "draft": {"ollama": "json_schema"},
+                        "revise": {"ollama": "json_schema"},
+                        "format": {"ollama": "json_mode"},
+                    }
+                ],
+            },
+        ),
+    ] = {}
     max_iterations: Annotated[
         int,
         Field(
@@ -39,9 +199,329 @@ class VirgoSettings(BaseSettings):
             },
         ),
     ] = 5
+    request_timeout: Annotated[
+        float | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The wall-clock limit of a generation, in seconds. Each node gets the remaining time, and once it is nearly up the latest answer is formatted, or rendered locally, instead of failing. Generations are not limited when unset.",
+                "examples": [60, 120],
+            },
+        ),
+    ] = None
+    deadline_reserve: Annotated[
+        float,
+        Field(
+            ge=0,
+            json_schema_extra={
+                "description": "The seconds of the request timeout kept for formatting the article: the other nodes are abandoned rather than eat into it, and with less time left, the graph skips straight to formatting the latest answer.",
+                "examples": [10],
+            },
+        ),
+    ] = 10.0
+    compact_schemas: Annotated[
+        bool,
+        Field(
+            json_schema_extra={
+                "description": "Whether to send compact structured output schemas to the model, without examples and with short descriptions, to save prompt tokens on every call.",
+                "examples": [False, True],
+            },
+        ),
+    ] = False
+    citation_index: Annotated[
+        bool,
+        Field(
+            json_schema_extra={
+                "description": "Whether the revisor cites the research sources by their ID in an index built from the search results, the references of the article being rendered locally as Markdown links instead of by the models.",
+                "examples": [False, True],
+            },
+        ),
+    ] = False
+    revision_mode: Annotated[
+        RevisionMode,
+        Field(
+            json_schema_extra={
+                "description": "How the revisor revises an answer already revised: by rewriting it in full, or by listing the edits of the previous answer, applied locally, to save output tokens.",
+                "examples": ["rewrite", "patch"],
+            },
+        ),
+    ] = "rewrite"
+    research_backend: Annotated[
+        ResearchBackend,
+        Field(
+            json_schema_extra={
+                "description": "Where to run the search queries: the Tavily web search, the local corpus indexed with `virgo index build`, or both. The `synthetic` backend returns made-up results, for load tests.",
+                "examples": ["tavily", "local", "both", "synthetic"],
+            },
+        ),
+    ] = "tavily"
+    search_rounds: Annotated[
+        dict[SearchRound, SearchRoundSettings],
+        Field(
+            json_schema_extra={
+                "description": "Parameters of the Tavily searches per research round: the first round researches the draft answer, the later ones the revisions. Both default to 5 results at the default depth. Broad, deep first searches followed by narrower, basic ones make the later rounds faster and cheaper. The hints of the reflections and the per-invocation settings override them.",
+                "examples": [
+                    {
+                        "first": {"max_results": 5, "search_depth": "advanced"},
+                        "later": {"max_results": 3, "search_depth": "basic"},
+                    },
+                    {"later": {"max_results": 3}},
+                ],
+            },
+        ),
+    ] = {
+        "first": SearchRoundSettings(max_results=5),
+        "later": SearchRoundSettings(max_results=5),
+    }
+    corpus_index_path: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The SQLite database file holding the inverted index of the local corpus.",
+                "examples": ["virgo-index.db"],
+            },
+        ),
+    ] = "virgo-index.db"
+    corpus_max_results: Annotated[
+        int,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The maximum number of local corpus chunks returned for each search query.",
+                "examples": [5],
+            },
+        ),
+    ] = 5
+    research_top_k: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "How many search result chunks, ranked with BM25 against the current critique and search queries, are forwarded to the revisor on each iteration. All the results are forwarded when unset.",
+                "examples": [8],
+            },
+        ),
+    ] = None
+    research_chunk_words: Annotated[
+        int,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The maximum number of words of the search result chunks ranked when `research_top_k` is set.",
+                "examples": [120],
+            },
+        ),
+    ] = 120
+    evidence_store: Annotated[
+        EvidenceStoreBackend,
+        Field(
+            json_schema_extra={
+                "description": "Where to store the research results. When enabled, the graph state only holds references to the stored results, which are resolved when building prompts. The `memory` store is shared by the runs of the process and evicts the least recently used results beyond `evidence_store_max_entries`, so long-lived processes, such as servers and daemons, had better use the `sqlite` store.",
+                "examples": ["none", "memory", "sqlite"],
+            },
+        ),
+    ] = "none"
+    evidence_store_max_entries: Annotated[
+        int,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "The maximum number of research results kept by the `memory` evidence store, before evicting the least recently used ones.",
+                "examples": [10000],
+            },
+        ),
+    ] = 10000
+    evidence_store_path: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The SQLite database file used by the `sqlite` evidence store.",
+                "examples": ["virgo-evidence.db"],
+            },
+        ),
+    ] = "virgo-evidence.db"
+    article_cache: Annotated[
+        ArticleCacheBackend,
+        Field(
+            json_schema_extra={
+                "description": "Where to cache the finished articles. A question asked again with the same provider, model and iterations is answered from the cache, without running the graph.",
+                "examples": ["none", "memory", "sqlite"],
+            },
+        ),
+    ] = "none"
+    article_cache_path: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The SQLite database file used by the `sqlite` article cache.",
+                "examples": ["virgo-cache.db"],
+            },
+        ),
+    ] = "virgo-cache.db"
+    article_cache_ttl: Annotated[
+        float,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "How long a cached article stays valid, in seconds.",
+                "examples": [86400, 3600],
+            },
+        ),
+    ] = 86400
+    article_cache_max_entries: Annotated[
+        int,
+        Field(
+            gt=0,
+            json_schema_extra={
+                "description": "How many articles the cache keeps before evicting the least recently used ones.",
+                "examples": [1000],
+            },
+        ),
+    ] = 1000
+    article_cache_similarity: Annotated[
+        float | None,
+        Field(
+            gt=0,
+            le=1,
+            json_schema_extra={
+                "description": "The minimum cosine similarity, between hashed n-gram vectors, of a previously cached question whose article is served for a rephrased question. Only exact matches are served when unset.",
+                "examples": [0.85],
+            },
+        ),
+    ] = None
+    profile: Annotated[
+        bool,
+        Field(
+            json_schema_extra={
+                "description": "Whether to measure the wall-clock and CPU time spent in each node of the graph.",
+                "examples": [False, True],
+            },
+        ),
+    ] = False
+    memory_profile: Annotated[
+        bool,
+        Field(
+            json_schema_extra={
+                "description": "Whether to trace the memory allocated by each node of the graph with `tracemalloc`, which slows the allocations down.",
+                "examples": [False, True],
+            },
+        ),
+    ] = False
+    profile_output: Annotated[
+        str | None,
+        Field(
+            json_schema_extra={
+                "description": "File where the deterministic profiler statistics are written, in the `pstats` format. Setting it enables the deterministic profiler.",
+                "examples": ["virgo.prof"],
+            },
+        ),
+    ] = None
+    trace_exporter: Annotated[
+        TraceExporter,
+        Field(
+            json_schema_extra={
+                "description": "Where to export the OTLP-JSON spans of the graph nodes, chat model calls and searches: a local file or an OTLP/HTTP collector endpoint.",
+                "examples": ["none", "file", "otlp"],
+            },
+        ),
+    ] = "none"
+    trace_file: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The file the `file` trace exporter appends to, one OTLP-JSON export request per line.",
+                "examples": ["virgo-traces.jsonl"],
+            },
+        ),
+    ] = "virgo-traces.jsonl"
+    trace_endpoint: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The base URL of the collector used by the `otlp` trace exporter.",
+                "examples": ["http://localhost:4318"],
+            },
+        ),
+    ] = "http://localhost:4318"
+    cassette: Annotated[
+        CassetteSetting,
+        Field(
+            json_schema_extra={
+                "description": "Record every chat model and research call of the runs to the cassette file, or replay the recorded calls instead, without network access nor API keys, for reproducible offline benchmarks.",
+                "examples": ["off", "record", "replay"],
+            },
+        ),
+    ] = "off"
+    cassette_path: Annotated[
+        str,
+        Field(
+            json_schema_extra={
+                "description": "The JSON Lines file the calls are recorded to and replayed from.",
+                "examples": ["virgo-cassette.jsonl"],
+            },
+        ),
+    ] = "virgo-cassette.jsonl"
+    cassette_latency_scale: Annotated[
+        float,
+        Field(
+            ge=0,
+            json_schema_extra={
+                "description": "When replaying, wait for the recorded latency of each call times this factor: 1 replays the recorded latencies, 0 answers at once.",
+                "examples": [0, 1, 0.5],
+            },
+        ),
+    ] = 0.0
+    synthetic_latency: Annotated[
+        float,
+        Field(
+            ge=0,
+            json_schema_extra={
+                "description": "How long the `synthetic` chat models and researcher wait before answering each call, in seconds.",
+                "examples": [0, 0.5],
+            },
+        ),
+    ] = 0.0
+    record_latencies: Annotated[
+        bool,
+        Field(
+            json_schema_extra={
+                "description": "Whether to keep the latency and token usage of every node run, to compute their percentiles as `virgo loadtest` does.",
+                "examples": [False, True],
+            },
+        ),
+    ] = False
+    metrics_textfile: Annotated[
+        str | None,
+        Field(
+            json_schema_extra={
+                "description": "File where the Prometheus metrics are written after each generation, for the node exporter textfile collector. Setting it enables the metrics.",
+                "examples": ["/var/lib/node_exporter/virgo.prom"],
+            },
+        ),
+    ] = None
+    metrics_port: Annotated[
+        int | None,
+        Field(
+            json_schema_extra={
+                "description": "Local port serving the Prometheus metrics over HTTP while a command runs. Setting it enables the metrics.",
+                "examples": [9464],
+            },
+        ),
+    ] = None
 
 
 __all__ = [
-    "VirgoSettings",
+    "ArticleCacheBackend",
+    "CassetteSetting",
+    "EvidenceStoreBackend",
     "GenAIProvider",
+    "GenerationNode",
+    "NodeGenerationSettings",
+    "ResearchBackend",
+    "RevisionMode",
+    "SearchRound",
+    "SearchRoundSettings",
+    "StructuredOutputMethod",
+    "TraceExporter",
+    "VirgoSettings",
 ]
@@ -0,0 +1 @@
+"""Telemetry for the Virgo agent: profiling, tracing and metrics."""
@@ -0,0 +1,118 @@
+"""Latency percentiles of the graph nodes, as measured by load tests.
+
+Unlike the Prometheus histograms, which only keep bucket counts, the
+`LatencyRecorder` keeps every sample, so that the exact percentiles of each
+node can be reported. It is meant for bounded runs such as `virgo loadtest`.
+"""
+
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Self
+
+import numpy as np
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.telemetry.metrics import node_token_usage
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """The percentiles of a set of latencies, in seconds."""
+
+    count: int
+    """The number of samples."""
+
+    p50: float
+    """The median latency."""
+
+    p95: float
+    """The 95th percentile latency."""
+
+    p99: float
+    """The 99th percentile latency."""
+
+    @classmethod
+    def of(cls, samples: Sequence[float]) -> Self:
+        """Summarize latency samples, all zero when there is none."""
+        if not samples:
+            return cls(count=0, p50=0.0, p95=0.0, p99=0.0)
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return cls(count=len(samples), p50=float(p50), p95=float(p95), p99=float(p99))
+
+
+@dataclass
+class TokenUsage:
+    """Tokens used by chat model calls."""
+
+    input_tokens: int = 0
+    """The prompt tokens."""
+
+    output_tokens: int = 0
+    """The completion tokens."""
+
+    @property
+    def total_tokens(self) -> int:
+        """The prompt and completion tokens."""
+        return self.input_tokens + self.output_tokens
+
+
+class LatencyRecorder:
+    """Node hook keeping the latency and token usage of every node run.
+
+    The hook is thread-safe, so that one recorder can measure concurrent
+    graph runs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: dict[str, list[float]] = {}
+        self._tokens: dict[str, TokenUsage] = {}
+
+    @contextmanager
+    def __call__(self, run: NodeRun) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._durations.setdefault(run.name, []).append(duration)
+        usage = node_token_usage(run)
+        if usage:
+            with self._lock:
+                tokens = self._tokens.setdefault(run.name, TokenUsage())
+                for input_tokens, output_tokens in usage:
+                    tokens.input_tokens += input_tokens
+                    tokens.output_tokens += output_tokens
+
+    def latencies(self) -> dict[str, LatencySummary]:
+        """Summarize the latencies of each node, in order of first run."""
+        with self._lock:
+            durations = {
+                name: list(samples) for name, samples in self._durations.items()
+            }
+        return {name: LatencySummary.of(samples) for name, samples in durations.items()}
+
+    def token_usage(self) -> dict[str, TokenUsage]:
+        """Get the tokens used by the chat model calls of each node."""
+        with self._lock:
+            return {
+                name: TokenUsage(usage.input_tokens, usage.output_tokens)
+                for name, usage in self._tokens.items()
+            }
+
+    def clear(self) -> None:
+        """Forget the recorded node runs."""
+        with self._lock:
+            self._durations.clear()
+            self._tokens.clear()
+
+
+__all__ = [
+    "LatencyRecorder",
+    "LatencySummary",
+    "TokenUsage",
+]
@@ -0,0 +1,177 @@
+"""Per-node memory profiling of the Virgo graph, with `tracemalloc`.
+
+The `NodeMemoryProfiler` takes a `tracemalloc` snapshot before and after each
+node, reporting the memory the node left allocated, its peak usage, the call
+sites that allocated the most, and the size of each `AnswerState` field once
+the node update is applied. Tracing slows the allocations down, so it is only
+meant for diagnostic runs.
+
+The allocations are traced process-wide: with concurrent graph runs, the
+measures of a node include the allocations of the others.
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel
+
+from virgo.core.agent.graph.hooks import NodeRun
+from virgo.core.agent.graph.state import AnswerState
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """A call site allocating memory during a node."""
+
+    location: str
+    """The file and line of the allocation."""
+
+    size: int
+    """The bytes allocated by the site and still held after the node."""
+
+    count: int
+    """The number of blocks allocated by the site and still held after the node."""
+
+
+@dataclass
+class NodeMemory:
+    """The memory usage of a node execution."""
+
+    name: str
+    """The name of the node."""
+
+    allocated: int
+    """The bytes the node left allocated, negative if it freed memory."""
+
+    peak: int
+    """The peak traced memory while the node ran, in bytes."""
+
+    top: list[AllocationSite] = field(default_factory=list)
+    """The call sites that allocated the most, largest first."""
+
+    state_sizes: dict[str, int] = field(default_factory=dict)
+    """The size of each state field once the node update is applied, in bytes."""
+
+
+def deep_size(value: Any, seen: set[int] | None = None) -> int:
+    """Estimate the memory held by an object and everything it references.
+
+    Objects referenced several times are only counted once.
+
+    Args:
+        value: The object to measure, such as a state field.
+        seen: The identifiers of the objects already counted.
+
+    Returns:
+        int: The estimated size, in bytes.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, str | bytes | int | float | bool | None):
+        return size
+    if isinstance(value, Mapping):
+        return size + sum(
+            deep_size(key, seen) + deep_size(item, seen) for key, item in value.items()
+        )
+    if isinstance(value, list | tuple | set | frozenset):
+        return size + sum(deep_size(item, seen) for item in value)
+    if isinstance(value, BaseModel):
+        return size + deep_size(value.__dict__, seen)
+    if hasattr(value, "__dict__"):
+        return size + deep_size(vars(value), seen)
+    return size
+
+
+def _updated_state(state: AnswerState, output: AnswerState | None) -> dict[str, Any]:
+    """Apply a node update to the state, as the graph reducers do."""
+    updated: dict[str, Any] = dict(state)
+    for key, value in (output or {}).items():
+        if key == "messages":
+            updated[key] = [*state.get("messages", []), *value]  # type: ignore[misc]
+        else:
+            updated[key] = value
+    return updated
+
+
+class NodeMemoryProfiler:
+    """Node hook measuring the memory allocated by each node with `tracemalloc`.
+
+    Tracing starts with the first profiled node, unless it already runs.
+    """
+
+    def __init__(self, top: int = 3, frames: int = 1) -> None:
+        """Initialize the profiler.
+
+        Args:
+            top: How many allocating call sites to keep per node.
+            frames: How many frames of the allocation tracebacks to keep; the
+                call sites are grouped by their innermost frame.
+        """
+        self._top = top
+        self._frames = frames
+        self.steps: list[NodeMemory] = []
+        """The memory usage of each node execution, in order."""
+
+    @contextmanager
+    def __call__(self, run: NodeRun) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+        before = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+            stats = sorted(
+                after.compare_to(before, "lineno"),
+                key=lambda stat: stat.size_diff,
+                reverse=True,
+            )
+            top = [
+                AllocationSite(
+                    location=str(stat.traceback[0]),
+                    size=stat.size_diff,
+                    count=stat.count_diff,
+                )
+                for stat in stats[: self._top]
+                if stat.size_diff > 0
+            ]
+            self.steps.append(
+                NodeMemory(
+                    name=run.name,
+                    allocated=current_after - current_before,
+                    peak=peak,
+                    top=top,
+                    state_sizes={
+                        key: deep_size(value)
+                        for key, value in _updated_state(run.state, run.output).items()
+                    },
+                )
+            )
+
+    def stop(self) -> None:
+        """Stop tracing the allocations."""
+        tracemalloc.stop()
+
+
+__all__ = [
+    "AllocationSite",
+    "NodeMemory",
+    "NodeMemoryProfiler",
+    "deep_size",
+]
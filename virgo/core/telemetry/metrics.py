@@ -0,0 +1,436 @@
+"""Prometheus-style metrics of the Virgo generations.
+
+Metrics are kept in memory by a `MetricsRegistry` and exposed in the Prometheus
+text format, either on a local HTTP endpoint or in a textfile read by the
+node exporter textfile collector. `VirgoMetrics` defines the Virgo metrics and
+collects them from the graph nodes (as a node hook), from the tool calls (as a
+callback handler) and from the `GenerateArticleAction` boundary.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Final, override
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, ToolMessage
+
+from virgo.core.agent.graph.hooks import NodeRun
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+"""The content type of the Prometheus text format."""
+
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+"""Default histogram buckets, in seconds, suited to LLM and search latencies."""
+
+type _LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """Base class of the metrics, holding their metadata and lock."""
+
+    type_name: str
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str]
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> _LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        """Render the metric in the Prometheus text format."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Render the samples of the metric, one line each."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[_LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: The non-negative amount to add.
+            **labels: The label values of the incremented series.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the current value of a series."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    @override
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labelnames:
+            values = [((), 0.0)]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """A histogram of observations, with cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[_LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value: The observed value.
+            **labels: The label values of the observed series.
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            totals[0] += value
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations of a series."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the time spent within the context, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @override
+    def _samples(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), totals[0]))
+                for key, (counts, totals) in self._series.items()
+            )
+        samples = []
+        names = (*self.labelnames, "le")
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                samples.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            samples.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            samples.append(f"{self.name}_count{labels} {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    """Registry of metrics, rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Register a counter.
+
+        Args:
+            name: The metric name.
+            documentation: The metric help text.
+            labelnames: The names of the metric labels.
+
+        Returns:
+            Counter: The registered counter.
+        """
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register a histogram.
+
+        Args:
+            name: The metric name.
+            documentation: The metric help text.
+            labelnames: The names of the metric labels.
+            buckets: The upper bounds of the buckets.
+
+        Returns:
+            Histogram: The registered histogram.
+        """
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register[M: _Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Atomically write the metrics to a file, for the textfile collector.
+
+        Args:
+            path: The file to write, usually with a `.prom` extension.
+        """
+        path = Path(path)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(self.render(), encoding="utf-8")
+        temporary.replace(path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve the metrics over HTTP from a daemon thread.
+
+        Args:
+            port: The port to listen on, or 0 to pick a free one.
+            host: The address to bind.
+
+        Returns:
+            ThreadingHTTPServer: The running server, to be shut down by the caller.
+        """
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def node_token_usage(run: NodeRun) -> list[tuple[int, int]]:
+    """Get the input and output tokens of each message a node added to the state."""
+    known = {id(message) for message in run.state.get("messages", [])}
+    return [
+        (usage["input_tokens"], usage["output_tokens"])
+        for message in (run.output or {}).get("messages", [])
+        if isinstance(message, AIMessage)
+        and (usage := message.usage_metadata)
+        and id(message) not in known
+    ]
+
+
+class VirgoMetrics(BaseCallbackHandler):
+    """The metrics of the Virgo generations.
+
+    An instance is at the same time a node hook, measuring the latency and
+    token usage of each node, and a callback handler, measuring the latency
+    and errors of the searches. The generation counters are updated by the
+    `GenerateArticleAction`.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        search_tool_names: Sequence[str] = ("tavily_search",),
+    ) -> None:
+        """Initialize the metrics.
+
+        Args:
+            registry: The registry to register the metrics in.
+            search_tool_names: The names of the tools measured as searches.
+        """
+        self.registry = registry or MetricsRegistry()
+        self._search_tool_names = frozenset(search_tool_names)
+        self._search_starts: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+        self.generations_started = self.registry.counter(
+            "virgo_generations_started_total", "Article generations started."
+        )
+        self.generations_succeeded = self.registry.counter(
+            "virgo_generations_succeeded_total", "Article generations that succeeded."
+        )
+        self.generations_failed = self.registry.counter(
+            "virgo_generations_failed_total",
+            "Article generations that failed or produced no article.",
+        )
+        self.generations_coalesced = self.registry.counter(
+            "virgo_generations_coalesced_total",
+            "Article requests served by an identical generation already in flight.",
+        )
+        self.node_duration = self.registry.histogram(
+            "virgo_node_duration_seconds", "Latency of the graph nodes.", ["node"]
+        )
+        self.node_tokens = self.registry.counter(
+            "virgo_node_tokens_total",
+            "Tokens used by the chat model calls of the graph nodes.",
+            ["node", "direction"],
+        )
+        self.iterations = self.registry.histogram(
+            "virgo_iterations_per_article",
+            "Research iterations run per formatted article.",
+            buckets=(1, 2, 3, 5, 8, 13),
+        )
+        self.search_duration = self.registry.histogram(
+            "virgo_search_duration_seconds", "Latency of the search queries."
+        )
+        self.search_errors = self.registry.counter(
+            "virgo_search_errors_total", "Search queries that failed."
+        )
+        self.cache_hits = self.registry.counter(
+            "virgo_cache_hits_total", "Lookups served from a cache.", ["cache"]
+        )
+        self.cache_misses = self.registry.counter(
+            "virgo_cache_misses_total", "Lookups not found in a cache.", ["cache"]
+        )
+
+    @contextmanager
+    def __call__(self, run: NodeRun) -> Iterator[None]:
+        with self.node_duration.time(node=run.name):
+            yield
+        self._observe_tokens(run)
+        if run.name == "format":
+            self.iterations.observe(
+                sum(isinstance(m, ToolMessage) for m in run.state["messages"])
+            )
+
+    def _observe_tokens(self, run: NodeRun) -> None:
+        """Count the tokens of the messages the node added to the state."""
+        for input_tokens, output_tokens in node_token_usage(run):
+            self.node_tokens.inc(input_tokens, node=run.name, direction="input")
+            self.node_tokens.inc(output_tokens, node=run.name, direction="output")
+
+    @override
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or serialized.get("name")
+        if name in self._search_tool_names:
+            with self._lock:
+                self._search_starts[run_id] = time.perf_counter()
+
+    @override
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            start = self._search_starts.pop(run_id, None)
+        if start is not None:
+            self.search_duration.observe(time.perf_counter() - start)
+            # Tavily reports the request failures in its output instead of raising.
+            if isinstance(output, dict) and "error" in output:
+                self.search_errors.inc()
+
+    @override
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        with self._lock:
+            start = self._search_starts.pop(run_id, None)
+        if start is not None:
+            self.search_duration.observe(time.perf_counter() - start)
+            self.search_errors.inc()
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "VirgoMetrics",
+    "node_token_usage",
+]
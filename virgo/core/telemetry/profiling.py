@@ -0,0 +1,97 @@
+"""Per-node CPU and wall-clock profiling of the Virgo graph."""
+
+import cProfile
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from virgo.core.agent.graph.hooks import NodeRun
+
+
+@dataclass
+class SectionTiming:
+    """Accumulated timings of a profiled section, such as a graph node."""
+
+    name: str
+    """The name of the section."""
+
+    calls: int = 0
+    """How many times the section ran."""
+
+    wall_time: float = 0.0
+    """Total elapsed time, in seconds."""
+
+    cpu_time: float = 0.0
+    """Total CPU time of the process, in seconds."""
+
+    @property
+    def mean_wall_time(self) -> float:
+        """Mean elapsed time per call, in seconds."""
+        return self.wall_time / self.calls if self.calls else 0.0
+
+
+class NodeProfiler:
+    """Node hook measuring the wall-clock and CPU time spent in each node.
+
+    Sections other than graph nodes, such as the rendering of the output,
+    can be measured with `section`. Optionally, a deterministic profiler
+    (`cProfile`) runs while the sections execute, and its statistics can be
+    dumped to a file readable by `pstats`, `snakeviz` or `gprof2dot`.
+    """
+
+    def __init__(self, deterministic: bool = False) -> None:
+        """Initialize the profiler.
+
+        Args:
+            deterministic: Whether to run `cProfile` within the profiled sections.
+        """
+        self._profile = cProfile.Profile() if deterministic else None
+        self._depth = 0
+        self.timings: dict[str, SectionTiming] = {}
+        """The timings of each section, in order of first execution."""
+
+    def __call__(self, run: NodeRun) -> AbstractContextManager[None]:
+        return self.section(run.name)
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Measure the time spent within the context.
+
+        Args:
+            name: The name the timings are accumulated under.
+        """
+        timing = self.timings.setdefault(name, SectionTiming(name))
+        if self._profile is not None and self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing.calls += 1
+            timing.wall_time += time.perf_counter() - wall_start
+            timing.cpu_time += time.process_time() - cpu_start
+            self._depth -= 1
+            if self._profile is not None and self._depth == 0:
+                self._profile.disable()
+
+    def dump_stats(self, path: str | Path) -> None:
+        """Write the deterministic profiler statistics to a file.
+
+        Args:
+            path: The file to write, in the `pstats` format.
+
+        Raises:
+            RuntimeError: If the profiler was not created as deterministic.
+        """
+        if self._profile is None:
+            raise RuntimeError("The deterministic profiler is not enabled.")
+        self._profile.dump_stats(path)
+
+
+__all__ = [
+    "NodeProfiler",
+    "SectionTiming",
+]
@@ -0,0 +1,412 @@
+"""OpenTelemetry-compatible tracing of the Virgo graph, exported as OTLP-JSON.
+
+The tracer is a LangChain callback handler emitting a span for the graph run,
+each graph node, each chat model call and each tool call (such as the Tavily
+queries). Spans are exported once the graph run ends, either to a local file
+(one `ExportTraceServiceRequest` per line, as read by the OpenTelemetry
+Collector `otlpjsonfile` receiver) or to a collector OTLP/HTTP endpoint.
+It does not depend on the OpenTelemetry SDK nor on any network service.
+"""
+
+import json
+import logging
+import secrets
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final, override
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+logger = logging.getLogger(__name__)
+
+type AttributeValue = str | int | float | bool
+
+SPAN_KIND_INTERNAL: Final[int] = 1
+SPAN_KIND_CLIENT: Final[int] = 3
+
+STATUS_CODE_OK: Final[int] = 1
+STATUS_CODE_ERROR: Final[int] = 2
+
+
+@dataclass
+class Span:
+    """A finished or ongoing span, following the OpenTelemetry data model."""
+
+    trace_id: str
+    """The trace identifier, as 32 hexadecimal characters."""
+
+    span_id: str
+    """The span identifier, as 16 hexadecimal characters."""
+
+    parent_span_id: str | None
+    """The identifier of the parent span, if any."""
+
+    name: str
+    """The span name."""
+
+    kind: int = SPAN_KIND_INTERNAL
+    """The OTLP span kind."""
+
+    start_time_ns: int = field(default_factory=time.time_ns)
+    """The start time, in nanoseconds since the epoch."""
+
+    end_time_ns: int | None = None
+    """The end time, in nanoseconds since the epoch, once the span has ended."""
+
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    """The span attributes."""
+
+    error: str | None = None
+    """The error message, if the span failed."""
+
+    def end(self, error: BaseException | None = None) -> None:
+        """End the span, recording its duration and its error, if any."""
+        self.end_time_ns = time.time_ns()
+        self.attributes["virgo.duration_ms"] = round(
+            (self.end_time_ns - self.start_time_ns) / 1e6, 3
+        )
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Convert the span to its OTLP-JSON representation."""
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": [
+                {"key": key, "value": _to_otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": STATUS_CODE_ERROR, "message": self.error}
+                if self.error
+                else {"code": STATUS_CODE_OK}
+            ),
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _to_otlp_value(value: AttributeValue) -> dict[str, Any]:
+    """Convert an attribute value to an OTLP-JSON `AnyValue`."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": value}
+
+
+def to_export_request(
+    spans: Sequence[Span], service_name: str = "virgo"
+) -> dict[str, Any]:
+    """Build the OTLP-JSON `ExportTraceServiceRequest` for the given spans.
+
+    Args:
+        spans: The spans to export.
+        service_name: The `service.name` resource attribute.
+
+    Returns:
+        dict[str, Any]: The export request, ready to be serialized as JSON.
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": {"stringValue": service_name},
+                        }
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "virgo"},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Abstract base class for span exporters."""
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Export a batch of finished spans.
+
+        Args:
+            spans: The spans to export.
+        """
+        ...
+
+
+class FileSpanExporter(SpanExporter):
+    """Exporter appending OTLP-JSON export requests to a file, one per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @override
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(to_export_request(spans), separators=(",", ":"))
+        with self._lock, self._path.open("a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class OTLPHTTPSpanExporter(SpanExporter):
+    """Exporter posting OTLP-JSON export requests to a collector endpoint."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0) -> None:
+        """Initialize the exporter.
+
+        Args:
+            endpoint: The collector base URL, such as `http://localhost:4318`.
+                The `/v1/traces` path is appended unless already present.
+            timeout: The request timeout, in seconds.
+        """
+        endpoint = endpoint.rstrip("/")
+        self._url = (
+            endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        )
+        self._timeout = timeout
+
+    @override
+    def export(self, spans: Sequence[Span]) -> None:
+        request = urllib.request.Request(
+            self._url,
+            data=json.dumps(to_export_request(spans)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout):
+            pass
+
+
+class OTLPTracer(BaseCallbackHandler):
+    """Callback handler recording the spans of the graph runs.
+
+    Spans are emitted for the root run, the graph nodes, the chat model calls
+    and the tool calls; the other runnables (prompts, parsers, sequences) are
+    folded into their closest traced ancestor. Exporting errors are logged and
+    never interrupt the generation.
+    """
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        """Initialize the tracer.
+
+        Args:
+            exporter: The exporter receiving the spans of each finished trace.
+        """
+        self._exporter = exporter
+        self._lock = threading.Lock()
+        self._spans: dict[UUID, Span] = {}
+        self._parents: dict[UUID, UUID | None] = {}
+        self._traces: dict[str, list[Span]] = {}
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        name: str | None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> None:
+        """Register a run, starting its span when `name` is given."""
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            if name is None:
+                return
+            parent = self._closest_span(parent_run_id)
+            span = Span(
+                trace_id=parent.trace_id if parent else secrets.token_hex(16),
+                span_id=secrets.token_hex(8),
+                parent_span_id=parent.span_id if parent else None,
+                name=name,
+                kind=kind,
+                attributes=attributes or {},
+            )
+            self._spans[run_id] = span
+            self._traces.setdefault(span.trace_id, []).append(span)
+
+    def _closest_span(self, run_id: UUID | None) -> Span | None:
+        while run_id is not None:
+            if run_id in self._spans:
+                return self._spans[run_id]
+            run_id = self._parents.get(run_id)
+        return None
+
+    def _end(
+        self,
+        run_id: UUID,
+        error: BaseException | None = None,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> None:
+        """Unregister a run, ending its span and exporting its finished trace."""
+        with self._lock:
+            parent_run_id = self._parents.pop(run_id, None)
+            span = self._spans.pop(run_id, None)
+            if span is None:
+                return
+            span.attributes.update(attributes or {})
+            span.end(error)
+            finished = (
+                self._traces.pop(span.trace_id, [])
+                if span.parent_span_id is None and parent_run_id is None
+                else None
+            )
+        if finished:
+            try:
+                self._exporter.export(finished)
+            except Exception:
+                logger.warning("Could not export the trace spans.", exc_info=True)
+
+    @override
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: dict[str, Any] | Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name")
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            self._start(run_id, None, f"virgo.generate {name or 'graph'}")
+        elif node is not None and node == name:
+            self._start(
+                run_id,
+                parent_run_id,
+                f"virgo.node {node}",
+                attributes={
+                    "virgo.node": node,
+                    "virgo.step": int((metadata or {}).get("langgraph_step", 0)),
+                },
+            )
+        else:
+            self._start(run_id, parent_run_id, None)
+
+    @override
+    def on_chain_end(
+        self, outputs: dict[str, Any] | Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id)
+
+    @override
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    @override
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        invocation_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        params = invocation_params or {}
+        model = params.get("model") or params.get("model_name") or "unknown"
+        self._start(
+            run_id,
+            parent_run_id,
+            f"chat {model}",
+            kind=SPAN_KIND_CLIENT,
+            attributes={
+                "gen_ai.operation.name": "chat",
+                "gen_ai.system": str(params.get("_type", "unknown")),
+                "gen_ai.request.model": str(model),
+            },
+        )
+
+    @override
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, attributes=_token_usage(response))
+
+    @override
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    @override
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        inputs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or serialized.get("name", "tool")
+        attributes: dict[str, AttributeValue] = {"virgo.tool": name}
+        if inputs and isinstance(inputs.get("query"), str):
+            attributes["virgo.search.query"] = inputs["query"]
+        self._start(
+            run_id,
+            parent_run_id,
+            f"tool {name}",
+            kind=SPAN_KIND_CLIENT,
+            attributes=attributes,
+        )
+
+    @override
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    @override
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+
+def _token_usage(response: LLMResult) -> dict[str, AttributeValue]:
+    """Extract the token usage attributes of a chat model response."""
+    for generations in response.generations:
+        for generation in generations:
+            if isinstance(generation, ChatGeneration):
+                usage = getattr(generation.message, "usage_metadata", None)
+                if usage:
+                    return {
+                        "gen_ai.usage.input_tokens": usage["input_tokens"],
+                        "gen_ai.usage.output_tokens": usage["output_tokens"],
+                    }
+    return {}
+
+
+__all__ = [
+    "FileSpanExporter",
+    "OTLPHTTPSpanExporter",
+    "OTLPTracer",
+    "Span",
+    "SpanExporter",
+    "to_export_request",
+]